@@ -0,0 +1,119 @@
+# -*- coding:utf-8 -*-
+
+"""
+Websocket frame decoder benchmark.
+
+Compare the legacy `json.loads(gzip.decompress(msg).decode())` path with `FrameDecoder` on every installed json
+backend, over recorded frames or synthetic depth/trade/kline frames.
+
+Usage:
+    python benchmarks/bench_decoder.py [frames_file] [rounds]
+
+    frames_file: Recorded binary frames, every frame is a 4 bytes big-endian length followed by the raw gzip frame.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import zlib
+import random
+import struct
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.utils.websocket import FrameDecoder, GZIP_WBITS
+
+
+def load_frames(path):
+    """ Load length-prefixed raw frames from file. """
+    frames = []
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                break
+            size = struct.unpack(">I", head)[0]
+            frames.append(f.read(size))
+    return frames
+
+
+def synthetic_frames(count=1000):
+    """ Generate gzip frames like the depth/trade/kline pushes of the exchange. """
+    frames = []
+    price = 50000.0
+    for i in range(count):
+        ts = 1600000000000 + i * 100
+        price += random.uniform(-5, 5)
+        kind = i % 10
+        if kind < 7:
+            tick = {
+                "mrid": i, "id": ts // 1000, "ts": ts, "version": i, "ch": "market.BTC-USD.depth.step6",
+                "asks": [[round(price + 0.1 * n, 1), random.randint(1, 5000)] for n in range(1, 151)],
+                "bids": [[round(price - 0.1 * n, 1), random.randint(1, 5000)] for n in range(1, 151)]
+            }
+            data = {"ch": "market.BTC-USD.depth.step6", "ts": ts, "tick": tick}
+        elif kind < 9:
+            trades = [{"amount": random.randint(1, 100), "ts": ts, "id": i * 10 + n, "price": round(price, 1),
+                       "direction": random.choice(["buy", "sell"])} for n in range(5)]
+            data = {"ch": "market.BTC-USD.trade.detail", "ts": ts, "tick": {"id": i, "ts": ts, "data": trades}}
+        else:
+            tick = {"id": ts // 1000, "mrid": i, "open": price, "close": price, "low": price - 10,
+                    "high": price + 10, "amount": 12.3456, "vol": 6172, "count": 100}
+            data = {"ch": "market.BTC-USD.kline.1min", "ts": ts, "tick": tick}
+        frames.append(gzip.compress(json.dumps(data).encode()))
+    return frames
+
+
+def legacy_decode(msg):
+    return json.loads(gzip.decompress(msg).decode())
+
+
+def make_template_decode(loads):
+    """ Decode by copying a pre-initialized `zlib.decompressobj`, for comparison with the one-shot decompress. """
+    template = zlib.decompressobj(GZIP_WBITS)
+
+    def decode(msg):
+        return loads(template.copy().decompress(msg))
+    return decode
+
+
+def run(name, decode, frames, rounds):
+    begin = time.perf_counter()
+    for _ in range(rounds):
+        for msg in frames:
+            decode(msg)
+    used = time.perf_counter() - begin
+    count = len(frames) * rounds
+    print("%-28s frames=%-8d total=%7.3fs  per frame=%7.2fus" % (name, count, used, used / count * 1000000))
+    return used
+
+
+def main():
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
+        frames = load_frames(sys.argv[1])
+        rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    else:
+        frames = synthetic_frames()
+        rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print("frames: %d, avg size: %d bytes" % (len(frames), sum(len(f) for f in frames) // max(len(frames), 1)))
+
+    baseline = run("legacy gzip+json", legacy_decode, frames, rounds)
+    for backend in ("json", "ujson", "orjson"):
+        try:
+            decoder = FrameDecoder(backend)
+        except ImportError:
+            print("%-28s not installed" % backend)
+            continue
+        used = run("FrameDecoder(%s)" % backend, decoder.decode, frames, rounds)
+        print("%-28s speedup=%.2fx" % ("", baseline / used))
+        run("decompressobj copy(%s)" % backend, make_template_decode(decoder.loads), frames, rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+
+"""
+Heartbeat scheduler benchmark.
+
+Compare the CPU time used and the scheduling drift of the legacy 5ms polling ticker, the heap based scheduler
+and the heap based scheduler spinning the last 2ms before every due time, with 1/100/10000 registered loop run
+tasks. The tasks are registered at the same instant, or `stagger` seconds apart so that their due times are spread
+over the interval.
+
+Usage:
+    python benchmarks/bench_heartbeat.py [seconds]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.config import config
+from huobi.heartbeat import HeartBeat
+
+
+class LegacyHeartBeat(object):
+    """ The 5ms polling ticker before the heap based scheduler, only used for comparison.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._interval = 0.005
+        self._tasks = {}
+
+    async def ticker(self):
+        while True:
+            self._count += 1
+            for task_id, task in self._tasks.items():
+                interval = task["interval"]
+                if self._count % int(interval*200) != 0:
+                    continue
+                kwargs = task["kwargs"]
+                kwargs["task_id"] = task_id
+                kwargs["heart_beat_count"] = self._count
+                asyncio.create_task(task["func"](*task["args"], **kwargs))
+            await asyncio.sleep(self._interval)
+
+    def register(self, func, interval=1, *args, **kwargs):
+        task_id = len(self._tasks)
+        self._tasks[task_id] = {"func": func, "interval": interval, "args": args, "kwargs": kwargs}
+        return task_id
+
+
+async def run_case(scheduler, tasks, seconds, stagger):
+    """ Register `tasks` loop run tasks (interval 1s) `stagger` seconds apart, run `seconds` and collect the lateness
+    of every run.
+    """
+    loop = asyncio.get_event_loop()
+    drifts = []
+
+    def make_task(index):
+        state = {"runs": 0, "first": loop.time() + 1}
+
+        async def on_tick(*args, **kwargs):
+            state["runs"] += 1
+            expected = state["first"] + (state["runs"] - 1) * 1
+            drifts.append(loop.time() - expected)
+        return on_tick
+
+    if isinstance(scheduler, LegacyHeartBeat):
+        ticker = asyncio.create_task(scheduler.ticker())
+    else:
+        ticker = None
+    for i in range(tasks):
+        scheduler.register(make_task(i), 1)
+        if stagger:
+            await asyncio.sleep(stagger)
+
+    cpu_begin = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu_used = time.process_time() - cpu_begin
+    if ticker:
+        ticker.cancel()
+    return cpu_used, drifts
+
+
+def report(name, tasks, stagger, seconds, cpu_used, drifts):
+    drifts = sorted(abs(d) * 1000 for d in drifts) or [0]
+    p50 = drifts[len(drifts) // 2]
+    p99 = drifts[min(len(drifts) - 1, int(len(drifts) * 0.99))]
+    print("%-10s tasks=%-6d stagger=%-4gms cpu=%6.1f%%  runs=%-7d drift p50=%7.3fms p99=%7.3fms max=%7.3fms" % (
+        name, tasks, stagger * 1000, cpu_used / seconds * 100, len(drifts), p50, p99, drifts[-1]))
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    schedulers = (("legacy", LegacyHeartBeat, None), ("heap", HeartBeat, 0), ("heap+spin", HeartBeat, 0.002))
+    for tasks, stagger in ((1, 0), (100, 0), (10000, 0), (100, 0.01)):
+        for name, factory, spin in schedulers:
+            config.heartbeat = {"interval": 0, "spin": spin or 0}
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            scheduler = factory()
+            cpu_used, drifts = loop.run_until_complete(run_case(scheduler, tasks, seconds, stagger))
+            report(name, tasks, stagger, seconds, cpu_used, drifts)
+            for t in asyncio.all_tasks(loop):
+                t.cancel()
+            loop.run_until_complete(asyncio.sleep(0.01))
+            loop.close()
+
+
+if __name__ == "__main__":
+    main()
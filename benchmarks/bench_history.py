@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+
+"""
+Trade history memory and indicator benchmark.
+
+Compare the memory used by a deque of `Trade` objects with string fields and by `TradeColumns`, and the time to
+compute the VWAP of the newest trades.
+
+Usage:
+    python benchmarks/bench_history.py [trades]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+from collections import deque
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.markettrade import Trade
+from huobi.history import TradeColumns, SIDE_BUY, SIDE_SELL, np
+
+
+def fill_objects(count):
+    trades = deque(maxlen=count)
+    price = 50000.0
+    for i in range(count):
+        price += random.uniform(-1, 1)
+        trades.append(Trade("huobi_swap", "BTC-USD", "BUY" if i % 2 else "SELL", "%.8f" % price,
+                            "%.8f" % random.randint(1, 100), 1600000000000 + i))
+    return trades
+
+
+def fill_columns(count):
+    trades = TradeColumns(count)
+    price = 50000.0
+    for i in range(count):
+        price += random.uniform(-1, 1)
+        trades.append(1600000000000 + i, price, random.randint(1, 100), SIDE_BUY if i % 2 else SIDE_SELL)
+    return trades
+
+
+def measure(name, func, count):
+    tracemalloc.start()
+    begin = time.perf_counter()
+    result = func(count)
+    used = time.perf_counter() - begin
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("%-10s trades=%-8d memory=%8.1fMB  fill=%6.2fs" % (name, count, current / 1024 / 1024, used))
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print("numpy:", "installed" if np is not None else "not installed, stdlib array is used")
+    objects = measure("objects", fill_objects, count)
+    begin = time.perf_counter()
+    recent = list(objects)[-10000:]
+    volume = sum(float(t.quantity) for t in recent)
+    vwap = sum(float(t.price) * float(t.quantity) for t in recent) / volume
+    print("%-10s vwap(10000)=%.2f  %.2fms" % ("objects", vwap, (time.perf_counter() - begin) * 1000))
+    del objects, recent
+
+    columns = measure("columns", fill_columns, count)
+    begin = time.perf_counter()
+    vwap = columns.vwap(10000)
+    print("%-10s vwap(10000)=%.2f  %.2fms" % ("columns", vwap, (time.perf_counter() - begin) * 1000))
+
+
+if __name__ == "__main__":
+    main()
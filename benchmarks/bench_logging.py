@@ -0,0 +1,90 @@
+# -*- coding:utf-8 -*-
+
+"""
+Logging stall benchmark.
+
+Log DEBUG messages (an order dict per message) in bursts from the event loop while a probe task sleeps 1ms in a loop,
+and compare the synchronous file handler with the queued handler (records written by a background thread). The time
+the loop is blocked in `logger.debug` and the lateness of the probe wakeups are printed.
+
+Usage:
+    python benchmarks/bench_logging.py [messages] [burst]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.utils import logger
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+async def probe(lateness, stop):
+    while not stop.is_set():
+        begin = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lateness.append(time.perf_counter() - begin - 0.001)
+
+
+async def produce(messages, burst, blocked):
+    order = {"order_id": 784017320339271680, "contract_code": "BTC-USDT", "price": 10000.5, "volume": 2,
+             "direction": "buy", "offset": "open", "status": 3, "trade_volume": 0, "ts": 1603766400000}
+    for i in range(0, messages, burst):
+        begin = time.perf_counter()
+        for j in range(burst):
+            logger.debug("data:", order, "seq:", i + j, caller=logger)
+        blocked.append(time.perf_counter() - begin)
+        await asyncio.sleep(0.002)
+
+
+async def measure(name, messages, burst, queued):
+    path = tempfile.mkdtemp()
+    logging.root.handlers.clear()
+    logger.initLogger("DEBUG", path, "bench.log", queued=queued)
+    lateness, blocked = [], []
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(probe(lateness, stop))
+    begin = time.perf_counter()
+    await produce(messages, burst, blocked)
+    used = time.perf_counter() - begin
+    stop.set()
+    await task
+    logger.shutdown()
+    for handler in logging.root.handlers:
+        handler.close()
+    logging.root.handlers.clear()
+    shutil.rmtree(path)
+    print("%-7s messages=%-7d blocked=%6.2fus/msg  burst p50=%7.3fms p99=%7.3fms  "
+          "probe lateness p50=%7.3fms p99=%7.3fms max=%7.3fms  total=%6.3fs" %
+          (name, messages, sum(blocked) / messages * 1e6, percentile(blocked, 0.5) * 1000,
+           percentile(blocked, 0.99) * 1000, percentile(lateness, 0.5) * 1000, percentile(lateness, 0.99) * 1000,
+           max(lateness) * 1000, used))
+
+
+async def run(messages, burst):
+    await measure("sync", messages, burst, False)
+    await measure("queued", messages, burst, True)
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    burst = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.get_event_loop().run_until_complete(run(messages, burst))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding:utf-8 -*-
+
+"""
+Simulated matching benchmark.
+
+Feed decoded depth (20 levels) and trade messages of a random walk market to the `simulated` Trade platform, with a
+market maker that quotes the best prices again (or closes its position) when a quote is filled, and print the
+market events matched per second. The json decoding is not included, see bench_replay.py for the whole replay path.
+
+Usage:
+    python benchmarks/bench_matching.py [events]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi import const
+from huobi.trade import Trade
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
+
+
+def market_events(count):
+    quantities = [[random.randint(1, 100) for _ in range(20)] for _ in range(100)]
+    events = []
+    price = 100000  # Ticks of 0.1.
+    for i in range(count):
+        if i % 10 == 9:
+            direction = random.choice(("buy", "sell"))
+            trade_price = (price + 1 if direction == "buy" else price) / 10
+            events.append({"ch": "market.BTC-USDT.trade.detail", "tick": {"data": [
+                {"price": trade_price, "amount": random.randint(1, 50), "direction": direction}]}})
+            continue
+        price += random.choice((-1, 0, 0, 1))
+        asks = random.choice(quantities)
+        bids = random.choice(quantities)
+        events.append({"ch": "market.BTC-USDT.depth.step6", "tick": {
+            "asks": [[(price + j + 1) / 10, asks[j]] for j in range(20)],
+            "bids": [[(price - j) / 10, bids[j]] for j in range(20)]}})
+    return events
+
+
+async def run(count):
+    logging.disable(logging.INFO)
+    events = market_events(count)
+    trader = Trade("bench", const.SIMULATED, "BTC-USDT", account="bench", balance=1e9)
+    sim = trader._t
+    begin = time.perf_counter()
+    quotes = -1
+    for i, event in enumerate(events):
+        await sim.process_data(event)
+        tick = event["tick"]
+        if len(sim.order_store) != quotes and "asks" in tick:
+            # Quote again after a fill.
+            await trader.revoke_order()
+            position = sim.position
+            if position.long_quantity:
+                await trader.create_order(ORDER_ACTION_SELL, tick["asks"][0][0], position.long_quantity)
+            elif position.short_quantity:
+                await trader.create_order(ORDER_ACTION_BUY, tick["bids"][0][0], -position.short_quantity)
+            else:
+                await trader.create_order(ORDER_ACTION_BUY, tick["bids"][0][0], 1)
+                await trader.create_order(ORDER_ACTION_SELL, tick["asks"][0][0], -1)
+            quotes = len(sim.order_store)
+        if i % 1000 == 0:
+            # Let the order/position/asset callbacks run.
+            await asyncio.sleep(0)
+    used = time.perf_counter() - begin
+    stats = trader.simulation_stats()
+    print("events=%d  %9.0f events/s  %.2fus/event  orders=%d fills=%d equity=%.2f" %
+          (count, count / used, used / count * 1e6, stats["orders"], stats["fills"], stats["equity"] - 1e9))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    asyncio.get_event_loop().run_until_complete(run(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# -*- coding:utf-8 -*-
+
+"""
+Full stack load test against the local mock exchange.
+
+The mock exchange (`huobi.mockexchange`) runs in a child process, publishing `rate` market messages per second over
+BTC-USDT and ETH-USDT (incremental depth and trades). A `HuobiUsdtSwapMarket` receives them and a `HuobiUsdtSwapTrade`
+sends market orders one by one, over REST or over the websocket order gateway. Printed:
+
+* market messages per second delivered to the callbacks, and the latency from the exchange sending a message to the
+  callback receiving it (the message timestamps are floats with microseconds);
+* order request latency (create_order to response) and order to fill latency (create_order to the filled order
+  callback, through the matching engine and the notification websocket).
+
+Usage:
+    python benchmarks/bench_mockexchange.py [rate] [seconds] [orders] [rest|websocket]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import multiprocessing
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.config import config
+from huobi.mockexchange import MockExchange
+from huobi.ordertransport import LatencyHistogram
+from huobi.utils.request import AsyncHttpRequests
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL, ORDER_TYPE_MARKET, ORDER_STATUS_FILLED
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+from huobi.platforms.huobi_usdt_swap_market import HuobiUsdtSwapMarket
+
+SYMBOLS = ["BTC-USDT", "ETH-USDT"]
+
+
+def serve(conn, rate):
+    """ Run the mock exchange in the child process until the parent asks to stop. """
+    logging.disable(logging.WARNING)
+
+    async def run():
+        # 80% depth, 20% trade messages, split over the symbols.
+        exchange = MockExchange(symbols=SYMBOLS, depth_rate=rate * 0.8 / len(SYMBOLS),
+                                trade_rate=rate * 0.2 / len(SYMBOLS), float_ts=True, ping_interval=30)
+        await exchange.start()
+        conn.send((exchange.host, exchange.wss))
+        await asyncio.get_event_loop().run_in_executor(None, conn.recv)
+        stats = exchange.stats()
+        await exchange.stop()
+        conn.send(stats)
+
+    asyncio.new_event_loop().run_until_complete(run())
+
+
+def report(name, stats):
+    if not stats.get("count"):
+        print("%-28s no samples" % name)
+        return
+    print("%-28s count=%-8d mean=%7.3fms  p50=%7.3fms  p90=%7.3fms  p99=%7.3fms  max=%7.3fms" %
+          (name, stats["count"], stats["mean"], stats["p50"], stats["p90"], stats["p99"], stats["max"]))
+
+
+async def run(rate, seconds, orders, transport):
+    logging.disable(logging.WARNING)
+    config.http = {"rate_limit": False}
+    conn, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child, rate), daemon=True)
+    server.start()
+    loop = asyncio.get_event_loop()
+    host, wss = await loop.run_in_executor(None, conn.recv)
+
+    market_latency = LatencyHistogram()
+    fill_latency = LatencyHistogram()
+    counter = {"messages": 0}
+    sent = {}  # {"client_order_id": perf_counter}
+    filled = asyncio.Event()
+    inited = asyncio.Event()
+
+    async def on_orderbook(orderbook):
+        counter["messages"] += 1
+        market_latency.record(time.time() - orderbook.timestamp / 1000)
+
+    async def on_trade(trade):
+        counter["messages"] += 1
+        market_latency.record(time.time() - trade.timestamp / 1000)
+
+    async def on_order(order):
+        if order.status == ORDER_STATUS_FILLED and order.client_order_id in sent:
+            fill_latency.record(time.perf_counter() - sent.pop(order.client_order_id))
+            filled.set()
+
+    async def on_init(success, error):
+        inited.set()
+
+    async def ignore(*args):
+        pass
+
+    market = HuobiUsdtSwapMarket(platform="huobi_usdt_swap", symbols=SYMBOLS, channels=["orderbook", "trade"],
+                                 wss=wss, host=host, orderbook_incremental=True, orderbook_update_callback=on_orderbook,
+                                 trade_update_callback=on_trade)
+    trader = HuobiUsdtSwapTrade(account="bench", strategy="bench", symbol="BTC-USDT", contract_type="swap", host=host,
+                                wss=wss, access_key="access", secret_key="secret", init_success_callback=on_init,
+                                order_update_callback=on_order, position_update_callback=ignore,
+                                asset_update_callback=ignore,
+                                order_wss=wss + "/linear-swap-order" if transport == "websocket" else None)
+    await asyncio.wait_for(inited.wait(), 10)
+    await asyncio.sleep(1)  # Warm up.
+    counter["messages"] = 0
+    market_latency.__init__()
+
+    begin = time.perf_counter()
+    for i in range(orders):
+        filled.clear()
+        client_order_id = i + 1
+        sent[client_order_id] = time.perf_counter()
+        # Open and close a long position in turn.
+        action = ORDER_ACTION_BUY if i % 2 == 0 else ORDER_ACTION_SELL
+        order_no, error = await trader.create_order(action, 0, 1, ORDER_TYPE_MARKET, client_order_id)
+        assert not error, error
+        await asyncio.wait_for(filled.wait(), 5)
+        await asyncio.sleep(seconds / max(orders, 1) / 2)
+    left = seconds - (time.perf_counter() - begin)
+    if left > 0:
+        await asyncio.sleep(left)
+    used = time.perf_counter() - begin
+    received = counter["messages"]
+
+    conn.send("stop")
+    server_stats = await loop.run_in_executor(None, conn.recv)
+    server.join()
+    await market.close()
+    await AsyncHttpRequests.close()
+
+    print("target rate=%d msgs/s  received=%.0f msgs/s  server sent %d messages, %d fills" %
+          (rate, received / used, server_stats["messages"], server_stats["fills"]))
+    report("market data latency", market_latency.stats())
+    report("order request (%s)" % transport, trader.order_transport_stats()[transport])
+    report("order to fill", fill_latency.stats())
+
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    orders = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    transport = sys.argv[4] if len(sys.argv) > 4 else "rest"
+    asyncio.get_event_loop().run_until_complete(run(rate, seconds, orders, transport))
+
+
+if __name__ == "__main__":
+    main()
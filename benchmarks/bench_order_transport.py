@@ -0,0 +1,125 @@
+# -*- coding:utf-8 -*-
+
+"""
+Order-entry latency benchmark.
+
+Send orders to a local mock gateway over REST and over the websocket order transport, one by one and pipelined,
+and print the latency histograms of both transports. The rate limiter is disabled.
+
+Usage:
+    python benchmarks/bench_order_transport.py [orders] [concurrency]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import asyncio
+
+from aiohttp import web
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.config import config
+from huobi.utils.request import AsyncHttpRequests
+from huobi.ordertransport import OrderRouter, WebsocketOrderTransport, LatencyHistogram
+from huobi.platforms.huobi_usdt_swap_api import HuobiUsdtSwapRestAPI
+
+
+class MockGateway:
+    """ Accept every order, over REST and websocket. """
+
+    def __init__(self):
+        self.order_id = 0
+        self.runner = None
+        self.port = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/linear-swap-api/v1/swap_order", self.rest_order)
+        app.router.add_get("/linear-swap-order", self.ws_handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def next_order(self):
+        self.order_id += 1
+        return {"status": "ok", "data": {"order_id": self.order_id}, "ts": int(time.time() * 1000)}
+
+    async def rest_order(self, request):
+        await request.read()
+        return web.json_response(self.next_order())
+
+    async def ws_handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            data = json.loads(msg.data)
+            if data["op"] == "auth":
+                result = {"op": "auth", "err-code": 0}
+            else:
+                result = self.next_order()
+                result.update({"op": "req", "cid": data["cid"]})
+            await ws.send_bytes(gzip.compress(json.dumps(result).encode()))
+        return ws
+
+
+def report(name, stats, used, orders):
+    s = stats
+    print("%-24s orders/s=%8.0f  mean=%6.3fms  p50=%6.3fms  p90=%6.3fms  p99=%6.3fms  max=%6.3fms" %
+          (name, orders / used, s["mean"], s["p50"], s["p90"], s["p99"], s["max"]))
+
+
+async def send(rest_api, orders, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            success, error = await rest_api.create_order("BTC-USDT", 10000, 1, "buy", "open", 20, "limit", i + 1)
+            assert not error, error
+
+    begin = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(orders)])
+    return time.perf_counter() - begin
+
+
+async def run(orders, concurrency):
+    config.http = {"rate_limit": False}
+    gateway = MockGateway()
+    await gateway.start()
+    host = "http://127.0.0.1:%s" % gateway.port
+
+    rest_api = HuobiUsdtSwapRestAPI("access", "secret", host)
+    transport = WebsocketOrderTransport("ws://127.0.0.1:%s/linear-swap-order" % gateway.port, "access", "secret")
+    while not transport.ready:
+        await asyncio.sleep(0.01)
+
+    for name, router_transport in (("rest", None), ("websocket", transport)):
+        for c in (1, concurrency):
+            router = OrderRouter(router_transport)
+            api = HuobiUsdtSwapRestAPI("access", "secret", host, router)
+            await send(api, 100, c)  # Warm up.
+            router.latency[name] = LatencyHistogram()
+            used = await send(api, orders, c)
+            report("%s concurrency=%d" % (name, c), router.stats()[name], used, orders)
+
+    await transport.close()
+    await AsyncHttpRequests.close()
+    await gateway.runner.cleanup()
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.get_event_loop().run_until_complete(run(orders, concurrency))
+
+
+if __name__ == "__main__":
+    main()
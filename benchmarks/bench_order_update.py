@@ -0,0 +1,125 @@
+# -*- coding:utf-8 -*-
+
+"""
+Order update benchmark.
+
+Push order updates (submitted -> partial filled -> filled) through `HuobiUsdtSwapTrade._update_order`, and compare
+the `__slots__` Order with frozen snapshots and the old `__dict__` Order copied by `copy.copy` for every callback.
+Logging is stubbed out in both runs, so only the order model cost is compared.
+
+Usage:
+    python benchmarks/bench_order_update.py [orders]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import copy
+import time
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.order import Order
+from huobi.utils import tools, logger
+from huobi.orderstore import OrderStore
+from huobi.dispatch import Dispatcher, DISPATCH_CONFLATE
+from huobi.platforms import huobi_usdt_swap_trade
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+
+
+class LegacyOrder:
+    """ The `__dict__` Order before `__slots__`, copied by `copy.copy` for callbacks. """
+
+    def __init__(self, account=None, platform=None, strategy=None, order_no=None, symbol=None, action=None, price=0,
+                 quantity=0, remain=0, status="NONE", avg_price=0, order_type="LIMIT", trade_type=0,
+                 client_order_id=None, order_price_type=None, role=None, trade_quantity=None, trade_price=None,
+                 ctime=None, utime=None):
+        self.platform = platform
+        self.account = account
+        self.strategy = strategy
+        self.order_no = order_no
+        self.action = action
+        self.order_type = order_type
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+        self.remain = remain if remain else quantity
+        self.status = status
+        self.avg_price = avg_price
+        self.trade_type = trade_type
+        self.client_order_id = client_order_id
+        self.order_price_type = order_price_type
+        self.role = role
+        self.trade_quantity = trade_quantity
+        self.trade_price = trade_price
+        self.ctime = ctime if ctime else tools.get_cur_timestamp_ms()
+        self.utime = utime if utime else tools.get_cur_timestamp_ms()
+
+    def snapshot(self):
+        return copy.copy(self)
+
+
+def create_trade():
+    async def on_order_update(order):
+        pass
+
+    trade = HuobiUsdtSwapTrade.__new__(HuobiUsdtSwapTrade)
+    trade._platform = "huobi_usdt_swap"
+    trade._account = "test"
+    trade._strategy = "bench"
+    trade._symbol = "BTC-USDT"
+    trade._contract_type = "swap"
+    trade._orders = OrderStore()
+    trade._order_update_callback = Dispatcher(on_order_update, DISPATCH_CONFLATE, key=lambda order: order.order_no)
+    return trade
+
+
+def pushes(orders):
+    result = []
+    for i in range(orders):
+        info = {"contract_code": "BTC-USDT", "order_id": i, "client_order_id": i, "direction": "buy",
+                "offset": "open", "order_type": 1, "order_price_type": "limit", "price": 10000, "volume": 2,
+                "trade_avg_price": None, "created_at": 1600000000000, "ts": 1600000000000}
+        result.append(dict(info, status=3, trade_volume=0))
+        result.append(dict(info, status=4, trade_volume=1, trade_avg_price=10000,
+                           trade=[{"role": "maker", "trade_volume": 1, "trade_price": 10000}]))
+        result.append(dict(info, status=6, trade_volume=2, trade_avg_price=10000,
+                           trade=[{"role": "maker", "trade_volume": 1, "trade_price": 10000}]))
+    return result
+
+
+async def measure(name, order_class, updates):
+    huobi_usdt_swap_trade.Order = order_class
+    trade = create_trade()
+    begin = time.perf_counter()
+    for info in updates:
+        trade._update_order(info)
+    used = time.perf_counter() - begin
+    await asyncio.sleep(0)
+    print("%-8s updates=%-8d total=%6.3fs  updates/s=%9.0f" % (name, len(updates), used, len(updates) / used))
+    return used
+
+
+async def run(orders):
+    updates = pushes(orders)
+    info, logger.info = logger.info, lambda *args, **kwargs: None
+    try:
+        legacy = await measure("legacy", LegacyOrder, updates)
+        slots = await measure("slots", Order, updates)
+    finally:
+        logger.info = info
+        huobi_usdt_swap_trade.Order = Order
+    print("speedup: %.2fx" % (legacy / slots))
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    asyncio.get_event_loop().run_until_complete(run(orders))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+
+"""
+Frame recorder benchmark.
+
+Record gzip depth frames from the event loop at a fixed rate, then as fast as possible, and print the time the loop
+spends in `FrameRecorder.record`, the writer thread throughput and the `FrameReader` read throughput.
+
+Usage:
+    python benchmarks/bench_recorder.py [frames] [rate]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import random
+import asyncio
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.utils.recorder import FrameRecorder, FrameReader
+
+URL = "wss://api.hbdm.com/linear-swap-ws"
+
+
+def depth_frames(count):
+    frames = []
+    for i in range(count):
+        price = 10000 + random.randint(-50, 50)
+        data = {"ch": "market.BTC-USDT.depth.size_20.high_freq", "ts": 1603766400000 + i,
+                "tick": {"version": i, "event": "update",
+                         "asks": [[price + j * 0.1, random.randint(1, 100)] for j in range(3)],
+                         "bids": [[price - j * 0.1, random.randint(1, 100)] for j in range(3)]}}
+        frames.append(gzip.compress(json.dumps(data).encode()))
+    return frames
+
+
+async def paced(recorder, frames, rate):
+    """ Record `rate` frames per second in 1ms ticks, like a busy market connection. """
+    per_tick = max(rate // 1000, 1)
+    blocked = 0
+    begin = time.perf_counter()
+    for i in range(0, len(frames), per_tick):
+        start = time.perf_counter()
+        for data in frames[i:i + per_tick]:
+            recorder.record(URL, data)
+        blocked += time.perf_counter() - start
+        await asyncio.sleep(0.001)
+    return blocked, time.perf_counter() - begin
+
+
+async def run(count, rate):
+    frames = depth_frames(count)
+    size = sum(len(f) for f in frames)
+    path = tempfile.mkdtemp()
+    try:
+        recorder = FrameRecorder(path)
+        blocked, used = await paced(recorder, frames, rate)
+        recorder.flush()
+        print("paced    frames=%d  rate=%8.0f/s  record=%5.2fus/frame  pending after run=%d" %
+              (count, count / used, blocked / count * 1e6, recorder.stats()["pending"]))
+
+        begin = time.perf_counter()
+        for data in frames:
+            recorder.record(URL, data)
+        queued = time.perf_counter() - begin
+        recorder.flush()
+        used = time.perf_counter() - begin
+        print("burst    frames=%d  record=%5.2fus/frame  written=%9.0f frames/s  %6.1f MB/s" %
+              (count, queued / count * 1e6, count / used, size / used / 1e6))
+        recorder.close()
+
+        begin = time.perf_counter()
+        total = sum(1 for _ in FrameReader(path))
+        used = time.perf_counter() - begin
+        print("read     frames=%d  %9.0f frames/s" % (total, total / used))
+    finally:
+        shutil.rmtree(path)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    asyncio.get_event_loop().run_until_complete(run(count, rate))
+
+
+if __name__ == "__main__":
+    main()
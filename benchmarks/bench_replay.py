@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+
+"""
+Replay benchmark.
+
+Record `seconds` of BTC-USDT depth frames (10 per second, like the `step6` depth channel) and a trade frame every
+second, then replay them into a `HuobiUsdtSwapMarket` as fast as possible, and print the replay speedup, the frames
+per second and the per frame process latency. A day is 86400 seconds.
+
+Usage:
+    python benchmarks/bench_replay.py [seconds]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import random
+import asyncio
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi import const
+from huobi.market import Market
+from huobi.replay import Replay
+from huobi.tasks import LoopRunTask
+from huobi.utils.recorder import FrameRecorder
+
+URL = "wss://api.hbdm.com/linear-swap-ws"
+START = 1603766400000
+
+
+def record(path, seconds):
+    recorder = FrameRecorder(path)
+    for i in range(seconds * 10):
+        ts = START + i * 100
+        price = 10000 + random.randint(-50, 50)
+        data = {"ch": "market.BTC-USDT.depth.step6", "ts": ts,
+                "tick": {"ts": ts, "asks": [[price + 0.1 + j * 0.1, random.randint(1, 100)] for j in range(20)],
+                         "bids": [[price - j * 0.1, random.randint(1, 100)] for j in range(20)]}}
+        recorder.record(URL, gzip.compress(json.dumps(data).encode()), ts * 1000000)
+        if i % 10 == 0:
+            data = {"ch": "market.BTC-USDT.trade.detail", "ts": ts, "tick": {"data": [
+                {"direction": "buy", "price": price, "amount": 1, "ts": ts}]}}
+            recorder.record(URL, gzip.compress(json.dumps(data).encode()), ts * 1000000 + 1)
+    recorder.close()
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    path = tempfile.mkdtemp()
+    try:
+        begin = time.perf_counter()
+        record(path, seconds)
+        print("recorded %d seconds in %.1fs" % (seconds, time.perf_counter() - begin))
+
+        replay = Replay(path)
+        asyncio.set_event_loop(replay.loop)
+        counts = {"orderbook": 0, "trade": 0, "tick": 0}
+
+        async def on_orderbook(orderbook):
+            counts["orderbook"] += 1
+
+        async def on_trade(trade):
+            counts["trade"] += 1
+
+        async def on_tick(*args, **kwargs):
+            counts["tick"] += 1
+
+        async def setup():
+            market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook", "trade"], 20, 100, 100, 100,
+                            "wss://api.hbdm.com", orderbook_update_callback=on_orderbook,
+                            trade_update_callback=on_trade)
+            LoopRunTask.register(on_tick, 1)
+            return market
+
+        replay.add(replay.loop.run_until_complete(setup()))
+        stats = replay.loop.run_until_complete(replay.run())
+        replay.close()
+        process = stats["process"]
+        print("replayed %.0f seconds in %.2fs  speedup=%.0fx  %.0f frames/s  callbacks=%s" %
+              (stats["replay_seconds"], stats["real_seconds"], stats["speedup"],
+               stats["frames"] / stats["real_seconds"], counts))
+        print("process  p50=%.3fms p99=%.3fms max=%.3fms" % (process["p50"], process["p99"], process["max"]))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
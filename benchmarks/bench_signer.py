@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+
+"""
+Request signing benchmark.
+
+Compare the per-order signing overhead of the old `generate_signature` (parse host, encode secret key, build HMAC and
+format timestamp every request) and `Signer` (precomputed host and keyed HMAC state, cached timestamp).
+
+Usage:
+    python benchmarks/bench_signer.py [orders]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import hmac
+import time
+import base64
+import hashlib
+import datetime
+import urllib.parse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi.utils.signer import Signer
+
+HOST = "https://api.hbdm.com"
+ACCESS_KEY = "e2xxxxxx-99xxxxxx-84xxxxxx-7xxxx"
+SECRET_KEY = "b0xxxxxx-c6xxxxxx-94xxxxxx-dxxxx"
+URI = "/linear-swap-api/v1/swap_order"
+
+
+def legacy_sign(method, params, request_path):
+    """ The signing code of `*_api.py` before `Signer`. """
+    timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+    params.update({"AccessKeyId": ACCESS_KEY,
+                   "SignatureMethod": "HmacSHA256",
+                   "SignatureVersion": "2",
+                   "Timestamp": timestamp})
+    host_url = urllib.parse.urlparse(HOST).hostname.lower()
+    sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
+    encode_params = urllib.parse.urlencode(sorted_params)
+    payload = [method, host_url, request_path, encode_params]
+    payload = "\n".join(payload)
+    payload = payload.encode(encoding="UTF8")
+    secret_key = SECRET_KEY.encode(encoding="utf8")
+    digest = hmac.new(secret_key, payload, digestmod=hashlib.sha256).digest()
+    signature = base64.b64encode(digest)
+    signature = signature.decode()
+    return signature
+
+
+def signer_sign(method, params, request_path):
+    signer = Signer.get(HOST, ACCESS_KEY, SECRET_KEY)
+    params.update(signer.auth_params())
+    return signer.sign(method, request_path, params)
+
+
+def measure(name, func, orders):
+    begin = time.perf_counter()
+    for _ in range(orders):
+        func("POST", {}, URI)
+    used = time.perf_counter() - begin
+    print("%-8s orders=%-8d total=%6.3fs  per order=%6.2fus" % (name, orders, used, used / orders * 1e6))
+    return used
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    params = {}
+    params.update(Signer.get(HOST, ACCESS_KEY, SECRET_KEY).auth_params())
+    assert legacy_sign("POST", dict(params), URI) == signer_sign("POST", dict(params), URI)
+    legacy = measure("legacy", legacy_sign, orders)
+    signer = measure("signer", signer_sign, orders)
+    print("speedup: %.2fx" % (legacy / signer))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding:utf-8 -*-
+
+"""
+Parameter sweep benchmark.
+
+Record `seconds` of BTC-USDT depth and trade frames, then backtest a simple market maker of the `simulated` platform
+over a grid of `spread` and `quantity` with 1 worker and with all CPUs, and print the jobs per second, the speedup and
+the best parameters.
+
+Usage:
+    python benchmarks/bench_sweep.py [seconds] [jobs]
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import random
+import logging
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from huobi import const
+from huobi.trade import Trade
+from huobi.market import Market
+from huobi.sweep import Sweep, grid
+from huobi.utils.recorder import FrameRecorder
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
+
+URL = "wss://api.hbdm.com/linear-swap-ws"
+START = 1603766400000
+
+
+def record(path, seconds):
+    recorder = FrameRecorder(path)
+    price = 100000  # Ticks of 0.1.
+    for i in range(seconds * 10):
+        ts = START + i * 100
+        price += random.choice((-1, 0, 0, 1))
+        data = {"ch": "market.BTC-USDT.depth.step6", "ts": ts,
+                "tick": {"ts": ts, "asks": [[(price + j + 1) / 10, random.randint(1, 100)] for j in range(20)],
+                         "bids": [[(price - j) / 10, random.randint(1, 100)] for j in range(20)]}}
+        recorder.record(URL, gzip.compress(json.dumps(data).encode()), ts * 1000000)
+        direction = random.choice(("buy", "sell"))
+        data = {"ch": "market.BTC-USDT.trade.detail", "ts": ts, "tick": {"data": [
+            {"direction": direction, "price": (price + 1 if direction == "buy" else price) / 10,
+             "amount": random.randint(1, 100), "ts": ts}]}}
+        recorder.record(URL, gzip.compress(json.dumps(data).encode()), ts * 1000000 + 1)
+    recorder.close()
+
+
+def init_worker():
+    logging.disable(logging.INFO)
+
+
+async def backtest(replay, params):
+    """ Quote both sides `spread` away from the best prices, close the position at the best price. """
+    spread = params["spread"]
+    quantity = params["quantity"]
+
+    async def on_orderbook(orderbook):
+        if len(trader.orders) or not orderbook.best_ask:
+            return
+        position = trader.position
+        if position.long_quantity:
+            await trader.create_order(ORDER_ACTION_SELL, orderbook.best_ask, position.long_quantity)
+        elif position.short_quantity:
+            await trader.create_order(ORDER_ACTION_BUY, orderbook.best_bid, -position.short_quantity)
+        else:
+            await trader.create_order(ORDER_ACTION_BUY, orderbook.best_bid - spread, quantity)
+            await trader.create_order(ORDER_ACTION_SELL, orderbook.best_ask + spread, -quantity)
+
+    trader = Trade("bench", const.SIMULATED, "BTC-USDT", account="bench", latency=0.005)
+    market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook"], 20, 10, 10, 10, "wss://api.hbdm.com",
+                    orderbook_update_callback=on_orderbook)
+    replay.add(trader)
+    replay.add(market)
+    await replay.run()
+    return trader.simulation_stats()
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    spreads = [round(0.1 * (i + 1), 1) for i in range((jobs + 1) // 2)]
+    params = grid(spread=spreads, quantity=[1, 2])[:jobs]
+    path = tempfile.mkdtemp()
+    try:
+        record(path, seconds)
+        results = {}
+        for workers in sorted({1, os.cpu_count() or 1}):
+            begin = time.perf_counter()
+            table = Sweep(backtest, path, params, workers=workers, initializer=init_worker).run()
+            used = time.perf_counter() - begin
+            results[workers] = used
+            errors = [row["error"] for row in table.rows if row["error"]]
+            print("workers=%-3d jobs=%d  %.2fs  %.2f jobs/s  replayed %.0f frames/s  errors=%d" %
+                  (workers, len(table), used, len(table) / used, len(table) * seconds * 20 / used, len(errors)))
+        if len(results) > 1:
+            print("speedup %.1fx on %d CPUs" % (results[1] / results[max(results)], max(results)))
+        print(table.format(columns=["spread", "quantity", "fills", "fees", "realized_pnl", "equity", "max_drawdown"],
+                           sort="equity", limit=5))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ Email:  huangtao@ifclover.com
 
 import json
 
+from huobi.utils.frozen import freeze
+
 
 class Asset:
     """ Asset object.
@@ -20,8 +22,12 @@ class Asset:
         assets: Asset information, e.g. {"BTC": {"free": "1.1", "locked": "2.2", "total": "3.3"}, ... }
         timestamp: Published time, millisecond.
         update: If any update? True or False.
+
+    The callbacks get a read-only `FrozenAsset` snapshot, see `snapshot`.
     """
 
+    __slots__ = ("platform", "account", "assets", "timestamp", "update")
+
     def __init__(self, platform=None, account=None, assets=None, timestamp=None, update=False):
         """ Initialize. """
         self.platform = platform
@@ -30,6 +36,10 @@ class Asset:
         self.timestamp = timestamp
         self.update = update
 
+    def snapshot(self):
+        """ Read-only copy of this asset, `assets` dict is copied too. """
+        return _snapshot(self)
+
     @property
     def data(self):
         d = {
@@ -46,4 +56,7 @@ class Asset:
         return info
 
     def __repr__(self):
-        return str(self)
\ No newline at end of file
+        return str(self)
+
+
+FrozenAsset, _snapshot = freeze(Asset, {"assets": lambda assets: dict(assets) if assets else assets})
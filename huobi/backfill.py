@@ -0,0 +1,207 @@
+# -*- coding:utf-8 -*-
+
+"""
+Concurrent history backfill.
+
+Split a long history query into windows (time ranges of klines, pages of orders), fetch the windows with bounded
+concurrency and request rate, retry the failed windows, and stream the results in order as an async iterator, e.g.
+
+    backfill = Backfill(HuobiUsdtSwapRestAPI(host, access_key, secret_key), concurrency=5, rate=10)
+    async for kline in backfill.klines("BTC-USDT", "1min", start, end):
+        ...
+
+Any REST client of this package can be used, the windows are fetched by the client's `get_klines`,
+`get_history_orders` and `get_order_detail` methods.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import asyncio
+from collections import deque
+
+from huobi.utils import logger
+
+__all__ = ("Backfill", "BackfillError")
+
+
+# Kline period seconds.
+KLINE_PERIODS = {
+    "1min": 60,
+    "5min": 300,
+    "15min": 900,
+    "30min": 1800,
+    "60min": 3600,
+    "4hour": 14400,
+    "1day": 86400,
+    "1week": 604800
+}
+
+KLINE_MAX_SIZE = 2000  # Max klines returned by one request.
+
+
+class BackfillError(Exception):
+    """ A window still failed after all retries, or the REST client doesn't support the query. """
+
+
+class Backfill:
+    """ Concurrent history backfill.
+
+    Args:
+        rest_api: REST client, e.g. `HuobiUsdtSwapRestAPI`.
+        concurrency: Max windows in flight, default is 5.
+        rate: Max requests per second, 0 is unlimited, default is 10.
+        retries: Retry times of a failed window, default is 3.
+        retry_delay: Seconds to wait before the first retry, doubled every retry, default is 1.
+    """
+
+    def __init__(self, rest_api, concurrency=5, rate=10, retries=3, retry_delay=1):
+        """ Initialize. """
+        self._rest_api = rest_api
+        self._concurrency = max(concurrency, 1)
+        self._interval = 1.0 / rate if rate else 0
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._next_request_time = 0
+
+    async def klines(self, symbol, period, start, end):
+        """ Backfill klines between `start` and `end`.
+
+        Args:
+            symbol: Contract code (or symbol of future), e.g. "BTC-USDT".
+            period: Kline period, 1min, 5min, 15min, 30min, 60min, 4hour, 1day, 1week.
+            start: Start time, seconds.
+            end: End time, seconds.
+
+        Yields:
+            kline: Kline dict returned by exchange, e.g. {"id": 1600000000, "open": 1, ...}, ascending by `id`, every
+                `id` is yielded only once.
+        """
+        if period not in KLINE_PERIODS:
+            raise BackfillError("kline period not supported: %s" % period)
+        if not hasattr(self._rest_api, "get_klines"):
+            raise BackfillError("%s doesn't support klines" % self._rest_api.__class__.__name__)
+        step = KLINE_PERIODS[period] * KLINE_MAX_SIZE
+        windows = [(t, min(t + step - 1, end)) for t in range(int(start), int(end) + 1, step)]
+
+        async def fetch(window):
+            success, error = await self._rest_api.get_klines(symbol, period, None, window[0], window[1])
+            if error:
+                return None, error
+            return success.get("data") or [], None
+
+        last_id = None
+        async for data in self._run(windows, fetch):
+            for kline in sorted(data, key=lambda k: k["id"]):
+                if last_id is not None and kline["id"] <= last_id:
+                    continue
+                last_id = kline["id"]
+                yield kline
+
+    async def history_orders(self, symbol, trade_type=0, stype=1, status=0, create_date=7, page_size=50, **kwargs):
+        """ Backfill all pages of history orders.
+
+        Args:
+            symbol: Contract code (or symbol of option), e.g. "BTC-USDT".
+            trade_type/stype/status/create_date: See `get_history_orders` of the REST client.
+            page_size: Orders per page, 50 max.
+            kwargs: Other params of `get_history_orders`.
+
+        Yields:
+            order: Order dict returned by exchange, every `order_id` is yielded only once.
+        """
+        if not hasattr(self._rest_api, "get_history_orders"):
+            raise BackfillError("%s doesn't support history orders" % self._rest_api.__class__.__name__)
+
+        async def fetch(page_index):
+            success, error = await self._rest_api.get_history_orders(symbol, trade_type, stype, status, create_date,
+                                                                     page_index=page_index, page_size=page_size,
+                                                                     **kwargs)
+            if error:
+                return None, error
+            return success.get("data") or {}, None
+
+        # The first page tells the total pages.
+        first = await self._fetch_with_retry(1, fetch)
+        seen = set()
+
+        async def pages():
+            yield first
+            async for data in self._run(range(2, first.get("total_page", 1) + 1), fetch):
+                yield data
+
+        # Orders may move to the next page while paging, an order is yielded only once.
+        async for data in pages():
+            for order in data.get("orders") or []:
+                order_id = order.get("order_id_str") or order.get("order_id")
+                if order_id in seen:
+                    continue
+                seen.add(order_id)
+                yield order
+
+    async def order_details(self, symbol, order_ids, **kwargs):
+        """ Backfill order details of orders.
+
+        Args:
+            symbol: Contract code, e.g. "BTC-USDT".
+            order_ids: Order id list.
+            kwargs: Other params of `get_order_detail`, e.g. `created_at`, `order_type`.
+
+        Yields:
+            order_id, detail: Order id and the order detail dict returned by exchange, in the order of `order_ids`.
+        """
+        if not hasattr(self._rest_api, "get_order_detail"):
+            raise BackfillError("%s doesn't support order detail" % self._rest_api.__class__.__name__)
+
+        async def fetch(order_id):
+            success, error = await self._rest_api.get_order_detail(symbol, order_id, **kwargs)
+            if error:
+                return None, error
+            return (order_id, success.get("data")), None
+
+        async for item in self._run(list(dict.fromkeys(order_ids)), fetch):
+            yield item
+
+    async def _run(self, windows, fetch):
+        """ Fetch windows with bounded concurrency, and yield the results in the order of windows.
+
+        Args:
+            windows: Window list.
+            fetch: Asynchronous function, `result, error = await fetch(window)`.
+        """
+        windows = deque(windows)
+        pending = deque()
+        try:
+            while windows or pending:
+                while windows and len(pending) < self._concurrency:
+                    pending.append(asyncio.create_task(self._fetch_with_retry(windows.popleft(), fetch)))
+                result = await pending.popleft()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_with_retry(self, window, fetch):
+        delay = self._retry_delay
+        for i in range(self._retries + 1):
+            await self._throttle()
+            result, error = await fetch(window)
+            if not error:
+                return result
+            logger.warn("backfill window failed. window:", window, "retry:", i, "error:", error, caller=self)
+            if i < self._retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+        raise BackfillError("backfill window failed. window: %s error: %s" % (window, error))
+
+    async def _throttle(self):
+        """ Wait until the next request is allowed by rate. """
+        if not self._interval:
+            return
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        wait = self._next_request_time - now
+        self._next_request_time = max(now, self._next_request_time) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
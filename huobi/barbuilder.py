@@ -0,0 +1,303 @@
+# -*- coding:utf-8 -*-
+
+"""
+Local bar aggregation from the trade stream.
+
+Bars are built incrementally in O(1) per trade:
+    a) BAR_TYPE_TIME: Time bars of any interval, `size` is seconds. Bars are aligned to the epoch, and closed by a timer
+        so quiet markets still roll over (a bar without trade is flat at the last close price, volume is 0). They are
+        reconciled against the exchange 1-min klines if the interval is a multiple of 1 minute: the minutes of the
+        current bar and the last closed bar are replaced by the exchange values, and a revised copy is emitted if the
+        last closed bar changed.
+    b) BAR_TYPE_VOLUME: Closed when the total quantity reaches `size`.
+    c) BAR_TYPE_TICK: Closed when the count of trades reaches `size`.
+    d) BAR_TYPE_DOLLAR: Closed when the total notional (price * quantity) reaches `size`.
+A trade is never split, so volume and dollar bars may exceed `size` by the last trade.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import copy
+import json
+
+from huobi.utils import tools
+from huobi.tasks import SingleTask
+
+__all__ = ("Bar", "BarBuilder", "BarAggregator", "BAR_TYPE_TIME", "BAR_TYPE_VOLUME", "BAR_TYPE_TICK",
+           "BAR_TYPE_DOLLAR")
+
+
+# Bar types.
+BAR_TYPE_TIME = "time"
+BAR_TYPE_VOLUME = "volume"
+BAR_TYPE_TICK = "tick"
+BAR_TYPE_DOLLAR = "dollar"
+
+MINUTE = 60000
+
+
+class Bar:
+    """ Bar object.
+
+    Args:
+        platform: Exchange platform name, e.g. huobi_swap.
+        symbol: Trade pair name, e.g. BTC-USD.
+        bar_type: Bar type, `time`/`volume`/`tick`/`dollar`.
+        size: Bar size, seconds of time bar, quantity of volume bar, trades count of tick bar, notional of dollar bar.
+        open_time: Time of the first trade (or bar start time of time bar), millisecond.
+        close_time: Time of the last trade (or bar end time of time bar), millisecond.
+        open: Open price.
+        high: Highest price.
+        low: Lowest price.
+        close: Close price.
+        volume: Total trade quantity.
+        notional: Total trade notional, price * quantity.
+        count: Trades count.
+        revision: 0 for the first emission of a bar, increased every time the bar is revised by reconciliation.
+    """
+
+    __slots__ = ("platform", "symbol", "bar_type", "size", "open_time", "close_time", "open", "high", "low", "close",
+                 "volume", "notional", "count", "revision")
+
+    def __init__(self, platform=None, symbol=None, bar_type=None, size=None, open_time=None, close_time=None,
+                 open=None, high=None, low=None, close=None, volume=0.0, notional=0.0, count=0, revision=0):
+        """ Initialize. """
+        self.platform = platform
+        self.symbol = symbol
+        self.bar_type = bar_type
+        self.size = size
+        self.open_time = open_time
+        self.close_time = close_time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.notional = notional
+        self.count = count
+        self.revision = revision
+
+    @property
+    def vwap(self):
+        return self.notional / self.volume if self.volume else self.close
+
+    @property
+    def data(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        info = json.dumps(self.data)
+        return info
+
+    def __repr__(self):
+        return str(self)
+
+
+class BarBuilder:
+    """ Build bars of one symbol and one bar type.
+
+    Args:
+        platform: Exchange platform name.
+        symbol: Trade pair name.
+        bar_type: Bar type, `time`/`volume`/`tick`/`dollar`.
+        size: Bar size, see `Bar`.
+    """
+
+    def __init__(self, platform, symbol, bar_type, size):
+        """ Initialize. """
+        if bar_type not in (BAR_TYPE_TIME, BAR_TYPE_VOLUME, BAR_TYPE_TICK, BAR_TYPE_DOLLAR) or size <= 0:
+            raise ValueError("bar type error: %s %s" % (bar_type, size))
+        self.platform = platform
+        self.symbol = symbol
+        self.bar_type = bar_type
+        self.size = size
+        self._interval = int(size * 1000) if bar_type == BAR_TYPE_TIME else None  # Time bar interval, millisecond.
+        self._reconcile = bool(self._interval) and self._interval % MINUTE == 0  # Reconcile with 1-min klines.
+        self._bar = None  # Current bar, None if no trade after the last bar closed (not time bar).
+        self._last_close = None  # Close price of the last bar.
+        self._minutes = {}  # Per minute OHLCV of current time bar {minute: [open, high, low, close, volume]}
+        self._last_bar = None  # The last closed time bar.
+        self._last_minutes = {}  # Per minute OHLCV of the last closed time bar.
+
+    @property
+    def current(self):
+        """ The bar being built, None if no bar yet. """
+        return self._bar
+
+    def on_trade(self, price, quantity, ts):
+        """ Apply a trade.
+
+        Args:
+            price: Trade price.
+            quantity: Trade quantity.
+            ts: Trade time, millisecond.
+
+        Returns:
+            bars: Closed bars, usually empty or one bar.
+        """
+        closed = []
+        bar = self._bar
+        if self._interval:
+            if bar is None or ts >= bar.close_time:
+                closed = self._roll(ts)
+                bar = self._bar
+            if self._reconcile:
+                # A late trade of a closed bar is counted in the first minute of the current bar.
+                minute = max(ts - ts % MINUTE, bar.open_time)
+                m = self._minutes.get(minute)
+                if m is None:
+                    self._minutes[minute] = [price, price, price, price, quantity]
+                else:
+                    if price > m[1]:
+                        m[1] = price
+                    if price < m[2]:
+                        m[2] = price
+                    m[3] = price
+                    m[4] += quantity
+        elif bar is None:
+            bar = self._bar = Bar(self.platform, self.symbol, self.bar_type, self.size, ts, ts, price, price, price,
+                                  price)
+
+        if bar.count == 0 and bar.volume == 0:
+            bar.open = bar.high = bar.low = price
+        if price > bar.high:
+            bar.high = price
+        if price < bar.low:
+            bar.low = price
+        bar.close = price
+        bar.volume += quantity
+        bar.notional += price * quantity
+        bar.count += 1
+        self._last_close = price
+        if not self._interval:
+            bar.close_time = ts
+            if (self.bar_type == BAR_TYPE_VOLUME and bar.volume >= self.size) or \
+                    (self.bar_type == BAR_TYPE_TICK and bar.count >= self.size) or \
+                    (self.bar_type == BAR_TYPE_DOLLAR and bar.notional >= self.size):
+                self._bar = None
+                closed.append(bar)
+        return closed
+
+    def on_timer(self, now):
+        """ Close the time bars ended before `now`, flat bars are emitted for the intervals without trade.
+
+        Args:
+            now: Current time, millisecond.
+
+        Returns:
+            bars: Closed bars.
+        """
+        if not self._interval or self._bar is None or now < self._bar.close_time:
+            return []
+        return self._roll(now)
+
+    def reconcile(self, ts, open, high, low, close, volume):
+        """ Reconcile a minute of time bars with the exchange 1-min kline.
+
+        Args:
+            ts: Kline open time, millisecond.
+            open/high/low/close: Kline prices.
+            volume: Kline trade quantity, in the same unit as the trade quantity (contracts for Huobi futures).
+
+        Returns:
+            bars: The last closed bar if it's revised, otherwise empty.
+        """
+        if not self._reconcile:
+            return []
+        values = [open, high, low, close, volume]
+        if self._bar is not None and self._bar.open_time <= ts < self._bar.close_time:
+            self._minutes[ts] = values
+            self._apply_minutes(self._bar, self._minutes)
+            return []
+        bar = self._last_bar
+        if bar is None or not bar.open_time <= ts < bar.close_time:
+            return []
+        if self._last_minutes.get(ts) == values:
+            return []
+        self._last_minutes[ts] = values
+        # The closed bar was published, revise a copy.
+        bar = self._last_bar = copy.copy(bar)
+        self._apply_minutes(bar, self._last_minutes)
+        bar.revision += 1
+        return [bar]
+
+    def _roll(self, ts):
+        """ Close the current time bar and the empty bars before `ts`, and open the bar of `ts`. """
+        closed = []
+        start = ts - ts % self._interval
+        bar = self._bar
+        while bar is not None and bar.close_time <= start:
+            closed.append(bar)
+            self._last_bar = bar
+            self._last_minutes = self._minutes
+            self._minutes = {}
+            if bar.close_time == start:
+                break
+            # Flat bar for the interval without trade.
+            bar = Bar(self.platform, self.symbol, self.bar_type, self.size, bar.close_time,
+                      bar.close_time + self._interval, bar.close, bar.close, bar.close, bar.close)
+        self._bar = Bar(self.platform, self.symbol, self.bar_type, self.size, start, start + self._interval,
+                        self._last_close, self._last_close, self._last_close, self._last_close)
+        return closed
+
+    def _apply_minutes(self, bar, minutes):
+        keys = sorted(minutes)
+        if not keys:
+            return
+        values = [minutes[k] for k in keys]
+        bar.open = values[0][0]
+        bar.high = max(v[1] for v in values)
+        bar.low = min(v[2] for v in values)
+        bar.close = values[-1][3]
+        bar.volume = sum(v[4] for v in values)
+        if bar is self._bar:
+            self._last_close = bar.close
+
+
+class BarAggregator:
+    """ Build bars of all symbols of a market, and publish the closed bars.
+
+    Args:
+        platform: Exchange platform name.
+        symbols: Trade pair list.
+        bars: Bar specs, e.g. [{"type": "time", "size": 300}, {"type": "volume", "size": 1000}]
+        callback: Asynchronous callback function, like `async def on_bar_update_callback(bar: Bar): pass`
+        delay: Seconds to wait after the end of a time bar before the timer closes it, for the trades still on the way.
+    """
+
+    def __init__(self, platform, symbols, bars, callback=None, delay=0):
+        """ Initialize. """
+        self._callback = callback
+        self._delay = int(delay * 1000)
+        self._builders = {}  # {"symbol": [BarBuilder, ...]}
+        for symbol in symbols:
+            self._builders[symbol] = [BarBuilder(platform, symbol, spec["type"], spec["size"]) for spec in bars]
+        self.has_time_bars = any(spec["type"] == BAR_TYPE_TIME for spec in bars)
+
+    def builders(self, symbol):
+        return self._builders.get(symbol, [])
+
+    def on_trade(self, symbol, price, quantity, ts):
+        for builder in self._builders.get(symbol, []):
+            for bar in builder.on_trade(price, quantity, ts):
+                self._publish(bar)
+
+    def on_kline(self, symbol, ts, open, high, low, close, volume):
+        """ Reconcile time bars with the exchange 1-min kline of `ts`. """
+        for builder in self._builders.get(symbol, []):
+            for bar in builder.reconcile(ts, open, high, low, close, volume):
+                self._publish(bar)
+
+    async def on_timer(self, *args, **kwargs):
+        """ Loop run task to close time bars. """
+        now = tools.get_cur_timestamp_ms() - self._delay
+        for builders in self._builders.values():
+            for builder in builders:
+                for bar in builder.on_timer(now):
+                    self._publish(bar)
+
+    def _publish(self, bar):
+        if self._callback:
+            SingleTask.run(self._callback, bar)
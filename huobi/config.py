@@ -26,6 +26,8 @@ class Config:
             MARKETS: Market Server config list, default is {}.
             HEARTBEAT: Server heartbeat config, default is {}.
             PROXY: HTTP proxy config, default is None.
+            HTTP: HTTP connection pool config, default is {}.
+            RECORDER: Websocket frame recorder config, default is None.
     """
 
     def __init__(self):
@@ -37,6 +39,8 @@ class Config:
         self.heartbeat = {}
         self.mongodb = {}
         self.proxy = None
+        self.http = {}
+        self.recorder = None
         self.config_file = None
 
     def loads(self, config_file=None):
@@ -74,6 +78,8 @@ class Config:
         self.markets = update_fields.get("MARKETS", [])
         self.heartbeat = update_fields.get("HEARTBEAT", {})
         self.proxy = update_fields.get("PROXY", None)
+        self.http = update_fields.get("HTTP", {})
+        self.recorder = update_fields.get("RECORDER", None)
 
         for k, v in update_fields.items():
             setattr(self, k, v)
@@ -19,6 +19,7 @@ HUOBI_FUTURE = "huobi_future"  # Huobi Future https://huobiapi.github.io/docs/dm
 HUOBI_OPTION = "huobi_option" # Huobi Option 
 HUOBI_USDT_SWAP = "huobi_usdt_swap" # Huobi Usdt Swap 
 HUOBI_USDT_SWAP_CROSS = "huobi_usdt_swap_cross" # Huobi USDT SWAP CROSS MODE
+SIMULATED = "simulated" # Simulated USDT SWAP, orders are matched locally against market data, see huobi.matching
 
 # Market Types
 MARKET_TYPE_TRADE = "trade"
@@ -0,0 +1,139 @@
+# -*- coding:utf-8 -*-
+
+"""
+Local depth book maintained by incremental depth updates.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+from bisect import bisect_left
+
+
+class DepthBook:
+    """ Local sorted depth book of one symbol.
+
+    Price levels are kept in sorted price lists (bids are stored negated, so the best level of both sides is always at
+    index 0), and the quantity of every level in a dict. Finding a level is a binary search, and reading the top N
+    levels only touches the first N items, the whole book is never copied.
+
+    Adding or removing a level is O(log n) to find it plus an O(n) `list.insert`/`del` to shift the prices behind it.
+    Huobi books are at most 150 levels a side, where the shift is a single memmove of a few hundred pointers and is
+    faster than a balanced tree in Python, so a plain sorted list is used on purpose. Set `depth` to keep it bounded.
+
+    Args:
+        symbol: Trade pair name, e.g. BTC-USDT.
+        depth: Max price levels kept for each side, None is unlimited.
+    """
+
+    def __init__(self, symbol=None, depth=None):
+        """ Initialize. """
+        self.symbol = symbol
+        self.depth = depth
+        self.version = None  # Version of the latest applied update, None if no snapshot yet.
+        self.timestamp = None  # Update time of the latest applied update, millisecond.
+        self._ask_prices = []  # Ascending ask prices.
+        self._bid_prices = []  # Ascending negated bid prices.
+        self._asks = {}  # {price: quantity}
+        self._bids = {}  # {price: quantity}
+
+    @property
+    def synced(self):
+        return self.version is not None
+
+    def reset(self, asks, bids, version, timestamp=None):
+        """ Replace the whole book by a snapshot.
+
+        Args:
+            asks: Asks list, e.g. [[price, quantity], [...], ...]
+            bids: Bids list, e.g. [[price, quantity], [...], ...]
+            version: Snapshot version.
+            timestamp: Snapshot time, millisecond.
+        """
+        self._asks = {float(p): float(q) for p, q in asks if float(q) > 0}
+        self._bids = {float(p): float(q) for p, q in bids if float(q) > 0}
+        self._ask_prices = sorted(self._asks)
+        self._bid_prices = sorted(-p for p in self._bids)
+        self._trim()
+        self.version = version
+        self.timestamp = timestamp
+
+    def clear(self):
+        """ Drop all levels and mark the book as not synced. """
+        self.reset([], [], None)
+
+    def update(self, asks, bids, version, timestamp=None):
+        """ Apply an incremental update, a level with quantity 0 is removed.
+
+        Args:
+            asks: Changed ask levels, e.g. [[price, quantity], [...], ...]
+            bids: Changed bid levels, e.g. [[price, quantity], [...], ...]
+            version: Update version, must be exactly the book version + 1.
+            timestamp: Update time, millisecond.
+
+        Returns:
+            True if applied, False if the version is not continuous (the book is left untouched and must be resynced).
+        """
+        if self.version is None or version != self.version + 1:
+            return False
+        for price, quantity in asks:
+            self._set_level(self._asks, self._ask_prices, float(price), float(quantity), 1)
+        for price, quantity in bids:
+            self._set_level(self._bids, self._bid_prices, float(price), float(quantity), -1)
+        self._trim()
+        self.version = version
+        self.timestamp = timestamp
+        return True
+
+    def asks(self, n=None):
+        """ Get the top `n` ask levels, e.g. [[price, quantity], ...], best first. """
+        prices = self._ask_prices if n is None else self._ask_prices[:n]
+        levels = self._asks
+        return [[p, levels[p]] for p in prices]
+
+    def bids(self, n=None):
+        """ Get the top `n` bid levels, e.g. [[price, quantity], ...], best first. """
+        prices = self._bid_prices if n is None else self._bid_prices[:n]
+        levels = self._bids
+        return [[-p, levels[-p]] for p in prices]
+
+    def top(self, n):
+        """ Get the top `n` levels of both sides as numeric sequences.
+
+        Returns:
+            ask_prices, ask_quantities, bid_prices, bid_quantities: Best level first.
+        """
+        ask_prices = self._ask_prices[:n]
+        bid_prices = [-p for p in self._bid_prices[:n]]
+        asks = self._asks
+        bids = self._bids
+        return ask_prices, [asks[p] for p in ask_prices], bid_prices, [bids[p] for p in bid_prices]
+
+    def best_ask(self):
+        return self._ask_prices[0] if self._ask_prices else None
+
+    def best_bid(self):
+        return -self._bid_prices[0] if self._bid_prices else None
+
+    def __len__(self):
+        return len(self._ask_prices) + len(self._bid_prices)
+
+    def _set_level(self, levels, prices, price, quantity, sign):
+        key = price * sign
+        if quantity > 0:
+            if price not in levels:
+                prices.insert(bisect_left(prices, key), key)
+            levels[price] = quantity
+        elif price in levels:
+            del levels[price]
+            index = bisect_left(prices, key)
+            if index < len(prices) and prices[index] == key:
+                del prices[index]
+
+    def _trim(self):
+        if not self.depth:
+            return
+        for prices, levels, sign in ((self._ask_prices, self._asks, 1), (self._bid_prices, self._bids, -1)):
+            while len(prices) > self.depth:
+                levels.pop(prices.pop() * sign, None)
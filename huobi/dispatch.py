@@ -0,0 +1,170 @@
+# -*- coding:utf-8 -*-
+
+"""
+Callback dispatch module.
+
+A `Dispatcher` wraps an asynchronous callback function and queues the events for it, instead of creating a new task
+for every event. Events are delivered one by one by a single worker task, so a slow callback never has more than one
+event in progress and the events waiting for it are bounded by the dispatch policy:
+    a) DISPATCH_UNBOUNDED: Create a task for every event, the same as `SingleTask.run`. (default)
+    b) DISPATCH_BOUNDED: Queue at most `maxsize` events, new events are dropped when the queue is full.
+    c) DISPATCH_DROP_OLDEST: Queue at most `maxsize` events, the oldest event is dropped when the queue is full.
+    d) DISPATCH_CONFLATE: Keep only the latest event of every key (the `symbol` of the event by default), e.g. the
+        callback always gets the newest orderbook of a symbol.
+    e) DISPATCH_ORDERED: Queue all events and deliver them strictly in order, nothing is dropped.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import asyncio
+from collections import deque, OrderedDict
+
+from huobi.utils import logger
+
+__all__ = ("Dispatcher", "DISPATCH_UNBOUNDED", "DISPATCH_BOUNDED", "DISPATCH_DROP_OLDEST", "DISPATCH_CONFLATE",
+           "DISPATCH_ORDERED")
+
+
+# Dispatch policies.
+DISPATCH_UNBOUNDED = "unbounded"
+DISPATCH_BOUNDED = "bounded"
+DISPATCH_DROP_OLDEST = "drop_oldest"
+DISPATCH_CONFLATE = "conflate"
+DISPATCH_ORDERED = "ordered"
+
+
+class Dispatcher:
+    """ Dispatch events to an asynchronous callback function by policy.
+
+    Args:
+        func: Asynchronous callback function.
+        policy: Dispatch policy, default is `DISPATCH_UNBOUNDED`.
+        maxsize: Max queued events of `DISPATCH_BOUNDED` and `DISPATCH_DROP_OLDEST`, default is 100.
+        key: Function to get the conflation key of an event from the callback params, only used by `DISPATCH_CONFLATE`,
+            default is the `symbol` attribute of the first param.
+    """
+
+    POLICIES = (DISPATCH_UNBOUNDED, DISPATCH_BOUNDED, DISPATCH_DROP_OLDEST, DISPATCH_CONFLATE, DISPATCH_ORDERED)
+
+    def __init__(self, func, policy=DISPATCH_UNBOUNDED, maxsize=100, key=None):
+        """ Initialize. """
+        if policy not in self.POLICIES:
+            raise ValueError("dispatch policy error: %s" % policy)
+        self.func = func
+        self.policy = policy
+        self.maxsize = maxsize
+        self._key = key or self._default_key
+        self._queue = OrderedDict() if policy == DISPATCH_CONFLATE else deque()
+        self._running = False
+        self._received = 0  # Events received.
+        self._delivered = 0  # Events delivered to callback function.
+        self._dropped = 0  # Events dropped because the queue is full.
+        self._conflated = 0  # Events replaced by a newer event of the same key.
+        self._errors = 0  # Callback function raised exceptions.
+        self._max_depth = 0  # Max queue depth ever seen.
+
+    @classmethod
+    def wrap(cls, func, policy=None, **kwargs):
+        """ Wrap a callback function by dispatch policy.
+
+        Args:
+            func: Asynchronous callback function, or None.
+            policy: Dispatch policy, or a dict like {"policy": "drop_oldest", "maxsize": 10}. If None, `func` is
+                returned as it is.
+
+        Returns:
+            callback: Dispatcher object, or `func` itself.
+        """
+        if not func or not policy:
+            return func
+        if isinstance(policy, dict):
+            kwargs = dict(policy, **kwargs)
+            policy = kwargs.pop("policy", DISPATCH_UNBOUNDED)
+        return cls(func, policy, **kwargs)
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def put(self, *args, **kwargs):
+        """ Put an event, the callback function will be called with `*args, **kwargs`.
+        """
+        self._received += 1
+        if self.policy == DISPATCH_UNBOUNDED:
+            asyncio.create_task(self._call(args, kwargs))
+            return
+        queue = self._queue
+        if self.policy == DISPATCH_CONFLATE:
+            key = self._key(*args, **kwargs)
+            if key in queue:
+                self._conflated += 1
+            queue[key] = (args, kwargs)
+        elif self.policy == DISPATCH_ORDERED or len(queue) < self.maxsize:
+            queue.append((args, kwargs))
+        elif self.policy == DISPATCH_DROP_OLDEST:
+            queue.popleft()
+            queue.append((args, kwargs))
+            self._dropped += 1
+        else:
+            self._dropped += 1
+            return
+        if len(queue) > self._max_depth:
+            self._max_depth = len(queue)
+        if not self._running:
+            self._running = True
+            asyncio.create_task(self._drain())
+
+    def __call__(self, *args, **kwargs):
+        """ Call the dispatcher as a callback function, the event is queued and this coroutine returns immediately.
+        """
+        self.put(*args, **kwargs)
+        return self._done()
+
+    async def _done(self):
+        pass
+
+    def stats(self):
+        """ Get dispatch metrics.
+
+        Returns:
+            stats: e.g. {"policy": "conflate", "depth": 1, "max_depth": 3, "received": 100, "delivered": 90,
+                "dropped": 0, "conflated": 9, "errors": 0}
+        """
+        return {
+            "policy": self.policy,
+            "depth": len(self._queue),
+            "max_depth": self._max_depth,
+            "received": self._received,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "conflated": self._conflated,
+            "errors": self._errors
+        }
+
+    async def _drain(self):
+        """ Deliver queued events one by one until the queue is empty. """
+        queue = self._queue
+        try:
+            while queue:
+                if self.policy == DISPATCH_CONFLATE:
+                    _, (args, kwargs) = queue.popitem(last=False)
+                else:
+                    args, kwargs = queue.popleft()
+                await self._call(args, kwargs)
+        finally:
+            self._running = False
+
+    async def _call(self, args, kwargs):
+        try:
+            await self.func(*args, **kwargs)
+        except Exception as e:
+            self._errors += 1
+            logger.exception("dispatch callback error:", e, caller=self)
+        finally:
+            self._delivered += 1
+
+    @staticmethod
+    def _default_key(*args, **kwargs):
+        return getattr(args[0], "symbol", None) if args else None
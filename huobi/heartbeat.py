@@ -7,80 +7,181 @@ Author: QiaoXiaofeng
 Date:   2020/12/1
 Email: andyjoe318@gmail.com
 History: 1.first version.
+         2.replace the 5ms polling ticker with a heap based timer, sleep until the next due task.
 """
 
+import heapq
 import asyncio
 
-import json
-
 from huobi.utils import tools
 from huobi.utils import logger
 from huobi.config import config
 
-__all__ = ("heartbeat")
+__all__ = ("heartbeat", "SCHEDULE_FIXED_RATE", "SCHEDULE_FIXED_DELAY")
+
+
+# 调度模式
+SCHEDULE_FIXED_RATE = "FIXED_RATE"  # 固定频率，按首次执行时间对齐，执行时间不累积漂移
+SCHEDULE_FIXED_DELAY = "FIXED_DELAY"  # 固定延迟，上次执行结束后间隔interval再执行
 
 
 class HeartBeat(object):
     """ 心跳
+    任务按下次执行时间保存在最小堆中，心跳协程只在最近一个任务到期时才被唤醒。
     """
 
     def __init__(self):
-        self._count = 0  # 心跳次数
-        self._interval = 0.005  # 服务心跳执行时间间隔(秒)
+        self._count = 0  # 心跳次数(唤醒次数)
+        self._spin = config.heartbeat.get("spin", 0)  # 到期前小于该时间(秒)时让出循环等待(忙等)，默认0只由loop.call_at唤醒
         self._print_interval = config.heartbeat.get("interval", 60)  # 心跳打印时间间隔(秒)，0为不打印
         self._tasks = {}  # 跟随心跳执行的回调任务列表，由 self.register 注册 {task_id: {...}}
+        self._heap = []  # 任务执行时间堆 [[due, seq, task_id], ...]
+        self._seq = 0  # 入堆序号，相同执行时间时保持注册顺序
+        self._waiter = None  # 心跳协程等待的future，新任务比当前等待时间更早时被提前唤醒
+        self._waiter_due = None  # 心跳协程等待到的时间点
         self.ticker_started = False
 
     @property
     def count(self):
         return self._count
 
+    def start(self):
+        """ 启动心跳
+        """
+        if self.ticker_started:
+            return
+        self.ticker_started = True
+        self._spin = config.heartbeat.get("spin", self._spin)
+        self._print_interval = config.heartbeat.get("interval", self._print_interval)
+        asyncio.create_task(self.ticker())
+        if self._print_interval > 0:
+            self.register(self._print_heartbeat, self._print_interval)
+
     async def ticker(self):
-        """ 启动心跳， 每interval间隔执行一次
+        """ 启动心跳，睡眠到最近一个任务的执行时间，执行所有到期任务
         """
+        loop = asyncio.get_event_loop()
         while True:
+            if not self._heap:
+                await self._sleep_until(loop, None)
+                continue
+            due = self._heap[0][0]
+            delay = due - loop.time()
+            if delay > self._spin:
+                await self._sleep_until(loop, due - self._spin)
+                continue
+            if delay > 0:
+                # 开启spin时即将到期，让出事件循环直到到期，以CPU占用换取亚毫秒级精度
+                await asyncio.sleep(0)
+                continue
+
             self._count += 1
+            now = loop.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, seq, task_id = heapq.heappop(self._heap)
+                task = self._tasks.get(task_id)
+                if not task or task["seq"] != seq:
+                    continue
+                self._run_task(loop, task_id, task, due, now)
 
-            # 打印心跳次数
-            if self._print_interval > 0:
-                if self._count % int(self._print_interval*200) == 0:
-                    logger.info("do server heartbeat, count:", self._count, caller=self)
+    async def _sleep_until(self, loop, when):
+        """ 睡眠到指定时间，或有更早的任务注册时被唤醒
+        @param when 唤醒的时间点(loop.time())，None为直到有任务注册
+        """
+        self._waiter = loop.create_future()
+        self._waiter_due = when
+        handle = None
+        if when is not None:
+            handle = loop.call_at(when, self._wakeup)
+        try:
+            await self._waiter
+        finally:
+            if handle:
+                handle.cancel()
+            self._waiter = None
+            self._waiter_due = None
+
+    def _wakeup(self):
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _run_task(self, loop, task_id, task, due, now):
+        """ 执行到期任务，并计算下次执行时间
+        """
+        kwargs = task["kwargs"]
+        kwargs["heart_beat_count"] = self._count
+        coro = task["func"](*task["args"], **kwargs)
+        interval = task["interval"]
+        if task["mode"] == SCHEDULE_FIXED_RATE:
+            asyncio.create_task(coro)
+            # 以上次的计划时间为基准，错过的周期直接跳过，避免漂移和补偿性的突发执行
+            next_due = due + interval
+            if next_due <= now:
+                next_due += ((now - next_due) // interval + 1) * interval
+            self._push(task_id, task, next_due)
+        else:
+            t = asyncio.create_task(coro)
+            t.add_done_callback(lambda _: self._push(task_id, task, loop.time() + interval))
+
+    def _push(self, task_id, task, due):
+        """ 将任务的下次执行时间放入堆中
+        """
+        if self._tasks.get(task_id) is not task:
+            return
+        self._seq += 1
+        task["seq"] = self._seq
+        heapq.heappush(self._heap, [due, self._seq, task_id])
+        if self._waiter and (self._waiter_due is None or due < self._waiter_due):
+            self._wakeup()
 
-            # 执行任务回调
-            for task_id, task in self._tasks.items():
-                interval = task["interval"]
-                if self._count % int(interval*200) != 0:
-                    continue
-                func = task["func"]
-                args = task["args"]
-                kwargs = task["kwargs"]
-                kwargs["task_id"] = task_id
-                kwargs["heart_beat_count"] = self._count
-                asyncio.create_task(func(*args, **kwargs))
-            
-            # sleep then recurse
-            await asyncio.sleep(self._interval)
+    async def _print_heartbeat(self, *args, **kwargs):
+        logger.info("do server heartbeat, count:", self._count, caller=self)
 
     def register(self, func, interval=1, *args, **kwargs):
-        """ 注册一个任务，在每次心跳的时候执行调用
+        """ 注册一个任务，按固定频率执行调用
         @param func 心跳的时候执行的函数
-        @param interval 执行回调的时间间隔(秒)
+        @param interval 执行回调的时间间隔(秒)，支持小数
         @return task_id 任务id
         """
-        if self.ticker_started is False:
-            asyncio.create_task(self.ticker())
-            self.ticker_started = True
+        return self._register(func, interval, SCHEDULE_FIXED_RATE, args, kwargs)
 
+    def register_fixed_delay(self, func, interval=1, *args, **kwargs):
+        """ 注册一个任务，在上次执行结束后间隔interval再执行调用
+        @param func 心跳的时候执行的函数
+        @param interval 两次执行的间隔时间(秒)，支持小数
+        @return task_id 任务id
+        """
+        return self._register(func, interval, SCHEDULE_FIXED_DELAY, args, kwargs)
+
+    def _register(self, func, interval, mode, args, kwargs):
+        if interval <= 0:
+            logger.error("interval must be greater than 0, interval:", interval, caller=self)
+            return None
+        self.start()
+
+        task_id = tools.get_uuid1()
+        kwargs["task_id"] = task_id
         t = {
             "func": func,
             "interval": interval,
+            "mode": mode,
             "args": args,
-            "kwargs": kwargs
+            "kwargs": kwargs,
+            "seq": 0
         }
-        task_id = tools.get_uuid1()
         self._tasks[task_id] = t
+        self._push(task_id, t, asyncio.get_event_loop().time() + interval)
         return task_id
 
+    def reset(self):
+        """ 清除所有任务并停止心跳，下次注册任务时在当前事件循环中重新启动，用于回放时切换到新的事件循环
+        """
+        self._tasks = {}
+        self._heap = []
+        self._waiter = None
+        self._waiter_due = None
+        self.ticker_started = False
+
     def unregister(self, task_id):
         """ 注销一个任务
         @param task_id 任务id
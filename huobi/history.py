@@ -0,0 +1,228 @@
+# -*- coding:utf-8 -*-
+
+"""
+Columnar ring buffers of trade and kline history.
+
+Every field is kept in a preallocated column (a NumPy array if NumPy is installed, otherwise a stdlib `array`), so
+a trade takes 25 bytes instead of a Python object with string fields, and indicators are computed over the columns
+without walking Python objects.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ("ColumnarBuffer", "TradeColumns", "KlineColumns", "SIDE_BUY", "SIDE_SELL")
+
+
+# Trade side values in `side` column.
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+_NUMPY_TYPES = {"d": "float64", "b": "int8"}
+
+
+class ColumnarBuffer:
+    """ Fixed size columnar ring buffer.
+
+    Args:
+        maxlen: Max rows kept, the oldest rows are overwritten.
+
+    Attributes:
+        COLUMNS: Column names and `array` typecodes, e.g. (("ts", "d"), ("price", "d")), defined by subclass.
+    """
+
+    COLUMNS = ()
+
+    def __init__(self, maxlen):
+        """ Initialize. """
+        self.maxlen = maxlen
+        self.seq = 0  # Total rows ever appended.
+        self._columns = {}
+        for name, typecode in self.COLUMNS:
+            if np is not None:
+                column = np.zeros(maxlen, dtype=_NUMPY_TYPES[typecode])
+            else:
+                column = array(typecode, bytes(array(typecode).itemsize * maxlen))
+            self._columns[name] = column
+            setattr(self, "_" + name, column)
+
+    def __len__(self):
+        return min(self.seq, self.maxlen)
+
+    @property
+    def nbytes(self):
+        """ Memory used by the columns, bytes. """
+        return sum(len(c) * c.itemsize for c in self._columns.values())
+
+    def _append(self, *values):
+        index = self.seq % self.maxlen
+        for (name, _), value in zip(self.COLUMNS, values):
+            self._columns[name][index] = value
+        self.seq += 1
+
+    def column(self, name, n=None):
+        """ Get the newest `n` values of a column, oldest first.
+
+        Args:
+            name: Column name.
+            n: Count of values, None is all the values in buffer.
+
+        Returns:
+            values: A NumPy array if NumPy is installed, otherwise an `array`.
+        """
+        size = len(self)
+        n = size if n is None else min(n, size)
+        column = self._columns[name]
+        end = self.seq % self.maxlen if self.seq >= self.maxlen else self.seq
+        begin = end - n
+        if begin >= 0:
+            values = column[begin:end]
+            if np is not None:
+                # A view of the column, not a copy.
+                values.flags.writeable = False
+            return values
+        if np is not None:
+            return np.concatenate((column[begin:], column[:end]))
+        return column[begin:] + column[:end]
+
+    def to_numpy(self, n=None):
+        """ Export the newest `n` rows as a dict of NumPy arrays, oldest first.
+        """
+        if np is None:
+            raise ImportError("numpy is not installed")
+        return {name: np.asarray(self.column(name, n)) for name, _ in self.COLUMNS}
+
+
+class TradeColumns(ColumnarBuffer):
+    """ Trade history of one symbol, columns are ts/price/qty/side.
+    """
+
+    COLUMNS = (("ts", "d"), ("price", "d"), ("qty", "d"), ("side", "b"))
+
+    def append(self, ts, price, qty, side):
+        """ Append a trade.
+
+        Args:
+            ts: Trade time, millisecond.
+            price: Trade price.
+            qty: Trade quantity.
+            side: `SIDE_BUY` or `SIDE_SELL`.
+        """
+        self._append(ts, price, qty, side)
+
+    def vwap(self, n=None):
+        """ Volume weighted average price of the newest `n` trades, None if no volume. """
+        prices = self.column("price", n)
+        quantities = self.column("qty", n)
+        if np is not None:
+            volume = quantities.sum()
+            return float(np.dot(prices, quantities) / volume) if volume > 0 else None
+        volume = sum(quantities)
+        return sum(p * q for p, q in zip(prices, quantities)) / volume if volume > 0 else None
+
+    def volume(self, n=None, side=None):
+        """ Total quantity of the newest `n` trades.
+
+        Args:
+            n: Count of trades, None is all the trades in buffer.
+            side: Only count `SIDE_BUY` or `SIDE_SELL` trades, None is both.
+        """
+        quantities = self.column("qty", n)
+        if side is None:
+            return float(sum(quantities) if np is None else quantities.sum())
+        sides = self.column("side", n)
+        if np is not None:
+            return float(quantities[sides == side].sum())
+        return sum(q for q, s in zip(quantities, sides) if s == side)
+
+    def rolling_volume(self, window, n=None):
+        """ Rolling sum of quantity over `window` trades, for the newest `n` trades, oldest first. The first
+        `window - 1` values are the partial sums.
+
+        Raises:
+            ValueError: `window` is not positive.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive, got %s" % window)
+        quantities = self.column("qty", n)
+        if np is not None:
+            sums = np.cumsum(quantities)
+            sums[window:] = sums[window:] - sums[:-window]
+            return sums
+        result = array("d")
+        total = 0.0
+        for i, q in enumerate(quantities):
+            total += q
+            if i >= window:
+                total -= quantities[i - window]
+            result.append(total)
+        return result
+
+    def returns(self, n=None, log=False):
+        """ Price returns between the newest `n` consecutive trades, `n - 1` values. """
+        return _returns(self.column("price", n), log)
+
+
+class KlineColumns(ColumnarBuffer):
+    """ Kline history of one symbol, columns are ts/open/high/low/close/volume.
+
+    A push of the bar which is not closed yet has the same `ts` as the last row, it updates the last row in place.
+    """
+
+    COLUMNS = (("ts", "d"), ("open", "d"), ("high", "d"), ("low", "d"), ("close", "d"), ("volume", "d"))
+
+    def append(self, ts, open, high, low, close, volume):
+        """ Append a kline or update the last kline.
+
+        Args:
+            ts: Bar open time, millisecond.
+            open/high/low/close: Prices.
+            volume: Trade volume.
+        """
+        if self.seq and self._ts[(self.seq - 1) % self.maxlen] == ts:
+            self.seq -= 1
+        self._append(ts, open, high, low, close, volume)
+
+    def vwap(self, n=None):
+        """ Volume weighted average of typical price (high + low + close) / 3 of the newest `n` bars. """
+        highs = self.column("high", n)
+        lows = self.column("low", n)
+        closes = self.column("close", n)
+        volumes = self.column("volume", n)
+        if np is not None:
+            volume = volumes.sum()
+            return float(np.dot((highs + lows + closes) / 3, volumes) / volume) if volume > 0 else None
+        volume = sum(volumes)
+        if volume <= 0:
+            return None
+        return sum((h + l + c) / 3 * v for h, l, c, v in zip(highs, lows, closes, volumes)) / volume
+
+    def volume(self, n=None):
+        """ Total volume of the newest `n` bars. """
+        volumes = self.column("volume", n)
+        return float(sum(volumes) if np is None else volumes.sum())
+
+    def returns(self, n=None, log=False):
+        """ Close price returns of the newest `n` bars, `n - 1` values. """
+        return _returns(self.column("close", n), log)
+
+
+def _returns(prices, log):
+    if np is not None:
+        if len(prices) < 2:
+            return np.zeros(0)
+        if log:
+            return np.diff(np.log(prices))
+        return prices[1:] / prices[:-1] - 1
+    if log:
+        return array("d", (math.log(b / a) for a, b in zip(prices, prices[1:])))
+    return array("d", (b / a - 1 for a, b in zip(prices, prices[1:])))
@@ -13,6 +13,7 @@ import copy
 from huobi import const
 from huobi.utils import logger
 from huobi.tasks import SingleTask
+from huobi.dispatch import Dispatcher, DISPATCH_CONFLATE
 from huobi.orderbook import Orderbook
 from huobi.kline import Kline
 from huobi.markettrade import Trade
@@ -36,12 +37,28 @@ class Market:
         trade_update_callback: You can use this param to specific a async callback function when you initializing
             Market object. `trade_update_callback` is like `async def on_trade_update_callback(trade: Trade): pass`
             and this callback function will be executed asynchronous when trade updated.
+        orderbook_dispatch: Dispatch policy of `orderbook_update_callback`, e.g. `conflate` or
+            {"policy": "drop_oldest", "maxsize": 10}, see `huobi.dispatch`. default is None, a task is created for
+            every event.
+        kline_dispatch: Dispatch policy of `kline_update_callback`.
+        trade_dispatch: Dispatch policy of `trade_update_callback`.
+        conflate_orderbooks: Latest book mode. While `orderbook_update_callback` is still running, a newer orderbook of
+            the same symbol replaces the pending one instead of queueing, the count of skipped orderbooks is
+            `orderbooks_skipped`. The orderbooks are not copied, the callback gets the same object kept in
+            `orderbooks` history, so it's shared and read-only: copy it before changing it. default is False.
     """
 
     def __init__(self, platform=None, symbols=None, channels=None, orderbook_length=None, orderbooks_length=None,\
                 klines_length=None, trades_length=None, wss=None, \
-                orderbook_update_callback=None, kline_update_callback=None, trade_update_callback=None, **kwargs):
+                orderbook_update_callback=None, kline_update_callback=None, trade_update_callback=None, \
+                orderbook_dispatch=None, kline_dispatch=None, trade_dispatch=None, conflate_orderbooks=False, **kwargs):
         """initialize trade object."""
+        if conflate_orderbooks:
+            orderbook_dispatch = DISPATCH_CONFLATE
+        kwargs["conflate_orderbooks"] = conflate_orderbooks and orderbook_update_callback is not None
+        orderbook_update_callback = Dispatcher.wrap(orderbook_update_callback, orderbook_dispatch)
+        kline_update_callback = Dispatcher.wrap(kline_update_callback, kline_dispatch)
+        trade_update_callback = Dispatcher.wrap(trade_update_callback, trade_dispatch)
         kwargs["platform"] = platform
         kwargs["symbols"] = symbols
         kwargs["channels"] = channels
@@ -84,4 +101,53 @@ class Market:
 
     @property
     def trades(self):
-        return self._m.trades
\ No newline at end of file
+        return self._m.trades
+
+    @property
+    def orderbooks_view(self):
+        """ Read-only view of the orderbooks history, zero-copy. Items are read by index (0 is the oldest, -1 is the
+        newest), `last(n)`, or by sequence number with `get(seq)` and `iter_from(seq)`. `BufferWrappedError` is raised
+        if an item not read yet was overwritten by newer items.
+        """
+        return self._m.orderbooks_view
+
+    @property
+    def klines_view(self):
+        """ Read-only view of the klines history, zero-copy. """
+        return self._m.klines_view
+
+    @property
+    def trades_view(self):
+        """ Read-only view of the trades history, zero-copy. """
+        return self._m.trades_view
+
+    def trade_history(self, symbol):
+        """ Columnar trade history of symbol, enabled by `history_length` param, e.g.
+            history = market.trade_history("BTC-USD")
+            vwap = history.vwap(1000)
+        """
+        return self._m.trade_history(symbol)
+
+    def kline_history(self, symbol):
+        """ Columnar kline history of symbol, enabled by `history_length` param. """
+        return self._m.kline_history(symbol)
+
+    @property
+    def orderbooks_skipped(self):
+        """ Count of orderbooks replaced by a newer one before delivered to `orderbook_update_callback`. """
+        if isinstance(self._on_orderbook_update_callback, Dispatcher):
+            return self._on_orderbook_update_callback.stats()["conflated"]
+        return 0
+
+    def dispatch_stats(self):
+        """ Get queue depth and drop metrics of the callbacks dispatched by policy.
+
+        Returns:
+            stats: e.g. {"orderbook": {"policy": "conflate", "depth": 1, "dropped": 0, ...}, ...}
+        """
+        callbacks = {
+            "orderbook": self._on_orderbook_update_callback,
+            "kline": self._on_kline_update_callback,
+            "trade": self._on_trade_update_callback
+        }
+        return {name: cb.stats() for name, cb in callbacks.items() if isinstance(cb, Dispatcher)}
@@ -0,0 +1,291 @@
+# -*- coding:utf-8 -*-
+
+"""
+Matching engine of simulated orders.
+
+Simulated orders are matched against the market data of one symbol, by price-time priority with queue position:
+
+* An order that crosses the latest book takes liquidity level by level, at the book prices (taker). The book quantity
+  taken is remembered until the next book update, so two orders can't take the same quantity.
+* The rest of a limit order joins the end of the queue at its price: the quantity shown at that price in the book is
+  ahead of it. Book updates only shrink the quantity ahead (cancels ahead of the order), never grow it.
+* A market trade at the order price fills the order only after the quantity ahead (and the simulated orders ahead at
+  the same price) is consumed. A market trade through the order price, or a book crossing it, fills the order fully at
+  its own price (maker).
+
+Quantities are contracts, like the quantities of Huobi depth and trade channels. Everything is synchronous and does
+nothing but store the book while there is no resting order, so millions of market events can be replayed per run.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+from bisect import bisect_left
+
+__all__ = ("MatchingEngine", "MatchOrder", "KIND_LIMIT", "KIND_MARKET", "KIND_POST_ONLY", "KIND_IOC", "KIND_FOK")
+
+
+KIND_LIMIT = "limit"
+KIND_MARKET = "market"  # Take at most `MARKET_LEVELS` levels at any price, like `optimal_20`.
+KIND_POST_ONLY = "post_only"  # Canceled if it would take liquidity.
+KIND_IOC = "ioc"  # The rest is canceled after taking.
+KIND_FOK = "fok"  # Canceled if it can't be filled fully at once.
+
+MARKET_LEVELS = 20
+
+_NO_FILLS = ()
+
+
+class MatchOrder:
+    """ Simulated order in the matching engine.
+
+    Args:
+        order_no: Order id.
+        buy: True for a buy order, False for a sell order.
+        price: Limit price, None for a market order.
+        volume: Order quantity, contracts.
+        kind: `KIND_LIMIT`, `KIND_MARKET`, `KIND_POST_ONLY`, `KIND_IOC` or `KIND_FOK`.
+        data: Anything the caller keeps with the order.
+
+    Attributes:
+        remain: Quantity not filled yet.
+        ahead: Market quantity ahead of the order in the queue of its price, while it's resting.
+    """
+
+    __slots__ = ("order_no", "buy", "price", "volume", "remain", "kind", "ahead", "data")
+
+    def __init__(self, order_no, buy, price, volume, kind=KIND_LIMIT, data=None):
+        """ Initialize. """
+        self.order_no = order_no
+        self.buy = buy
+        self.price = price
+        self.volume = volume
+        self.remain = volume
+        self.kind = kind
+        self.ahead = 0
+        self.data = data
+
+
+class MatchingEngine:
+    """ Matching engine of one symbol.
+
+    `submit`, `on_book` and `on_trade` return the fills they made, a sequence of `(order, price, volume, maker)`, in
+    the order they happened.
+    """
+
+    def __init__(self):
+        """ Initialize. """
+        self._asks = []  # Latest book, [[price, quantity], ...] best first.
+        self._bids = []
+        self._taken = {}  # Book quantity taken by simulated orders since the latest book update, {price: quantity}
+        self._orders = {}  # Resting orders, {"order_no": order}
+        self._sells = {}  # Resting sell orders of every price in time priority, {price: [order, ...]}
+        self._buys = {}
+        self._sell_keys = []  # Ascending prices of resting sell orders.
+        self._buy_keys = []  # Ascending negated prices of resting buy orders, best first like `_sell_keys`.
+
+    def __contains__(self, order_no):
+        return order_no in self._orders
+
+    def __len__(self):
+        return len(self._orders)
+
+    @property
+    def best_ask(self):
+        return self._asks[0][0] if self._asks else None
+
+    @property
+    def best_bid(self):
+        return self._bids[0][0] if self._bids else None
+
+    def get(self, order_no):
+        """ Get a resting order, None if it's not resting. """
+        return self._orders.get(order_no)
+
+    def submit(self, order):
+        """ Match a new order against the latest book, the rest of a limit order is resting.
+
+        After that, the order is filled if `remain` is 0, resting if it's in the engine, otherwise the rest is
+        canceled (market, IOC, FOK, or a post only order that would take liquidity).
+        """
+        buy = order.buy
+        book = self._asks if buy else self._bids
+        price = order.price
+        kind = order.kind
+        crossed = bool(book) and (price is None or (book[0][0] <= price if buy else book[0][0] >= price))
+        if kind == KIND_POST_ONLY:
+            if crossed:
+                return _NO_FILLS
+            self._rest(order)
+            return _NO_FILLS
+        fills = []
+        if crossed:
+            levels = book[:MARKET_LEVELS] if price is None else book
+            if kind == KIND_FOK and self._available(levels, price, buy) < order.remain:
+                return _NO_FILLS
+            taken = self._taken
+            for level in levels:
+                level_price = level[0]
+                if price is not None and (level_price > price if buy else level_price < price):
+                    break
+                available = level[1] - taken.get(level_price, 0)
+                if available <= 0:
+                    continue
+                volume = min(available, order.remain)
+                taken[level_price] = taken.get(level_price, 0) + volume
+                order.remain -= volume
+                fills.append((order, level_price, volume, False))
+                if order.remain <= 0:
+                    break
+        if order.remain > 0 and kind == KIND_LIMIT:
+            self._rest(order)
+        return fills
+
+    def cancel(self, order_no):
+        """ Cancel a resting order.
+
+        Returns:
+            order: The canceled order, None if it's not resting.
+        """
+        order = self._orders.pop(order_no, None)
+        if not order:
+            return None
+        levels, keys, key = self._side(order)
+        queue = levels[order.price]
+        queue.remove(order)
+        if not queue:
+            self._remove_level(levels, keys, key)
+        return order
+
+    def on_book(self, asks, bids):
+        """ Update the latest book, asks and bids are [[price, quantity], ...] best first, they're not modified. """
+        self._asks = asks
+        self._bids = bids
+        if self._taken:
+            self._taken = {}
+        if not self._orders:
+            return _NO_FILLS
+        fills = []
+        if self._buys:
+            if asks:
+                self._fill_through(self._buys, self._buy_keys, -1, -asks[0][0], fills)
+            self._shrink_queues(self._buys, self._buy_keys, -1, bids)
+        if self._sells:
+            if bids:
+                self._fill_through(self._sells, self._sell_keys, 1, bids[0][0], fills)
+            self._shrink_queues(self._sells, self._sell_keys, 1, asks)
+        return fills
+
+    def on_trade(self, price, volume, buy):
+        """ Match a market trade against the resting orders.
+
+        Args:
+            price: Trade price.
+            volume: Trade quantity.
+            buy: True if the taker of the trade is a buyer (it matches resting sell orders).
+        """
+        if not self._orders:
+            return _NO_FILLS
+        if buy:
+            levels, keys, sign = self._sells, self._sell_keys, 1
+        else:
+            levels, keys, sign = self._buys, self._buy_keys, -1
+        if not keys or keys[0] > price * sign:
+            return _NO_FILLS
+        fills = []
+        key = price * sign
+        # Prices better than the trade price are traded through.
+        self._fill_through(levels, keys, sign, key, fills, inclusive=False)
+        if keys and keys[0] == key:
+            queue = levels[price]
+            ahead_ours = 0
+            for order in queue:
+                reach = volume - order.ahead - ahead_ours
+                ahead_ours += order.remain
+                order.ahead = max(order.ahead - volume, 0)
+                if reach > 0:
+                    filled = min(reach, order.remain)
+                    order.remain -= filled
+                    fills.append((order, price, filled, True))
+            if fills:
+                self._drop_filled(levels, keys, key)
+        return fills
+
+    def _available(self, levels, price, buy):
+        taken = self._taken
+        total = 0
+        for level_price, quantity in levels:
+            if price is not None and (level_price > price if buy else level_price < price):
+                break
+            total += max(quantity - taken.get(level_price, 0), 0)
+        return total
+
+    def _side(self, order):
+        if order.buy:
+            return self._buys, self._buy_keys, -order.price
+        return self._sells, self._sell_keys, order.price
+
+    def _rest(self, order):
+        levels, keys, key = self._side(order)
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = []
+            keys.insert(bisect_left(keys, key), key)
+        book = self._bids if order.buy else self._asks
+        order.ahead = 0
+        for level_price, quantity in book:
+            if level_price == order.price:
+                order.ahead = quantity
+                break
+            if (level_price < order.price) if order.buy else (level_price > order.price):
+                break
+        queue.append(order)
+        self._orders[order.order_no] = order
+
+    def _remove_level(self, levels, keys, key):
+        del levels[key if key > 0 else -key]
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def _fill_through(self, levels, keys, sign, key, fills, inclusive=True):
+        """ Fill the resting orders of the prices better than or equal to (inclusive) `key` fully at their price. """
+        orders = self._orders
+        while keys and (keys[0] <= key if inclusive else keys[0] < key):
+            level_key = keys.pop(0)
+            for order in levels.pop(level_key * sign):
+                volume = order.remain
+                order.remain = 0
+                del orders[order.order_no]
+                fills.append((order, order.price, volume, True))
+
+    def _drop_filled(self, levels, keys, key):
+        price = key if key > 0 else -key
+        queue = levels[price]
+        rest = []
+        for order in queue:
+            if order.remain > 0:
+                rest.append(order)
+            else:
+                del self._orders[order.order_no]
+        if rest:
+            levels[price] = rest
+        else:
+            self._remove_level(levels, keys, key)
+
+    def _shrink_queues(self, levels, keys, sign, book):
+        """ The quantity ahead of a resting order is at most the quantity shown at its price, and 0 if its price is
+        within the shown levels but not shown.
+        """
+        index = 0
+        size = len(book)
+        for key in keys:
+            while index < size and book[index][0] * sign < key:
+                index += 1
+            if index >= size:
+                return
+            quantity = book[index][1] if book[index][0] * sign == key else 0
+            for order in levels[key * sign]:
+                if order.ahead > quantity:
+                    order.ahead = quantity
@@ -0,0 +1,1097 @@
+# -*- coding:utf-8 -*-
+
+"""
+Local mock Huobi exchange.
+
+An aiohttp server standing in for the Huobi swap gateways, to test and benchmark the full stack offline:
+
+* REST: the endpoints of `HuobiUsdtSwapRestAPI` (`/linear-swap-api`, `/linear-swap-ex`) and `HuobiSwapRestAPI`
+  (`/swap-api`, `/swap-ex`), the private requests are checked by their signatures.
+* Market websocket `/linear-swap-ws` and `/swap-ws`: gzip frames, ping/pong, sub/unsub of the depth (`step*`
+  snapshots and `size_*.high_freq` incremental), `trade.detail` and `kline.*` channels, fed by a synthetic random walk
+  market of `depth_rate` depth and `trade_rate` trade messages per second per contract.
+* Notification websocket `/linear-swap-notification` and `/swap-notification`: signed auth, the `orders`,
+  `positions` and `accounts` topics, wildcard `*` included.
+* Order gateway websocket `/linear-swap-order` and `/swap-order`, see `huobi.ordertransport`.
+
+Orders of every access key and contract are matched by a `MockAccount`, which is the `simulated` platform running on
+the server side against the synthetic market, so the fills, positions and assets follow the same rules as backtests.
+Coin margined contracts are accounted like the USDT margined ones (linear), fine for latency and load testing, not
+for pnl.
+
+    exchange = MockExchange(keys={"access": "secret"}, symbols=["BTC-USDT"], depth_rate=5000, latency=0.002)
+    await exchange.start()
+    market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook"], 10, 10, 10, 10, exchange.wss,
+                    host=exchange.host, orderbook_update_callback=on_orderbook)
+    trader = Trade("mm", const.HUOBI_USDT_SWAP, "BTC-USDT", exchange.host, exchange.wss, "mock", "access", "secret",
+                   contract_type="USDTSWAP")
+    ...
+    await exchange.stop()
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import hmac
+import json
+import time
+import zlib
+import random
+import asyncio
+import calendar
+from collections import OrderedDict, deque
+
+from aiohttp import web, WSMsgType
+
+from huobi.utils import logger
+from huobi.utils.signer import Signer
+from huobi.utils.websocket import GZIP_WBITS
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
+from huobi.order import ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_MAKER, ORDER_TYPE_FOK, ORDER_TYPE_IOC
+from huobi.platforms.simulated_trade import SimulatedTrade
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(data):
+        return json.dumps(data, separators=(",", ":")).encode()
+
+__all__ = ("MockExchange", "MockAccount", "CONTRACTS")
+
+
+# Contracts of the synthetic market, the unknown contracts are like {"contract_size": 0.001, "price_tick": 0.01,
+# "price": 100}.
+CONTRACTS = {
+    "BTC-USDT": {"contract_size": 0.001, "price_tick": 0.1, "price": 10000},
+    "ETH-USDT": {"contract_size": 0.01, "price_tick": 0.01, "price": 300},
+    "BTC-USD": {"contract_size": 0.01, "price_tick": 0.1, "price": 10000},
+    "ETH-USD": {"contract_size": 0.1, "price_tick": 0.01, "price": 300}
+}
+
+KLINE_PERIODS = {"1min": 60, "5min": 300, "15min": 900, "30min": 1800, "60min": 3600, "4hour": 14400, "1day": 86400}
+
+ORDER_PRICE_TYPES = {
+    "limit": ORDER_TYPE_LIMIT,
+    "post_only": ORDER_TYPE_MAKER,
+    "ioc": ORDER_TYPE_IOC,
+    "fok": ORDER_TYPE_FOK
+}  # The others, `opponent`, `optimal_20` etc. are market orders.
+
+PRIVATE_ENDPOINTS = ("swap_account_info", "swap_position_info", "swap_account_position_info", "swap_order",
+                     "swap_batchorder", "swap_cancel", "swap_cancelall", "swap_order_info", "swap_order_detail",
+                     "swap_openorders", "swap_hisorders", "swap_transfer_inner")
+
+FEED_INTERVAL = 0.001  # Seconds between two batches of the synthetic feed.
+FEED_BATCH = 16  # Messages of every contract published before yielding to the other tasks.
+MAX_QUEUE = 100000  # A websocket client with more messages waiting to be sent is too slow, it's disconnected.
+HISTORY_SIZE = 1000  # Completed orders kept by an account.
+
+
+def _gzip(data):
+    c = zlib.compressobj(1, zlib.DEFLATED, GZIP_WBITS)
+    return c.compress(_dumps(data)) + c.flush()
+
+
+def _ms():
+    return int(time.time() * 1000)
+
+
+def _error(code, msg):
+    """ Error response of the contract API. """
+    return {"status": "error", "err_code": code, "err_msg": msg, "ts": _ms()}
+
+
+def _diff(old, new):
+    """ Levels changed from `old` to `new`, the removed levels with quantity 0. """
+    quantities = dict(old)
+    levels = [level for level in new if quantities.pop(level[0], None) != level[1]]
+    levels.extend([price, 0] for price in quantities)
+    return levels
+
+
+async def _ignore(*args, **kwargs):
+    pass
+
+
+class _Feed:
+    """ Synthetic market of a contract, the best bid walks by a tick at times, the best ask is a tick above it.
+    """
+
+    def __init__(self, symbol, contract_size, price_tick, price, levels, rand):
+        self.symbol = symbol
+        self.contract_size = contract_size
+        self.price_tick = price_tick
+        self.levels = levels
+        self.rand = rand
+        self._prices = {}  # Price of ticks, rounded once, {ticks: price}
+        bid = int(round(price / price_tick))
+        self.ask_prices = [self._price(bid + 1 + i) for i in range(levels)]
+        self.bid_prices = [self._price(bid - i) for i in range(levels)]
+        self.ask_quantities = [self._quantity() for _ in range(levels)]
+        self.bid_quantities = [self._quantity() for _ in range(levels)]
+        self.bid = bid  # Best bid price in ticks.
+        self.version = 1
+        self.trade_id = 0
+        self.changed = None  # Levels changed by the last step, [(is_ask, index), ...], None if the price moved.
+        self.asks = self.bids = None
+        self._build()
+        self.prev_asks = self.asks
+        self.prev_bids = self.bids
+        self.last_price = self.bids[0][0]
+        self.bars = {}  # Current bar of every kline period, {"1min": {"id": ..., "open": ..., ...}}
+        self.history = {period: deque(maxlen=2000) for period in KLINE_PERIODS}  # Completed bars.
+        self.book_channel = "market.%s.depth.step0" % symbol
+        self.trade_channel = "market.%s.trade.detail" % symbol
+
+    def _price(self, ticks):
+        price = self._prices.get(ticks)
+        if price is None:
+            price = self._prices[ticks] = round(ticks * self.price_tick, 8)
+        return price
+
+    def _quantity(self):
+        return int(self.rand.random() * 100) + 1
+
+    def _build(self):
+        self.asks = [[p, q] for p, q in zip(self.ask_prices, self.ask_quantities)]
+        self.bids = [[p, q] for p, q in zip(self.bid_prices, self.bid_quantities)]
+
+    def step(self):
+        """ Next depth version, the price moves a tick at times and the quantities of two levels change. """
+        random = self.rand.random
+        levels = self.levels
+        self.prev_asks = self.asks
+        self.prev_bids = self.bids
+        move = random()
+        changed = []
+        if move < 0.2:
+            changed = None
+            if move < 0.1:
+                self.bid += 1
+                self.ask_prices.pop(0)
+                self.ask_prices.append(self._price(self.bid + levels))
+                self.ask_quantities.pop(0)
+                self.ask_quantities.append(self._quantity())
+                self.bid_prices.insert(0, self._price(self.bid))
+                self.bid_prices.pop()
+                self.bid_quantities.insert(0, self._quantity())
+                self.bid_quantities.pop()
+            else:
+                self.bid -= 1
+                self.bid_prices.pop(0)
+                self.bid_prices.append(self._price(self.bid - levels + 1))
+                self.bid_quantities.pop(0)
+                self.bid_quantities.append(self._quantity())
+                self.ask_prices.insert(0, self._price(self.bid + 1))
+                self.ask_prices.pop()
+                self.ask_quantities.insert(0, self._quantity())
+                self.ask_quantities.pop()
+        for _ in range(2):
+            ask = random() < 0.5
+            index = int(random() * levels)
+            (self.ask_quantities if ask else self.bid_quantities)[index] = self._quantity()
+            if changed is not None:
+                changed.append((ask, index))
+        self.changed = changed
+        self.version += 1
+        self._build()
+
+    def diff(self, size):
+        """ Incremental update of the top `size` levels from the previous version, the removed levels with quantity 0.
+
+        Returns:
+            asks: Changed asks.
+            bids: Changed bids.
+        """
+        if self.changed is None:
+            return _diff(self.prev_asks[:size], self.asks[:size]), _diff(self.prev_bids[:size], self.bids[:size])
+        asks = []
+        bids = []
+        for ask, index in self.changed:
+            if index < size:
+                if ask:
+                    asks.append(self.asks[index])
+                else:
+                    bids.append(self.bids[index])
+        return asks, bids
+
+    def trade(self, ts):
+        """ A market trade at the best price. """
+        buy = self.rand.random() < 0.5
+        price = self.asks[0][0] if buy else self.bids[0][0]
+        amount = int(self.rand.random() * 10) + 1
+        self.trade_id += 1
+        self.last_price = price
+        for period, seconds in KLINE_PERIODS.items():
+            bar_id = int(ts // 1000) // seconds * seconds
+            bar = self.bars.get(period)
+            if bar is None or bar["id"] != bar_id:
+                if bar is not None:
+                    self.history[period].append(bar)
+                bar = self.bars[period] = {"id": bar_id, "open": price, "close": price, "low": price, "high": price,
+                                           "amount": 0.0, "vol": 0, "trade_turnover": 0.0, "count": 0}
+            bar["close"] = price
+            if price > bar["high"]:
+                bar["high"] = price
+            elif price < bar["low"]:
+                bar["low"] = price
+            bar["amount"] += amount * self.contract_size
+            bar["vol"] += amount
+            bar["trade_turnover"] += amount * self.contract_size * price
+            bar["count"] += 1
+        return {"id": self.trade_id, "price": price, "amount": amount, "direction": "buy" if buy else "sell",
+                "quantity": amount * self.contract_size, "ts": ts}
+
+    def depth_tick(self, ch, ts, size=None, event=None):
+        """ Full depth tick of the current version. """
+        tick = {"asks": self.asks[:size] if size else self.asks, "bids": self.bids[:size] if size else self.bids,
+                "ch": ch, "id": self.version, "mrid": self.version, "ts": ts, "version": self.version}
+        if event:
+            tick["event"] = event
+        return tick
+
+
+class _Client:
+    """ A websocket connection, messages are sent in order by a writer task, delayed by the push latency.
+    """
+
+    def __init__(self, exchange, ws, kind):
+        self.exchange = exchange
+        self.ws = ws
+        self.kind = kind  # `market`, `notification` or `order`.
+        self.access_key = None  # Authorized access key.
+        self.channels = set()  # Market channels, {(channel, incremental)}
+        self.topics = set()  # Notification topics, {("orders", "BTC-USDT")}, contract code `*` is wildcard.
+        self.last = time.time()  # Last time a message was received.
+        self.queue = deque()
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.ensure_future(self._write())
+
+    def push(self, raw):
+        """ Queue a gzip message. """
+        queue = self.queue
+        if len(queue) >= MAX_QUEUE:
+            logger.warn("client too slow, disconnect. kind:", self.kind, caller=self)
+            self.close()
+            return
+        delay = self.exchange.push_delay()
+        queue.append((time.time() + delay if delay else 0, raw))
+        self.exchange.messages += 1
+        if len(queue) == 1:
+            self._wakeup.set()
+
+    def push_json(self, data):
+        self.push(_gzip(data))
+
+    async def _write(self):
+        queue = self.queue
+        try:
+            while True:
+                if not queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                due, raw = queue[0]
+                if due:
+                    wait = due - time.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                queue.popleft()
+                await self.ws.send_bytes(raw)
+        except (ConnectionResetError, RuntimeError):
+            self.queue.clear()
+
+    def close(self):
+        self._writer.cancel()
+        self.queue.clear()
+        if not self.ws.closed:
+            asyncio.ensure_future(self.ws.close())
+
+
+class MockAccount(SimulatedTrade):
+    """ Orders of an access key on a contract of the mock exchange, matched against its synthetic market. The order,
+    position and asset updates are pushed to the notification subscribers of the access key.
+
+    Args:
+        exchange: `MockExchange`.
+        access_key: Access key of the account.
+        symbol: Contract code, e.g. `BTC-USDT`.
+        kwargs: `balance`, `margin_asset`, `contract_size`, `maker_fee` and `taker_fee` of `SimulatedTrade`.
+    """
+
+    def __init__(self, exchange, access_key, symbol, **kwargs):
+        """ Initialize. """
+        self._exchange = exchange
+        self._access_key = access_key
+        self._open_infos = {}  # Latest info of the open orders, {"order_id": info}
+        self._done_infos = OrderedDict()  # Latest info of the completed orders, {"order_id": info}
+        super(MockAccount, self).__init__(account=access_key, strategy="mock", symbol=symbol,
+                                          init_success_callback=_ignore, **kwargs)
+
+    def place(self, body):
+        """ Create an order by a `swap_order` request body, or an item of `swap_batchorder`.
+
+        Returns:
+            order_id: Order id if it's accepted, otherwise None.
+            error: Error response, otherwise None.
+        """
+        direction = body.get("direction")
+        offset = body.get("offset")
+        order_price_type = body.get("order_price_type") or body.get("orderPriceType") or "limit"
+        order_type = ORDER_PRICE_TYPES.get(order_price_type, ORDER_TYPE_MARKET)
+        try:
+            volume = int(body.get("volume") or 0)
+            lever_rate = int(body.get("lever_rate") or body.get("leverRate") or 20)
+            price = body.get("price")
+            price = float(price) if price is not None else None
+        except (TypeError, ValueError):
+            return None, _error(1000, "Incorrect order params.")
+        if direction not in ("buy", "sell") or offset not in ("open", "close") or volume <= 0:
+            return None, _error(1000, "Incorrect order params.")
+        if price is None and order_type != ORDER_TYPE_MARKET:
+            return None, _error(1000, "Incorrect order params.")
+        if direction == "buy":
+            action, quantity = ORDER_ACTION_BUY, volume if offset == "open" else -volume
+        else:
+            action, quantity = ORDER_ACTION_SELL, volume if offset == "close" else -volume
+        order, error = self._new_order(action, price, quantity, order_type, body.get("client_order_id"), lever_rate)
+        if error:
+            return None, error if isinstance(error, dict) else _error(1000, error)
+        order.data["order_price_type"] = order_price_type
+        self._submit(order)
+        return order.data["order_id"], None
+
+    def cancel(self, order_ids=None, client_order_ids=None):
+        """ Cancel orders by order ids or client order ids, all open orders if both are None.
+
+        Returns:
+            successes: Canceled order ids.
+            errors: [{"order_id": "1", "err_code": 1061, "err_msg": "This order doesnt exist."}, ...]
+        """
+        if order_ids is None and client_order_ids is None:
+            order_ids = list(self._open_infos)
+        elif client_order_ids is not None:
+            ids = {str(info["client_order_id"]): order_id for order_id, info in self._open_infos.items()}
+            order_ids = [ids.get(str(client_order_id), client_order_id) for client_order_id in client_order_ids]
+        successes = []
+        errors = []
+        for order_id in order_ids:
+            if self._cancel(str(order_id)):
+                successes.append(str(order_id))
+            else:
+                errors.append({"order_id": str(order_id), "err_code": 1061, "err_msg": "This order doesnt exist."})
+        return successes, errors
+
+    def open_orders(self):
+        return list(self._open_infos.values())
+
+    def history_orders(self):
+        """ Completed orders, the latest first. """
+        return list(reversed(self._done_infos.values()))
+
+    def order_info(self, order_id):
+        order_id = int(order_id)
+        return self._open_infos.get(order_id) or self._done_infos.get(order_id)
+
+    def positions(self):
+        return [self._position_info(position) for position in (self._long, self._short) if position[0]]
+
+    def asset(self):
+        return self._asset_info()
+
+    def snapshot(self, topic):
+        """ Notification message of all positions or the asset, pushed after the topic is subscribed. """
+        if topic == "positions":
+            data = self.positions()
+        else:
+            data = [self._asset_info()]
+        return {"op": "notify", "topic": "%s.%s" % (topic, self._symbol), "ts": _ms(), "event": "snapshot",
+                "data": data}
+
+    def _update_order(self, info):
+        order_id = info["order_id"]
+        info.pop("margin", None)
+        info["order_id_str"] = str(order_id)
+        info["symbol"] = self._symbol.split("-")[0]
+        info["margin_asset"] = self._margin_asset
+        for trade in info["trade"]:
+            trade["id"] = trade["trade_id"] = self._exchange.next_trade_id()
+            trade["created_at"] = info["ts"]
+            trade["fee_asset"] = self._margin_asset
+        prev = self._open_infos.get(order_id)
+        stored = dict(info)
+        stored["trades"] = (prev["trades"] if prev else []) + info["trade"]
+        del stored["trade"]
+        if info["status"] in (3, 4):
+            self._open_infos[order_id] = stored
+        else:
+            self._open_infos.pop(order_id, None)
+            self._done_infos[order_id] = stored
+            if len(self._done_infos) > HISTORY_SIZE:
+                self._done_infos.popitem(last=False)
+        info["op"] = "notify"
+        info["topic"] = "orders." + self._symbol
+        self._exchange.notify(self._access_key, "orders", self._symbol, info)
+
+    def _update_position(self, data):
+        data["op"] = "notify"
+        data["event"] = "order.match"
+        self._exchange.notify(self._access_key, "positions", self._symbol, data)
+
+    def _update_asset(self, data):
+        data["op"] = "notify"
+        data["event"] = "order.match"
+        self._exchange.notify(self._access_key, "accounts", self._symbol, data)
+
+
+class MockExchange:
+    """ Local mock Huobi exchange server.
+
+    Args:
+        keys: Accounts, {"access key": "secret key"}, default is {"access": "secret"}.
+        symbols: Contract codes of the synthetic market, default is ["BTC-USDT"].
+        contracts: Contract size, price tick and initial price of the contracts, merged into `CONTRACTS`.
+        latency: Seconds every REST and order gateway request is delayed, default is 0.
+        push_latency: Seconds every websocket message is delayed, default is 0.
+        jitter: Max random seconds added to every delay, default is 0.
+        depth_rate: Depth messages per second of every contract, default is 10.
+        trade_rate: Trade messages per second of every contract, default is 10.
+        depth_levels: Levels of the synthetic book, default is 20.
+        balance: Initial balance of every account and contract, default is 10000.
+        maker_fee: Maker fee rate, default is 0.0002.
+        taker_fee: Taker fee rate, default is 0.0005.
+        ping_interval: Seconds between the pings of websocket, a connection silent for 2 intervals is closed,
+            default is 5.
+        float_ts: Millisecond timestamps of the market messages are floats with microseconds, to measure sub
+            millisecond latency. default is False, integers like Huobi.
+        check_signature: Check the signatures of private requests, default is True.
+        seed: Random seed of the synthetic market.
+        bind: Listen address, default is `127.0.0.1`.
+        port: Listen port, default is 0, a free port.
+
+    Attributes:
+        host: REST address after started, e.g. `http://127.0.0.1:8080`.
+        wss: Websocket address after started, e.g. `ws://127.0.0.1:8080`.
+    """
+
+    def __init__(self, keys=None, symbols=None, contracts=None, latency=0, push_latency=0, jitter=0, depth_rate=10,
+                 trade_rate=10, depth_levels=20, balance=10000, maker_fee=0.0002, taker_fee=0.0005, ping_interval=5,
+                 float_ts=False, check_signature=True, seed=None, bind="127.0.0.1", port=0):
+        """ Initialize. """
+        self._keys = keys or {"access": "secret"}
+        self._contracts = dict(CONTRACTS)
+        self._contracts.update(contracts or {})
+        self._latency = latency
+        self._push_latency = push_latency
+        self._jitter = jitter
+        self._depth_rate = depth_rate
+        self._trade_rate = trade_rate
+        self._balance = balance
+        self._maker_fee = maker_fee
+        self._taker_fee = taker_fee
+        self._ping_interval = ping_interval
+        self._float_ts = float_ts
+        self._check_signature = check_signature
+        self._rand = random.Random(seed)
+        self._bind = bind
+        self._port = port
+
+        self._feeds = {}  # {"contract code": _Feed}
+        for symbol in symbols or ["BTC-USDT"]:
+            symbol = symbol.upper()
+            contract = self._contracts.get(symbol) or {}
+            self._feeds[symbol] = _Feed(symbol, contract.get("contract_size", 0.001),
+                                        contract.get("price_tick", 0.01), contract.get("price", 100), depth_levels,
+                                        self._rand)
+        self._channel_info = {}  # {"channel": (contract code, kind, size or period)}
+        self._subscribers = {}  # {"contract code": {(channel, incremental): set(client)}}
+        self._notify_clients = {}  # Authorized notification clients, {"access key": set(client)}
+        self._clients = set()
+        self._accounts = {}  # {(access key, contract code): MockAccount}
+        self._symbol_accounts = {}  # {"contract code": [MockAccount, ...]}
+        self._trade_id = 0
+        self._runner = None
+        self._tasks = []
+
+        self.host = None
+        self.wss = None
+        self.requests = 0  # REST and order gateway requests.
+        self.signature_errors = 0
+        self.messages = 0  # Websocket messages sent.
+
+    def stats(self):
+        """ Get the server stats, e.g.
+        {"requests": 100, "signature_errors": 0, "messages": 20000, "clients": 3, "accounts": 1, "orders": 90,
+         "fills": 50}
+        """
+        return {
+            "requests": self.requests,
+            "signature_errors": self.signature_errors,
+            "messages": self.messages,
+            "clients": len(self._clients),
+            "accounts": len(self._accounts),
+            "orders": sum(account.stats()["orders"] for account in self._accounts.values()),
+            "fills": sum(account.stats()["fills"] for account in self._accounts.values())
+        }
+
+    def account(self, access_key, symbol):
+        """ Get the `MockAccount` of an access key on a contract, created if not exists, None if the contract is not
+        in the synthetic market.
+        """
+        symbol = symbol.upper()
+        account = self._accounts.get((access_key, symbol))
+        if account is None and symbol in self._feeds:
+            feed = self._feeds[symbol]
+            margin_asset = "USDT" if symbol.endswith("-USDT") else symbol.split("-")[0]
+            account = MockAccount(self, access_key, symbol, balance=self._balance, margin_asset=margin_asset,
+                                  contract_size=feed.contract_size, maker_fee=self._maker_fee,
+                                  taker_fee=self._taker_fee)
+            self._accounts[(access_key, symbol)] = account
+            self._symbol_accounts.setdefault(symbol, []).append(account)
+            # The account knows the current book before the first order.
+            account._engine.on_book(feed.asks, feed.bids)
+            account._last_price = feed.last_price
+        return account
+
+    def next_trade_id(self):
+        self._trade_id += 1
+        return self._trade_id
+
+    def push_delay(self):
+        if self._jitter:
+            return self._push_latency + self._rand.random() * self._jitter
+        return self._push_latency
+
+    def _delay(self):
+        if self._jitter:
+            return self._latency + self._rand.random() * self._jitter
+        return self._latency
+
+    def _timestamp(self):
+        if self._float_ts:
+            return round(time.time() * 1000, 3)
+        return _ms()
+
+    def notify(self, access_key, topic, symbol, data):
+        """ Push a notification message to the clients of an access key subscribing `topic.symbol` or `topic.*`. """
+        clients = self._notify_clients.get(access_key)
+        if not clients:
+            return
+        raw = None
+        for client in clients:
+            if (topic, symbol) in client.topics or (topic, "*") in client.topics:
+                if raw is None:
+                    raw = _gzip(data)
+                client.push(raw)
+
+    async def start(self):
+        """ Start the server and the synthetic feed. """
+        app = web.Application(middlewares=[self._middleware])
+        for prefix in ("linear-swap", "swap"):
+            for name in PRIVATE_ENDPOINTS:
+                app.router.add_post("/%s-api/v1/%s" % (prefix, name), self._rest_private)
+            app.router.add_get("/%s-api/v1/swap_contract_info" % prefix, self._contract_info)
+            app.router.add_get("/%s-api/v1/swap_price_limit" % prefix, self._price_limit)
+            app.router.add_get("/%s-ex/market/depth" % prefix, self._depth)
+            app.router.add_get("/%s-ex/market/history/kline" % prefix, self._kline)
+            app.router.add_get("/%s-ex/market/detail/merged" % prefix, self._merged)
+            app.router.add_get("/%s-ex/v1/swap_funding_rate" % prefix, self._funding_rate)
+            app.router.add_get("/%s-ws" % prefix, self._market_handler)
+            app.router.add_get("/%s-notification" % prefix, self._notification_handler)
+            app.router.add_get("/%s-order" % prefix, self._order_handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._bind, self._port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = "http://%s:%s" % (self._bind, port)
+        self.wss = "ws://%s:%s" % (self._bind, port)
+        self._tasks = [asyncio.ensure_future(self._run_feed()), asyncio.ensure_future(self._run_ping())]
+        logger.info("mock exchange started. host:", self.host, caller=self)
+
+    async def stop(self):
+        """ Close the connections and stop the server. """
+        for task in self._tasks:
+            task.cancel()
+        for client in list(self._clients):
+            client.close()
+            await client.ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path.startswith(("/linear-swap-api/", "/linear-swap-ex/", "/swap-api/", "/swap-ex/")):
+            self.requests += 1
+            delay = self._delay()
+            if delay:
+                await asyncio.sleep(delay)
+        return await handler(request)
+
+    def _verify(self, method, host, path, params, names=None):
+        """ Check the signature of a request.
+
+        Args:
+            names: Names of the signed params, default is all params but `Signature`.
+
+        Returns:
+            error: Error message if the signature is invalid, otherwise None.
+        """
+        if not self._check_signature:
+            return None
+        access_key = params.get("AccessKeyId")
+        secret_key = self._keys.get(access_key)
+        if secret_key is None:
+            error = "Incorrect Access key [Access key错误]"
+        elif params.get("SignatureMethod") != "HmacSHA256" or str(params.get("SignatureVersion")) != "2":
+            error = "Incorrect signature method or version"
+        else:
+            try:
+                ts = calendar.timegm(time.strptime(params.get("Timestamp") or "", "%Y-%m-%dT%H:%M:%S"))
+            except ValueError:
+                ts = 0
+            if abs(time.time() - ts) > 300:
+                error = "Timestamp for this request is too old or too late"
+            else:
+                names = names or [name for name in params if name != "Signature"]
+                signed = {name: params[name] for name in names if name in params}
+                signature = Signer.get(host, access_key, secret_key).sign(method, path, signed)
+                if hmac.compare_digest(signature, str(params.get("Signature") or "")):
+                    return None
+                error = "Verification failure [校验失败]"
+        self.signature_errors += 1
+        logger.warn("signature check failed:", error, "path:", path, caller=self)
+        return error
+
+    # REST
+
+    async def _rest_private(self, request):
+        params = dict(request.query)
+        error = self._verify(request.method, request.url.host, request.path, params)
+        if error:
+            return web.json_response(_error(403, error))
+        body = await request.json() if request.body_exists else {}
+        return web.json_response(self._private(params.get("AccessKeyId"), request.path, body or {}))
+
+    def _private(self, access_key, path, body):
+        """ Handle a private request of REST or order gateway, the response body. """
+        name = path.rsplit("/", 1)[-1]
+        if name not in PRIVATE_ENDPOINTS:
+            return _error(404, "Unknown request path: %s" % path)
+        if name == "swap_batchorder":
+            return self._batch_order(access_key, body)
+        if name == "swap_transfer_inner":
+            return {"status": "ok", "data": {"order_id": str(self.next_trade_id())}, "ts": _ms()}
+        if name in ("swap_account_info", "swap_position_info") and not body.get("contract_code"):
+            symbols = list(self._feeds)
+        else:
+            symbols = [str(body.get("contract_code") or "").upper()]
+        accounts = [self.account(access_key, symbol) for symbol in symbols]
+        if None in accounts:
+            return _error(1014, "This contract doesnt exist.")
+        account = accounts[0]
+        if name == "swap_account_info":
+            data = [account.asset() for account in accounts]
+        elif name == "swap_position_info":
+            data = [position for account in accounts for position in account.positions()]
+        elif name == "swap_account_position_info":
+            data = [dict(account.asset(), positions=account.positions())]
+        elif name == "swap_order":
+            order_id, error = account.place(body)
+            if error:
+                return error
+            data = {"order_id": order_id, "order_id_str": str(order_id)}
+            if body.get("client_order_id"):
+                data["client_order_id"] = body["client_order_id"]
+        elif name in ("swap_cancel", "swap_cancelall"):
+            if name == "swap_cancelall":
+                if not account.open_orders():
+                    return _error(1051, "No cancellable orders.")
+                successes, errors = account.cancel()
+            elif body.get("order_id"):
+                successes, errors = account.cancel(order_ids=str(body["order_id"]).split(","))
+            elif body.get("client_order_id"):
+                successes, errors = account.cancel(client_order_ids=str(body["client_order_id"]).split(","))
+            else:
+                return _error(1000, "Incorrect order params.")
+            data = {"errors": errors, "successes": ",".join(successes)}
+        elif name in ("swap_order_info", "swap_order_detail"):
+            if name == "swap_order_detail":
+                order_ids = [body.get("order_id")]
+            else:
+                order_ids = str(body.get("order_id") or "").split(",")
+            data = []
+            for order_id in order_ids:
+                try:
+                    info = account.order_info(order_id)
+                except (TypeError, ValueError):
+                    info = None
+                if info:
+                    data.append(info)
+            if name == "swap_order_detail":
+                if not data:
+                    return _error(1061, "This order doesnt exist.")
+                data = data[0]
+        else:
+            orders = account.open_orders() if name == "swap_openorders" else account.history_orders()
+            index = int(body.get("page_index") or 1)
+            size = int(body.get("page_size") or 20)
+            data = {"orders": orders[(index - 1) * size:index * size], "total_page": (len(orders) + size - 1) // size,
+                    "current_page": index, "total_size": len(orders)}
+        return {"status": "ok", "data": data, "ts": _ms()}
+
+    def _batch_order(self, access_key, body):
+        successes = []
+        errors = []
+        for index, item in enumerate(body.get("orders_data") or [], 1):
+            account = self.account(access_key, str(item.get("contract_code") or ""))
+            if account is None:
+                errors.append({"index": index, "err_code": 1014, "err_msg": "This contract doesnt exist."})
+                continue
+            order_id, error = account.place(item)
+            if error:
+                errors.append({"index": index, "err_code": error["err_code"], "err_msg": error["err_msg"]})
+            else:
+                successes.append({"index": index, "order_id": order_id, "order_id_str": str(order_id)})
+        return {"status": "ok", "data": {"errors": errors, "success": successes}, "ts": _ms()}
+
+    def _market_error(self, msg):
+        return web.json_response({"status": "error", "err-code": "invalid-parameter", "err-msg": msg, "ts": _ms()})
+
+    def _feed_of(self, request):
+        return self._feeds.get((request.query.get("contract_code") or "").upper())
+
+    async def _contract_info(self, request):
+        code = (request.query.get("contract_code") or "").upper()
+        data = []
+        for symbol, feed in self._feeds.items():
+            if code and code != symbol:
+                continue
+            data.append({"symbol": symbol.split("-")[0], "contract_code": symbol,
+                         "contract_size": feed.contract_size, "price_tick": feed.price_tick,
+                         "create_date": "20201021", "contract_status": 1, "settlement_date": "",
+                         "support_margin_mode": "all"})
+        return web.json_response({"status": "ok", "data": data, "ts": _ms()})
+
+    async def _price_limit(self, request):
+        code = (request.query.get("contract_code") or "").upper()
+        data = [{"symbol": symbol.split("-")[0], "contract_code": symbol, "high_limit": feed.last_price * 1.05,
+                 "low_limit": feed.last_price * 0.95}
+                for symbol, feed in self._feeds.items() if not code or code == symbol]
+        return web.json_response({"status": "ok", "data": data, "ts": _ms()})
+
+    async def _depth(self, request):
+        feed = self._feed_of(request)
+        if not feed:
+            return self._market_error("invalid contract code")
+        ch = "market.%s.depth.%s" % (feed.symbol, request.query.get("type") or "step0")
+        ts = _ms()
+        return web.json_response({"ch": ch, "status": "ok", "tick": feed.depth_tick(ch, ts), "ts": ts})
+
+    async def _kline(self, request):
+        feed = self._feed_of(request)
+        period = request.query.get("period")
+        if not feed or period not in KLINE_PERIODS:
+            return self._market_error("invalid contract code or period")
+        bars = list(feed.history[period])
+        if period in feed.bars:
+            bars.append(feed.bars[period])
+        start = int(request.query.get("from") or 0)
+        end = int(request.query.get("to") or 0)
+        if start or end:
+            bars = [bar for bar in bars if bar["id"] >= start and (not end or bar["id"] <= end)]
+        else:
+            bars = bars[-min(int(request.query.get("size") or 150), 2000):]
+        ch = "market.%s.kline.%s" % (feed.symbol, period)
+        return web.json_response({"ch": ch, "status": "ok", "data": bars, "ts": _ms()})
+
+    async def _merged(self, request):
+        feed = self._feed_of(request)
+        if not feed:
+            return self._market_error("invalid contract code")
+        bar = feed.bars.get("1day") or {"id": 0, "open": feed.last_price, "close": feed.last_price,
+                                        "low": feed.last_price, "high": feed.last_price, "amount": 0, "vol": 0,
+                                        "trade_turnover": 0, "count": 0}
+        tick = dict(bar, ask=feed.asks[0], bid=feed.bids[0], ts=_ms())
+        ch = "market.%s.detail.merged" % feed.symbol
+        return web.json_response({"ch": ch, "status": "ok", "tick": tick, "ts": _ms()})
+
+    async def _funding_rate(self, request):
+        feed = self._feed_of(request)
+        if not feed:
+            return self._market_error("invalid contract code")
+        now = _ms()
+        funding_time = now - now % (8 * 3600 * 1000) + 8 * 3600 * 1000
+        data = {"symbol": feed.symbol.split("-")[0], "contract_code": feed.symbol, "fee_asset": "USDT",
+                "funding_rate": "0.000100000000000000", "estimated_rate": "0.000100000000000000",
+                "funding_time": str(funding_time), "next_funding_time": str(funding_time + 8 * 3600 * 1000)}
+        return web.json_response({"status": "ok", "data": data, "ts": now})
+
+    # Websocket
+
+    async def _accept(self, request, kind):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        client = _Client(self, ws, kind)
+        self._clients.add(client)
+        return ws, client
+
+    def _remove(self, client):
+        client.close()
+        self._clients.discard(client)
+        for (ch, incremental) in client.channels:
+            self._unsubscribe(client, ch, incremental)
+        clients = self._notify_clients.get(client.access_key)
+        if clients:
+            clients.discard(client)
+
+    async def _messages(self, ws, client):
+        """ Decoded messages of a websocket client, text json or gzip binary json. """
+        async for msg in ws:
+            client.last = time.time()
+            if msg.type == WSMsgType.TEXT:
+                data = msg.data
+            elif msg.type == WSMsgType.BINARY:
+                data = zlib.decompress(msg.data, GZIP_WBITS)
+            else:
+                continue
+            try:
+                data = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                yield data
+
+    async def _market_handler(self, request):
+        ws, client = await self._accept(request, "market")
+        try:
+            async for data in self._messages(ws, client):
+                if "sub" in data:
+                    self._market_sub(client, data)
+                elif "unsub" in data:
+                    ch = data["unsub"]
+                    for incremental in (False, True):
+                        if (ch, incremental) in client.channels:
+                            client.channels.discard((ch, incremental))
+                            self._unsubscribe(client, ch, incremental)
+                    client.push_json({"id": data.get("id"), "status": "ok", "unsubbed": ch, "ts": _ms()})
+                elif "ping" in data:
+                    client.push_json({"pong": data["ping"]})
+        finally:
+            self._remove(client)
+        return ws
+
+    def _parse_channel(self, ch):
+        """ (contract code, kind, size or period) of a market channel, None if it's invalid. """
+        info = self._channel_info.get(ch)
+        if info:
+            return info
+        parts = str(ch).split(".")
+        if len(parts) < 4 or parts[0] != "market" or parts[1].upper() not in self._feeds:
+            return None
+        symbol = parts[1].upper()
+        if parts[2] == "depth" and len(parts) == 4 and parts[3].startswith("step"):
+            info = symbol, "depth", None
+        elif parts[2] == "depth" and len(parts) == 5 and parts[4] == "high_freq" and \
+                parts[3] in ("size_20", "size_150"):
+            info = symbol, "high_freq", int(parts[3][5:])
+        elif parts[2:] == ["trade", "detail"]:
+            info = symbol, "trade", None
+        elif parts[2] == "kline" and len(parts) == 4 and parts[3] in KLINE_PERIODS:
+            info = symbol, "kline", parts[3]
+        else:
+            return None
+        self._channel_info[ch] = info
+        return info
+
+    def _market_sub(self, client, data):
+        ch = data["sub"]
+        info = self._parse_channel(ch)
+        if not info:
+            client.push_json({"id": data.get("id"), "status": "error", "err-code": "bad-request",
+                              "err-msg": "invalid topic %s" % ch, "ts": _ms()})
+            return
+        symbol, kind, size = info
+        incremental = kind == "high_freq" and data.get("data_type") == "incremental"
+        client.channels.add((ch, incremental))
+        self._subscribers.setdefault(symbol, {}).setdefault((ch, incremental), set()).add(client)
+        ts = self._timestamp()
+        client.push_json({"id": data.get("id"), "status": "ok", "subbed": ch, "ts": ts})
+        if incremental:
+            feed = self._feeds[symbol]
+            client.push_json({"ch": ch, "ts": ts, "tick": feed.depth_tick(ch, ts, size, "snapshot")})
+
+    def _unsubscribe(self, client, ch, incremental):
+        symbol = self._channel_info[ch][0]
+        channels = self._subscribers.get(symbol, {})
+        clients = channels.get((ch, incremental))
+        if clients is not None:
+            clients.discard(client)
+            if not clients:
+                del channels[(ch, incremental)]
+
+    def _auth(self, request, client, data):
+        """ Authorize a notification or order gateway client by the auth message. """
+        error = self._verify("GET", request.url.host, request.path, data,
+                             ("AccessKeyId", "SignatureMethod", "SignatureVersion", "Timestamp"))
+        if error:
+            client.push_json({"op": "auth", "type": "api", "err-code": 2002, "err-msg": error, "ts": _ms()})
+            return
+        client.access_key = data.get("AccessKeyId")
+        client.push_json({"op": "auth", "type": "api", "err-code": 0, "ts": _ms(),
+                          "data": {"user-id": client.access_key}})
+
+    async def _notification_handler(self, request):
+        ws, client = await self._accept(request, "notification")
+        try:
+            async for data in self._messages(ws, client):
+                op = data.get("op")
+                if op == "auth":
+                    self._auth(request, client, data)
+                    if client.access_key is not None:
+                        self._notify_clients.setdefault(client.access_key, set()).add(client)
+                elif op in ("sub", "unsub"):
+                    self._notification_sub(client, op, data)
+                elif op == "ping":
+                    client.push_json({"op": "pong", "ts": data.get("ts")})
+        finally:
+            self._remove(client)
+        return ws
+
+    def _notification_sub(self, client, op, data):
+        topic = str(data.get("topic"))
+        name, _, symbol = topic.partition(".")
+        symbol = symbol.upper()
+        result = {"op": op, "cid": data.get("cid"), "topic": topic, "ts": _ms()}
+        if client.access_key is None:
+            client.push_json(dict(result, **{"err-code": 4003, "err-msg": "Not authorized."}))
+            return
+        if name not in ("orders", "positions", "accounts") or (symbol != "*" and symbol not in self._feeds):
+            client.push_json(dict(result, **{"err-code": 4001, "err-msg": "Invalid topic."}))
+            return
+        if op == "unsub":
+            client.topics.discard((name, symbol))
+            client.push_json(dict(result, **{"err-code": 0}))
+            return
+        client.topics.add((name, symbol))
+        client.push_json(dict(result, **{"err-code": 0}))
+        if name == "orders":
+            return
+        symbols = list(self._feeds) if symbol == "*" else [symbol]
+        for symbol in symbols:
+            client.push_json(self.account(client.access_key, symbol).snapshot(name))
+
+    async def _order_handler(self, request):
+        ws, client = await self._accept(request, "order")
+        try:
+            async for data in self._messages(ws, client):
+                op = data.get("op")
+                if op == "auth":
+                    self._auth(request, client, data)
+                elif op == "req":
+                    asyncio.ensure_future(self._order_request(client, data))
+                elif op == "ping":
+                    client.push_json({"op": "pong", "ts": data.get("ts")})
+        finally:
+            self._remove(client)
+        return ws
+
+    async def _order_request(self, client, data):
+        self.requests += 1
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        if client.access_key is None:
+            result = _error(2002, "Not authorized.")
+        else:
+            result = self._private(client.access_key, str(data.get("topic")), data.get("data") or {})
+        result["op"] = "req"
+        result["cid"] = data.get("cid")
+        client.push_json(result)
+
+    # Synthetic market
+
+    async def _run_feed(self):
+        start = time.time()
+        depths = trades = 0
+        while True:
+            elapsed = time.time() - start
+            depth_due = int(elapsed * self._depth_rate) - depths
+            trade_due = int(elapsed * self._trade_rate) - trades
+            depths += depth_due
+            trades += trade_due
+            # After a stall, the messages more than 100ms late are skipped instead of bursting.
+            depth_due = min(depth_due, max(int(self._depth_rate / 10), 1))
+            trade_due = min(trade_due, max(int(self._trade_rate / 10), 1))
+            for i in range(max(depth_due, trade_due)):
+                ts = self._timestamp()
+                for feed in self._feeds.values():
+                    if i < depth_due:
+                        await self._publish_depth(feed, ts)
+                    if i < trade_due:
+                        await self._publish_trade(feed, ts)
+                if i % FEED_BATCH == FEED_BATCH - 1:
+                    await asyncio.sleep(0)  # Let the connections and requests in.
+            await asyncio.sleep(FEED_INTERVAL)
+
+    async def _publish_depth(self, feed, ts):
+        feed.step()
+        channels = self._subscribers.get(feed.symbol)
+        if channels:
+            for (ch, incremental), clients in list(channels.items()):
+                _, kind, size = self._channel_info[ch]
+                if kind == "depth":
+                    tick = feed.depth_tick(ch, ts)
+                elif kind != "high_freq":
+                    continue
+                elif incremental:
+                    asks, bids = feed.diff(size)
+                    tick = {"asks": asks, "bids": bids, "ch": ch, "event": "update", "id": feed.version,
+                            "mrid": feed.version, "ts": ts, "version": feed.version}
+                else:
+                    tick = feed.depth_tick(ch, ts, size, "snapshot")
+                raw = _gzip({"ch": ch, "ts": ts, "tick": tick})
+                for client in clients:
+                    client.push(raw)
+        accounts = self._symbol_accounts.get(feed.symbol)
+        if accounts:
+            data = {"ch": feed.book_channel, "ts": ts, "tick": {"asks": feed.asks, "bids": feed.bids}}
+            for account in accounts:
+                await account.process_data(data)
+
+    async def _publish_trade(self, feed, ts):
+        trade = feed.trade(ts)
+        channels = self._subscribers.get(feed.symbol)
+        if channels:
+            for (ch, incremental), clients in list(channels.items()):
+                _, kind, period = self._channel_info[ch]
+                if kind == "trade":
+                    raw = _gzip({"ch": ch, "ts": ts, "tick": {"id": trade["id"], "ts": ts, "data": [trade]}})
+                elif kind == "kline":
+                    raw = _gzip({"ch": ch, "ts": ts, "tick": feed.bars[period]})
+                else:
+                    continue
+                for client in clients:
+                    client.push(raw)
+        accounts = self._symbol_accounts.get(feed.symbol)
+        if accounts:
+            data = {"ch": feed.trade_channel, "ts": ts, "tick": {"data": [trade]}}
+            for account in accounts:
+                await account.process_data(data)
+
+    async def _run_ping(self):
+        while True:
+            await asyncio.sleep(self._ping_interval)
+            now = time.time()
+            for client in list(self._clients):
+                if now - client.last > self._ping_interval * 2:
+                    logger.warn("client silent, disconnect. kind:", client.kind, caller=self)
+                    self._remove(client)
+                elif client.kind == "market":
+                    client.push_json({"ping": _ms()})
+                else:
+                    client.push_json({"op": "ping", "ts": str(_ms())})
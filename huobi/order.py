@@ -9,6 +9,7 @@ Email:  andyjoe318@gmail.com
 """
 
 from huobi.utils import tools
+from huobi.utils.frozen import freeze
 
 
 # Order type.
@@ -62,8 +63,14 @@ class Order:
         trade_price: trade price of this push. 
         ctime: Order create time, millisecond.
         utime: Order update time, millisecond.
+
+    The callbacks get a read-only `FrozenOrder` snapshot of the order, see `snapshot`.
     """
 
+    __slots__ = ("platform", "account", "strategy", "order_no", "action", "order_type", "symbol", "price", "quantity",
+                 "remain", "status", "avg_price", "trade_type", "client_order_id", "order_price_type", "role",
+                 "trade_quantity", "trade_price", "ctime", "utime")
+
     def __init__(self, account=None, platform=None, strategy=None, order_no=None, symbol=None, action=None, price=0,
                  quantity=0, remain=0, status=ORDER_STATUS_NONE, avg_price=0, order_type=ORDER_TYPE_LIMIT,
                  trade_type=TRADE_TYPE_NONE, client_order_id=None, order_price_type=None, role=None, trade_quantity=None, trade_price=None, ctime=None, utime=None):
@@ -85,8 +92,16 @@ class Order:
         self.role = role
         self.trade_quantity = trade_quantity
         self.trade_price = trade_price
-        self.ctime = ctime if ctime else tools.get_cur_timestamp_ms()
-        self.utime = utime if utime else tools.get_cur_timestamp_ms()
+        if not ctime or not utime:
+            now = tools.get_cur_timestamp_ms()
+            ctime = ctime or now
+            utime = utime or now
+        self.ctime = ctime
+        self.utime = utime
+
+    def snapshot(self):
+        """ Read-only copy of this order. """
+        return _snapshot(self)
 
     def __str__(self):
         info = "[platform: {platform}, account: {account}, strategy: {strategy}, order_no: {order_no}, " \
@@ -102,4 +117,7 @@ class Order:
         return info
 
     def __repr__(self):
-        return str(self)
\ No newline at end of file
+        return str(self)
+
+
+FrozenOrder, _snapshot = freeze(Order)
@@ -9,6 +9,7 @@ Email:  andyjoe318@gmail.com
 """
 
 import json
+from array import array
 
 from huobi import const
 from huobi.utils import logger
@@ -17,6 +18,9 @@ from huobi.utils import logger
 class Orderbook:
     """ Orderbook object.
 
+    Prices and quantities are kept in float64 arrays, best level first. `asks` and `bids` are compatibility views of
+    `"%.8f"` formatted strings, they are only built when accessed.
+
     Args:
         platform: Exchange platform name, e.g. huobi_swap.
         symbol: Trade pair name, e.g. BTC-USD.
@@ -25,6 +29,9 @@ class Orderbook:
         timestamp: Update time, millisecond.
     """
 
+    __slots__ = ("platform", "symbol", "timestamp", "ask_prices", "ask_quantities", "bid_prices", "bid_quantities",
+                 "_asks", "_bids")
+
     def __init__(self, platform=None, symbol=None, asks=None, bids=None, timestamp=None):
         """ Initialize. """
         self.platform = platform
@@ -33,6 +40,95 @@ class Orderbook:
         self.bids = bids
         self.timestamp = timestamp
 
+    @classmethod
+    def from_levels(cls, platform, symbol, ask_prices, ask_quantities, bid_prices, bid_quantities, timestamp=None):
+        """ Create an orderbook from numeric price and quantity sequences, no string is created.
+
+        Args:
+            platform: Exchange platform name, e.g. huobi_swap.
+            symbol: Trade pair name, e.g. BTC-USD.
+            ask_prices: Ask prices, best first.
+            ask_quantities: Ask quantities.
+            bid_prices: Bid prices, best first.
+            bid_quantities: Bid quantities.
+            timestamp: Update time, millisecond.
+        """
+        orderbook = cls.__new__(cls)
+        orderbook.platform = platform
+        orderbook.symbol = symbol
+        orderbook.timestamp = timestamp
+        orderbook.ask_prices = array("d", ask_prices)
+        orderbook.ask_quantities = array("d", ask_quantities)
+        orderbook.bid_prices = array("d", bid_prices)
+        orderbook.bid_quantities = array("d", bid_quantities)
+        orderbook._asks = None
+        orderbook._bids = None
+        return orderbook
+
+    @property
+    def asks(self):
+        if self._asks is None:
+            self._asks = [["%.8f" % p, "%.8f" % q] for p, q in zip(self.ask_prices, self.ask_quantities)]
+        return self._asks
+
+    @asks.setter
+    def asks(self, asks):
+        self.ask_prices = array("d", (float(item[0]) for item in asks or []))
+        self.ask_quantities = array("d", (float(item[1]) for item in asks or []))
+        self._asks = asks
+
+    @property
+    def bids(self):
+        if self._bids is None:
+            self._bids = [["%.8f" % p, "%.8f" % q] for p, q in zip(self.bid_prices, self.bid_quantities)]
+        return self._bids
+
+    @bids.setter
+    def bids(self, bids):
+        self.bid_prices = array("d", (float(item[0]) for item in bids or []))
+        self.bid_quantities = array("d", (float(item[1]) for item in bids or []))
+        self._bids = bids
+
+    @property
+    def best_ask(self):
+        return self.ask_prices[0] if self.ask_prices else None
+
+    @property
+    def best_bid(self):
+        return self.bid_prices[0] if self.bid_prices else None
+
+    @property
+    def best_ask_quantity(self):
+        return self.ask_quantities[0] if self.ask_quantities else None
+
+    @property
+    def best_bid_quantity(self):
+        return self.bid_quantities[0] if self.bid_quantities else None
+
+    @property
+    def mid(self):
+        if not self.ask_prices or not self.bid_prices:
+            return None
+        return (self.ask_prices[0] + self.bid_prices[0]) / 2
+
+    @property
+    def spread(self):
+        if not self.ask_prices or not self.bid_prices:
+            return None
+        return self.ask_prices[0] - self.bid_prices[0]
+
+    @property
+    def microprice(self):
+        """ Best bid and ask weighted by the quantity of the opposite side. """
+        if not self.ask_prices or not self.bid_prices:
+            return None
+        ask_quantity = self.ask_quantities[0]
+        bid_quantity = self.bid_quantities[0]
+        total = ask_quantity + bid_quantity
+        if total <= 0:
+            return self.mid
+        return (self.bid_prices[0] * ask_quantity + self.ask_prices[0] * bid_quantity) / total
+
     @property
     def data(self):
         d = {
@@ -49,4 +145,4 @@ class Orderbook:
         return info
 
     def __repr__(self):
-        return str(self)
\ No newline at end of file
+        return str(self)
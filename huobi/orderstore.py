@@ -0,0 +1,174 @@
+# -*- coding:utf-8 -*-
+
+"""
+In-memory order store.
+
+Open orders are indexed by order_no, client_order_id, status and price level (per side), so every lookup is O(1) and
+a price range query like "all my resting bids above X" costs O(log L + k) for L price levels and k matched orders.
+Terminal orders (filled, canceled, failed) are moved to a bounded history instead of being dropped, they can still be
+looked up by order_no and client_order_id until evicted.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import bisect
+from collections import deque
+
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
+from huobi.order import ORDER_STATUS_FAILED, ORDER_STATUS_CANCELED, ORDER_STATUS_FILLED
+
+__all__ = ("OrderStore", )
+
+
+TERMINAL_STATUSES = (ORDER_STATUS_FAILED, ORDER_STATUS_CANCELED, ORDER_STATUS_FILLED)
+
+
+class OrderStore:
+    """ Order store with indexes.
+
+    Args:
+        history_size: Max terminal orders kept in history, default is 1000.
+    """
+
+    def __init__(self, history_size=1000):
+        """ Initialize. """
+        self._open = {}  # Open orders, {"order_no": order}
+        self._keys = {}  # Indexed keys of open orders, {"order_no": (status, action, price)}
+        self._by_client_order_id = {}  # {"client_order_id": order}, open and history orders.
+        self._by_status = {}  # {status: {"order_no": order}}
+        self._levels = {ORDER_ACTION_BUY: [], ORDER_ACTION_SELL: []}  # Sorted prices of open orders per side.
+        self._level_orders = {}  # {(action, price): {"order_no": order}}
+        self._history = deque()  # Terminal orders, oldest first.
+        self._history_orders = {}  # {"order_no": order}
+        self._history_size = history_size
+
+    @property
+    def open(self):
+        """ Open orders, {"order_no": order}, don't modify it. """
+        return self._open
+
+    @property
+    def history(self):
+        """ Terminal orders, oldest first. """
+        return list(self._history)
+
+    def __len__(self):
+        return len(self._open)
+
+    def __contains__(self, order_no):
+        return order_no in self._open or order_no in self._history_orders
+
+    def get(self, order_no):
+        """ Get an open or history order by order_no, None if not found. """
+        return self._open.get(order_no) or self._history_orders.get(order_no)
+
+    def get_by_client_order_id(self, client_order_id):
+        """ Get an open or history order by client_order_id, None if not found. """
+        return self._by_client_order_id.get(client_order_id)
+
+    def put(self, order):
+        """ Add an order or re-index it after it's updated. A terminal order is moved to history.
+        """
+        order_no = order.order_no
+        if order.client_order_id is not None:
+            self._by_client_order_id[order.client_order_id] = order
+        if order_no in self._history_orders:
+            return
+        old_key = self._keys.get(order_no)
+        if order.status in TERMINAL_STATUSES:
+            if old_key:
+                self._unindex(order_no, old_key)
+                del self._open[order_no]
+            self._add_history(order)
+            return
+        key = (order.status, order.action, float(order.price or 0))
+        if key == old_key:
+            return
+        if old_key:
+            self._unindex(order_no, old_key)
+        self._open[order_no] = order
+        self._index(order, key)
+
+    def remove(self, order_no):
+        """ Remove an order from the store, return the order or None. """
+        order = self._open.pop(order_no, None)
+        if order:
+            self._unindex(order_no, self._keys[order_no])
+        else:
+            order = self._history_orders.pop(order_no, None)
+        if order and self._by_client_order_id.get(order.client_order_id) is order:
+            del self._by_client_order_id[order.client_order_id]
+        return order
+
+    def by_status(self, status):
+        """ Open orders of a status, e.g. `ORDER_STATUS_SUBMITTED`. """
+        return list(self._by_status.get(status, {}).values())
+
+    def at_price(self, action, price):
+        """ Open orders of side `action` at `price`. """
+        return list(self._level_orders.get((action, float(price)), {}).values())
+
+    def above(self, action, price, inclusive=False):
+        """ Open orders of side `action` with price above `price`, highest first, e.g. `above(BUY, x)` is all my
+        resting bids above x.
+        """
+        levels = self._levels[action]
+        index = bisect.bisect_left(levels, float(price)) if inclusive else bisect.bisect_right(levels, float(price))
+        return self._collect(action, reversed(levels[index:]))
+
+    def below(self, action, price, inclusive=False):
+        """ Open orders of side `action` with price below `price`, lowest first. """
+        levels = self._levels[action]
+        index = bisect.bisect_right(levels, float(price)) if inclusive else bisect.bisect_left(levels, float(price))
+        return self._collect(action, levels[:index])
+
+    def best(self, action):
+        """ Open orders at the best price of side `action` (highest bid or lowest ask), empty if no order. """
+        levels = self._levels[action]
+        if not levels:
+            return []
+        price = levels[-1] if action == ORDER_ACTION_BUY else levels[0]
+        return self.at_price(action, price)
+
+    def _collect(self, action, prices):
+        result = []
+        for price in prices:
+            result.extend(self._level_orders[(action, price)].values())
+        return result
+
+    def _index(self, order, key):
+        status, action, price = key
+        self._keys[order.order_no] = key
+        self._by_status.setdefault(status, {})[order.order_no] = order
+        level = self._level_orders.get((action, price))
+        if level is None:
+            level = self._level_orders[(action, price)] = {}
+            if action in self._levels:
+                bisect.insort(self._levels[action], price)
+        level[order.order_no] = order
+
+    def _unindex(self, order_no, key):
+        status, action, price = key
+        del self._keys[order_no]
+        orders = self._by_status[status]
+        del orders[order_no]
+        if not orders:
+            del self._by_status[status]
+        level = self._level_orders[(action, price)]
+        del level[order_no]
+        if not level:
+            del self._level_orders[(action, price)]
+            if action in self._levels:
+                levels = self._levels[action]
+                del levels[bisect.bisect_left(levels, price)]
+
+    def _add_history(self, order):
+        self._history.append(order)
+        self._history_orders[order.order_no] = order
+        while len(self._history) > self._history_size:
+            old = self._history.popleft()
+            self._history_orders.pop(old.order_no, None)
+            if self._by_client_order_id.get(old.client_order_id) is old:
+                del self._by_client_order_id[old.client_order_id]
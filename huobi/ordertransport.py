@@ -0,0 +1,243 @@
+# -*- coding:utf-8 -*-
+
+"""
+Order-entry transports.
+
+Orders are sent over REST by default. A `WebsocketOrderTransport` keeps a long-lived authenticated websocket to an
+order gateway, many requests are pipelined on it without waiting for the previous responses, and the responses are
+matched by `cid`. The public Huobi gateways don't offer websocket order entry, so the websocket transport is for the
+gateways that do (e.g. a co-located gateway or the local mock server), set by the `order_wss` param of `Trade`.
+
+Protocol of the websocket order gateway (gzip binary or text JSON frames):
+    auth:     {"op": "auth", "type": "api", "AccessKeyId": ..., "Signature": ...}  ->  {"op": "auth", "err-code": 0}
+    request:  {"op": "req", "cid": "1", "topic": "/linear-swap-api/v1/swap_order", "data": {...}}
+    response: {"op": "req", "cid": "1", "status": "ok", "data": {...}}, the same body as the REST response.
+    ping:     {"op": "ping", "ts": ...}  ->  {"op": "pong", "ts": ...}
+
+`OrderRouter` is given to a REST client by its `order_router` param, it routes the trading requests (create and
+cancel orders) of that client to the websocket transport when it's authorized, otherwise to REST, and records the
+latency of both transports.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import math
+import time
+import asyncio
+from urllib.parse import urlparse
+
+from huobi.utils import logger
+from huobi.utils.signer import Signer
+from huobi.utils.websocket import Websocket
+from huobi.utils.ratelimit import RateLimiter, PRIORITY_TRADE
+
+__all__ = ("LatencyHistogram", "WebsocketOrderTransport", "OrderRouter")
+
+
+class LatencyHistogram:
+    """ Latency histogram with log scale buckets, 4 buckets per power of 2 (about 19% width), from 1us.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self):
+        """ Initialize. """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = {}  # {bucket index: count}
+
+    def record(self, seconds):
+        us = max(seconds * 1e6, 1)
+        index = int(math.log2(us) * self.BUCKETS_PER_OCTAVE)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """ Upper bound of the bucket holding the `p` percentile, seconds, None if empty. """
+        if not self.count:
+            return None
+        rank = self.count * p / 100
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(2 ** ((index + 1) / self.BUCKETS_PER_OCTAVE) / 1e6, self.max)
+        return self.max
+
+    def stats(self):
+        """ Get latency metrics, milliseconds.
+
+        Returns:
+            stats: e.g. {"count": 100, "mean": 0.5, "min": 0.3, "p50": 0.45, "p90": 0.7, "p99": 1.2, "max": 1.5}
+        """
+        if not self.count:
+            return {"count": 0}
+        result = {"count": self.count, "mean": self.total / self.count * 1000, "min": self.min * 1000}
+        for p in (50, 90, 99):
+            result["p%d" % p] = self.percentile(p) * 1000
+        result["max"] = self.max * 1000
+        return result
+
+
+class WebsocketOrderTransport(Websocket):
+    """ Order-entry over an authenticated websocket.
+
+    Args:
+        url: Websocket url of the order gateway, e.g. "wss://127.0.0.1:9090/linear-swap-order".
+        access_key: Account's ACCESS KEY.
+        secret_key: Account's SECRET KEY.
+        timeout: Seconds to wait for a response, default is 5.
+    """
+
+    def __init__(self, url, access_key, secret_key, timeout=5):
+        """ Initialize. """
+        super(WebsocketOrderTransport, self).__init__(url, send_hb_interval=0)
+        self._signer = Signer.get(url, access_key, secret_key)
+        self._path = urlparse(url).path or "/"
+        self._timeout = timeout
+        self._cid = 0
+        self._pending = {}  # Requests waiting for response, {"cid": future}
+        self.ready = False  # If the connection is authorized.
+        self.initialize()
+
+    async def connected_callback(self):
+        self.ready = False
+        data = self._signer.auth_params()
+        data["Signature"] = self._signer.sign("GET", self._path, data)
+        data["op"] = "auth"
+        data["type"] = "api"
+        await self.ws.send_json(data)
+
+    async def request(self, uri, body):
+        """ Send an order request.
+
+        Args:
+            uri: REST uri of the request, e.g. "/linear-swap-api/v1/swap_order".
+            body: REST request body.
+
+        Returns:
+            sent: False if the request was not sent because the connection is not ready, the request can be sent by
+                another transport safely.
+            success: Success results, otherwise it's None.
+            error: Error information, otherwise it's None. If the connection is lost or timeout after the request was
+                sent, the order state is unknown, query it by `client_order_id`.
+        """
+        if not self.ready or not self.ws or self.ws.closed:
+            return False, None, None
+        self._cid += 1
+        cid = str(self._cid)
+        waiter = asyncio.get_event_loop().create_future()
+        self._pending[cid] = waiter
+        try:
+            await self.ws.send_json({"op": "req", "cid": cid, "topic": uri, "data": body})
+        except (ConnectionResetError, RuntimeError) as e:
+            self._pending.pop(cid, None)
+            logger.warn("send order request failed:", e, caller=self)
+            return False, None, None
+        try:
+            data = await asyncio.wait_for(waiter, self._timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(cid, None)
+            return True, None, {"status": "error", "err_msg": "order request timeout, cid: %s" % cid}
+        if data.get("status") != "ok":
+            return True, None, data
+        return True, data, None
+
+    async def process(self, msg):
+        await self._on_message(msg)
+
+    async def process_binary(self, raw):
+        await self._on_message(self.decoder.decode(raw))
+
+    async def _on_message(self, data):
+        if not isinstance(data, dict):
+            return
+        op = data.get("op")
+        if op == "req":
+            waiter = self._pending.pop(data.get("cid"), None)
+            if waiter and not waiter.done():
+                waiter.set_result(data)
+        elif op == "ping":
+            await self.ws.send_json({"op": "pong", "ts": data.get("ts")})
+        elif op == "auth":
+            self.ready = data.get("err-code") == 0
+            if self.ready:
+                logger.info("order websocket authorized. url:", self._url, caller=self)
+            else:
+                logger.error("order websocket authorized failed:", data, caller=self)
+        else:
+            logger.warn("unhandled msg:", data, caller=self)
+
+    async def _reconnect(self):
+        """ The pending requests are failed, their order states are unknown. """
+        self.ready = False
+        pending, self._pending = self._pending, {}
+        for cid, waiter in pending.items():
+            if not waiter.done():
+                waiter.set_result({"status": "error", "err_msg": "order websocket disconnected, cid: %s" % cid})
+        await super(WebsocketOrderTransport, self)._reconnect()
+
+
+class OrderRouter:
+    """ Route the trading requests of a REST client.
+
+    Passed to a REST client by its `order_router` param (e.g. `HuobiUsdtSwapRestAPI`), the trading requests of that
+    client are sent by `transport` if it's ready, otherwise by REST. Other requests and other clients don't pass the
+    router.
+
+    Args:
+        transport: `WebsocketOrderTransport`, None is REST only (the latency is still recorded).
+    """
+
+    def __init__(self, transport=None):
+        """ Initialize. """
+        self._transport = transport
+        self.latency = {"websocket": LatencyHistogram(), "rest": LatencyHistogram()}
+        self.fallbacks = 0  # Trading requests sent by REST because the websocket is not ready.
+
+    def routes(self, method, uri, auth):
+        """ If the request is a trading request (create and cancel orders), which is sent by the router. """
+        return auth and method == "POST" and RateLimiter.priority(uri) == PRIORITY_TRADE
+
+    async def request(self, rest_request, method, uri, params=None, body=None, headers=None, auth=False):
+        """ Send a trading request.
+
+        Args:
+            rest_request: Coroutine function sending the request by REST, with the arguments of the REST client's
+                `request`.
+            method, uri, params, body, headers, auth: Arguments of the REST client's `request`.
+
+        Returns:
+            success: Success results, otherwise it's None.
+            error: Error information, otherwise it's None.
+        """
+        begin = time.perf_counter()
+        if self._transport:
+            sent, success, error = await self._transport.request(uri, body)
+            if sent:
+                self.latency["websocket"].record(time.perf_counter() - begin)
+                return success, error
+            self.fallbacks += 1
+            begin = time.perf_counter()
+        success, error = await rest_request(method, uri, params, body, headers, auth)
+        self.latency["rest"].record(time.perf_counter() - begin)
+        return success, error
+
+    def stats(self):
+        """ Get latency metrics of both transports.
+
+        Returns:
+            stats: e.g. {"websocket": {"count": 10, "p50": 0.4, ...}, "rest": {...}, "fallbacks": 0}
+        """
+        result = {name: histogram.stats() for name, histogram in self.latency.items()}
+        result["fallbacks"] = self.fallbacks
+        return result
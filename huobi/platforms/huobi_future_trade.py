@@ -8,7 +8,6 @@ Date:   2020/02/10
 Email:  andyjoe318@gmail.com
 """
 
-import gzip
 import json
 import copy
 import datetime
@@ -24,6 +23,7 @@ from urllib.parse import urljoin
 
 from huobi.asset import Asset
 from huobi.order import Order
+from huobi.orderstore import OrderStore
 from huobi.position import Position
 from huobi.error import Error
 from huobi.utils import tools, logger
@@ -31,6 +31,7 @@ from huobi.tasks import SingleTask, LoopRunTask
 from huobi.const import HUOBI_FUTURE
 from huobi.utils.websocket import Websocket
 from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.signer import Signer
 from huobi.utils.decorator import async_method_locker
 from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
 from huobi.order import ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_MAKER, ORDER_TYPE_FOK, ORDER_TYPE_IOC
@@ -101,6 +102,7 @@ class HuobiFutureTrade(Websocket):
         self._wss = kwargs["wss"]
         self._access_key = kwargs["access_key"]
         self._secret_key = kwargs["secret_key"]
+        self._signer = Signer.get(self._wss, self._access_key, self._secret_key)
         self._asset_update_callback = kwargs.get("asset_update_callback")
         self._order_update_callback = kwargs.get("order_update_callback")
         self._position_update_callback = kwargs.get("position_update_callback")
@@ -110,7 +112,7 @@ class HuobiFutureTrade(Websocket):
         super(HuobiFutureTrade, self).__init__(url, send_hb_interval=5)
 
         self._assets = {}  # Asset detail, {"BTC": {"free": "1.1", "locked": "2.2", "total": "3.3"}, ... }.
-        self._orders = {}  # Order objects, {"order_id": order, ...}.
+        self._orders = OrderStore(kwargs.get("order_history_size", 1000))  # Order objects, indexed.
         self._position = Position(self._platform, self._account, self._strategy, self._symbol + '/' + self._contract_type)
 
         self._order_channel = "orders.{symbol}".format(symbol=self._symbol.lower())
@@ -131,11 +133,15 @@ class HuobiFutureTrade(Websocket):
 
     @property
     def orders(self):
-        return copy.copy(self._orders)
+        return copy.copy(self._orders.open)
+
+    @property
+    def order_store(self):
+        return self._orders
 
     @property
     def position(self):
-        return copy.copy(self._position)
+        return self._position.snapshot()
 
     @property
     def rest_api(self):
@@ -150,13 +156,7 @@ class HuobiFutureTrade(Websocket):
 
     async def connected_callback(self):
         """After connect to Websocket server successfully, send a auth message to server."""
-        timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
-        data = {
-            "AccessKeyId": self._access_key,
-            "SignatureMethod": "HmacSHA256",
-            "SignatureVersion": "2",
-            "Timestamp": timestamp
-        }
+        data = self._signer.auth_params()
         sign = self.generate_signature("GET", data, "/notification")
         data["op"] = "auth"
         data["type"] = "api"
@@ -164,18 +164,7 @@ class HuobiFutureTrade(Websocket):
         await self.ws.send_json(data)
     
     def generate_signature(self, method, params, request_path):
-        host_url = urllib.parse.urlparse(self._wss).hostname.lower()
-        #host_url = "172.18.6.227:9090"
-        sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
-        encode_params = urllib.parse.urlencode(sorted_params)
-        payload = [method, host_url, request_path, encode_params]
-        payload = "\n".join(payload)
-        payload = payload.encode(encoding="UTF8")
-        secret_key = self._secret_key.encode(encoding="utf8")
-        digest = hmac.new(secret_key, payload, digestmod=hashlib.sha256).digest()
-        signature = base64.b64encode(digest)
-        signature = signature.decode()
-        return signature
+        return self._signer.sign(method, request_path, params)
 
     async def auth_callback(self, data):
         if data["err-code"] != 0:
@@ -243,7 +232,7 @@ class HuobiFutureTrade(Websocket):
         """ 处理websocket上接收到的消息
         @param raw 原始的压缩数据
         """
-        data = json.loads(gzip.decompress(raw).decode())
+        data = self.decoder.decode(raw)
         logger.debug("data:", data, caller=self)
 
         op = data.get("op")
@@ -332,13 +321,22 @@ class HuobiFutureTrade(Websocket):
                 price: Price of each contract.
                 quantity: The buying or selling quantity.
                 order_type: Order type, LIMIT or MARKET.
-                lever_rate: leverage.
+                lever_rate: leverage, default is 20.
             kwargs:
                 
         Returns:
             success: order info  if created successfully.
             error: erros information.
         """
+        order_nos, error = await self._create_orders_indexed(orders, *args, **kwargs)
+        if order_nos is None:
+            return None, error
+        return [order_no for _, order_no in order_nos], error
+
+    async def _create_orders_indexed(self, orders, *args, **kwargs):
+        """ Same as `create_orders`, but the order ids are (index, order_id) pairs, index is the 1-based position in
+        `orders`, the same as the `index` of the failed orders in `error`.
+        """
         orders_data = []
         for order in orders:
             if int(order["quantity"]) > 0:
@@ -360,7 +358,7 @@ class HuobiFutureTrade(Websocket):
                 else:
                     return None, "action error"
 
-            lever_rate = order["lever_rate"]
+            lever_rate = order.get("lever_rate", 20)
             if order["order_type"] == ORDER_TYPE_LIMIT:
                 order_price_type = "limit"
             elif order["order_type"] == ORDER_TYPE_MARKET:
@@ -385,7 +383,7 @@ class HuobiFutureTrade(Websocket):
         result, error = await self._rest_api.create_orders({"orders_data": orders_data})
         if error:
             return None, error
-        order_nos = [ order["order_id"] for order in result.get("data").get("success")]
+        order_nos = [(order["index"], order["order_id"]) for order in result.get("data").get("success")]
         return order_nos, result.get("data").get("errors")
         
     async def revoke_order(self, *order_nos):
@@ -487,7 +485,7 @@ class HuobiFutureTrade(Websocket):
                 "trade_type": trade_type
             }
             order = Order(**info)
-            self._orders[order_no] = order
+            self._orders.put(order)
         
         order.trade_quantity = None
         order.trade_price = None
@@ -522,11 +520,10 @@ class HuobiFutureTrade(Websocket):
         order.ctime = order_info["created_at"]
         order.utime = order_info["ts"]
 
-        SingleTask.run(self._order_update_callback, copy.copy(order))
+        SingleTask.run(self._order_update_callback, order.snapshot())
 
-        # Delete order that already completed.
-        if order.status in [ORDER_STATUS_FAILED, ORDER_STATUS_CANCELED, ORDER_STATUS_FILLED]:
-            self._orders.pop(order_no)
+        # Index the order, the order that already completed is moved to history.
+        self._orders.put(order)
         
         # publish order
         logger.info("symbol:", order.symbol, "order:", order, caller=self)
@@ -551,7 +548,7 @@ class HuobiFutureTrade(Websocket):
                 self._position.short_avg_price = position_info["cost_open"]
             # self._position.liquid_price = None
             self._position.utime = data["ts"]
-            SingleTask.run(self._position_update_callback, copy.copy(self._position))
+            SingleTask.run(self._position_update_callback, self._position.snapshot())
 
     def _update_asset(self, data):
         """ Asset update.
@@ -588,11 +585,11 @@ class HuobiFutureTrade(Websocket):
             }
             asset = Asset(**info)
             self._assets = asset
-            SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
+            SingleTask.run(self._asset_update_callback, self._assets.snapshot())
         else:
             for symbol in assets:
                 self._assets.assets.update({
                     symbol: assets[symbol]
                     })
             self._assets.timestamp = tools.get_cur_timestamp_ms()
-            SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
\ No newline at end of file
+            SingleTask.run(self._asset_update_callback, self._assets.snapshot())
\ No newline at end of file
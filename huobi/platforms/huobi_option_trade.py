@@ -9,7 +9,6 @@ Email:  andyjoe318@gmail.com
 """
 
 import asyncio
-import gzip
 import json
 import copy
 import datetime
@@ -25,6 +24,7 @@ from urllib.parse import urljoin
 
 from huobi.asset import Asset
 from huobi.order import Order
+from huobi.orderstore import OrderStore
 from huobi.position import Position
 from huobi.error import Error
 from huobi.utils import tools, logger
@@ -32,6 +32,7 @@ from huobi.tasks import SingleTask, LoopRunTask
 from huobi.const import HUOBI_OPTION
 from huobi.utils.websocket import Websocket
 from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.signer import Signer
 from huobi.utils.decorator import async_method_locker
 from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
 from huobi.order import ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_MAKER, ORDER_TYPE_FOK, ORDER_TYPE_IOC
@@ -99,6 +100,7 @@ class HuobiOptionTrade(Websocket):
         self._wss = kwargs["wss"]
         self._access_key = kwargs["access_key"]
         self._secret_key = kwargs["secret_key"]
+        self._signer = Signer.get(self._wss, self._access_key, self._secret_key)
         self._contract_code = kwargs.get("contract_code")
         self._order_update_callback = kwargs.get("order_update_callback")
         self._position_update_callback = kwargs.get("position_update_callback")
@@ -113,7 +115,7 @@ class HuobiOptionTrade(Websocket):
         # self._trade_partition = self._symbol.split("-")[1]
 
         self._assets = {}  # Asset detail, {"BTC": {"free": "1.1", "locked": "2.2", "total": "3.3"}, ... }.
-        self._orders = {}  # Order objects, {"order_id": order, ...}.
+        self._orders = OrderStore(kwargs.get("order_history_size", 1000))  # Order objects, indexed.
         self._position = Position(self._platform, self._account, self._strategy, self._symbol)
 
         self._order_channel = "orders.{symbol}-USDT".format(symbol=self._symbol)
@@ -137,11 +139,15 @@ class HuobiOptionTrade(Websocket):
 
     @property
     def orders(self):
-        return copy.copy(self._orders)
+        return copy.copy(self._orders.open)
+
+    @property
+    def order_store(self):
+        return self._orders
 
     @property
     def position(self):
-        return copy.copy(self._position)
+        return self._position.snapshot()
 
     @property
     def rest_api(self):
@@ -156,13 +162,7 @@ class HuobiOptionTrade(Websocket):
 
     async def connected_callback(self):
         """After connect to Websocket server successfully, send a auth message to server."""
-        timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
-        data = {
-            "AccessKeyId": self._access_key,
-            "SignatureMethod": "HmacSHA256",
-            "SignatureVersion": "2",
-            "Timestamp": timestamp
-        }
+        data = self._signer.auth_params()
         sign = self.generate_signature("GET", data, "/option-notification")
         data["op"] = "auth"
         data["type"] = "api"
@@ -170,18 +170,7 @@ class HuobiOptionTrade(Websocket):
         await self.ws.send_json(data)
     
     def generate_signature(self, method, params, request_path):
-        host_url = urllib.parse.urlparse(self._wss).hostname.lower()
-        #host_url = "172.18.6.227:9090"
-        sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
-        encode_params = urllib.parse.urlencode(sorted_params)
-        payload = [method, host_url, request_path, encode_params]
-        payload = "\n".join(payload)
-        payload = payload.encode(encoding="UTF8")
-        secret_key = self._secret_key.encode(encoding="utf8")
-        digest = hmac.new(secret_key, payload, digestmod=hashlib.sha256).digest()
-        signature = base64.b64encode(digest)
-        signature = signature.decode()
-        return signature
+        return self._signer.sign(method, request_path, params)
 
     async def auth_callback(self, data):
         if data["err-code"] != 0:
@@ -254,7 +243,7 @@ class HuobiOptionTrade(Websocket):
         """
         try:
             await self._lock.acquire()
-            data = json.loads(gzip.decompress(raw).decode())
+            data = self.decoder.decode(raw)
             logger.debug("data:", data, caller=self)
 
             op = data.get("op")
@@ -498,7 +487,7 @@ class HuobiOptionTrade(Websocket):
                 "trade_type": trade_type
             }
             order = Order(**info)
-            self._orders[order_no] = order
+            self._orders.put(order)
 
         order.trade_quantity = None
         order.trade_price = None
@@ -534,11 +523,10 @@ class HuobiOptionTrade(Websocket):
         order.utime = order_info["ts"]
 
         if self._order_update_callback is not None:
-            SingleTask.run(self._order_update_callback, copy.copy(order))
+            SingleTask.run(self._order_update_callback, order.snapshot())
 
-        # Delete order that already completed.
-        if order.status in [ORDER_STATUS_FAILED, ORDER_STATUS_CANCELED, ORDER_STATUS_FILLED]:
-            self._orders.pop(order_no)
+        # Index the order, the order that already completed is moved to history.
+        self._orders.put(order)
         
         # publish order
         logger.info("symbol:", order.symbol, "order:", order, caller=self)
@@ -564,7 +552,7 @@ class HuobiOptionTrade(Websocket):
             # self._position.liquid_price = None
             self._position.utime = data["ts"]
             if self._position_update_callback is not None:
-                SingleTask.run(self._position_update_callback, copy.copy(self._position))
+                SingleTask.run(self._position_update_callback, self._position.snapshot())
     
     def _update_asset(self, data):
         """ Asset update.
@@ -619,7 +607,7 @@ class HuobiOptionTrade(Websocket):
             asset = Asset(**info)
             self._assets = asset
             if self._asset_update_callback is not None:
-                SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
+                SingleTask.run(self._asset_update_callback, self._assets.snapshot())
         else:
             for symbol in assets:
                 self._assets.assets.update({
@@ -627,4 +615,4 @@ class HuobiOptionTrade(Websocket):
                     })
             self._assets.timestamp = tools.get_cur_timestamp_ms()
             if self._asset_update_callback is not None:
-                SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
+                SingleTask.run(self._asset_update_callback, self._assets.snapshot())
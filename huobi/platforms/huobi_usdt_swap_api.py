@@ -19,6 +19,8 @@ import datetime
 import time
 from urllib.parse import urljoin
 from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.ratelimit import RateLimiter
+from huobi.utils.signer import Signer
 from huobi.const import USER_AGENT
 
 
@@ -31,13 +33,16 @@ class HuobiUsdtSwapRestAPI:
         host: HTTP request host.
         access_key: Account's ACCESS KEY.
         secret_key: Account's SECRET KEY.
+        order_router: `OrderRouter` sending the trading requests (create and cancel orders), None is REST only.
     """
 
-    def __init__(self, access_key, secret_key, host="https://api.hbdm.com"):
+    def __init__(self, access_key, secret_key, host="https://api.hbdm.com", order_router=None):
         """ initialize REST API client. """
         self._host = host
         self._access_key = access_key
         self._secret_key = secret_key
+        self._signer = Signer.get(host, access_key, secret_key)
+        self._order_router = order_router
 
     async def get_swap_info(self, contract_code=None):
         """ Get Swap Info
@@ -115,9 +120,9 @@ class HuobiUsdtSwapRestAPI:
         }
         if size:
             params["size"] = size
-        if sfrom:
+        if sfrom is not None:
             params["from"] = sfrom
-        if to:
+        if to is not None:
             params["to"] = to
         success, error = await self.request("GET", uri, params=params)
         return success, error
@@ -491,18 +496,26 @@ class HuobiUsdtSwapRestAPI:
             success: Success results, otherwise it's None.
             error: Error information, otherwise it's None.
         """
+        if self._order_router and self._order_router.routes(method, uri, auth):
+            return await self._order_router.request(self._rest_request, method, uri, params, body, headers, auth)
+        return await self._rest_request(method, uri, params, body, headers, auth)
+
+    async def _rest_request(self, method, uri, params=None, body=None, headers=None, auth=False):
+        """ Do HTTP request by REST, the arguments are the same as `request`. """
         if uri.startswith("http://") or uri.startswith("https://"):
             url = uri
         else:
             url = urljoin(self._host, uri)
 
+        # Wait for rate limit before signing, so the timestamp is fresh.
+        bucket = RateLimiter.get(url, self._access_key, auth)
+        if bucket:
+            await bucket.acquire(RateLimiter.priority(uri))
+        response_headers = {}
+
         if auth:
-            timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
             params = params if params else {}
-            params.update({"AccessKeyId": self._access_key,
-                           "SignatureMethod": "HmacSHA256",
-                           "SignatureVersion": "2",
-                           "Timestamp": timestamp})
+            params.update(self._signer.auth_params())
 
             params["Signature"] = self.generate_signature(method, params, uri)
 
@@ -511,13 +524,16 @@ class HuobiUsdtSwapRestAPI:
         if method == "GET":
             headers["Content-type"] = "application/x-www-form-urlencoded"
             headers["User-Agent"] = USER_AGENT
-            _, success, error = await AsyncHttpRequests.fetch("GET", url, params=params, headers=headers, timeout=10)
+            _, success, error = await AsyncHttpRequests.fetch("GET", url, params=params, headers=headers, timeout=10,
+                                                              response_headers=response_headers)
         else:
             headers["Accept"] = "application/json"
             headers["Content-type"] = "application/json"
             headers["User-Agent"] = USER_AGENT
             _, success, error = await AsyncHttpRequests.fetch("POST", url, params=params, data=body, headers=headers,
-                                                              timeout=10)
+                                                              timeout=10, response_headers=response_headers)
+        if bucket:
+            bucket.update(response_headers, error)
         if error:
             return None, error
         if not isinstance(success, dict):
@@ -525,22 +541,15 @@ class HuobiUsdtSwapRestAPI:
         else:
             result = success
         if result.get("status") != "ok":
+            if bucket:
+                bucket.update(error=result)
             return None, result
         return result, None
 
     def generate_signature(self, method, params, request_path):
         if request_path.startswith("http://") or request_path.startswith("https://"):
-            host_url = urllib.parse.urlparse(request_path).hostname.lower()
+            signer = Signer.get(request_path, self._access_key, self._secret_key)
             request_path = '/' + '/'.join(request_path.split('/')[3:])
         else:
-            host_url = urllib.parse.urlparse(self._host).hostname.lower()
-        sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
-        encode_params = urllib.parse.urlencode(sorted_params)
-        payload = [method, host_url, request_path, encode_params]
-        payload = "\n".join(payload)
-        payload = payload.encode(encoding="UTF8")
-        secret_key = self._secret_key.encode(encoding="utf8")
-        digest = hmac.new(secret_key, payload, digestmod=hashlib.sha256).digest()
-        signature = base64.b64encode(digest)
-        signature = signature.decode()
-        return signature
+            signer = self._signer
+        return signer.sign(method, request_path, params)
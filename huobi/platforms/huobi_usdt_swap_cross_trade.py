@@ -8,7 +8,6 @@ Date:   2020/12/14
 Email:  andyjoe318@gmail.com
 """
 
-import gzip
 import json
 import copy
 import datetime
@@ -24,6 +23,7 @@ from urllib.parse import urljoin
 
 from huobi.asset import Asset
 from huobi.order import Order
+from huobi.orderstore import OrderStore
 from huobi.position import Position
 from huobi.error import Error
 from huobi.utils import tools, logger
@@ -31,6 +31,8 @@ from huobi.tasks import SingleTask, LoopRunTask
 from huobi.const import HUOBI_USDT_SWAP_CROSS
 from huobi.utils.websocket import Websocket
 from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.signer import Signer
+from huobi.utils.notification import NotificationSession
 from huobi.utils.decorator import async_method_locker
 from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
 from huobi.order import ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_MAKER, ORDER_TYPE_FOK, ORDER_TYPE_IOC
@@ -65,6 +67,10 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         init_success_callback: You can use this param to specific a async callback function when you initializing Trade
             object. `init_success_callback` is like `async def on_init_success_callback(success: bool, error: Error, **kwargs): pass`
             and this callback function will be executed asynchronous after Trade module object initialized successfully.
+        shared_notification: Receive the order/position/asset pushes over one notification connection shared by all
+            the Trade objects of the same account, subscribed with wildcard topics like `orders.*` and dispatched by
+            `contract_code`, see `huobi.utils.notification`. default is False, every Trade object has its own
+            connection.
     """
 
     def __init__(self, **kwargs):
@@ -100,6 +106,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         self._wss = kwargs["wss"]
         self._access_key = kwargs["access_key"]
         self._secret_key = kwargs["secret_key"]
+        self._signer = Signer.get(self._wss, self._access_key, self._secret_key)
         self._order_update_callback = kwargs.get("order_update_callback")
         self._position_update_callback = kwargs.get("position_update_callback")
         self._asset_update_callback = kwargs.get("asset_update_callback")
@@ -109,7 +116,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         super(HuobiUsdtSwapCrossTrade, self).__init__(url, send_hb_interval=5)
 
         self._assets = {}  # Asset detail, {"BTC": {"free": "1.1", "locked": "2.2", "total": "3.3"}, ... }.
-        self._orders = {}  # Order objects, {"order_id": order, ...}.
+        self._orders = OrderStore(kwargs.get("order_history_size", 1000))  # Order objects, indexed.
         self._position = Position(self._platform, self._account, self._strategy, self._symbol + '/' + self._contract_type)
 
         self._order_channel = "orders_cross.{symbol}".format(symbol=self._symbol)
@@ -122,7 +129,14 @@ class HuobiUsdtSwapCrossTrade(Websocket):
 
         self._rest_api = HuobiUsdtSwapCrossRestAPI(self._access_key, self._secret_key, self._host)
 
-        self.initialize()
+        if kwargs.get("shared_notification"):
+            self._session = NotificationSession.get(self._wss, "/linear-swap-notification", self._access_key, self._secret_key)
+            topics = [channel.split(".")[0] + ".*" for channel in
+                      (self._order_channel, self._position_channel, self._asset_channel)]
+            self._session.register(self, self._symbol, topics)
+        else:
+            self._session = None
+            self.initialize()
 
 
     @property
@@ -131,11 +145,15 @@ class HuobiUsdtSwapCrossTrade(Websocket):
 
     @property
     def orders(self):
-        return copy.copy(self._orders)
+        return copy.copy(self._orders.open)
+
+    @property
+    def order_store(self):
+        return self._orders
 
     @property
     def position(self):
-        return copy.copy(self._position)
+        return self._position.snapshot()
 
     @property
     def rest_api(self):
@@ -150,13 +168,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
 
     async def connected_callback(self):
         """After connect to Websocket server successfully, send a auth message to server."""
-        timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
-        data = {
-            "AccessKeyId": self._access_key,
-            "SignatureMethod": "HmacSHA256",
-            "SignatureVersion": "2",
-            "Timestamp": timestamp
-        }
+        data = self._signer.auth_params()
         sign = self.generate_signature("GET", data, "/linear-swap-notification")
         data["op"] = "auth"
         data["type"] = "api"
@@ -164,17 +176,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         await self.ws.send_json(data)
     
     def generate_signature(self, method, params, request_path):
-        host_url = urllib.parse.urlparse(self._wss).hostname.lower()
-        sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
-        encode_params = urllib.parse.urlencode(sorted_params)
-        payload = [method, host_url, request_path, encode_params]
-        payload = "\n".join(payload)
-        payload = payload.encode(encoding="UTF8")
-        secret_key = self._secret_key.encode(encoding="utf8")
-        digest = hmac.new(secret_key, payload, digestmod=hashlib.sha256).digest()
-        signature = base64.b64encode(digest)
-        signature = signature.decode()
-        return signature
+        return self._signer.sign(method, request_path, params)
 
     async def auth_callback(self, data):
         if data["err-code"] != 0:
@@ -224,26 +226,36 @@ class HuobiUsdtSwapCrossTrade(Websocket):
             self._subscribe_asset_ok = True
         if self._subscribe_order_ok and self._subscribe_position_ok \
             and self._subscribe_asset_ok:
-            success, error = await self._rest_api.get_open_orders(self._symbol)
-            if error:
-                e = Error("get open orders failed!")
-                SingleTask.run(self._init_success_callback, False, e)
-            elif "data" in success and "orders" in success["data"]:
-                for order_info in success["data"]["orders"]:
-                    order_info["ts"] = order_info["created_at"]
-                    self._update_order(order_info)
-                SingleTask.run(self._init_success_callback, True, None)
-            else:
-                logger.warn("get open orders:", success, caller=self)
-                e = Error("Get Open Orders Unknown error")
-                SingleTask.run(self._init_success_callback, False, e)
+            await self._load_open_orders()
+
+    async def session_callback(self, success, error):
+        """ Shared notification session authorized and subscribed, or failed. """
+        if not success:
+            SingleTask.run(self._init_success_callback, False, error)
+            return
+        await self._load_open_orders()
+
+    async def _load_open_orders(self):
+        success, error = await self._rest_api.get_open_orders(self._symbol)
+        if error:
+            e = Error("get open orders failed!")
+            SingleTask.run(self._init_success_callback, False, e)
+        elif "data" in success and "orders" in success["data"]:
+            for order_info in success["data"]["orders"]:
+                order_info["ts"] = order_info["created_at"]
+                self._update_order(order_info)
+            SingleTask.run(self._init_success_callback, True, None)
+        else:
+            logger.warn("get open orders:", success, caller=self)
+            e = Error("Get Open Orders Unknown error")
+            SingleTask.run(self._init_success_callback, False, e)
 
     @async_method_locker("HuobiSwapCrossTrade.process_binary.locker")
     async def process_binary(self, raw):
         """ 处理websocket上接收到的消息
         @param raw 原始的压缩数据
         """
-        data = json.loads(gzip.decompress(raw).decode())
+        data = self.decoder.decode(raw)
         logger.debug("data:", data, caller=self)
 
         op = data.get("op")
@@ -258,12 +270,17 @@ class HuobiUsdtSwapCrossTrade(Websocket):
             await self.sub_callback(data)
 
         elif op == "notify":
-            if data["topic"].startswith("orders"):
-                self._update_order(data)
-            elif data["topic"].startswith("positions"):
-                self._update_position(data)
-            elif data["topic"].startswith("accounts"):
-                self._update_asset(data)
+            await self.process_notify(data)
+
+    async def process_notify(self, data):
+        """ Process notify message, from own Websocket connection or shared notification session.
+        """
+        if data["topic"].startswith("orders"):
+            self._update_order(data)
+        elif data["topic"].startswith("positions"):
+            self._update_position(data)
+        elif data["topic"].startswith("accounts"):
+            self._update_asset(data)
 
     async def create_order(self, action, price, quantity, order_type=ORDER_TYPE_LIMIT, client_order_id=None,  *args, **kwargs):
         """ Create an order.
@@ -332,13 +349,22 @@ class HuobiUsdtSwapCrossTrade(Websocket):
                 price: Price of each contract.
                 quantity: The buying or selling quantity.
                 order_type: Order type, LIMIT or MARKET.
-                lever_rate: leverage.
+                lever_rate: leverage, default is 20.
             kwargs:
                 
         Returns:
             success: order info  if created successfully.
             error: erros information.
         """
+        order_nos, error = await self._create_orders_indexed(orders, *args, **kwargs)
+        if order_nos is None:
+            return None, error
+        return [order_no for _, order_no in order_nos], error
+
+    async def _create_orders_indexed(self, orders, *args, **kwargs):
+        """ Same as `create_orders`, but the order ids are (index, order_id) pairs, index is the 1-based position in
+        `orders`, the same as the `index` of the failed orders in `error`.
+        """
         orders_data = []
         for order in orders:
             if int(order["quantity"]) > 0:
@@ -360,7 +386,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
                 else:
                     return None, "action error"
 
-            lever_rate = order["lever_rate"]
+            lever_rate = order.get("lever_rate", 20)
             if order["order_type"] == ORDER_TYPE_LIMIT:
                 order_price_type = "limit"
             elif order["order_type"] == ORDER_TYPE_MARKET:
@@ -385,7 +411,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         result, error = await self._rest_api.create_orders({"orders_data": orders_data})
         if error:
             return None, error
-        order_nos = [ order["order_id"] for order in result.get("data").get("success")]
+        order_nos = [(order["index"], order["order_id"]) for order in result.get("data").get("success")]
         return order_nos, result.get("data").get("errors")
         
     async def revoke_order(self, *order_nos):
@@ -487,7 +513,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
                 "trade_type": trade_type
             }
             order = Order(**info)
-            self._orders[order_no] = order
+            self._orders.put(order)
             
         order.trade_quantity = None
         order.trade_price = None
@@ -522,11 +548,10 @@ class HuobiUsdtSwapCrossTrade(Websocket):
         order.ctime = order_info["created_at"]
         order.utime = order_info["ts"]
 
-        SingleTask.run(self._order_update_callback, copy.copy(order))
+        SingleTask.run(self._order_update_callback, order.snapshot())
 
-        # Delete order that already completed.
-        if order.status in [ORDER_STATUS_FAILED, ORDER_STATUS_CANCELED, ORDER_STATUS_FILLED]:
-            self._orders.pop(order_no)
+        # Index the order, the order that already completed is moved to history.
+        self._orders.put(order)
         
         # publish order
         logger.info("symbol:", order.symbol, "order:", order, caller=self)
@@ -551,7 +576,7 @@ class HuobiUsdtSwapCrossTrade(Websocket):
                 self._position.short_avg_price = position_info["cost_open"]
             # self._position.liquid_price = None
             self._position.utime = data["ts"]
-            SingleTask.run(self._position_update_callback, copy.copy(self._position))
+            SingleTask.run(self._position_update_callback, self._position.snapshot())
     
     def _update_asset(self, data):
         """ Asset update.
@@ -589,11 +614,11 @@ class HuobiUsdtSwapCrossTrade(Websocket):
             }
             asset = Asset(**info)
             self._assets = asset
-            SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
+            SingleTask.run(self._asset_update_callback, self._assets.snapshot())
         else:
             for symbol in assets:
                 self._assets.assets.update({
                     symbol: assets[symbol]
                     })
             self._assets.timestamp = tools.get_cur_timestamp_ms()
-            SingleTask.run(self._asset_update_callback, copy.copy(self._assets))
+            SingleTask.run(self._asset_update_callback, self._assets.snapshot())
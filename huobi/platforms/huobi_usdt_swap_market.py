@@ -8,7 +8,6 @@ Date:   2020/9/10
 Email:  andyjoe318@gmail.com
 """
 
-import gzip
 import json
 import time
 import asyncio
@@ -17,13 +16,19 @@ from collections import deque
 
 from huobi.utils import logger
 from huobi.utils.websocket import Websocket
+from huobi.utils.shard import ShardManager
+from huobi.utils.ringbuffer import RingBuffer
 from huobi.utils.decorator import async_method_locker
 from huobi.const import MARKET_TYPE_KLINE
 from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
-from huobi.tasks import SingleTask
+from huobi.tasks import SingleTask, LoopRunTask
 from huobi.orderbook import Orderbook
 from huobi.markettrade import Trade
 from huobi.kline import Kline
+from huobi.depthbook import DepthBook
+from huobi.history import TradeColumns, KlineColumns, SIDE_BUY, SIDE_SELL
+from huobi.barbuilder import BarAggregator
+from huobi.platforms.huobi_usdt_swap_api import HuobiUsdtSwapRestAPI
 
 class HuobiUsdtSwapMarket(Websocket):
     """ Huobi USDT Swap Market Server.
@@ -35,6 +40,26 @@ class HuobiUsdtSwapMarket(Websocket):
             symbols: Trade pair list, e.g. ["BTC_USDT"].
             channels: channel list, only `orderbook`, `kline` and `trade` to be enabled.
             orderbook_length: The length of orderbook's data to be published via OrderbookEvent, default is 10.
+            orderbook_incremental: Subscribe the incremental depth channel `depth.size_N.high_freq` and maintain a local
+                book for every symbol, instead of the full `depth.step6` snapshots, default is False.
+            orderbook_depth_size: The depth size N of incremental depth channel, 20 or 150, default is 20.
+            host: Exchange HTTP host address, used to resync the local book from REST depth snapshot. default is the
+                `https` address of `wss`.
+            shards: Spread the subscriptions over at most N websocket connections shared by all the markets of the same
+                `wss`, and balance them by message rate. default is 0, the market opens its own connection.
+            shard_max_rate: Messages per second a shard connection is saturated, only used when `shards` > 0, default
+                is 1000.
+            conflate_orderbooks: The orderbook callback is dispatched by `conflate` policy, pass the orderbook to the
+                callback without copy, it's the same object kept in `orderbooks` history and must be treated as
+                read-only. default is False.
+            history_length: Keep the newest N trades and klines of every symbol in columnar ring buffers, see
+                `trade_history` and `kline_history`. default is 0, disabled.
+            bars: Build bars locally from the trade stream, e.g. [{"type": "time", "size": 300}, {"type": "volume",
+                "size": 1000}], see `huobi.barbuilder`. Subscribe `kline` channel to reconcile time bars with the
+                exchange 1-min klines.
+            bar_update_callback: Asynchronous callback function of closed bars, like
+                `async def on_bar_update_callback(bar: Bar): pass`
+            bar_close_delay: Seconds to wait after the end of a time bar before closing it by timer, default is 0.
     """
 
     def __init__(self, **kwargs):
@@ -49,27 +74,72 @@ class HuobiUsdtSwapMarket(Websocket):
         self._orderbook_update_callback = kwargs.get("orderbook_update_callback")
         self._kline_update_callback = kwargs.get("kline_update_callback")
         self._trade_update_callback = kwargs.get("trade_update_callback")
+        self._orderbook_incremental = kwargs.get("orderbook_incremental", False)
+        self._orderbook_depth_size = kwargs.get("orderbook_depth_size", 20)
+        self._host = kwargs.get("host") or self._wss.replace("wss://", "https://")
+        self._shards = kwargs.get("shards") or 0
+        self._shard_max_rate = kwargs.get("shard_max_rate", 1000)
+        self._conflate_orderbooks = kwargs.get("conflate_orderbooks", False)
+        self._history_length = kwargs.get("history_length") or 0
 
         self._c_to_s = {}  # {"channel": "symbol"}
-        self._orderbooks = deque(maxlen=self._orderbooks_length) 
-        self._klines = deque(maxlen=self._klines_length)
-        self._trades = deque(maxlen=self._trades_length)
+        self._orderbooks = RingBuffer(self._orderbooks_length)
+        self._klines = RingBuffer(self._klines_length)
+        self._trades = RingBuffer(self._trades_length)
+        self._depth_books = {}  # {"symbol": DepthBook}, local books of incremental depth.
+        self._depth_buffers = {}  # {"symbol": deque}, incremental updates received while resyncing the book.
+        self._rest_api = None
+        self._trade_history = {}  # {"symbol": TradeColumns}
+        self._kline_history = {}  # {"symbol": KlineColumns}
+        self._bar_aggregator = None
+        if kwargs.get("bars"):
+            self._bar_aggregator = BarAggregator(self._platform, self._symbols, kwargs["bars"],
+                                                 kwargs.get("bar_update_callback"), kwargs.get("bar_close_delay", 0))
+            if self._bar_aggregator.has_time_bars:
+                LoopRunTask.register(self._bar_aggregator.on_timer, 1)
 
         url = self._wss + "/linear-swap-ws"
         super(HuobiUsdtSwapMarket, self).__init__(url, send_hb_interval=5)
-        self.initialize()
+        if self._shards > 0:
+            self._shard_manager = ShardManager.get(url, self._shards, send_hb_interval=5,
+                                                   max_rate=self._shard_max_rate)
+            for channel, data in self._subscriptions():
+                self._shard_manager.subscribe(channel, data, self)
+        else:
+            self._shard_manager = None
+            self.initialize()
     
     @property
     def orderbooks(self):
-        return copy.copy(self._orderbooks)
+        return self._orderbooks.copy()
 
     @property
     def klines(self):
-        return copy.copy(self._klines)
+        return self._klines.copy()
 
     @property
     def trades(self):
-        return copy.copy(self._trades)
+        return self._trades.copy()
+
+    @property
+    def orderbooks_view(self):
+        return self._orderbooks.view()
+
+    @property
+    def klines_view(self):
+        return self._klines.view()
+
+    @property
+    def trades_view(self):
+        return self._trades.view()
+
+    def trade_history(self, symbol):
+        """ Get the columnar trade history of symbol, None if `history_length` is 0 or no trade yet. """
+        return self._trade_history.get(symbol)
+
+    def kline_history(self, symbol):
+        """ Get the columnar kline history of symbol, None if `history_length` is 0 or no kline yet. """
+        return self._kline_history.get(symbol)
 
     async def _send_heartbeat_msg(self, *args, **kwargs):
         """ 发送心跳给服务器
@@ -86,6 +156,16 @@ class HuobiUsdtSwapMarket(Websocket):
     async def connected_callback(self):
         """ After create Websocket connection successfully, we will subscribing orderbook/trade events.
         """
+        for channel, data in self._subscriptions():
+            await self.ws.send_json(data)
+
+    def _subscriptions(self):
+        """ Get the subscribe messages of all symbols and channels.
+
+        Returns:
+            subscriptions: [(channel, data), ...]
+        """
+        subscriptions = []
         for ch in self._channels:
             if ch == "kline":
                 for symbol in self._symbols:
@@ -95,7 +175,7 @@ class HuobiUsdtSwapMarket(Websocket):
                     kline = {
                         "sub": channel
                     }
-                    await self.ws.send_json(kline)
+                    subscriptions.append((channel, kline))
             elif ch == "orderbook":
                 for symbol in self._symbols:
                     channel = self._symbol_to_channel(symbol, "depth")
@@ -104,7 +184,12 @@ class HuobiUsdtSwapMarket(Websocket):
                     data = {
                         "sub": channel
                     }
-                    await self.ws.send_json(data)
+                    if self._orderbook_incremental:
+                        # A new snapshot will be pushed after subscribed.
+                        data["data_type"] = "incremental"
+                        self._depth_books.pop(symbol, None)
+                        self._depth_buffers.pop(symbol, None)
+                    subscriptions.append((channel, data))
             elif ch == "trade":
                 for symbol in self._symbols:
                     channel = self._symbol_to_channel(symbol, "trade")
@@ -113,24 +198,28 @@ class HuobiUsdtSwapMarket(Websocket):
                     data = {
                         "sub": channel
                     }
-                    await self.ws.send_json(data)
+                    subscriptions.append((channel, data))
             else:
                 logger.error("channel error! channel:", ch, caller=self)
+        return subscriptions
 
     async def process_binary(self, msg):
         """ Process binary message that received from Websocket connection.
         """
-        data = json.loads(gzip.decompress(msg).decode())
-        logger.debug("data:", json.dumps(data), caller=self)
+        data = self.decoder.decode(msg)
+        logger.debug("data:", data, caller=self)
         channel = data.get("ch")
         if not channel:
             if data.get("ping"):
                 hb_msg = {"pong": data.get("ping")}
                 await self.ws.send_json(hb_msg)
             return
+        await self.process_data(data)
 
-        symbol = self._c_to_s[channel]
-
+    async def process_data(self, data):
+        """ Process decoded channel message, from own Websocket connection or shard connection.
+        """
+        channel = data.get("ch")
         if channel.find("kline") != -1:
             await self.process_kline(data)
 
@@ -140,7 +229,7 @@ class HuobiUsdtSwapMarket(Websocket):
         elif channel.find("trade") != -1:
             await self.process_trade(data)
         else:
-            logger.error("event error! msg:", msg, caller=self)
+            logger.error("event error! msg:", data, caller=self)
 
     def _symbol_to_channel(self, symbol, channel_type):
         """ Convert symbol to channel.
@@ -152,7 +241,10 @@ class HuobiUsdtSwapMarket(Websocket):
         if channel_type == "kline":
             channel = "market.{s}.kline.1min".format(s=symbol.upper())
         elif channel_type == "depth":
-            channel = "market.{s}.depth.step6".format(s=symbol.upper())
+            if self._orderbook_incremental:
+                channel = "market.{s}.depth.size_{n}.high_freq".format(s=symbol.upper(), n=self._orderbook_depth_size)
+            else:
+                channel = "market.{s}.depth.step6".format(s=symbol.upper())
         elif channel_type == "trade":
             channel = "market.{s}.trade.detail".format(s=symbol.upper())
         else:
@@ -167,6 +259,16 @@ class HuobiUsdtSwapMarket(Websocket):
         channel = data.get("ch")
         symbol = self._c_to_s[channel]
         d = data.get("tick")
+        if self._history_length:
+            history = self._kline_history.get(symbol)
+            if history is None:
+                history = self._kline_history[symbol] = KlineColumns(self._history_length)
+            history.append(d["id"] * 1000, d["open"], d["high"], d["low"], d["close"], d["amount"])
+        if self._bar_aggregator:
+            # Bars count the trade `amount` in contracts, so reconcile with the kline `vol` (contracts), not the kline
+            # `amount` (coin).
+            self._bar_aggregator.on_kline(symbol, d["id"] * 1000, d["open"], d["high"], d["low"], d["close"],
+                                          d["vol"])
         info = {
             "platform": self._platform,
             "symbol": symbol,
@@ -190,39 +292,116 @@ class HuobiUsdtSwapMarket(Websocket):
         channel = data.get("ch")
         symbol = self._c_to_s[channel]
         d = data.get("tick")
-        asks, bids = [], []
-        if d.get("asks"):
-            for item in d.get("asks")[:self._orderbook_length]:
-                price = "%.8f" % item[0]
-                quantity = "%.8f" % item[1]
-                asks.append([price, quantity])
-        if d.get("bids"):
-            for item in d.get("bids")[:self._orderbook_length]:
-                price = "%.8f" % item[0]
-                quantity = "%.8f" % item[1]
-                bids.append([price, quantity])
-        info = {
-            "platform": self._platform,
-            "symbol": symbol,
-            "asks": asks,
-            "bids": bids,
-            "timestamp": d.get("ts")
-        }
-        orderbook = Orderbook(**info)
+        if self._orderbook_incremental:
+            book = self._update_depth_book(symbol, d)
+            if not book:
+                return
+            ask_prices, ask_quantities, bid_prices, bid_quantities = book.top(self._orderbook_length)
+            timestamp = book.timestamp
+        else:
+            asks = (d.get("asks") or [])[:self._orderbook_length]
+            bids = (d.get("bids") or [])[:self._orderbook_length]
+            ask_prices = [item[0] for item in asks]
+            ask_quantities = [item[1] for item in asks]
+            bid_prices = [item[0] for item in bids]
+            bid_quantities = [item[1] for item in bids]
+            timestamp = d.get("ts")
+        orderbook = Orderbook.from_levels(self._platform, symbol, ask_prices, ask_quantities, bid_prices,
+                                          bid_quantities, timestamp)
         self._orderbooks.append(orderbook)
-        SingleTask.run(self._orderbook_update_callback, copy.copy(orderbook))
+        if self._conflate_orderbooks:
+            # Only the latest pending orderbook is delivered, the skipped ones are never copied.
+            SingleTask.run(self._orderbook_update_callback, orderbook)
+        else:
+            SingleTask.run(self._orderbook_update_callback, copy.copy(orderbook))
         logger.debug("symbol:", symbol, "orderbook:", orderbook, caller=self)
     
+    def _update_depth_book(self, symbol, tick):
+        """ Apply an incremental depth push to the local book of symbol.
+
+        Returns:
+            book: The local book if it's synced and updated, otherwise None.
+        """
+        book = self._depth_books.get(symbol)
+        if not book:
+            book = DepthBook(symbol, self._orderbook_depth_size)
+            self._depth_books[symbol] = book
+        asks = tick.get("asks") or []
+        bids = tick.get("bids") or []
+        if tick.get("event") == "snapshot":
+            book.reset(asks, bids, tick.get("version"), tick.get("ts"))
+            self._depth_buffers.pop(symbol, None)
+            return book
+        buffer = self._depth_buffers.get(symbol)
+        if buffer is not None:
+            buffer.append(tick)
+            return None
+        if book.update(asks, bids, tick.get("version"), tick.get("ts")):
+            return book
+        logger.warn("depth version not continuous, resync. symbol:", symbol, "book version:", book.version,
+                    "version:", tick.get("version"), caller=self)
+        self._depth_buffers[symbol] = deque([tick], maxlen=1000)
+        SingleTask.run(self._resync_depth_book, symbol)
+        return None
+
+    async def _resync_depth_book(self, symbol):
+        """ Rebuild the local book from REST depth snapshot and replay the buffered updates. If the snapshot can not
+        be joined with the buffered updates, resubscribe the channel to receive a new snapshot from server.
+        """
+        if not self._rest_api:
+            self._rest_api = HuobiUsdtSwapRestAPI(None, None, self._host)
+        success, error = await self._rest_api.get_orderbook(symbol)
+        buffer = self._depth_buffers.get(symbol)
+        if buffer is None:
+            # Already resynced by a snapshot from websocket.
+            return
+        book = self._depth_books[symbol]
+        tick = success.get("tick") if success else None
+        if tick and tick.get("version") is not None:
+            book.reset(tick.get("asks") or [], tick.get("bids") or [], tick["version"], tick.get("ts"))
+            synced = True
+            for t in buffer:
+                if t.get("version") <= book.version:
+                    continue
+                if not book.update(t.get("asks") or [], t.get("bids") or [], t.get("version"), t.get("ts")):
+                    synced = False
+                    break
+            if synced:
+                self._depth_buffers.pop(symbol)
+                logger.info("depth resynced from rest snapshot. symbol:", symbol, "version:", book.version,
+                            caller=self)
+                return
+        logger.warn("resync depth from rest failed, resubscribe. symbol:", symbol, "error:", error, caller=self)
+        book.clear()
+        buffer.clear()
+        channel = self._symbol_to_channel(symbol, "depth")
+        if self._shard_manager:
+            await self._shard_manager.resubscribe(channel)
+            return
+        if not self.ws:
+            return
+        await self.ws.send_json({"unsub": channel})
+        await self.ws.send_json({"sub": channel, "data_type": "incremental"})
+
     async def process_trade(self, data):
         """ process trade
         """
         channel = data.get("ch")
         symbol = self._c_to_s[channel]
         ticks = data.get("tick")
+        history = None
+        if self._history_length:
+            history = self._trade_history.get(symbol)
+            if history is None:
+                history = self._trade_history[symbol] = TradeColumns(self._history_length)
         for tick in ticks["data"]: 
             direction = tick.get("direction")
             price = tick.get("price")
             quantity = tick.get("amount")
+            if history is not None:
+                history.append(tick.get("ts"), price, quantity, SIDE_BUY if direction == "buy" else SIDE_SELL)
+            if self._bar_aggregator:
+                self._bar_aggregator.on_trade(symbol, price, quantity, tick.get("ts"))
             info = {
                 "platform": self._platform,
                 "symbol": symbol,
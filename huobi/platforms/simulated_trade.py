@@ -0,0 +1,544 @@
+# -*- coding:utf-8 -*-
+
+"""
+Simulated Trade Module.
+
+Orders of a USDT margined swap are matched locally by `huobi.matching.MatchingEngine` against the market data of the
+symbol, and the order / position / asset updates are built as Huobi notification messages and applied by the same
+`_update_order`, `_update_position` and `_update_asset` as `HuobiUsdtSwapTrade`, so strategies get the same callbacks
+as in live trading.
+
+The market data comes from the websocket messages of the market channels, usually replayed by `huobi.replay.Replay`:
+
+    trader = Trade(platform=const.SIMULATED, ...)
+    market = Market(const.HUOBI_USDT_SWAP, ...)
+    replay.add(trader)  # Before the market, so the orders are matched before the strategy sees the data.
+    replay.add(market)
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import copy
+import asyncio
+
+from huobi.orderstore import OrderStore
+from huobi.position import Position
+from huobi.error import Error
+from huobi.depthbook import DepthBook
+from huobi.utils import tools, logger
+from huobi.tasks import SingleTask
+from huobi.const import SIMULATED
+from huobi.utils.websocket import default_decoder
+from huobi.matching import MatchingEngine, MatchOrder
+from huobi.matching import KIND_LIMIT, KIND_MARKET, KIND_POST_ONLY, KIND_IOC, KIND_FOK
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL
+from huobi.order import ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_MAKER, ORDER_TYPE_FOK, ORDER_TYPE_IOC
+from .huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+
+
+__all__ = ("SimulatedTrade", )
+
+
+ORDER_KINDS = {
+    ORDER_TYPE_LIMIT: (KIND_LIMIT, "limit"),
+    ORDER_TYPE_MARKET: (KIND_MARKET, "optimal_20"),
+    ORDER_TYPE_MAKER: (KIND_POST_ONLY, "post_only"),
+    ORDER_TYPE_FOK: (KIND_FOK, "fok"),
+    ORDER_TYPE_IOC: (KIND_IOC, "ioc")
+}
+
+
+class SimulatedTrade:
+    """ Simulated Trade module, the kwargs are the same as `HuobiUsdtSwapTrade`, access_key and secret_key are not
+    required.
+
+    Attributes:
+        account: Account name for this trade exchange.
+        strategy: What's name would you want to created for you strategy.
+        symbol: Symbol name for your trade, e.g. `BTC-USDT`.
+        contract_type: Contract type, default is `USDTSWAP`.
+        wss: Websocket address of the market data, default `wss://api.hbdm.com`, the market data url is
+            `wss + /linear-swap-ws`.
+        asset_update_callback: Same as `HuobiUsdtSwapTrade`.
+        order_update_callback: Same as `HuobiUsdtSwapTrade`.
+        position_update_callback: Same as `HuobiUsdtSwapTrade`.
+        init_success_callback: Same as `HuobiUsdtSwapTrade`, it's called once the object is created.
+        balance: Initial margin balance, default is 10000.
+        margin_asset: Margin asset, default is `USDT`.
+        contract_size: Contract size of the symbol, default is 0.001 (BTC-USDT).
+        maker_fee: Maker fee rate, default is 0.0002.
+        taker_fee: Taker fee rate, default is 0.0005.
+        latency: Seconds from an order or cancel request to the matching engine, and from the matching engine to the
+            response, default is 0. It follows the clock of the event loop, the replay time while replaying.
+        orderbook_depth: Levels of the incremental depth book used for matching, default is 20.
+    """
+
+    # The notification messages are applied the same way as live trading.
+    _update_order = HuobiUsdtSwapTrade._update_order
+    _update_position = HuobiUsdtSwapTrade._update_position
+    _update_asset = HuobiUsdtSwapTrade._update_asset
+
+    def __init__(self, **kwargs):
+        """Initialize."""
+        e = None
+        if not kwargs.get("account"):
+            e = Error("param account miss")
+        if not kwargs.get("strategy"):
+            e = Error("param strategy miss")
+        if not kwargs.get("symbol"):
+            e = Error("param symbol miss")
+        if not kwargs.get("contract_type"):
+            kwargs["contract_type"] = "USDTSWAP"
+        if not kwargs.get("wss"):
+            kwargs["wss"] = "wss://api.hbdm.com"
+        if e:
+            logger.error(e, caller=self)
+            if kwargs.get("init_success_callback"):
+                SingleTask.run(kwargs["init_success_callback"], False, e)
+            return
+        self._account = kwargs["account"]
+        self._strategy = kwargs["strategy"]
+        self._platform = SIMULATED
+        self._symbol = kwargs["symbol"]
+        self._contract_type = kwargs["contract_type"]
+        self._wss = kwargs["wss"]
+        self._url = self._wss + "/linear-swap-ws"
+        self._order_update_callback = kwargs.get("order_update_callback")
+        self._position_update_callback = kwargs.get("position_update_callback")
+        self._asset_update_callback = kwargs.get("asset_update_callback")
+        self._init_success_callback = kwargs.get("init_success_callback")
+
+        self._margin_asset = kwargs.get("margin_asset", "USDT")
+        self._contract_size = kwargs.get("contract_size", 0.001)
+        self._maker_fee = kwargs.get("maker_fee", 0.0002)
+        self._taker_fee = kwargs.get("taker_fee", 0.0005)
+        self._latency = kwargs.get("latency", 0)
+        self._orderbook_depth = kwargs.get("orderbook_depth", 20)
+
+        self._assets = {}  # Asset detail, {"BTC": {"free": "1.1", "locked": "2.2", "total": "3.3"}, ... }.
+        self._orders = OrderStore(kwargs.get("order_history_size", 1000))  # Order objects, indexed.
+        self._position = Position(self._platform, self._account, self._strategy, self._symbol + '/' + self._contract_type)
+
+        self._engine = MatchingEngine()
+        self._depth_book = None  # Local book of incremental depth channel.
+        self._c_to_s = {}  # Market channels of the symbol, {"channel": "symbol"}
+        for channel in ("depth.step0", "depth.step6", "depth.size_20.high_freq", "depth.size_150.high_freq",
+                        "trade.detail"):
+            self._c_to_s["market.{s}.{c}".format(s=self._symbol.upper(), c=channel)] = self._symbol
+        self._order_id = 0
+        self._last_price = None  # Price to mark the position, the latest trade price, or the mid price of the book
+        self._trade_replayed = False  # if no trade is replayed.
+
+        # Account, all amounts are in margin asset.
+        self._balance = float(kwargs.get("balance", 10000))  # Initial balance + realized pnl - fees.
+        self._long = [0, 0.0, 0]  # [volume, cost_open, lever_rate]
+        self._short = [0, 0.0, 0]
+        self._frozen = 0.0  # Margin of open orders.
+        self._closing = {"buy": 0, "sell": 0}  # Volume of open close orders, by direction.
+
+        # Stats.
+        self._fills = 0
+        self._traded_volume = 0
+        self._turnover = 0.0
+        self._fees = 0.0
+        self._realized = 0.0
+        self._peak = self._balance
+        self._max_drawdown = 0.0
+
+        self._push_asset()
+        SingleTask.run(self._init_success_callback, True, None)
+
+    @property
+    def assets(self):
+        return copy.copy(self._assets)
+
+    @property
+    def orders(self):
+        return copy.copy(self._orders.open)
+
+    @property
+    def order_store(self):
+        return self._orders
+
+    @property
+    def position(self):
+        return self._position.snapshot()
+
+    @property
+    def rest_api(self):
+        return None
+
+    def stats(self):
+        """ Get the simulated account stats, amounts are in margin asset, e.g.
+        {"orders": 100, "fills": 80, "volume": 120, "turnover": 1200.5, "fees": 0.3, "realized_pnl": 12.1,
+         "unrealized_pnl": -1.2, "balance": 10011.8, "equity": 10010.6, "max_drawdown": 5.5,
+         "long_quantity": 0, "short_quantity": 2}
+        """
+        unrealized = self._unrealized()
+        return {
+            "orders": self._order_id,
+            "fills": self._fills,
+            "volume": self._traded_volume,
+            "turnover": self._turnover,
+            "fees": self._fees,
+            "realized_pnl": self._realized,
+            "unrealized_pnl": unrealized,
+            "balance": self._balance,
+            "equity": self._balance + unrealized,
+            "max_drawdown": self._max_drawdown,
+            "long_quantity": self._long[0],
+            "short_quantity": self._short[0]
+        }
+
+    async def process_binary(self, raw):
+        """ Process binary message of the market channels.
+        """
+        data = default_decoder.decode(raw)
+        if data.get("ch") in self._c_to_s:
+            await self.process_data(data)
+
+    async def process_data(self, data):
+        """ Process decoded market channel message, match the resting orders.
+        """
+        channel = data["ch"]
+        tick = data["tick"]
+        engine = self._engine
+        if channel.endswith("trade.detail"):
+            self._trade_replayed = True
+            for item in tick["data"]:
+                price = item["price"]
+                self._last_price = price
+                fills = engine.on_trade(price, item["amount"], item["direction"] == "buy")
+                if fills:
+                    self._apply_fills(fills)
+            if self._long[0] or self._short[0]:
+                self._mark()
+            return
+        if channel.endswith("high_freq"):
+            book = self._depth_book
+            if not book:
+                book = self._depth_book = DepthBook(self._symbol, self._orderbook_depth)
+            if tick.get("event") == "snapshot":
+                book.reset(tick.get("asks") or [], tick.get("bids") or [], tick.get("version"), tick.get("ts"))
+            elif not book.update(tick.get("asks") or [], tick.get("bids") or [], tick.get("version"), tick.get("ts")):
+                # Gap of recorded data, the book is rebuilt by the next snapshot.
+                book.clear()
+                return
+            fills = engine.on_book(book.asks(), book.bids())
+        else:
+            fills = engine.on_book(tick.get("asks") or [], tick.get("bids") or [])
+        if fills:
+            self._apply_fills(fills)
+        if not self._trade_replayed and engine.best_ask is not None and engine.best_bid is not None:
+            self._last_price = (engine.best_ask + engine.best_bid) / 2
+            if self._long[0] or self._short[0]:
+                self._mark()
+
+    async def create_order(self, action, price, quantity, order_type=ORDER_TYPE_LIMIT, client_order_id=None, *args, **kwargs):
+        """ Create an order, the arguments are the same as `HuobiUsdtSwapTrade.create_order`.
+
+        Returns:
+            order_no: Order ID if created successfully, otherwise it's None.
+            error: Error information, otherwise it's None.
+        """
+        order, error = self._new_order(action, price, quantity, order_type, client_order_id,
+                                       kwargs.get("lever_rate", 20))
+        if error:
+            return None, error
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        self._submit(order)
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return order.order_no, None
+
+    async def create_orders(self, orders, *args, **kwargs):
+        """ Batch create orders, the arguments are the same as `HuobiUsdtSwapTrade.create_orders`.
+
+        Returns:
+            order_nos: Order ids of the orders created successfully.
+            errors: Errors of the failed orders, e.g. [{"index": 1, "err_code": 1047, "err_msg": "..."}]
+        """
+        order_nos, errors = await self._create_orders_indexed(orders, *args, **kwargs)
+        if order_nos is None:
+            return None, errors
+        return [order_no for _, order_no in order_nos], errors
+
+    async def _create_orders_indexed(self, orders, *args, **kwargs):
+        """ Same as `create_orders`, but the order ids are (index, order_id) pairs, index is 1-based. """
+        accepted = []
+        errors = []
+        for index, data in enumerate(orders, 1):
+            order, error = self._new_order(data["action"], data["price"], data["quantity"], data["order_type"],
+                                           data.get("client_order_id"), data.get("lever_rate", 20))
+            if error:
+                if not isinstance(error, dict):
+                    return None, error
+                errors.append({"index": index, "err_code": error["err_code"], "err_msg": error["err_msg"]})
+            else:
+                accepted.append((index, order))
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        for _, order in accepted:
+            self._submit(order)
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return [(index, order.order_no) for index, order in accepted], errors
+
+    async def revoke_order(self, *order_nos):
+        """ Revoke (an) order(s), the arguments and results are the same as `HuobiUsdtSwapTrade.revoke_order`.
+        """
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        if len(order_nos) == 0:
+            for order_no in list(self._orders.open):
+                self._cancel(order_no)
+            result = True, None
+        else:
+            errors = []
+            successes = []
+            for order_no in order_nos:
+                if self._cancel(str(order_no)):
+                    successes.append(str(order_no))
+                else:
+                    errors.append({"order_id": str(order_no), "err_code": 1061, "err_msg": "This order doesnt exist."})
+            if len(order_nos) == 1:
+                result = (order_nos[0], None) if not errors else (False, errors)
+            elif errors:
+                result = False, errors
+            else:
+                result = {"errors": errors, "successes": ",".join(successes)}, None
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return result
+
+    async def get_open_order_nos(self):
+        """ Get open order id list.
+        """
+        return list(self._orders.open), None
+
+    def _error(self, code, msg):
+        """ Error like Huobi REST API. """
+        return {"status": "error", "err_code": code, "err_msg": msg, "ts": tools.get_cur_timestamp_ms()}
+
+    def _new_order(self, action, price, quantity, order_type, client_order_id, lever_rate):
+        """ Check and create an order, the offset follows `HuobiUsdtSwapTrade.create_order`.
+        """
+        if action not in (ORDER_ACTION_BUY, ORDER_ACTION_SELL):
+            return None, "action error"
+        if order_type not in ORDER_KINDS:
+            return None, "order type error"
+        kind, order_price_type = ORDER_KINDS[order_type]
+        quantity = int(quantity)
+        if action == ORDER_ACTION_BUY:
+            direction, offset = ("buy", "open") if quantity > 0 else ("buy", "close")
+        else:
+            direction, offset = ("sell", "close") if quantity > 0 else ("sell", "open")
+        volume = abs(quantity)
+        if volume == 0:
+            return None, self._error(1032, "Incorrect volume.")
+        price = None if kind == KIND_MARKET else float(price)
+        reference = price
+        if reference is None:
+            reference = self._engine.best_ask if direction == "buy" else self._engine.best_bid
+            if reference is None:
+                return None, self._error(1068, "No market price.")
+        margin = 0.0
+        if offset == "open":
+            margin = reference * volume * self._contract_size / lever_rate
+            if margin > self._available():
+                return None, self._error(1047, "Insufficient margin available.")
+        else:
+            # Closing a long position is selling, closing a short position is buying.
+            position = self._long if direction == "sell" else self._short
+            if volume > position[0] - self._closing[direction]:
+                return None, self._error(1048, "Insufficient close amount available.")
+        self._order_id += 1
+        data = {
+            "contract_code": self._symbol,
+            "order_id": self._order_id,
+            "client_order_id": client_order_id,
+            "direction": direction,
+            "offset": offset,
+            "order_price_type": order_price_type,
+            "order_type": 1,
+            "price": price if price is not None else reference,
+            "volume": volume,
+            "lever_rate": lever_rate,
+            "margin": margin,
+            "trade_volume": 0,
+            "trade_turnover": 0.0,
+            "fee": 0.0,
+            "created_at": tools.get_cur_timestamp_ms()
+        }
+        return MatchOrder(str(self._order_id), direction == "buy", price, volume, kind, data), None
+
+    def _submit(self, order):
+        """ The order arrives at the matching engine. """
+        data = order.data
+        if data["offset"] == "open":
+            self._frozen += data["margin"]
+        else:
+            self._closing[data["direction"]] += order.volume
+        fills = self._engine.submit(order)
+        if order.order_no in self._engine and not fills:
+            self._push_order(order, 3)
+        if fills:
+            self._apply_fills(fills)
+        if order.remain > 0 and order.order_no not in self._engine:
+            self._finish(order)
+
+    def _cancel(self, order_no):
+        order = self._engine.cancel(order_no)
+        if not order:
+            return False
+        self._finish(order)
+        return True
+
+    def _finish(self, order):
+        """ The rest of the order is canceled. """
+        self._release(order, order.remain)
+        self._push_order(order, 5 if order.data["trade_volume"] else 7)
+        self._push_asset()
+
+    def _release(self, order, volume):
+        """ Release the margin or the close amount of `volume` of the order. """
+        data = order.data
+        if data["offset"] == "open":
+            margin = data["margin"] * volume / order.volume
+            self._frozen = max(self._frozen - margin, 0.0)
+        else:
+            self._closing[data["direction"]] -= volume
+
+    def _apply_fills(self, fills):
+        for order, price, volume, maker in fills:
+            data = order.data
+            value = price * volume * self._contract_size
+            fee = value * (self._maker_fee if maker else self._taker_fee)
+            data["trade_volume"] += volume
+            data["trade_turnover"] += value
+            data["fee"] += fee
+            self._fills += 1
+            self._traded_volume += volume
+            self._turnover += value
+            self._fees += fee
+            self._balance -= fee
+            self._release(order, volume)
+            self._trade(data["direction"], data["offset"], price, volume, data["lever_rate"])
+            trade = {
+                "trade_volume": volume,
+                "trade_price": price,
+                "trade_fee": -fee,
+                "trade_turnover": value,
+                "role": "maker" if maker else "taker"
+            }
+            self._push_order(order, 6 if order.remain <= 0 else 4, [trade])
+            self._push_position(self._long if (data["direction"] == "buy") == (data["offset"] == "open")
+                                else self._short)
+        self._push_asset()
+
+    def _trade(self, direction, offset, price, volume, lever_rate):
+        """ Update the position of a fill, the cost of an open is the weighted average. """
+        if offset == "open":
+            position = self._long if direction == "buy" else self._short
+            total = position[0] + volume
+            position[1] = (position[1] * position[0] + price * volume) / total
+            position[0] = total
+            position[2] = lever_rate
+            return
+        position = self._short if direction == "buy" else self._long
+        sign = 1 if position is self._long else -1
+        pnl = (price - position[1]) * volume * self._contract_size * sign
+        self._realized += pnl
+        self._balance += pnl
+        position[0] -= volume
+        if position[0] <= 0:
+            position[0] = 0
+            position[1] = 0.0
+        self._mark()
+
+    def _unrealized(self):
+        price = self._last_price
+        if price is None:
+            return 0.0
+        size = self._contract_size
+        return (price - self._long[1]) * self._long[0] * size + (self._short[1] - price) * self._short[0] * size
+
+    def _position_margin(self):
+        size = self._contract_size
+        margin = 0.0
+        for volume, cost, lever_rate in (self._long, self._short):
+            if volume:
+                margin += volume * cost * size / lever_rate
+        return margin
+
+    def _available(self):
+        return self._balance + self._unrealized() - self._position_margin() - self._frozen
+
+    def _mark(self):
+        """ Track the max drawdown of the equity. """
+        equity = self._balance + self._unrealized()
+        if equity > self._peak:
+            self._peak = equity
+        elif self._peak - equity > self._max_drawdown:
+            self._max_drawdown = self._peak - equity
+
+    def _push_order(self, order, status, trades=None):
+        data = order.data
+        info = dict(data)
+        info["status"] = status
+        info["trade_avg_price"] = data["trade_turnover"] / data["trade_volume"] / self._contract_size \
+            if data["trade_volume"] else 0
+        info["fee"] = -data["fee"]
+        info["ts"] = tools.get_cur_timestamp_ms()
+        info["trade"] = trades or []
+        self._update_order(info)
+
+    def _push_position(self, position):
+        data = {
+            "topic": "positions." + self._symbol,
+            "ts": tools.get_cur_timestamp_ms(),
+            "data": [self._position_info(position)]
+        }
+        self._update_position(data)
+
+    def _push_asset(self):
+        data = {
+            "topic": "accounts." + self._symbol,
+            "ts": tools.get_cur_timestamp_ms(),
+            "data": [self._asset_info()]
+        }
+        self._update_asset(data)
+
+    def _position_info(self, position):
+        """ Position item of Huobi notification and REST API. """
+        direction = "buy" if position is self._long else "sell"
+        volume, cost, lever_rate = position
+        return {
+            "contract_code": self._symbol,
+            "direction": direction,
+            "volume": volume,
+            "available": volume - self._closing["sell" if direction == "buy" else "buy"],
+            "cost_open": cost,
+            "cost_hold": cost,
+            "lever_rate": lever_rate,
+            "margin_asset": self._margin_asset
+        }
+
+    def _asset_info(self):
+        """ Account item of Huobi notification and REST API. """
+        unrealized = self._unrealized()
+        position_margin = self._position_margin()
+        return {
+            "symbol": self._symbol.split("-")[0],
+            "contract_code": self._symbol,
+            "margin_asset": self._margin_asset,
+            "margin_balance": self._balance + unrealized,
+            "margin_position": position_margin,
+            "margin_frozen": self._frozen,
+            "margin_available": self._balance + unrealized - position_margin - self._frozen,
+            "profit_real": self._realized,
+            "profit_unreal": unrealized
+        }
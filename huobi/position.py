@@ -8,12 +8,19 @@ Date:   2019/11/04
 """
 
 from huobi.utils import tools
+from huobi.utils.frozen import freeze
 
 
 class Position:
     """ 持仓对象
+    回调函数收到的是只读的持仓快照 `FrozenPosition`，见 `snapshot`
     """
 
+    __slots__ = ("platform", "account", "strategy", "symbol", "leverage", "short_quantity", "short_avg_price",
+                 "short_pnl_ratio", "short_pnl_unreal", "short_pnl", "long_quantity", "long_avg_price",
+                 "long_pnl_ratio", "long_pnl_unreal", "long_pnl", "long_pos_margin", "short_pos_margin",
+                 "liquid_price", "maint_margin_ratio", "utime")
+
     def __init__(self, platform=None, account=None, strategy=None, symbol=None, leverage=None,\
         short_quantity=None, short_avg_price=None, short_pnl_ratio=None, short_pnl_unreal=None,\
            short_pnl=None, long_quantity=None, long_avg_price=None,  long_pnl_ratio=None, long_pnl_unreal=None,\
@@ -54,6 +61,11 @@ class Position:
         self.liquid_price = liquid_price
         self.utime = utime if utime else tools.get_cur_timestamp_ms()
 
+    def snapshot(self):
+        """ 只读的持仓快照
+        """
+        return _snapshot(self)
+
     def __str__(self):
         info = "[platform: {platform}, account: {account}, strategy: {strategy}, symbol: {symbol}, " \
                "short_quantity: {short_quantity}, short_avg_price: {short_avg_price}, " \
@@ -66,4 +78,7 @@ class Position:
         return info
 
     def __repr__(self):
-        return str(self)
\ No newline at end of file
+        return str(self)
+
+
+FrozenPosition, _snapshot = freeze(Position)
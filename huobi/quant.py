@@ -48,12 +48,27 @@ class Quant:
 
         logger.info("start io loop ...", caller=self)
         self.loop.run_forever()
+        # Interrupted by signal, release the resources before exit.
+        self.loop.run_until_complete(self._close_resources())
 
     def stop(self):
         """Stop the event loop."""
         logger.info("stop io loop.", caller=self)
+        if self.loop.is_running():
+            self.loop.create_task(self._shutdown())
+        else:
+            self.loop.run_until_complete(self._close_resources())
+
+    async def _shutdown(self):
+        """Release the resources, then stop the event loop."""
+        await self._close_resources()
         self.loop.stop()
 
+    async def _close_resources(self):
+        """Close pooled HTTP sessions."""
+        from huobi.utils.request import AsyncHttpRequests
+        await AsyncHttpRequests.close()
+
     def _get_version(self):
         """ get software version
         """
@@ -82,10 +97,12 @@ class Quant:
         name = config.log.get("name", "quant.log")
         clear = config.log.get("clear", False)
         backup_count = config.log.get("backup_count", 0)
+        queued = config.log.get("queued", False)
+        json_lines = config.log.get("json", False)
         if console:
-            logger.initLogger(level)
+            logger.initLogger(level, queued=queued, json_lines=json_lines)
         else:
-            logger.initLogger(level, path, name, clear, backup_count)
+            logger.initLogger(level, path, name, clear, backup_count, queued, json_lines)
     
     def _init_db_instance(self):
         """Initialize db."""
@@ -96,7 +113,7 @@ class Quant:
     def _do_heartbeat(self):
         """Start server heartbeat."""
         from huobi.heartbeat import heartbeat
-        self.loop.call_later(0.5, heartbeat.ticker)
+        self.loop.call_later(0.5, heartbeat.start)
 
 
 quant = Quant()
@@ -0,0 +1,238 @@
+# -*- coding:utf-8 -*-
+
+"""
+Replay recorded websocket frames.
+
+Feed the frames recorded by `huobi.utils.recorder.FrameRecorder` back into Market and Trade objects, through the
+same `process_binary` -> `process_orderbook` / `process_kline` / `process_trade` pipeline as live messages, under a
+simulated clock, e.g.
+
+    replay = Replay("/data/frames", speed=None)
+    asyncio.set_event_loop(replay.loop)
+    market = replay.loop.run_until_complete(create_market())  # Market objects are created in the replay loop.
+    replay.add(market)
+    replay.loop.run_until_complete(replay.run())
+    print(replay.stats())
+    replay.close()
+
+The replay loop is an asyncio event loop whose `time()` is the replay time. When the loop is idle, the clock jumps to
+the next timer instead of sleeping (`speed=None`, as fast as possible), or sleeps `1/speed` of the interval (`speed=10`
+is 10x real time). So `LoopRunTask`, `SingleTask.call_later`, `asyncio.sleep` and `tools.get_cur_timestamp_ms` all
+follow the replay time, and every callback of a frame finishes before the clock moves to the next frame.
+
+While replaying, `Websocket.offline` is True: Market and Trade objects don't connect, and messages they send are
+dropped. `Websocket.offline`, the clock of `tools` and the heartbeat are process wide, so only one Replay can be
+active in a process at a time, and live trading must wait until it's closed. Markets must be created without `shards`.
+
+A Trade of the `simulated` platform is fed the replayed market frames and matches its orders against them. Add it
+before the Market objects of the same url.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import time
+import asyncio
+import selectors
+
+from huobi.config import config
+from huobi.heartbeat import heartbeat
+from huobi.utils import tools, logger
+from huobi.utils.websocket import Websocket, default_decoder
+from huobi.utils.recorder import FrameReader
+from huobi.ordertransport import LatencyHistogram
+
+__all__ = ("Replay", "ReplayEventLoop")
+
+
+class _VirtualSelector:
+    """ Selector of the replay loop, move the clock forward instead of blocking on select. """
+
+    def __init__(self, loop, selector):
+        self._loop = loop
+        self._selector = selector
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or timeout is not None and timeout <= 0:
+            return events
+        if timeout is None:
+            # Nothing scheduled, wait for I/O or threads.
+            return self._selector.select(None)
+        speed = self._loop.speed
+        if speed:
+            begin = time.perf_counter()
+            events = self._selector.select(timeout / speed)
+            elapsed = (time.perf_counter() - begin) * speed
+            if elapsed < timeout:
+                self._loop.advance(elapsed)
+                return events
+        self._loop.advance_to_next_timer()
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class ReplayEventLoop(asyncio.SelectorEventLoop):
+    """ Event loop under a simulated clock.
+
+    Args:
+        start: Start time of the clock, seconds since epoch.
+        speed: None to jump to the next timer when idle, otherwise the multiple of real time.
+    """
+
+    def __init__(self, start=0, speed=None):
+        """ Initialize. """
+        self._now = start
+        self.speed = speed
+        super(ReplayEventLoop, self).__init__(_VirtualSelector(self, selectors.DefaultSelector()))
+        # Timers are due within 1us, the float clock of epoch seconds can't resolve 1ns.
+        self._clock_resolution = 1e-6
+
+    def time(self):
+        return self._now
+
+    def advance(self, seconds):
+        """ Move the clock forward. """
+        if seconds > 0:
+            self._now += seconds
+
+    def advance_to_next_timer(self):
+        """ Move the clock to the earliest scheduled timer exactly, so it's due without rounding error. """
+        if self._scheduled:
+            self._now = max(self._now, self._scheduled[0].when())
+
+    def set_time(self, now):
+        """ Move the clock forward to `now`, the clock never goes backward. """
+        self._now = max(self._now, now)
+
+
+class Replay:
+    """ Replay driver.
+
+    Args:
+        path: Directory of the recorded segment files.
+        name: Segment file name prefix, default is `frames`.
+        start: Replay the frames received at or after `start`, milliseconds timestamp. default is the first frame.
+        end: Replay the frames received before `end`, milliseconds timestamp. default is the last frame.
+        speed: None to replay as fast as possible, otherwise the multiple of real time, e.g. 1, 10, 60.
+
+    Only one Replay can be active in a process, `close` it before creating another one or trading live.
+    """
+
+    def __init__(self, path, name="frames", start=None, end=None, speed=None):
+        """ Initialize. """
+        self._reader = FrameReader(path, name)
+        self._start = start * 1000000 if start is not None else None
+        self._end = end * 1000000 if end is not None else None
+        self._targets = {}  # {"url": [Market or Trade platform object, ...]}
+        self._frames = 0
+        self._skipped = 0
+        self._first = None  # Receive time of the first replayed frame, nanoseconds.
+        self._last = None
+        self._real = 0
+        self._latency = LatencyHistogram()
+
+        begin = self._start
+        if begin is None:
+            for ts, _, _ in self._reader.read():
+                begin = ts
+                break
+        self.loop = ReplayEventLoop((begin or 0) / 1e9, speed)
+        Websocket.offline = True
+        tools.set_clock(self.loop.time)
+        # The heartbeat restarts in the replay loop, without busy waiting for due tasks, the simulated clock doesn't
+        # move while the loop is busy. The config is restored by `close`.
+        self._heartbeat_config = config.heartbeat
+        config.heartbeat = dict(config.heartbeat or {}, spin=0)
+        heartbeat.reset()
+
+    def add(self, target, url=None):
+        """ Replay the frames of a websocket url to a Market or Trade object.
+
+        Args:
+            target: `huobi.market.Market`, `huobi.trade.Trade`, or a platform object of them.
+            url: Recorded websocket url, default is the url of the target.
+        """
+        target = getattr(target, "_m", None) or getattr(target, "_t", None) or target
+        url = url or target._url
+        self._targets.setdefault(url, []).append(target)
+
+    def close(self):
+        """ Cancel the pending tasks and close the replay loop, restore the system clock, online mode and heartbeat
+        config.
+        """
+        tools.set_clock(None)
+        Websocket.offline = False
+        config.heartbeat = self._heartbeat_config
+        heartbeat.reset()
+        if self.loop.is_closed():
+            return
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    async def run(self):
+        """ Replay all frames, return the stats. """
+        loop = self.loop
+        begin = time.perf_counter()
+        # Let the objects just created subscribe their channels before the first frame.
+        await asyncio.sleep(0)
+        for ts, url, data in self._reader.read(self._start, self._end, list(self._targets)):
+            delay = ts / 1e9 - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._first is None:
+                self._first = ts
+            self._last = ts
+            start = time.perf_counter()
+            try:
+                await self._feed(self._targets[url], data)
+            except Exception as e:
+                logger.exception("replay frame error:", e, caller=self)
+            self._latency.record(time.perf_counter() - start)
+            self._frames += 1
+        # Let the callbacks of the last frame finish.
+        await asyncio.sleep(0.001)
+        self._real += time.perf_counter() - begin
+        return self.stats()
+
+    async def _feed(self, targets, data):
+        if len(targets) == 1 and not hasattr(targets[0], "process_notify"):
+            await targets[0].process_binary(data)
+            return
+        # Several objects share the url, or a Trade object: decode once, and route by channel.
+        msg = default_decoder.decode(data)
+        channel = msg.get("ch")
+        delivered = False
+        for target in targets:
+            if hasattr(target, "process_notify"):
+                if msg.get("op") == "notify":
+                    await target.process_notify(msg)
+                    delivered = True
+            elif channel and channel in target._c_to_s:
+                await target.process_data(msg)
+                delivered = True
+        if not delivered:
+            self._skipped += 1
+
+    def stats(self):
+        """ Replay stats, e.g.
+        {"frames": 100000, "skipped": 0, "replay_seconds": 3600, "real_seconds": 36, "speedup": 100,
+         "process": {"count": 100000, "mean": 0.02, "p50": 0.02, "p90": 0.03, "p99": 0.05, "max": 0.3}}
+        The `process` latency (milliseconds) is the time to process one frame, not including the callbacks.
+        """
+        replay_seconds = (self._last - self._first) / 1e9 if self._first is not None else 0
+        return {
+            "frames": self._frames,
+            "skipped": self._skipped,
+            "replay_seconds": replay_seconds,
+            "real_seconds": self._real,
+            "speedup": replay_seconds / self._real if self._real else 0,
+            "process": self._latency.stats()
+        }
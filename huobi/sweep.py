@@ -0,0 +1,328 @@
+# -*- coding:utf-8 -*-
+
+"""
+Parameter sweep of backtests.
+
+Backtest jobs, one for every parameter set and period, run in a `ProcessPoolExecutor`. Every job replays the recorded
+frames of its period by `huobi.replay.Replay`, the segment files are memory-mapped by `FrameReader`, so all the workers
+share the page cache of the same data instead of loading their own copy. Results stream back as the jobs complete, e.g.
+
+    async def backtest(replay, params):
+        trader = Trade("mm", const.SIMULATED, "BTC-USDT", account="sim", latency=0.01)
+        strategy = MyStrategy(trader, spread=params["spread"], quantity=params["quantity"])
+        replay.add(trader)
+        replay.add(strategy.market)
+        await replay.run()
+        return trader.simulation_stats()
+
+    sweep = Sweep(backtest, "/data/frames", grid(spread=[0.5, 1, 2], delta_limit=[1, 2], quantity=[1, 5]),
+                  periods=daily_periods("/data/frames"))
+    table = sweep.run(on_result=print)
+    print(table.format(sort="equity", limit=10))
+    print(table.summary("equity"))
+
+`backtest` must be a module level function so that it can be pickled to the workers, it's called in the replay loop
+with a new `Replay` of the period and a parameter dict, and returns a dict of metrics.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import csv
+import time
+import random
+import asyncio
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from huobi.utils.recorder import FrameReader
+
+__all__ = ("Sweep", "SweepTable", "grid", "random_search", "daily_periods")
+
+
+DAY_MS = 86400 * 1000
+
+
+def grid(**params):
+    """ All combinations of the parameter values, e.g.
+        grid(spread=[1, 2], quantity=[1, 5]) -> [{"spread": 1, "quantity": 1}, {"spread": 1, "quantity": 5}, ...]
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*(params[name] for name in names))]
+
+
+def random_search(count, seed=None, **params):
+    """ `count` random parameter sets, e.g.
+        random_search(50, spread=(0.5, 3.0), delta_limit=(1, 5), quantity=[1, 2, 5])
+
+    Args:
+        count: Number of parameter sets.
+        seed: Random seed, to get the same parameter sets again.
+        params: A list is a choice, a `(low, high)` tuple of ints is a random int between them (inclusive), a tuple
+            of floats is a uniform random float between them.
+    """
+    rand = random.Random(seed)
+    result = []
+    for _ in range(count):
+        values = {}
+        for name, space in params.items():
+            if isinstance(space, tuple):
+                low, high = space
+                if isinstance(low, int) and isinstance(high, int):
+                    values[name] = rand.randint(low, high)
+                else:
+                    values[name] = rand.uniform(low, high)
+            else:
+                values[name] = rand.choice(space)
+        result.append(values)
+    return result
+
+
+def daily_periods(path, name="frames", interval=DAY_MS):
+    """ Split the recorded frames into periods of UTC days (or `interval` milliseconds).
+
+    Returns:
+        periods: [(start, end), ...], milliseconds timestamps, `end` is excluded.
+    """
+    first, last = FrameReader(path, name).time_range()
+    if first is None:
+        return []
+    first //= 1000000
+    last //= 1000000
+    periods = []
+    start = first - first % interval
+    while start <= last:
+        periods.append((max(start, first), start + interval))
+        start += interval
+    return periods
+
+
+def _run_job(backtest, path, name, params, start, end):
+    """ Run one backtest job in a worker process. """
+    from huobi.replay import Replay
+    begin = time.perf_counter()
+    row = dict(params)
+    row["start"] = start
+    row["end"] = end
+    replay = Replay(path, name, start, end)
+    asyncio.set_event_loop(replay.loop)
+    try:
+        result = replay.loop.run_until_complete(backtest(replay, params))
+        row.update(result or {})
+        row["error"] = None
+    except Exception as e:
+        row["error"] = repr(e)
+    finally:
+        replay.close()
+        asyncio.set_event_loop(None)
+    row["seconds"] = time.perf_counter() - begin
+    return row
+
+
+class SweepTable:
+    """ Results of a sweep, a row of parameters, period (`start`, `end`), metrics, `error` and `seconds` for every job.
+
+    Args:
+        params: Names of the parameters.
+    """
+
+    def __init__(self, params):
+        """ Initialize. """
+        self.params = list(params)
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def columns(self):
+        """ Parameters first, then the other columns in the order they appear. """
+        columns = list(self.params)
+        for row in self.rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        return columns
+
+    def sorted(self, key, reverse=True):
+        """ Rows sorted by a column, the rows without it are the last. """
+        rows = [row for row in self.rows if row.get(key) is not None]
+        rows.sort(key=lambda row: row[key], reverse=reverse)
+        return rows + [row for row in self.rows if row.get(key) is None]
+
+    def summary(self, metric, sort="mean", reverse=True):
+        """ Aggregate a metric over the periods of every parameter set.
+
+        Returns:
+            rows: [{params..., "runs": 5, "errors": 0, "mean": 1.2, "min": -0.3, "max": 3.1, "total": 6.0}, ...]
+        """
+        groups = {}
+        for row in self.rows:
+            key = tuple(row.get(name) for name in self.params)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {"values": [], "runs": 0, "errors": 0}
+            group["runs"] += 1
+            if row.get("error"):
+                group["errors"] += 1
+            elif row.get(metric) is not None:
+                group["values"].append(row[metric])
+        result = SweepTable(self.params)
+        for key, group in groups.items():
+            values = group["values"]
+            row = dict(zip(self.params, key))
+            row["runs"] = group["runs"]
+            row["errors"] = group["errors"]
+            row["mean"] = sum(values) / len(values) if values else None
+            row["min"] = min(values) if values else None
+            row["max"] = max(values) if values else None
+            row["total"] = sum(values) if values else None
+            result.add(row)
+        result.rows = result.sorted(sort, reverse)
+        return result
+
+    def format(self, columns=None, sort=None, reverse=True, limit=None):
+        """ Format the rows as a text table. """
+        columns = columns or self.columns()
+        rows = self.sorted(sort, reverse) if sort else self.rows
+        if limit:
+            rows = rows[:limit]
+        cells = [[_cell(row.get(column)) for column in columns] for row in rows]
+        widths = [max([len(column)] + [len(line[i]) for line in cells]) for i, column in enumerate(columns)]
+        lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+        for line in cells:
+            lines.append("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+        return "\n".join(lines)
+
+    def to_csv(self, path):
+        """ Write all rows to a csv file. """
+        columns = self.columns()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, columns)
+            writer.writeheader()
+            for row in self.rows:
+                writer.writerow({column: _flat(row.get(column)) for column in columns})
+
+    def __str__(self):
+        return self.format()
+
+
+def _cell(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return "%.6g" % value
+    return str(value)
+
+
+def _flat(value):
+    if isinstance(value, dict):
+        return repr(value)
+    return value
+
+
+def _csv_header(path):
+    """ Columns of an existing csv file, None if it doesn't exist or is empty. """
+    try:
+        with open(path, newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+class Sweep:
+    """ Parameter sweep runner.
+
+    Args:
+        backtest: Module level async function, `async def backtest(replay, params): return {"metric": value, ...}`.
+        path: Directory of the recorded segment files.
+        params: Parameter sets, see `grid` and `random_search`.
+        periods: [(start, end), ...] milliseconds timestamps, every parameter set is backtested on every period,
+            see `daily_periods`. default is the whole recording.
+        name: Segment file name prefix, default is `frames`.
+        workers: Number of worker processes, default is the number of CPUs.
+        initializer: Function called once in every worker process, e.g. to load a config or init logger.
+        initargs: Arguments of `initializer`.
+    """
+
+    def __init__(self, backtest, path, params, periods=None, name="frames", workers=None, initializer=None,
+                 initargs=()):
+        """ Initialize. """
+        self._backtest = backtest
+        self._path = path
+        self._params = list(params)
+        self._periods = list(periods) if periods else [(None, None)]
+        self._name = name
+        self._workers = workers or os.cpu_count() or 1
+        self._initializer = initializer
+        self._initargs = initargs
+
+    def jobs(self):
+        """ All jobs, [(params, start, end), ...] """
+        return [(params, start, end) for params in self._params for start, end in self._periods]
+
+    def results(self):
+        """ Run the jobs, yield the result rows in the order they complete. """
+        jobs = self.jobs()
+        workers = min(self._workers, len(jobs)) or 1
+        with ProcessPoolExecutor(workers, initializer=self._initializer, initargs=self._initargs) as executor:
+            futures = [executor.submit(_run_job, self._backtest, self._path, self._name, params, start, end)
+                       for params, start, end in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, on_result=None, csv_path=None):
+        """ Run the jobs, and collect the results.
+
+        Args:
+            on_result: Function called with every result row as it completes, e.g. to print the progress.
+            csv_path: Append every result row to this csv file as it completes, so the results of a long sweep are
+                kept if it's stopped. The header is written if the file is empty, otherwise the rows are appended
+                with the columns of the existing header, e.g. the results of a rerun after the earlier ones.
+
+        Returns:
+            table: `SweepTable` of all result rows.
+        """
+        names = []
+        for params in self._params:
+            for name in params:
+                if name not in names:
+                    names.append(name)
+        table = SweepTable(names)
+        f = None
+        writer = None
+        if csv_path:
+            columns = _csv_header(csv_path)
+            f = open(csv_path, "a", newline="")
+            if columns:
+                writer = csv.DictWriter(f, columns, extrasaction="ignore")
+        pending = []  # Failed rows before the first successful row, which has all the columns.
+        try:
+            for row in self.results():
+                table.add(row)
+                if f:
+                    pending.append(row)
+                    if writer is None and not row["error"]:
+                        writer = csv.DictWriter(f, list(row), extrasaction="ignore")
+                        writer.writeheader()
+                    if writer:
+                        for item in pending:
+                            writer.writerow({key: _flat(value) for key, value in item.items()})
+                        pending = []
+                        f.flush()
+                if on_result:
+                    on_result(row)
+        finally:
+            if f:
+                if pending:
+                    writer = writer or csv.DictWriter(f, list(pending[0]), extrasaction="ignore")
+                    if f.tell() == 0:
+                        writer.writeheader()
+                    for item in pending:
+                        writer.writerow({key: _flat(value) for key, value in item.items()})
+                f.close()
+        return table
@@ -6,9 +6,11 @@ Tasks module.
     a) assign a asynchronous callback function;
     b) assign a execute interval time(seconds), default is 1s.
     c) assign some input params like `*args, **kwargs`;
+    d) run at a fixed rate by `register`, or with a fixed delay after the last run finished by `register_fixed_delay`.
 2. Register a single task to run:
     a) Create a coroutine and execute immediately.
     b) Create a coroutine and delay execute, delay time is seconds, default delay time is 0s.
+    c) Queue the call by a `Dispatcher` object's policy, see `huobi.dispatch`.
 
 Author: HuangTao
 Date:   2018/04/26
@@ -19,6 +21,7 @@ import asyncio
 import inspect
 
 from huobi.heartbeat import heartbeat
+from huobi.dispatch import Dispatcher
 
 __all__ = ("LoopRunTask", "SingleTask")
 
@@ -41,6 +44,20 @@ class LoopRunTask(object):
         task_id = heartbeat.register(func, interval, *args, **kwargs)
         return task_id
 
+    @classmethod
+    def register_fixed_delay(cls, func, interval=1, *args, **kwargs):
+        """ Register a loop run, the next run is scheduled `interval` seconds after the last run finished.
+
+        Args:
+            func: Asynchronous callback function.
+            interval: delay time(seconds) between two runs, default is 1s.
+
+        Returns:
+            task_id: Task id.
+        """
+        task_id = heartbeat.register_fixed_delay(func, interval, *args, **kwargs)
+        return task_id
+
     @classmethod
     def unregister(cls, task_id):
         """ Unregister a loop run task.
@@ -60,25 +77,24 @@ class SingleTask:
         """ Create a coroutine and execute immediately.
 
         Args:
-            func: Asynchronous callback function.
+            func: Asynchronous callback function, or a `Dispatcher` object which queues the call by its policy.
         """
+        if isinstance(func, Dispatcher):
+            func.put(*args, **kwargs)
+            return
         asyncio.create_task(func(*args, **kwargs))
 
-    async def _wait_and_call(self, delay, func, *args, **kwargs):
-        await asyncio.sleep(delay)
-        await asyncio.create_task(func(*args, **kwargs))
-
     @classmethod
     def call_later(cls, func, delay=0, *args, **kwargs):
         """ Create a coroutine and delay execute, delay time is seconds, default delay time is 0s.
+        The delay follows the event loop clock, so it's the replay time when replaying, see `huobi.replay`.
 
         Args:
             func: Asynchronous callback function.
             delay: Delay time is seconds, default delay time is 0, you can assign a float e.g. 0.5, 2.3, 5.1 ...
         """
-        if not inspect.iscoroutinefunction(func):
-            asyncio.create_task(cls._wait_and_call(delay, func, args, kwargs))
-        else:
-            def foo(f, *args, **kwargs):
-                asyncio.create_task(f(*args, **kwargs))
-            asyncio.create_task(cls._wait_and_call(delay, foo, func, *args))
+        def run():
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        asyncio.get_event_loop().call_later(delay, run)
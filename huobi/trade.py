@@ -9,22 +9,87 @@ Email:  andyjoe318@gmail.com
 """
 
 import copy
+import asyncio
 
 from huobi import const
 from huobi.error import Error
 from huobi.utils import logger
 from huobi.tasks import SingleTask
-from huobi.order import ORDER_TYPE_LIMIT
+from huobi.dispatch import Dispatcher
+from huobi.order import ORDER_TYPE_LIMIT, ORDER_ACTION_BUY, ORDER_ACTION_SELL
 from huobi.order import Order
+from huobi.asset import Asset
 from huobi.position import Position
 
+BATCH_MAX_SIZE = 10  # Max orders of `swap_batchorder`, and max order ids of a cancel request.
+
+
+class OrderBatcher:
+    """ Collect the requests issued within a short window, and send them in one batch request.
+
+    Args:
+        send: Asynchronous function to send a batch, like `async def send(items): return [(result, error), ...]`,
+            one `(result, error)` for every item.
+        window: Seconds to collect requests after the first one, default is 0.002.
+        max_size: The batch is sent at once when it has `max_size` requests, default is 10.
+    """
+
+    def __init__(self, send, window=0.002, max_size=BATCH_MAX_SIZE):
+        """ Initialize. """
+        self._send = send
+        self._window = window
+        self._max_size = min(max_size, BATCH_MAX_SIZE)
+        self._items = []  # Requests waiting to be sent, [(item, future), ...]
+        self._handle = None
+        self._batches = 0
+        self._requests = 0
+
+    async def submit(self, item):
+        """ Add a request to the batch, and wait for its own result.
+
+        Returns:
+            result, error: The result of this request.
+        """
+        waiter = asyncio.get_event_loop().create_future()
+        self._items.append((item, waiter))
+        if len(self._items) >= self._max_size:
+            self._flush()
+        elif not self._handle:
+            self._handle = asyncio.get_event_loop().call_later(self._window, self._flush)
+        return await waiter
+
+    def stats(self):
+        """ Get batching metrics, e.g. {"batches": 10, "requests": 35, "pending": 0} """
+        return {"batches": self._batches, "requests": self._requests, "pending": len(self._items)}
+
+    def _flush(self):
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        items, self._items = self._items, []
+        if items:
+            self._batches += 1
+            self._requests += len(items)
+            asyncio.ensure_future(self._send_batch(items))
+
+    async def _send_batch(self, items):
+        try:
+            results = await self._send([item for item, _ in items])
+        except Exception as e:
+            logger.error("send batch error:", e, caller=self)
+            results = [(None, e)] * len(items)
+        for (_, waiter), result in zip(items, results):
+            if not waiter.done():
+                waiter.set_result(result)
+
 
 class Trade:
     """ Trade Module.
 
     Attributes:
         strategy: What's name would you want to created for your strategy.
-        platform: Exchange platform name. e.g. `huobi_swap`.
+        platform: Exchange platform name. e.g. `huobi_swap`, or `simulated` to match orders locally against replayed
+            market data, see `huobi.platforms.simulated_trade`.
         symbol: Symbol name for your trade. e.g. `BTC-USD`.
         host: HTTP request host.
         wss: Websocket address.
@@ -43,12 +108,27 @@ class Trade:
         init_success_callback: You can use this param to specific a async callback function when you initializing Trade
             object. `init_success_callback` is like `async def on_init_success_callback(success: bool, error: Error, **kwargs): pass`
             and this callback function will be executed asynchronous after Trade module object initialized successfully.
+        order_dispatch: Dispatch policy of `order_update_callback`, e.g. `ordered` or
+            {"policy": "bounded", "maxsize": 1000}, see `huobi.dispatch`. default is None, a task is created for every
+            event.
+        position_dispatch: Dispatch policy of `position_update_callback`.
+        asset_dispatch: Dispatch policy of `asset_update_callback`.
+        order_batch: Batch the `create_order` and `revoke_order` calls issued within a short window into one
+            `create_orders` / cancel request, `True` or {"window": 0.002, "max_size": 10}. default is None, every call
+            is a separate request. Only the orders with `lever_rate` and `client_order_id` kwargs are batched.
+        order_history_size: Max completed orders kept in `order_store` history, default is 1000.
+        shared_notification: Share one notification connection among all the Trade objects of the same account, only for
+            `huobi_swap`, `huobi_usdt_swap` and `huobi_usdt_swap_cross`, see `huobi.utils.notification`.
     """
 
     def __init__(self, strategy=None, platform=None, symbol=None, host=None, wss=None, account=None, access_key=None,
                  secret_key=None, asset_update_callback=None, order_update_callback=None,
-                 position_update_callback=None, init_success_callback=None, **kwargs):
+                 position_update_callback=None, init_success_callback=None, order_dispatch=None,
+                 position_dispatch=None, asset_dispatch=None, order_batch=None, **kwargs):
         """initialize trade object."""
+        asset_update_callback = Dispatcher.wrap(asset_update_callback, asset_dispatch)
+        order_update_callback = Dispatcher.wrap(order_update_callback, order_dispatch)
+        position_update_callback = Dispatcher.wrap(position_update_callback, position_dispatch)
         kwargs["strategy"] = strategy
         kwargs["platform"] = platform
         kwargs["symbol"] = symbol
@@ -57,16 +137,34 @@ class Trade:
         kwargs["account"] = account
         kwargs["access_key"] = access_key
         kwargs["secret_key"] = secret_key
-        kwargs["asset_update_callback"] = asset_update_callback
-        kwargs["order_update_callback"] = self._on_order_update_callback
-        kwargs["position_update_callback"] = self._on_position_update_callback
+        # Dispatchers are passed to the platform directly, the events are queued without an extra task.
+        if isinstance(asset_update_callback, Dispatcher):
+            kwargs["asset_update_callback"] = asset_update_callback
+        else:
+            kwargs["asset_update_callback"] = self._on_asset_update_callback
+        if isinstance(order_update_callback, Dispatcher):
+            kwargs["order_update_callback"] = order_update_callback
+        else:
+            kwargs["order_update_callback"] = self._on_order_update_callback
+        if isinstance(position_update_callback, Dispatcher):
+            kwargs["position_update_callback"] = position_update_callback
+        else:
+            kwargs["position_update_callback"] = self._on_position_update_callback
         kwargs["init_success_callback"] = self._on_init_success_callback
 
         self._raw_params = copy.copy(kwargs)
+        self._asset_update_callback = asset_update_callback
         self._order_update_callback = order_update_callback
         self._position_update_callback = position_update_callback
         self._init_success_callback = init_success_callback
 
+        self._order_batcher = None
+        self._revoke_batcher = None
+        if order_batch:
+            options = order_batch if isinstance(order_batch, dict) else {}
+            self._order_batcher = OrderBatcher(self._send_order_batch, **options)
+            self._revoke_batcher = OrderBatcher(self._send_revoke_batch, **options)
+
         if platform == const.HUOBI_SWAP:
             from huobi.platforms.huobi_swap_trade import HuobiSwapTrade as T
         elif platform == const.HUOBI_FUTURE:
@@ -77,6 +175,8 @@ class Trade:
             from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade  as T
         elif platform == const.HUOBI_USDT_SWAP_CROSS:
             from huobi.platforms.huobi_usdt_swap_cross_trade import HuobiUsdtSwapCrossTrade  as T
+        elif platform == const.SIMULATED:
+            from huobi.platforms.simulated_trade import SimulatedTrade  as T
         else:
             logger.error("platform error:", platform, caller=self)
             e = Error("platform error")
@@ -93,6 +193,11 @@ class Trade:
     def orders(self):
         return self._t.orders
 
+    @property
+    def order_store(self):
+        """ `OrderStore` of open and completed orders, lookup by order_no / client_order_id / status / price. """
+        return self._t.order_store
+
     @property
     def position(self):
         return self._t.position
@@ -101,6 +206,49 @@ class Trade:
     def rest_api(self):
         return self._t.rest_api
 
+    def dispatch_stats(self):
+        """ Get queue depth and drop metrics of the callbacks dispatched by policy.
+
+        Returns:
+            stats: e.g. {"order": {"policy": "ordered", "depth": 0, "dropped": 0, ...}, ...}
+        """
+        callbacks = {
+            "asset": self._asset_update_callback,
+            "order": self._order_update_callback,
+            "position": self._position_update_callback
+        }
+        return {name: cb.stats() for name, cb in callbacks.items() if isinstance(cb, Dispatcher)}
+
+    def order_transport_stats(self):
+        """ Get order-entry latency metrics of websocket and REST transports, empty if the platform doesn't support.
+
+        Returns:
+            stats: e.g. {"websocket": {"count": 10, "p50": 0.4, ...}, "rest": {...}, "fallbacks": 0}
+        """
+        if not hasattr(self._t, "order_transport_stats"):
+            return {}
+        return self._t.order_transport_stats()
+
+    def simulation_stats(self):
+        """ Get the account stats of `simulated` platform, empty for the other platforms.
+
+        Returns:
+            stats: e.g. {"fills": 80, "volume": 120, "fees": 0.3, "realized_pnl": 12.1, "equity": 10010.6, ...}
+        """
+        if not hasattr(self._t, "stats"):
+            return {}
+        return self._t.stats()
+
+    def order_batch_stats(self):
+        """ Get batching metrics of orders and cancels, empty if `order_batch` is not set.
+
+        Returns:
+            stats: e.g. {"order": {"batches": 10, "requests": 35, "pending": 0}, "revoke": {...}}
+        """
+        if not self._order_batcher:
+            return {}
+        return {"order": self._order_batcher.stats(), "revoke": self._revoke_batcher.stats()}
+
     async def create_order(self, action, price, quantity, order_type=ORDER_TYPE_LIMIT, **kwargs):
         """ Create an order.
 
@@ -114,6 +262,13 @@ class Trade:
             order_no: Order ID if created successfully, otherwise it's None.
             error: Error information, otherwise it's None.
         """
+        if self._order_batcher and hasattr(self._t, "_create_orders_indexed") and \
+                action in (ORDER_ACTION_BUY, ORDER_ACTION_SELL) and \
+                set(kwargs).issubset(("lever_rate", "client_order_id")):
+            order = {"action": action, "price": price, "quantity": quantity, "order_type": order_type}
+            order.update(kwargs)
+            order_no, error = await self._order_batcher.submit(order)
+            return order_no, error
         order_no, error = await self._t.create_order(action, price, quantity, order_type, **kwargs)
         return order_no, error
     
@@ -140,6 +295,9 @@ class Trade:
             success: If execute successfully, return success information, otherwise it's None.
             error: If execute failed, return error information, otherwise it's None.
         """
+        if self._revoke_batcher and len(order_nos) == 1:
+            success, error = await self._revoke_batcher.submit(order_nos[0])
+            return success, error
         success, error = await self._t.revoke_order(*order_nos)
         return success, error
 
@@ -156,6 +314,58 @@ class Trade:
         result, error = await self._t.get_open_order_nos()
         return result, error
 
+    async def _send_order_batch(self, orders):
+        """ Send a batch of orders by the platform `_create_orders_indexed`, and split the result for every order.
+
+        Both the successful orders and the failed ones (in `errors`) of a batch response are matched to the requests by
+        their 1-based `index`, `lever_rate` is left to the platform default if not given.
+        """
+        if len(orders) == 1:
+            order = orders[0]
+            kwargs = {k: v for k, v in order.items() if k in ("lever_rate", "client_order_id")}
+            result = await self._t.create_order(order["action"], order["price"], order["quantity"],
+                                                order["order_type"], **kwargs)
+            return [result]
+        orders_data = [{k: v for k, v in order.items() if v is not None} for order in orders]
+        order_nos, errors = await self._t._create_orders_indexed(orders_data)
+        if order_nos is None:
+            return [(None, errors)] * len(orders)
+        failed = {e.get("index"): e for e in errors or []}
+        order_nos = dict(order_nos)
+        results = []
+        for index in range(1, len(orders) + 1):
+            if index in failed:
+                results.append((None, failed[index]))
+                continue
+            order_no = order_nos.get(index)
+            if order_no is None:
+                results.append((None, "order not found in batch response"))
+            else:
+                results.append((str(order_no), None))
+        return results
+
+    async def _send_revoke_batch(self, order_nos):
+        """ Cancel a batch of orders in one request, and split the result for every order. """
+        if len(order_nos) == 1:
+            result = await self._t.revoke_order(order_nos[0])
+            return [result]
+        success, error = await self._t.revoke_order(*dict.fromkeys(order_nos))
+        if success is False:
+            failed = {str(e.get("order_id")): e for e in error or []}
+            return [(False, [failed[str(no)]]) if str(no) in failed else (no, None) for no in order_nos]
+        if error:
+            return [(no, error) for no in order_nos]
+        return [(no, None) for no in order_nos]
+
+    async def _on_asset_update_callback(self, asset: Asset):
+        """ Asset information update callback.
+
+        Args:
+            asset: Asset object.
+        """
+        if self._asset_update_callback:
+            SingleTask.run(self._asset_update_callback, asset)
+
     async def _on_order_update_callback(self, order: Order):
         """ Order information update callback.
 
@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+
+"""
+Immutable snapshots of `__slots__` model objects.
+
+`freeze(cls)` creates a frozen subclass of `cls` and a snapshot function. A snapshot keeps all the fields in one tuple,
+read at once by an `attrgetter` (no `__reduce_ex__` round trip like `copy.copy`, no store per slot), and the frozen
+subclass shadows the slots of `cls` by read-only properties over the tuple. Setting or deleting an attribute of a
+snapshot raises `AttributeError`.
+
+Snapshots are immutable, so `copy.copy` and `copy.deepcopy` return the snapshot itself, and pickle rebuilds the
+object of `cls` and takes its snapshot again.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+from operator import attrgetter
+
+__all__ = ("freeze", )
+
+
+def _readonly(self, *args):
+    raise AttributeError("%s is read-only" % self.__class__.__name__)
+
+
+def _field(index):
+    return property(lambda self: self._values[index])
+
+
+def _rebuild(cls, values):
+    """ Unpickle a snapshot: restore the object of `cls`, and take its snapshot. """
+    obj = cls.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        setattr(obj, name, value)
+    return obj.snapshot()
+
+
+def freeze(cls, copiers=None):
+    """ Create the frozen subclass and the snapshot function of a `__slots__` class.
+
+    Args:
+        cls: Class with `__slots__`.
+        copiers: Functions to copy the mutable fields, e.g. {"assets": dict}, other fields are shared.
+
+    Returns:
+        frozen_cls: Frozen subclass, `isinstance(snapshot, cls)` is True.
+        snapshot: Function, `snapshot(obj)` returns a frozen copy of `obj`.
+    """
+    copiers = copiers or {}
+    names = cls.__slots__
+    namespace = {name: _field(index) for index, name in enumerate(names)}
+    namespace.update({
+        "__slots__": ("_values", ),
+        "__setattr__": _readonly,
+        "__delattr__": _readonly,
+        "__copy__": lambda self: self,
+        "__deepcopy__": lambda self, memo: self,
+        "__reduce__": lambda self: (_rebuild, (cls, self._values)),
+        "snapshot": lambda self: self,
+        "__doc__": "Read-only snapshot of `%s`." % cls.__name__
+    })
+    frozen_cls = type("Frozen" + cls.__name__, (cls, ), namespace)
+    frozen_cls.__module__ = cls.__module__
+    read = attrgetter(*names) if len(names) > 1 else lambda obj: (getattr(obj, names[0]), )
+    set_values = frozen_cls._values.__set__
+    copied = tuple((names.index(name), copier) for name, copier in copiers.items())
+    new = object.__new__
+
+    def snapshot(obj):
+        frozen = new(frozen_cls)
+        values = read(obj)
+        if copied:
+            values = list(values)
+            for index, copier in copied:
+                values[index] = copier(values[index])
+            values = tuple(values)
+        set_values(frozen, values)
+        return frozen
+
+    return frozen_cls, snapshot
@@ -7,25 +7,107 @@ Author: HuangTao
 Date:   2018/04/08
 Update: 2018/07/16  1. 初始化日志增加参数 clear 和 backup_count；
         2018/07/19  1. 修复日志初始化的时候，clear设置为Ture，但文件不存在的异常；
+        2026/10/18  1. debug级别未开启时，debug不再格式化日志参数；
+                    2. 所有级别先检查级别再格式化，日志参数在需要输出时才格式化；error/exception只写一条日志；
+                       增加队列日志(QueueHandler + 后台线程写日志)和JSON行格式输出。
 """
 
 import os
 import sys
+import json
+import queue
+import atexit
 import shutil
 import logging
 import traceback
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
 initialized = False
 
+_listener = None  # 队列日志的后台写日志线程
+_BANNER = "*" * 60
 
-def initLogger(log_level="DEBUG", log_path=None, logfile_name=None, clear=False, backup_count=0):
+
+class _Message(object):
+    """ 日志消息，str()时才格式化日志参数，格式化结果会被缓存
+    """
+
+    __slots__ = ("caller", "args", "kwargs", "_text")
+
+    def __init__(self, caller, args, kwargs):
+        self.caller = caller
+        self.args = args
+        self.kwargs = kwargs
+        self._text = None
+
+    @property
+    def body(self):
+        if self._text is None:
+            self._text = _log("", *self.args, **self.kwargs)
+        return self._text
+
+    def __str__(self):
+        return "[-] [{cls_name}] {body}".format(cls_name=self.caller, body=self.body)
+
+
+class TextFormatter(logging.Formatter):
+    """ 文本格式，error/exception日志前后加分隔行
+    """
+
+    def format(self, record):
+        text = super(TextFormatter, self).format(record)
+        if getattr(record, "banner", False):
+            return "{banner}\n{text}\n{banner}".format(banner=_BANNER, text=text)
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """ JSON行格式，每条日志一行，如
+    {"ts": 1603766400000, "level": "INFO", "caller": "Trade", "msg": "..."}
+    """
+
+    def format(self, record):
+        msg = record.msg
+        data = {
+            "ts": int(record.created * 1000),
+            "level": record.levelname,
+            "caller": msg.caller if isinstance(msg, _Message) else "",
+            "msg": msg.body if isinstance(msg, _Message) else record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """ 在调用线程格式化日志参数(参数对象之后可能被修改)，时间格式化、JSON编码和写文件都在后台线程
+    """
+
+    def prepare(self, record):
+        msg = record.msg
+        if isinstance(msg, _Message):
+            msg.body
+        else:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def initLogger(log_level="DEBUG", log_path=None, logfile_name=None, clear=False, backup_count=0, queued=False,
+               json_lines=False):
     """ 初始化日志输出
     @param log_level 日志级别 DEBUG/INFO
     @param log_path 日志输出路径
     @param logfile_name 日志文件名
     @param clear 初始化的时候，是否清理之前的日志文件
     @param backup_count 保存按天分割的日志文件个数，默认0为永久保存所有日志文件
+    @param queued 是否使用队列日志，日志放入队列后立即返回，由后台线程写入，事件循环不会阻塞在写文件/控制台上
+    @param json_lines 是否输出JSON行格式日志
     """
     logger = logging.getLogger()
     logger.setLevel(log_level)
@@ -40,42 +122,85 @@ def initLogger(log_level="DEBUG", log_path=None, logfile_name=None, clear=False,
     else:
         print("init logger ...")
         handler = logging.StreamHandler()
-    fmt_str = "%(levelname)1.1s [%(asctime)s] %(message)s"
-    fmt = logging.Formatter(fmt=fmt_str, datefmt=None)
+    if json_lines:
+        fmt = JsonFormatter()
+    else:
+        fmt_str = "%(levelname)1.1s [%(asctime)s] %(message)s"
+        fmt = TextFormatter(fmt=fmt_str, datefmt=None)
     handler.setFormatter(fmt)
+    if queued:
+        global _listener
+        shutdown()
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        handler = _QueueHandler(log_queue)
     logger.addHandler(handler)
 
 
+def shutdown():
+    """ 停止队列日志的后台线程，写完队列中剩余的日志
+    """
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
+
+
 def info(*args, **kwargs):
-    func_name, kwargs = _log_msg_header(*args, **kwargs)
-    logging.info(_log(func_name, *args, **kwargs))
+    if not logging.root.isEnabledFor(logging.INFO):
+        return
+    _emit(logging.INFO, _message(args, kwargs))
 
 
 def warn(*args, **kwargs):
-    msg_header, kwargs = _log_msg_header(*args, **kwargs)
-    logging.warning(_log(msg_header, *args, **kwargs))
+    if not logging.root.isEnabledFor(logging.WARNING):
+        return
+    _emit(logging.WARNING, _message(args, kwargs))
 
 
 def debug(*args, **kwargs):
-    msg_header, kwargs = _log_msg_header(*args, **kwargs)
-    logging.debug(_log(msg_header, *args, **kwargs))
+    # DEBUG未开启时直接返回，不格式化参数
+    if not logging.root.isEnabledFor(logging.DEBUG):
+        return
+    _emit(logging.DEBUG, _message(args, kwargs))
 
 
 def error(*args, **kwargs):
-    logging.error("*" * 60)
-    msg_header, kwargs = _log_msg_header(*args, **kwargs)
-    logging.error(_log(msg_header, *args, **kwargs))
-    logging.error("*" * 60)
+    if not logging.root.isEnabledFor(logging.ERROR):
+        return
+    _emit(logging.ERROR, _message(args, kwargs), banner=True)
 
 
 def exception(*args, **kwargs):
-    logging.error("*" * 60)
-    msg_header, kwargs = _log_msg_header(*args, **kwargs)
-    logging.error(_log(msg_header, *args, **kwargs))
-    # exc_info = sys.exc_info()
-    # traceback.print_exception(*exc_info)
-    logging.error(traceback.format_exc())
-    logging.error("*" * 60)
+    if not logging.root.isEnabledFor(logging.ERROR):
+        return
+    _emit(logging.ERROR, _message(args, kwargs), sys.exc_info(), True)
+
+
+def _emit(level, msg, exc_info=None, banner=False):
+    """ 创建并处理日志记录，调用位置已在日志消息中(caller)，不再查找调用栈
+    """
+    root = logging.root
+    if not root.handlers:
+        logging.basicConfig()
+    record = root.makeRecord(root.name, level, "", 0, msg, None, exc_info)
+    if banner:
+        record.banner = True
+    root.handle(record)
+
+
+def _message(args, kwargs):
+    cls_name = ""
+    _caller = kwargs.pop("caller", None)
+    if _caller:
+        if not hasattr(_caller, "__name__"):
+            _caller = _caller.__class__
+        cls_name = _caller.__name__
+    return _Message(cls_name, args, kwargs)
 
 
 def _log(msg_header, *args, **kwargs):
@@ -95,29 +220,3 @@ def _log(msg_header, *args, **kwargs):
     if len(kwargs) > 0:
         _log_msg += str(kwargs)
     return _log_msg
-
-def _log_msg_header(*args, **kwargs):
-    """ 打印日志的message头
-    @param kwargs["caller"] 调用的方法所属类对象
-    * NOTE: logger.xxx(... caller=self) for instance method
-            logger.xxx(... caller=cls) for @classmethod
-    """
-    cls_name = ""
-    func_name = ""
-    #exec("func_name = sys._getframe().f_back.f_back.f_code.co_name")
-    session_id = "-"
-    try:
-        _caller = kwargs.get("caller", None)
-        if _caller:
-            if not hasattr(_caller, "__name__"):
-                _caller = _caller.__class__
-            cls_name = _caller.__name__
-            del kwargs["caller"]
-    except:
-        pass
-    finally:
-        #msg_header = "[{session_id}] [{cls_name}.{func_name}] ".format(cls_name=cls_name, func_name=func_name,
-        #                                                               session_id=session_id)
-        msg_header = "[{session_id}] [{cls_name}] ".format(cls_name=cls_name,
-                                                                       session_id=session_id)
-        return msg_header, kwargs
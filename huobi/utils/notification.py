@@ -0,0 +1,230 @@
+# -*- coding:utf-8 -*-
+
+"""
+账户级共享的订单/持仓/资产推送websocket连接
+
+同一个账户(access_key)在同一个推送地址上只建立一个连接，只鉴权一次，用通配符订阅 `orders.*`、`positions.*`、
+`accounts.*` 等频道，推送消息按 `contract_code` 分发给每个合约的Trade对象。
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import time
+import asyncio
+
+from huobi.error import Error
+from huobi.utils import tools, logger
+from huobi.tasks import SingleTask
+from huobi.utils.signer import Signer
+from huobi.utils.websocket import Websocket
+
+__all__ = ("NotificationSession", )
+
+
+class NotificationSession(Websocket):
+    """ 账户级共享推送连接
+    Trade对象通过 `register` 注册自己的合约代码和需要的通配符频道，连接鉴权成功且这些频道都订阅成功后，调用
+    `await listener.session_callback(True, None)`，鉴权或订阅失败时调用 `await listener.session_callback(False, error)`，
+    断线重连后会重新鉴权订阅并再次回调。
+    推送消息调用 `await listener.process_notify(data)`:
+        订单推送按消息中的 `contract_code` 分发；
+        持仓/资产推送按 `data` 列表中每一项的 `contract_code` 拆分后分发，没有 `contract_code` 的项(如全仓资产)分发给
+        该频道的所有Trade对象。
+    """
+
+    _SESSIONS = {}  # {(url, access_key): session}
+
+    @classmethod
+    def get(cls, wss, path, access_key, secret_key):
+        """ 获取账户在推送地址上的共享连接，如果没有，创建一个新的
+        @param wss websocket服务地址，如 `wss://api.hbdm.com`
+        @param path 推送路径，如 `/linear-swap-notification`
+        @param access_key 账户 ACCESS KEY
+        @param secret_key 账户 SECRET KEY
+        """
+        key = (wss + path, access_key)
+        session = cls._SESSIONS.get(key)
+        if not session:
+            session = cls(wss, path, access_key, secret_key)
+            cls._SESSIONS[key] = session
+        return session
+
+    def __init__(self, wss, path, access_key, secret_key):
+        """ 初始化
+        """
+        self._path = path
+        self._signer = Signer.get(wss, access_key, secret_key)
+        self._topics = {}  # 通配符频道及是否订阅成功 {"orders.*": True}
+        self._listeners = {}  # {"orders": {"BTC-USDT": [listener, ...]}}
+        self._registered = []  # 等待订阅完成的Trade对象 [(listener, topics), ...]
+        self._waiting = []  # 已注册但还未回调的Trade对象
+        self._authorized = False
+        self._messages = 0  # 收到的推送消息数
+        self._dropped = 0  # 没有Trade对象接收的推送消息数
+        self.closed = False
+        super(NotificationSession, self).__init__(wss + path, send_hb_interval=5)
+        self.initialize()
+
+    def register(self, listener, contract_code, topics):
+        """ 注册Trade对象
+        @param listener Trade对象，需实现 `session_callback` 和 `process_notify`
+        @param contract_code 合约代码，如 `BTC-USDT`
+        @param topics 通配符频道列表，如 ["orders.*", "positions.*", "accounts.*"]
+        """
+        for topic in topics:
+            listeners = self._listeners.setdefault(topic.split(".")[0], {}).setdefault(contract_code, [])
+            if listener not in listeners:
+                listeners.append(listener)
+            if topic not in self._topics:
+                self._topics[topic] = False
+                if self._authorized:
+                    SingleTask.run(self._subscribe, topic)
+        self._registered.append((listener, topics))
+        self._waiting.append((listener, topics))
+        self._check_ready()
+
+    def stats(self):
+        """ 获取统计信息
+        @return {"connected": True, "topics": {"orders.*": True}, "contracts": 40, "messages": 100, "dropped": 0}
+        """
+        contracts = set()
+        for listeners in self._listeners.values():
+            contracts.update(listeners)
+        return {
+            "connected": self.ws is not None and not self.ws.closed,
+            "topics": dict(self._topics),
+            "contracts": len(contracts),
+            "messages": self._messages,
+            "dropped": self._dropped
+        }
+
+    async def connected_callback(self):
+        """ 连接建立(或重连)成功后，发送鉴权消息
+        """
+        self._authorized = False
+        for topic in self._topics:
+            self._topics[topic] = False
+        self._waiting = list(self._registered)
+        data = self._signer.auth_params()
+        data["Signature"] = self._signer.sign("GET", self._path, data)
+        data["op"] = "auth"
+        data["type"] = "api"
+        await self.ws.send_json(data)
+
+    async def _subscribe(self, topic):
+        data = {
+            "op": "sub",
+            "cid": tools.get_uuid1(),
+            "topic": topic
+        }
+        await self.ws.send_json(data)
+
+    async def _send_heartbeat_msg(self, *args, **kwargs):
+        if not self.ws:
+            logger.warn("websocket connection not connected yet!", caller=self)
+            return
+        data = {"op": "pong", "ts": str(int(time.time()*1000))}
+        try:
+            await self.ws.send_json(data)
+        except ConnectionResetError:
+            await asyncio.create_task(self._reconnect())
+
+    def _check_ready(self):
+        """ 回调所需频道都已订阅成功的Trade对象
+        """
+        if not self._authorized:
+            return
+        waiting = []
+        for listener, topics in self._waiting:
+            if all(self._topics.get(topic) for topic in topics):
+                SingleTask.run(listener.session_callback, True, None)
+            else:
+                waiting.append((listener, topics))
+        self._waiting = waiting
+
+    def _fail(self, topics, error):
+        """ 回调失败给需要这些频道的Trade对象
+        """
+        logger.error(error, caller=self)
+        waiting = []
+        for listener, listener_topics in self._waiting:
+            if topics is None or set(topics) & set(listener_topics):
+                SingleTask.run(listener.session_callback, False, error)
+            else:
+                waiting.append((listener, listener_topics))
+        self._waiting = waiting
+
+    async def process_binary(self, raw):
+        """ 处理websocket上接收到的消息
+        @param raw 原始的压缩数据
+        """
+        data = self.decoder.decode(raw)
+        logger.debug("data:", data, caller=self)
+
+        op = data.get("op")
+        if op == "notify":
+            await self.process_notify(data)
+
+        elif op == "ping":
+            await self.ws.send_json({"op": "pong", "ts": data.get("ts")})
+
+        elif op == "auth":
+            if data["err-code"] != 0:
+                self._fail(None, Error("Websocket connection authorized failed: {}".format(data)))
+                return
+            self._authorized = True
+            for topic in self._topics:
+                await self._subscribe(topic)
+
+        elif op == "sub":
+            if data["err-code"] != 0:
+                self._fail([data["topic"]], Error("subscribe {} failed!".format(data["topic"])))
+                return
+            self._topics[data["topic"]] = True
+            self._check_ready()
+
+    async def process_notify(self, data):
+        """ 按合约代码分发推送消息
+        """
+        self._messages += 1
+        listeners = self._listeners.get(data["topic"].split(".")[0])
+        if not listeners:
+            self._dropped += 1
+            return
+
+        contract_code = data.get("contract_code")
+        if contract_code is not None:
+            targets = listeners.get(contract_code)
+            if not targets:
+                self._dropped += 1
+                return
+            for listener in targets:
+                await listener.process_notify(data)
+            return
+
+        items = data.get("data")
+        if not isinstance(items, list):
+            items = []
+        groups = {}  # {"contract_code": [item, ...]}
+        common = []  # 没有合约代码的项，分发给所有Trade对象
+        for item in items:
+            code = item.get("contract_code")
+            if code is None:
+                common.append(item)
+            else:
+                groups.setdefault(code, []).append(item)
+        delivered = False
+        for code, group in groups.items():
+            for listener in listeners.get(code, []):
+                await listener.process_notify(dict(data, data=group))
+                delivered = True
+        if common or not items:
+            message = dict(data, data=common) if items else data
+            for targets in listeners.values():
+                for listener in targets:
+                    await listener.process_notify(message)
+                    delivered = True
+        if not delivered:
+            self._dropped += 1
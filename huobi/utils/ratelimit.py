@@ -0,0 +1,225 @@
+# -*- coding:utf-8 -*-
+
+"""
+Client-side rate limiter of REST requests.
+
+Every account holds a token bucket of private (authenticated) requests, and every host holds a token bucket of
+public requests, shared by all the REST clients in process. Trading requests (create and cancel orders) are served
+before queries when they are waiting for tokens. The buckets are calibrated by the `ratelimit-*` response headers.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import time
+import asyncio
+from collections import deque
+from urllib.parse import urlparse
+
+from huobi.utils import logger
+from huobi.config import config
+
+__all__ = ("RateLimiter", "TokenBucket", "ENDPOINT_PRIVATE", "ENDPOINT_PUBLIC", "PRIORITY_TRADE", "PRIORITY_QUERY")
+
+
+# Endpoint classes.
+ENDPOINT_PRIVATE = "private"
+ENDPOINT_PUBLIC = "public"
+
+# Request priorities, smaller is served first.
+PRIORITY_TRADE = 0
+PRIORITY_QUERY = 1
+PRIORITY_NAMES = ("trade", "query")
+
+# Default limits, (requests, interval seconds).
+DEFAULT_LIMITS = {
+    ENDPOINT_PRIVATE: (72, 3),
+    ENDPOINT_PUBLIC: (800, 1)
+}
+
+# The last segment of trading uri ends with, e.g. `swap_order`, `swap_batchorder`, `swap_cancel`, `swap_cancelall`.
+TRADE_URI_SUFFIXES = ("_order", "_batchorder", "_cancel", "_cancelall", "_close_position")
+
+ERROR_CODE_RATE_LIMITED = 1032  # The number of visits exceeds the limit.
+
+
+class TokenBucket:
+    """ Token bucket with prioritized waiters.
+
+    Args:
+        name: Bucket name.
+        limit: Max requests in `interval`.
+        interval: Seconds.
+    """
+
+    def __init__(self, name, limit, interval):
+        """ Initialize. """
+        self.name = name
+        self.limit = limit
+        self.interval = interval
+        self._tokens = float(limit)
+        self._updated = None  # Last refill time, loop time.
+        self._paused_until = 0  # No token is available until, loop time.
+        self._waiters = tuple(deque() for _ in PRIORITY_NAMES)
+        self._handle = None
+        self._throttled = 0  # Requests rejected by exchange because of rate limit.
+        self._stats = {name: {"acquired": 0, "waited": 0, "wait_time": 0.0, "max_wait": 0.0}
+                       for name in PRIORITY_NAMES}
+
+    async def acquire(self, priority=PRIORITY_QUERY):
+        """ Wait for a token.
+
+        Args:
+            priority: `PRIORITY_TRADE` or `PRIORITY_QUERY`.
+
+        Returns:
+            wait: Seconds waited.
+        """
+        loop = asyncio.get_event_loop()
+        begin = loop.time()
+        self._refill(begin)
+        if begin >= self._paused_until and self._tokens >= 1 and not any(self._waiters):
+            self._tokens -= 1
+            self._record(priority, 0)
+            return 0
+        waiter = loop.create_future()
+        self._waiters[priority].append(waiter)
+        self._wakeup()
+        await waiter
+        wait = loop.time() - begin
+        self._record(priority, wait)
+        return wait
+
+    def update(self, headers=None, error=None):
+        """ Calibrate the bucket by response.
+
+        Args:
+            headers: Response headers, `ratelimit-limit`, `ratelimit-interval`(ms), `ratelimit-remaining` and
+                `ratelimit-reset`(ms timestamp) are used.
+            error: Response error, the bucket is drained if it's a rate limit error.
+        """
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        self._refill(now)
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        try:
+            limit = int(headers.get("ratelimit-limit", 0))
+            interval = int(headers.get("ratelimit-interval", 0)) / 1000
+            if limit > 0 and interval > 0 and (limit, interval) != (self.limit, self.interval):
+                self.limit, self.interval = limit, interval
+            if "ratelimit-remaining" in headers:
+                self._tokens = min(self._tokens, float(headers["ratelimit-remaining"]))
+            reset = int(headers.get("ratelimit-reset", 0)) / 1000
+        except (TypeError, ValueError):
+            logger.warn("ratelimit headers error:", headers, caller=self)
+            return
+        if isinstance(error, dict) and error.get("err_code") == ERROR_CODE_RATE_LIMITED:
+            self._throttled += 1
+            self._tokens = 0
+            if not reset:
+                self._paused_until = max(self._paused_until, now + self.interval / self.limit)
+        if self._tokens < 1 and reset:
+            self._paused_until = max(self._paused_until, now + max(reset - time.time(), 0))
+
+    def stats(self):
+        """ Get bucket metrics.
+
+        Returns:
+            stats: e.g. {"limit": 72, "interval": 3, "tokens": 70.5, "waiting": 0, "throttled": 0,
+                "trade": {"acquired": 10, "waited": 2, "wait_time": 0.1, "max_wait": 0.08}, "query": {...}}
+        """
+        self._refill(asyncio.get_event_loop().time())
+        result = {
+            "limit": self.limit,
+            "interval": self.interval,
+            "tokens": self._tokens,
+            "waiting": sum(len(w) for w in self._waiters),
+            "throttled": self._throttled
+        }
+        for name, stats in self._stats.items():
+            result[name] = dict(stats)
+        return result
+
+    def _refill(self, now):
+        if self._updated is not None and now > self._updated:
+            self._tokens = min(self.limit, self._tokens + (now - self._updated) * self.limit / self.interval)
+        self._updated = now
+
+    def _wakeup(self):
+        """ Give tokens to waiters by priority, and schedule the next wakeup if someone is still waiting. """
+        loop = asyncio.get_event_loop()
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        now = loop.time()
+        self._refill(now)
+        if now < self._paused_until:
+            self._handle = loop.call_at(self._paused_until, self._wakeup)
+            return
+        for waiters in self._waiters:
+            while waiters and self._tokens >= 1:
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self._tokens -= 1
+                waiter.set_result(None)
+        if any(self._waiters):
+            delay = (1 - self._tokens) * self.interval / self.limit
+            self._handle = loop.call_later(delay, self._wakeup)
+
+    def _record(self, priority, wait):
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        stats["acquired"] += 1
+        if wait > 0:
+            stats["waited"] += 1
+            stats["wait_time"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+
+class RateLimiter:
+    """ Token buckets shared by the REST clients, configured by `rate_limit` of `HTTP` config, e.g.
+        "HTTP": {"rate_limit": {"private": [72, 3], "public": [800, 1]}}
+    set `"rate_limit": false` to disable.
+    """
+
+    _BUCKETS = {}  # {(endpoint class, account or host): TokenBucket}
+
+    @classmethod
+    def get(cls, url, access_key=None, auth=False):
+        """ Get the token bucket of a request.
+
+        Args:
+            url: HTTP request url or host.
+            access_key: Account's ACCESS KEY.
+            auth: If this request requires authentication.
+
+        Returns:
+            bucket: TokenBucket, None if rate limit is disabled.
+        """
+        options = (config.http or {}).get("rate_limit", {})
+        if options is False:
+            return None
+        if auth:
+            key = (ENDPOINT_PRIVATE, access_key)
+        else:
+            key = (ENDPOINT_PUBLIC, urlparse(url).netloc or url)
+        bucket = cls._BUCKETS.get(key)
+        if not bucket:
+            limit, interval = (options or {}).get(key[0], DEFAULT_LIMITS[key[0]])
+            name = "%s:%s" % (key[0], key[1][:8] if auth and key[1] else key[1])
+            bucket = cls._BUCKETS[key] = TokenBucket(name, limit, interval)
+        return bucket
+
+    @classmethod
+    def priority(cls, uri):
+        """ Trading requests have higher priority than queries. """
+        path = urlparse(uri).path.rstrip("/")
+        if path.rsplit("/", 1)[-1].endswith(TRADE_URI_SUFFIXES):
+            return PRIORITY_TRADE
+        return PRIORITY_QUERY
+
+    @classmethod
+    def stats(cls):
+        """ Get metrics of all buckets, {"bucket name": {...}, ...} """
+        return {bucket.name: bucket.stats() for bucket in cls._BUCKETS.values()}
@@ -0,0 +1,365 @@
+# -*- coding:utf-8 -*-
+
+"""
+websocket原始消息录制
+
+录制 `Websocket.receive` 收到的原始gzip二进制消息及本地接收时间，写入按大小/时间切分的分段文件，写文件在后台线程进行，
+事件循环只把消息放入队列。
+
+分段文件 `{name}-{首条消息毫秒时间戳}.seg`:
+    文件头 `HBFRAME1`(8字节)，之后是连续的消息记录，每条记录为
+    接收时间纳秒(int64) + 流编号(uint16) + 数据长度(uint32) + 原始数据，小端字节序；
+    流编号为 `STREAM_DEFINE`(0xFFFF)的记录是流定义，数据为json `{"stream": 0, "url": "wss://..."}`，
+    每个分段在某个流的第一条消息之前写入该流的定义，所以每个分段都可以单独读取。
+时间索引文件 `{name}-{首条消息毫秒时间戳}.idx`:
+    每隔 `index_interval` 秒记录一条 接收时间纳秒(int64) + 记录在分段文件中的偏移(uint64)，用于按时间定位；
+    时间为 `-1` 的索引项是流定义记录的偏移，按时间定位后不需要从分段开头扫描流定义。
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import os
+import json
+import mmap
+import time
+import queue
+import atexit
+import struct
+import bisect
+import threading
+
+from huobi.utils import logger
+from huobi.config import config
+
+__all__ = ("FrameRecorder", "FrameReader")
+
+
+MAGIC = b"HBFRAME1"
+RECORD_HEADER = struct.Struct("<qHI")  # 接收时间纳秒, 流编号, 数据长度
+INDEX_ENTRY = struct.Struct("<qQ")  # 接收时间纳秒, 记录偏移
+STREAM_DEFINE = 0xFFFF
+
+
+class FrameRecorder(object):
+    """ websocket原始消息录制
+    """
+
+    _DEFAULT = None  # 按配置 `RECORDER` 创建的录制器
+
+    @classmethod
+    def get(cls, url):
+        """ 获取websocket地址使用的录制器，未配置 `RECORDER` 或地址不在 `urls` 中时返回None
+        @param url websocket地址
+        """
+        if not config.recorder:
+            return None
+        urls = config.recorder.get("urls")
+        if urls and not any(u in url for u in urls):
+            return None
+        if not cls._DEFAULT:
+            options = dict(config.recorder)
+            options.pop("urls", None)
+            cls._DEFAULT = cls(**options)
+        return cls._DEFAULT
+
+    def __init__(self, path, name="frames", segment_size=256*1024*1024, segment_interval=3600, index_interval=1,
+                 buffer_size=1024*1024):
+        """ 初始化
+        @param path 分段文件保存目录
+        @param name 分段文件名前缀
+        @param segment_size 单个分段文件的最大字节数，超过后切换到新的分段
+        @param segment_interval 单个分段文件的最长时间(秒)，超过后切换到新的分段
+        @param index_interval 时间索引间隔(秒)
+        @param buffer_size 文件写缓冲字节数
+        """
+        self._path = path
+        self._name = name
+        self._segment_size = segment_size
+        self._segment_interval_ns = int(segment_interval * 1e9)
+        self._index_interval_ns = int(index_interval * 1e9)
+        self._buffer_size = buffer_size
+        self._queue = queue.SimpleQueue()
+        self._streams = {}  # {"url": 流编号}
+        self._file = None  # 当前分段文件
+        self._index = None  # 当前时间索引文件
+        self._segment_start = 0
+        self._segment_bytes = 0
+        self._segment_streams = set()  # 当前分段已写入定义的流编号
+        self._next_index = 0  # 下一条时间索引的时间
+        self._frames = 0  # 放入队列的消息数
+        self._written = 0  # 已写入的消息数
+        self._bytes = 0  # 已写入的字节数
+        self._segments = 0  # 已创建的分段数
+        self._closed = False
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def attach(self, ws):
+        """ 录制websocket连接收到的消息
+        @param ws Websocket对象，如Market/Trade的平台对象
+        """
+        ws.recorder = self
+
+    def record(self, url, data, ts=None):
+        """ 录制一条消息，只放入队列，由后台线程写入
+        @param url websocket地址
+        @param data 原始二进制数据
+        @param ts 接收时间(纳秒)，默认为当前时间，导入其他来源的数据时指定
+        """
+        if self._closed:
+            return
+        self._frames += 1
+        self._queue.put((ts or time.time_ns(), url, data))
+
+    def flush(self, timeout=None):
+        """ 等待队列中的消息都写入文件
+        """
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self):
+        """ 写完队列中的消息，关闭文件
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """ 获取统计信息
+        @return {"frames": 100, "written": 100, "pending": 0, "bytes": 10000, "segments": 1}
+        """
+        return {
+            "frames": self._frames,
+            "written": self._written,
+            "pending": self._frames - self._written,
+            "bytes": self._bytes,
+            "segments": self._segments
+        }
+
+    def _run(self):
+        """ 后台写文件线程，每次取出队列中所有消息批量写入后再flush
+        """
+        q = self._queue
+        while True:
+            items = [q.get()]
+            try:
+                while len(items) < 10000:
+                    items.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            stop = False
+            events = []
+            try:
+                for item in items:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        events.append(item)
+                    else:
+                        self._write(*item)
+                if self._file:
+                    self._file.flush()
+                    self._index.flush()
+            except Exception as e:
+                logger.error("write frames error:", e, caller=self)
+            for event in events:
+                event.set()
+            if stop:
+                self._close_segment()
+                return
+
+    def _write(self, ts, url, data):
+        if not self._file or self._segment_bytes >= self._segment_size or \
+                ts - self._segment_start >= self._segment_interval_ns:
+            self._open_segment(ts)
+        stream = self._streams.get(url)
+        if stream is None:
+            stream = self._streams[url] = len(self._streams)
+        if stream not in self._segment_streams:
+            self._segment_streams.add(stream)
+            define = json.dumps({"stream": stream, "url": url}).encode()
+            self._index.write(INDEX_ENTRY.pack(-1, self._segment_bytes))
+            self._append(RECORD_HEADER.pack(ts, STREAM_DEFINE, len(define)), define)
+        if ts >= self._next_index:
+            self._index.write(INDEX_ENTRY.pack(ts, self._segment_bytes))
+            self._next_index = ts - ts % self._index_interval_ns + self._index_interval_ns
+        self._append(RECORD_HEADER.pack(ts, stream, len(data)), data)
+        self._written += 1
+
+    def _append(self, header, data):
+        self._file.write(header)
+        self._file.write(data)
+        size = len(header) + len(data)
+        self._segment_bytes += size
+        self._bytes += size
+
+    def _open_segment(self, ts):
+        self._close_segment()
+        ms = ts // 1000000
+        while os.path.exists(os.path.join(self._path, "%s-%013d.seg" % (self._name, ms))):
+            ms += 1
+        base = os.path.join(self._path, "%s-%013d" % (self._name, ms))
+        self._file = open(base + ".seg", "wb", buffering=self._buffer_size)
+        self._index = open(base + ".idx", "wb")
+        self._file.write(MAGIC)
+        self._segment_start = ts
+        self._segment_bytes = len(MAGIC)
+        self._segment_streams = set()
+        self._next_index = 0
+        self._segments += 1
+
+    def _close_segment(self):
+        if self._file:
+            self._file.close()
+            self._index.close()
+            self._file = None
+            self._index = None
+
+
+class FrameReader(object):
+    """ 读取录制的消息，按接收时间顺序返回 (接收时间纳秒, websocket地址, 原始数据)
+    分段文件通过mmap读取，可以在多个进程中共享页缓存。
+    """
+
+    def __init__(self, path, name="frames"):
+        """ 初始化
+        @param path 分段文件保存目录
+        @param name 分段文件名前缀
+        """
+        self._path = path
+        self._name = name
+
+    def segments(self):
+        """ 分段文件列表，按时间排序
+        """
+        prefix = self._name + "-"
+        files = [f for f in os.listdir(self._path) if f.startswith(prefix) and f.endswith(".seg")]
+        return [os.path.join(self._path, f) for f in sorted(files)]
+
+    def read(self, start=None, end=None, urls=None):
+        """ 按时间顺序读取消息
+        @param start 开始时间(纳秒)，包含，None为从头开始
+        @param end 结束时间(纳秒)，不包含，None为读到最后
+        @param urls 只返回这些websocket地址的消息，None为全部
+        """
+        segments = self.segments()
+        first = 0
+        if start is not None:
+            # 从开始时间之前的最后一个分段开始读
+            starts = [self._segment_time(s) for s in segments]
+            first = max(bisect.bisect_right(starts, start // 1000000) - 1, 0)
+        for segment in segments[first:]:
+            if end is not None and self._segment_time(segment) * 1000000 >= end:
+                return
+            for ts, url, data in self._read_segment(segment, start, urls):
+                if end is not None and ts >= end:
+                    return
+                yield ts, url, data
+
+    def __iter__(self):
+        return self.read()
+
+    def time_range(self):
+        """ 录制消息的时间范围，通过时间索引定位，只读取最后一个分段的最后一部分
+        @return (第一条消息接收时间纳秒, 最后一条消息接收时间纳秒)，没有消息时返回 (None, None)
+        """
+        segments = self.segments()
+        first = last = None
+        for segment in segments:
+            for ts, _, _ in self._read_segment(segment):
+                first = ts
+                break
+            if first is not None:
+                break
+        for segment in reversed(segments):
+            start = self._last_index_time(segment)
+            for ts, _, _ in self._read_segment(segment, start):
+                last = ts
+            if last is not None:
+                break
+        return first, last
+
+    def _segment_time(self, segment):
+        return int(os.path.basename(segment)[len(self._name) + 1:-4])
+
+    def _last_index_time(self, segment):
+        """ 分段最后一条时间索引的时间，没有索引时返回None(从头读取)
+        """
+        try:
+            with open(segment[:-4] + ".idx", "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        for i in range(len(data) // INDEX_ENTRY.size - 1, -1, -1):
+            ts, _ = INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size)
+            if ts != -1:
+                return ts
+        return None
+
+    def _seek(self, segment, start):
+        """ 通过时间索引找到开始时间之前最近的记录偏移，及该偏移之前的流定义记录偏移
+        @return offset, [stream define offset, ...]
+        """
+        try:
+            with open(segment[:-4] + ".idx", "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return len(MAGIC), []
+        offset = len(MAGIC)
+        defines = []
+        for i in range(len(data) // INDEX_ENTRY.size):
+            ts, position = INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size)
+            if ts == -1:
+                defines.append(position)
+                continue
+            if ts > start:
+                break
+            offset = position
+        return offset, [position for position in defines if position < offset]
+
+    def _read_segment(self, segment, start=None, urls=None):
+        with open(segment, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC):
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mm[:len(MAGIC)] != MAGIC:
+                logger.error("not a frames segment:", segment, caller=self)
+                return
+            size = len(mm)
+            header_size = RECORD_HEADER.size
+            unpack = RECORD_HEADER.unpack_from
+            streams = {}
+            offset = len(MAGIC)
+            if start is not None:
+                offset, defines = self._seek(segment, start)
+                for position in defines:
+                    _, _, length = unpack(mm, position)
+                    define = json.loads(mm[position + header_size:position + header_size + length])
+                    streams[define["stream"]] = define["url"]
+            while offset + header_size <= size:
+                ts, stream, length = unpack(mm, offset)
+                begin = offset + header_size
+                offset = begin + length
+                if offset > size:
+                    break  # 最后一条记录不完整(录制进程异常退出)
+                if stream == STREAM_DEFINE:
+                    define = json.loads(mm[begin:offset])
+                    streams[define["stream"]] = define["url"]
+                    continue
+                if start is not None and ts < start:
+                    continue
+                url = streams.get(stream)
+                if urls is not None and url not in urls:
+                    continue
+                yield ts, url, mm[begin:offset]
+        finally:
+            mm.close()
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 import json
+import asyncio
 import aiohttp
 from urllib.parse import urlparse
 
@@ -10,10 +11,20 @@ from huobi.config import config
 
 class AsyncHttpRequests(object):
     """ Asynchronous HTTP Request Client.
+
+    Every domain name holds a long-lived `aiohttp.ClientSession`, so the TCP+TLS handshake is done once and the
+    keep-alive connections are reused by the following requests. The connector can be tuned by the `HTTP` config:
+        limit: Total number of simultaneous connections per session, default is 100.
+        limit_per_host: Number of simultaneous connections to one host, default is 30.
+        keepalive_timeout: Seconds an idle connection is kept alive, default is 30.
+        dns_cache_ttl: Seconds a resolved DNS record is cached, default is 300.
+        max_inflight_per_host: Max requests in flight per domain, the rest will wait. 0 is unlimited, default is 0.
     """
 
     # Every domain name holds a connection session, for less system resource utilization and faster request speed.
     _SESSIONS = {}  # {"domain-name": session, ... }
+    _SEMAPHORES = {}  # {"domain-name": semaphore, ... }
+    _STATS = {}  # {"domain-name": {"requests": 0, "connections_created": 0, ...}, ... }
 
     @classmethod
     async def fetch(cls, method, url, params=None, body=None, data=None, headers=None, timeout=30, **kwargs):
@@ -30,6 +41,7 @@ class AsyncHttpRequests(object):
 
             kwargs:
                 proxy: HTTP proxy.
+                response_headers: A dict to be filled with the response headers.
 
         Return:
             code: HTTP response code.
@@ -40,29 +52,49 @@ class AsyncHttpRequests(object):
             HTTP request exceptions or response data parse exceptions. All the exceptions will be captured and return
             Error information.
         """
-        # session = cls._get_session(url)
-        async with aiohttp.ClientSession() as session:
-            if not kwargs.get("proxy"):
-                kwargs["proxy"] = config.proxy
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            error = "http method error!"
+            return None, None, error
+        if not kwargs.get("proxy"):
+            kwargs["proxy"] = config.proxy
+        if not isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        key = cls._get_session_key(url)
+        session = cls._get_session(url)
+        semaphore = cls._get_semaphore(key)
+        stats = cls._get_stats(key)
+
+        if semaphore:
+            stats["waiting"] += 1
             try:
-                if method == "GET":
-                    response = await session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
-                elif method == "POST":
-                    response = await session.post(url, params=params, data=body, json=data, headers=headers,
-                                                timeout=timeout, **kwargs)
-                elif method == "PUT":
-                    response = await session.put(url, params=params, data=body, json=data, headers=headers,
-                                                timeout=timeout, **kwargs)
-                elif method == "DELETE":
-                    response = await session.delete(url, params=params, data=body, json=data, headers=headers,
-                                                    timeout=timeout, **kwargs)
-                else:
-                    error = "http method error!"
-                    return None, None, error
-            except Exception as e:
-                logger.error("method:", method, "url:", url, "headers:", headers, "params:", params, "body:", body,
-                            "data:", data, "Error:", e, caller=cls)
-                return None, None, e
+                await semaphore.acquire()
+            finally:
+                stats["waiting"] -= 1
+        stats["inflight"] += 1
+        try:
+            return await cls._do_fetch(session, method, url, params, body, data, headers, timeout, **kwargs)
+        finally:
+            stats["inflight"] -= 1
+            if semaphore:
+                semaphore.release()
+
+    @classmethod
+    async def _do_fetch(cls, session, method, url, params, body, data, headers, timeout, response_headers=None,
+                        **kwargs):
+        """ Send the request over the pooled session and read the response. """
+        try:
+            if method == "GET":
+                response = await session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+            else:
+                response = await session.request(method, url, params=params, data=body, json=data, headers=headers,
+                                                 timeout=timeout, **kwargs)
+        except Exception as e:
+            logger.error("method:", method, "url:", url, "headers:", headers, "params:", params, "body:", body,
+                        "data:", data, "Error:", e, caller=cls)
+            return None, None, e
+        if response_headers is not None:
+            response_headers.update(response.headers)
+        try:
             code = response.status
             if code not in (200, 201, 202, 203, 204, 205, 206):
                 text = await response.text()
@@ -76,6 +108,11 @@ class AsyncHttpRequests(object):
             logger.debug("method:", method, "url:", url, "headers:", headers, "params:", params, "body:", body,
                         "data:", data, "code:", code, "result:", json.dumps(result), caller=cls)
             return code, result, None
+        except Exception as e:
+            logger.error("method:", method, "url:", url, "read response error:", e, caller=cls)
+            return None, None, e
+        finally:
+            response.release()
 
     @classmethod
     async def get(cls, url, params=None, body=None, data=None, headers=None, timeout=30, **kwargs):
@@ -105,6 +142,39 @@ class AsyncHttpRequests(object):
         result = await cls.fetch("PUT", url, params, body, data, headers, timeout, **kwargs)
         return result
 
+    @classmethod
+    def stats(cls, url=None):
+        """ Get the connection reuse counters.
+
+        Args:
+            url: HTTP request url or domain name, if None, return counters of all domains.
+
+        Returns:
+            stats: Counters dict, e.g. {"requests": 10, "connections_created": 1, "connections_reused": 9, ...}, or
+                {"domain-name": {...}, ... } if `url` is None.
+        """
+        if url is None:
+            return {key: dict(value) for key, value in cls._STATS.items()}
+        key = cls._get_session_key(url)
+        return dict(cls._get_stats(key))
+
+    @classmethod
+    async def close(cls):
+        """ Close all the connection sessions, normally called when the server is stopping.
+        """
+        sessions = list(cls._SESSIONS.values())
+        cls._SESSIONS = {}
+        cls._SEMAPHORES = {}
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+        logger.info("http sessions closed, count:", len(sessions), caller=cls)
+
+    @classmethod
+    def _get_session_key(cls, url):
+        parsed_url = urlparse(url)
+        return parsed_url.netloc or parsed_url.hostname or url
+
     @classmethod
     def _get_session(cls, url):
         """ Get the connection session for url's domain, if no session, create a new.
@@ -115,9 +185,56 @@ class AsyncHttpRequests(object):
         Returns:
             session: HTTP request session.
         """
-        parsed_url = urlparse(url)
-        key = parsed_url.netloc or parsed_url.hostname
-        if key not in cls._SESSIONS:
-            session = aiohttp.ClientSession()
+        key = cls._get_session_key(url)
+        session = cls._SESSIONS.get(key)
+        if not session or session.closed:
+            options = config.http or {}
+            connector = aiohttp.TCPConnector(limit=options.get("limit", 100),
+                                             limit_per_host=options.get("limit_per_host", 30),
+                                             keepalive_timeout=options.get("keepalive_timeout", 30),
+                                             use_dns_cache=True,
+                                             ttl_dns_cache=options.get("dns_cache_ttl", 300))
+            session = aiohttp.ClientSession(connector=connector, trace_configs=[cls._create_trace_config(key)])
             cls._SESSIONS[key] = session
-        return cls._SESSIONS[key]
+        return session
+
+    @classmethod
+    def _get_semaphore(cls, key):
+        """ Get the in-flight requests limiter for domain, None if unlimited. """
+        if key not in cls._SEMAPHORES:
+            options = config.http or {}
+            max_inflight = options.get("max_inflight_per_host", 0)
+            cls._SEMAPHORES[key] = asyncio.Semaphore(max_inflight) if max_inflight > 0 else None
+        return cls._SEMAPHORES[key]
+
+    @classmethod
+    def _get_stats(cls, key):
+        if key not in cls._STATS:
+            cls._STATS[key] = {
+                "requests": 0,
+                "connections_created": 0,
+                "connections_reused": 0,
+                "dns_cache_hits": 0,
+                "dns_cache_misses": 0,
+                "inflight": 0,
+                "waiting": 0
+            }
+        return cls._STATS[key]
+
+    @classmethod
+    def _create_trace_config(cls, key):
+        """ Count requests and new/reused connections of the session. """
+        stats = cls._get_stats(key)
+
+        def counter(name):
+            async def on_signal(session, context, params):
+                stats[name] += 1
+            return on_signal
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(counter("requests"))
+        trace_config.on_connection_create_end.append(counter("connections_created"))
+        trace_config.on_connection_reuseconn.append(counter("connections_reused"))
+        trace_config.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace_config
@@ -0,0 +1,163 @@
+# -*- coding:utf-8 -*-
+
+"""
+Fixed size ring buffer with read-only zero-copy views.
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+from collections import deque
+
+__all__ = ("RingBuffer", "RingBufferView", "BufferWrappedError")
+
+
+class BufferWrappedError(Exception):
+    """ The item to be read was overwritten by newer items, the reader is too slow. """
+
+
+class RingBuffer:
+    """ Fixed size ring buffer.
+
+    Every appended item gets a sequence number, starting from 0. The buffer keeps the latest `maxlen` items, older
+    items are overwritten in place, nothing is moved or copied on append.
+
+    Args:
+        maxlen: Max items kept, None is unlimited.
+    """
+
+    __slots__ = ("maxlen", "_items", "_seq")
+
+    def __init__(self, maxlen=None):
+        """ Initialize. """
+        self.maxlen = maxlen
+        self._items = [None] * maxlen if maxlen else []
+        self._seq = 0  # Sequence number of the next appended item.
+
+    def append(self, item):
+        if self.maxlen:
+            self._items[self._seq % self.maxlen] = item
+        else:
+            self._items.append(item)
+        self._seq += 1
+
+    @property
+    def seq(self):
+        """ Sequence number of the next appended item, also the total count of items ever appended. """
+        return self._seq
+
+    @property
+    def first_seq(self):
+        """ Sequence number of the oldest item still in buffer. """
+        if self.maxlen and self._seq > self.maxlen:
+            return self._seq - self.maxlen
+        return 0
+
+    def get(self, seq):
+        """ Get item by sequence number.
+
+        Raises:
+            BufferWrappedError: The item was overwritten.
+            IndexError: The item is not appended yet.
+        """
+        if seq >= self._seq or seq < 0:
+            raise IndexError("ring buffer sequence out of range: %s" % seq)
+        if seq < self.first_seq:
+            raise BufferWrappedError("item %s was overwritten, the oldest is %s" % (seq, self.first_seq))
+        return self._items[seq % self.maxlen] if self.maxlen else self._items[seq]
+
+    def __len__(self):
+        return self._seq - self.first_seq
+
+    def __getitem__(self, index):
+        """ Get item by index, 0 is the oldest and -1 is the newest, like `deque`. """
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("ring buffer index out of range")
+        return self.get(self._seq - length + index)
+
+    def last(self, n=1):
+        """ Get the newest `n` items, oldest first. """
+        n = min(n, len(self))
+        return [self.get(seq) for seq in range(self._seq - n, self._seq)]
+
+    def __iter__(self):
+        """ Iterate the items in buffer when the iteration begins, oldest first.
+
+        Raises:
+            BufferWrappedError: An item not read yet was overwritten while iterating.
+        """
+        return self._iter_range(self.first_seq, self._seq)
+
+    def _iter_range(self, begin, end):
+        for seq in range(begin, end):
+            yield self.get(seq)
+
+    def iter_from(self, seq):
+        """ Iterate the items from sequence number `seq`, including the items appended while iterating.
+
+        Raises:
+            BufferWrappedError: The item `seq` or a later item not read yet was overwritten.
+        """
+        while seq < self._seq:
+            yield self.get(seq)
+            seq += 1
+
+    def view(self):
+        return RingBufferView(self)
+
+    def copy(self):
+        """ Copy the items to a `deque`, oldest first. """
+        if not self.maxlen:
+            return deque(self._items)
+        if self._seq <= self.maxlen:
+            return deque(self._items[:self._seq], maxlen=self.maxlen)
+        index = self._seq % self.maxlen
+        return deque(self._items[index:] + self._items[:index], maxlen=self.maxlen)
+
+
+class RingBufferView:
+    """ Read-only view of a ring buffer, the items are read from the buffer directly without copy.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer):
+        """ Initialize. """
+        self._buffer = buffer
+
+    @property
+    def maxlen(self):
+        return self._buffer.maxlen
+
+    @property
+    def seq(self):
+        return self._buffer.seq
+
+    @property
+    def first_seq(self):
+        return self._buffer.first_seq
+
+    def get(self, seq):
+        return self._buffer.get(seq)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        return self._buffer[index]
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+    def last(self, n=1):
+        return self._buffer.last(n)
+
+    def iter_from(self, seq):
+        return self._buffer.iter_from(seq)
+
+    def copy(self):
+        return self._buffer.copy()
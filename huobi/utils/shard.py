@@ -0,0 +1,287 @@
+# -*- coding:utf-8 -*-
+
+"""
+多websocket连接的行情订阅分片
+
+Author: QiaoXiaofeng
+Date:   2026/10/18
+Email:  andyjoe318@gmail.com
+"""
+
+import time
+import asyncio
+
+from huobi.utils import logger
+from huobi.tasks import LoopRunTask
+from huobi.utils.websocket import Websocket
+
+__all__ = ("ShardManager", "ShardConnection")
+
+
+class ShardConnection(Websocket):
+    """ 分片websocket连接，发送自己负责的频道的订阅消息，收到的行情交给ShardManager分发
+    """
+
+    def __init__(self, manager, index, url, send_hb_interval=5):
+        """ 初始化
+        @param manager 所属的ShardManager
+        @param index 分片序号
+        @param url 建立websocket的地址
+        @param send_hb_interval 发送心跳时间间隔
+        """
+        self.index = index
+        self.channels = {}  # 本连接负责的频道及订阅消息 {channel: sub data}
+        self._manager = manager
+        self.closed = False
+        super(ShardConnection, self).__init__(url, send_hb_interval=send_hb_interval)
+        self.initialize()
+
+    @property
+    def connected(self):
+        return self.ws is not None and not self.ws.closed
+
+    async def connected_callback(self):
+        """ 连接建立(或重连)成功后，重新订阅本连接负责的所有频道
+        """
+        for data in list(self.channels.values()):
+            await self.ws.send_json(data)
+
+    async def send(self, data):
+        """ 发送消息，未连接时不发送，连接建立后由connected_callback订阅
+        """
+        if not self.connected:
+            return
+        try:
+            await self.ws.send_json(data)
+        except ConnectionResetError:
+            await asyncio.create_task(self._reconnect())
+
+    async def _send_heartbeat_msg(self, *args, **kwargs):
+        """ 发送心跳给服务器
+        """
+        if not self.ws:
+            logger.warn("websocket connection not connected yet!", caller=self)
+            return
+        data = {"pong": int(time.time()*1000)}
+        try:
+            await self.ws.send_json(data)
+        except ConnectionResetError:
+            await asyncio.create_task(self._reconnect())
+
+    async def process_binary(self, msg):
+        """ 处理websocket上接收到的消息
+        """
+        data = self.decoder.decode(msg)
+        logger.debug("shard:", self.index, "data:", data, caller=self)
+        channel = data.get("ch")
+        if channel:
+            await self._manager.dispatch(self, channel, data)
+        elif data.get("ping"):
+            await self.ws.send_json({"pong": data.get("ping")})
+        elif data.get("subbed"):
+            await self._manager.on_subbed(self, data["subbed"])
+        elif data.get("status") == "error":
+            logger.error("shard:", self.index, "error:", data, caller=self)
+
+
+class ShardManager(object):
+    """ 行情订阅分片管理
+    把同一个websocket地址上的频道订阅分散到多个websocket连接上，连接在有频道分配时才建立。
+    新的频道分配到消息频率最低的连接上；定时统计每个频道的消息频率，如果某个连接的消息频率超过 `max_rate`，
+    或者超过所有连接平均值的 `imbalance` 倍，就把一个频道迁移到消息频率最低的连接上。
+    迁移时先在新连接上订阅，收到订阅成功的回复后才切换到新连接分发并取消旧连接的订阅，迁移过程中旧连接的消息被忽略。
+    同一个websocket地址的所有Market共用一个ShardManager，多个Market订阅同一个频道时只订阅一次。
+    """
+
+    _MANAGERS = {}  # {"url": manager}
+    connection_class = ShardConnection
+
+    @classmethod
+    def get(cls, url, shards=2, **kwargs):
+        """ 获取websocket地址的分片管理，如果没有，创建一个新的，参数只在创建时生效
+        @param url websocket地址
+        @param shards 最大连接数
+        """
+        manager = cls._MANAGERS.get(url)
+        if not manager:
+            manager = cls(url, shards, **kwargs)
+            cls._MANAGERS[url] = manager
+        return manager
+
+    def __init__(self, url, shards=2, send_hb_interval=5, max_rate=1000, imbalance=2, rebalance_interval=10):
+        """ 初始化
+        @param url websocket地址
+        @param shards 最大连接数
+        @param send_hb_interval 发送心跳时间间隔
+        @param max_rate 单个连接每秒的消息数超过此值时视为饱和
+        @param imbalance 单个连接的消息频率超过平均值的此倍数时迁移频道
+        @param rebalance_interval 统计消息频率及迁移频道的时间间隔(秒)
+        """
+        self._url = url
+        self._max_shards = max(shards, 1)
+        self._send_hb_interval = send_hb_interval
+        self._max_rate = max_rate
+        self._imbalance = imbalance
+        self._shards = []  # 已建立的连接
+        self._subs = {}  # {channel: sub data}
+        self._owners = {}  # 频道当前分发消息的连接 {channel: shard}
+        self._listeners = {}  # {channel: [listener, ...]}
+        self._counts = {}  # 本统计周期内每个频道的消息数 {channel: count}
+        self._rates = {}  # 每个频道的消息频率(条/秒) {channel: rate}
+        self._moving = {}  # 迁移中的频道 {channel: (new shard, start time)}
+        self._last_rebalance = time.time()
+        self._rebalance_interval = rebalance_interval
+        LoopRunTask.register(self._rebalance, rebalance_interval)
+
+    def subscribe(self, channel, data, listener):
+        """ 订阅频道
+        @param channel 频道名
+        @param data 订阅消息
+        @param listener 行情对象，收到频道消息时调用 `await listener.process_data(data)`
+        """
+        listeners = self._listeners.setdefault(channel, [])
+        if listener not in listeners:
+            listeners.append(listener)
+        if channel in self._owners:
+            return
+        shard = self._pick_shard()
+        self._subs[channel] = data
+        self._owners[channel] = shard
+        self._counts[channel] = 0
+        self._rates.setdefault(channel, 0)
+        shard.channels[channel] = data
+        asyncio.create_task(shard.send(data))
+
+    def unsubscribe(self, channel, listener):
+        """ 取消订阅频道，频道没有订阅者时取消连接上的订阅
+        """
+        listeners = self._listeners.get(channel, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if listeners or channel not in self._owners:
+            return
+        self._listeners.pop(channel, None)
+        shards = [self._owners.pop(channel)]
+        if channel in self._moving:
+            shards.append(self._moving.pop(channel)[0])
+        for shard in shards:
+            shard.channels.pop(channel, None)
+            asyncio.create_task(shard.send({"unsub": channel}))
+        self._subs.pop(channel, None)
+        self._counts.pop(channel, None)
+        self._rates.pop(channel, None)
+
+    async def resubscribe(self, channel):
+        """ 在当前连接上重新订阅频道，服务器会重新推送快照
+        """
+        shard = self._owners.get(channel)
+        if not shard:
+            return
+        await shard.send({"unsub": channel})
+        await shard.send(self._subs[channel])
+
+    async def dispatch(self, shard, channel, data):
+        """ 分发频道消息，只分发当前负责该频道的连接的消息
+        """
+        if self._owners.get(channel) is not shard:
+            return
+        self._counts[channel] += 1
+        for listener in self._listeners.get(channel, []):
+            await listener.process_data(data)
+
+    async def on_subbed(self, shard, channel):
+        """ 连接订阅成功，如果是迁移中的频道，切换到新连接并取消旧连接的订阅
+        """
+        moving = self._moving.get(channel)
+        if not moving or moving[0] is not shard:
+            return
+        self._moving.pop(channel)
+        old = self._owners[channel]
+        self._owners[channel] = shard
+        old.channels.pop(channel, None)
+        await old.send({"unsub": channel})
+        logger.info("channel moved. channel:", channel, "from shard:", old.index, "to shard:", shard.index,
+                    caller=self)
+
+    def stats(self):
+        """ 获取每个连接的统计信息
+        @return [{"index": 0, "connected": True, "channels": 10, "rate": 100.0}, ...]
+        """
+        result = []
+        for shard in self._shards:
+            result.append({
+                "index": shard.index,
+                "connected": shard.connected,
+                "channels": len(shard.channels),
+                "rate": self._shard_rate(shard)
+            })
+        return result
+
+    def _shard_rate(self, shard):
+        return sum(self._rates.get(channel, 0) for channel, owner in self._owners.items() if owner is shard)
+
+    def _shard_load(self, shard):
+        return self._shard_rate(shard), len(shard.channels)
+
+    def _pick_shard(self, exclude=None):
+        """ 选择消息频率最低的连接，未达到最大连接数时，优先建立新连接
+        """
+        candidates = [shard for shard in self._shards if shard is not exclude]
+        if len(self._shards) < self._max_shards and (not candidates or
+                                                     min(len(s.channels) for s in candidates) > 0):
+            shard = self.connection_class(self, len(self._shards), self._url, self._send_hb_interval)
+            self._shards.append(shard)
+            return shard
+        if not candidates:
+            return None
+        return min(candidates, key=self._shard_load)
+
+    async def _rebalance(self, *args, **kwargs):
+        """ 统计消息频率，迁移饱和连接上的频道
+        """
+        now = time.time()
+        elapsed = max(now - self._last_rebalance, 0.001)
+        self._last_rebalance = now
+        for channel, count in self._counts.items():
+            rate = count / elapsed
+            self._rates[channel] = rate if not self._rates.get(channel) else (self._rates[channel] + rate) / 2
+            self._counts[channel] = 0
+
+        # 取消超时未收到订阅回复的迁移
+        for channel, (shard, start) in list(self._moving.items()):
+            if now - start > self._rebalance_interval * 3:
+                logger.warn("move channel timeout. channel:", channel, "shard:", shard.index, caller=self)
+                self._moving.pop(channel)
+                shard.channels.pop(channel, None)
+                await shard.send({"unsub": channel})
+
+        if not self._shards or self._moving:
+            return
+        hot = max(self._shards, key=self._shard_load)
+        hot_rate = self._shard_rate(hot)
+        average = sum(self._rates.values()) / self._max_shards
+        if hot_rate <= self._max_rate and hot_rate <= average * self._imbalance:
+            return
+        cool = self._pick_shard(exclude=hot)
+        if not cool:
+            return
+        cool_rate = self._shard_rate(cool)
+        # 迁移后两个连接的频率差最小的频道，频率差不能比迁移前大
+        best = None
+        for channel, owner in self._owners.items():
+            if owner is not hot:
+                continue
+            rate = self._rates.get(channel, 0)
+            if rate <= 0 or rate >= hot_rate - cool_rate:
+                continue
+            diff = abs((hot_rate - rate) - (cool_rate + rate))
+            if best is None or diff < best[0]:
+                best = (diff, channel)
+        if not best:
+            return
+        channel = best[1]
+        logger.info("shard saturated, move channel. shard:", hot.index, "rate:", hot_rate, "channel:", channel,
+                    "to shard:", cool.index, caller=self)
+        self._moving[channel] = (cool, now)
+        cool.channels[channel] = self._subs[channel]
+        await cool.send(self._subs[channel])
@@ -7,6 +7,7 @@ Author: QiaoXiaofeng
 Date:   2018/04/28
 Update: 2018/09/07 1. 增加函数datetime_to_timestamp;
         2019/09/18 2. 增加函数来处理浮点数截取不四舍五入noround_float
+        2026/10/18 3. 当前时间可以替换为模拟时钟set_clock，用于回放
 """
 
 import uuid
@@ -14,18 +15,28 @@ import time
 import decimal
 import datetime
 
+_clock = time.time  # 当前时间函数(秒)，回放时替换为模拟时钟
+
+
+def set_clock(clock=None):
+    """ 设置当前时间函数，get_cur_timestamp/get_cur_timestamp_ms 按此时间返回
+    @param clock 返回当前时间戳(秒，浮点数)的函数，None为恢复系统时间
+    """
+    global _clock
+    _clock = clock or time.time
+
 
 def get_cur_timestamp():
     """ 获取当前时间戳
     """
-    ts = int(time.time())
+    ts = int(_clock())
     return ts
 
 
 def get_cur_timestamp_ms():
     """ 获取当前时间戳(毫秒)
     """
-    ts = int(time.time() * 1000)
+    ts = int(_clock() * 1000)
     return ts
 
 
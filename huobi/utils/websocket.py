@@ -6,10 +6,14 @@ websocket接口封装
 Author: QiaoXiaofeng
 Date:   2020/01/08
 History: 1.fix method locker bug when ws is disconnected.
+         2.add FrameDecoder, decode gzip frames by zlib and parse json by orjson/ujson if installed.
+         3.record the raw binary frames by FrameRecorder if `RECORDER` is configured.
+         4.add offline mode for replay, no connection is made and messages are fed by the replay engine.
 """
 
 import json
 import time
+import zlib
 import traceback
 import aiohttp
 import asyncio
@@ -18,14 +22,93 @@ from huobi.const import *
 from huobi.utils import logger
 from huobi.config import config
 from huobi.heartbeat import heartbeat
+from huobi.utils.recorder import FrameRecorder
 
 from huobi.utils.decorator import METHOD_LOCKERS
 
+try:
+    import orjson as _fast_json
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        import ujson as _fast_json
+        JSON_BACKEND = "ujson"
+    except ImportError:
+        _fast_json = json
+        JSON_BACKEND = "json"
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # zlib解压gzip格式数据的wbits参数
+
+
+def _json_loads(name):
+    """ 获取json解析函数，bytes可直接传入，无需先decode
+    @param name json库名称 orjson/ujson/json
+    """
+    if name == "orjson":
+        import orjson
+        return orjson.loads
+    if name == "ujson":
+        import ujson
+        return ujson.loads
+    if name == "json":
+        return json.loads
+    raise ValueError("unknown json backend: %s" % name)
+
+
+class FrameDecoder:
+    """ websocket消息解码
+    gzip压缩数据直接由zlib解压(跳过gzip模块的Python层文件头解析)，解压后的bytes直接交给json库解析，不再decode成str。
+    json库在模块导入时按 orjson > ujson > json 的顺序检测，也可通过 `backend` 指定。
+    """
+
+    def __init__(self, backend=None):
+        """ 初始化
+        @param backend json库名称 orjson/ujson/json，默认为导入时检测到的最快的库
+        """
+        self.backend = backend or JSON_BACKEND
+        self.loads = _json_loads(self.backend)
+
+    def decompress(self, msg):
+        """ 解压gzip数据
+        @param msg gzip压缩的bytes
+        """
+        return zlib.decompress(msg, GZIP_WBITS)
+
+    def decode(self, msg):
+        """ 解压并解析binary消息
+        @param msg gzip压缩的bytes
+        """
+        return self.loads(zlib.decompress(msg, GZIP_WBITS))
+
+
+default_decoder = FrameDecoder()
+
+
+class OfflineConnection:
+    """ 离线模式的websocket连接，发送的消息被丢弃
+    """
+
+    closed = False
+
+    async def send_json(self, data):
+        pass
+
+    async def send_str(self, data):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+    async def close(self):
+        pass
+
 
 class Websocket:
     """ websocket接口封装
     """
 
+    offline = False  # 离线模式(回放)，不建立连接，消息由回放引擎调用process_binary传入，见 `huobi.replay`
+
     def __init__(self, url, check_conn_interval=10, send_hb_interval=10):
         """ 初始化
         @param url 建立websocket的地址
@@ -38,10 +121,17 @@ class Websocket:
         self.ws = None  # websocket连接对象
         self.heartbeat_msg = None  # 心跳消息
         self.session = None
+        self.decoder = default_decoder  # 消息解码器
+        self.recorder = FrameRecorder.get(url)  # 原始消息录制器，None为不录制
 
     def initialize(self):
         """ 初始化
         """
+        if self.offline:
+            self.ws = OfflineConnection()
+            self.closed = False
+            asyncio.create_task(self.connected_callback())
+            return
         # 注册服务 检查连接是否正常
         heartbeat.register(self._check_connection, self._check_conn_interval)
         # 注册服务 发送心跳
@@ -91,11 +181,13 @@ class Websocket:
         async for msg in self.ws:
             if msg.type == aiohttp.WSMsgType.TEXT:
                 try:
-                    data = json.loads(msg.data)
+                    data = self.decoder.loads(msg.data)
                 except:
                     data = msg.data
-                await asyncio().create_task(self.process(data))
+                await asyncio.create_task(self.process(data))
             elif msg.type == aiohttp.WSMsgType.BINARY:
+                if self.recorder is not None:
+                    self.recorder.record(self._url, msg.data)
                 await asyncio.create_task(self.process_binary(msg.data))
             elif msg.type == aiohttp.WSMsgType.CLOSED:
                 logger.warn("receive event CLOSED:", msg, caller=self)
@@ -0,0 +1,85 @@
+import sys
+import asyncio
+import unittest
+from unittest import mock
+
+sys.path.append('..')
+from huobi.backfill import Backfill, BackfillError
+from huobi.platforms.huobi_usdt_swap_api import HuobiUsdtSwapRestAPI
+
+
+class FakeRestAPI:
+    """ Klines of every minute, the first request of each window fails once. """
+
+    def __init__(self):
+        self.calls = []
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def get_klines(self, contract_code, period, size=None, sfrom=None, to=None):
+        self.calls.append((sfrom, to))
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(0.001)
+        self.inflight -= 1
+        if self.calls.count((sfrom, to)) == 1:
+            return None, "timeout"
+        # Overlap one bar with the previous window.
+        begin = max(sfrom - 60, 0)
+        return {"data": [{"id": t} for t in range(begin - begin % 60, to + 1, 60)]}, None
+
+    async def get_history_orders(self, contract_code, trade_type, stype, status, create_date, page_index=1,
+                                 page_size=50):
+        orders = [{"order_id": i} for i in range((page_index - 1) * 2, page_index * 2 + 1)]
+        return {"data": {"orders": orders, "total_page": 3, "current_page": page_index}}, None
+
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def collect(self, iterator):
+        async def do():
+            return [item async for item in iterator]
+        return self.loop.run_until_complete(do())
+
+    def test_klines(self):
+        api = FakeRestAPI()
+        backfill = Backfill(api, concurrency=3, rate=0, retry_delay=0)
+        end = 60 * 2000 * 5
+        klines = self.collect(backfill.klines("BTC-USDT", "1min", 0, end))
+        ids = [k["id"] for k in klines]
+        self.assertEqual(list(range(0, end + 1, 60)), ids)
+        self.assertEqual(12, len(api.calls))
+        self.assertLessEqual(api.max_inflight, 3)
+
+    def test_klines_window_from_zero(self):
+        api = HuobiUsdtSwapRestAPI("access", "secret")
+        requests = []
+
+        async def request(method, uri, params=None, body=None, headers=None, auth=False):
+            requests.append(params)
+            return {"data": []}, None
+
+        with mock.patch.object(api, "request", request):
+            self.collect(Backfill(api, rate=0).klines("BTC-USDT", "1min", 0, 600))
+        self.assertEqual([(0, 600)], [(p["from"], p["to"]) for p in requests])
+
+    def test_history_orders(self):
+        backfill = Backfill(FakeRestAPI(), rate=0)
+        orders = self.collect(backfill.history_orders("BTC-USDT"))
+        self.assertEqual(list(range(7)), [o["order_id"] for o in orders])
+
+    def test_unsupported(self):
+        backfill = Backfill(object(), rate=0)
+        with self.assertRaises(BackfillError):
+            self.collect(backfill.order_details("BTC-USDT", [1]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.barbuilder import BarBuilder, BAR_TYPE_TIME, BAR_TYPE_VOLUME, BAR_TYPE_TICK, BAR_TYPE_DOLLAR
+from huobi.heartbeat import heartbeat
+from huobi.platforms.huobi_usdt_swap_market import HuobiUsdtSwapMarket
+from huobi.utils.websocket import Websocket
+
+
+class TestBarBuilder(unittest.TestCase):
+
+    def test_time_bars(self):
+        builder = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_TIME, 60)
+        self.assertEqual([], builder.on_trade(100, 1, 60000))
+        builder.on_trade(102, 2, 61000)
+        builder.on_trade(99, 1, 62000)
+        closed = builder.on_trade(101, 1, 121000)
+        self.assertEqual(1, len(closed))
+        bar = closed[0]
+        self.assertEqual((60000, 120000), (bar.open_time, bar.close_time))
+        self.assertEqual((100, 102, 99, 99, 4, 3), (bar.open, bar.high, bar.low, bar.close, bar.volume, bar.count))
+
+    def test_timer_rolls_quiet_market(self):
+        builder = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_TIME, 60)
+        builder.on_trade(100, 1, 60000)
+        self.assertEqual([], builder.on_timer(119999))
+        closed = builder.on_timer(250000)
+        self.assertEqual([60000, 120000, 180000], [bar.open_time for bar in closed])
+        flat = closed[1]
+        self.assertEqual((100, 100, 100, 100, 0), (flat.open, flat.high, flat.low, flat.close, flat.volume))
+        self.assertEqual(240000, builder.current.open_time)
+
+    def test_reconcile(self):
+        builder = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_TIME, 120)
+        builder.on_trade(100, 1, 0)
+        builder.on_trade(101, 1, 60000)
+        self.assertEqual([], builder.reconcile(0, 100, 103, 98, 100, 5))
+        self.assertEqual((103, 98, 6), (builder.current.high, builder.current.low, builder.current.volume))
+        closed = builder.on_trade(100, 1, 120000)
+        revised = builder.reconcile(60000, 101, 101, 97, 99, 2)
+        self.assertEqual(1, len(revised))
+        self.assertIsNot(closed[0], revised[0])
+        self.assertEqual((97, 99, 7, 1), (revised[0].low, revised[0].close, revised[0].volume, revised[0].revision))
+        self.assertEqual([], builder.reconcile(60000, 101, 101, 97, 99, 2))
+
+    def test_volume_tick_dollar_bars(self):
+        volume = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_VOLUME, 5)
+        tick = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_TICK, 2)
+        dollar = BarBuilder("huobi_swap", "BTC-USD", BAR_TYPE_DOLLAR, 1000)
+        bars = {volume: [], tick: [], dollar: []}
+        for i, (price, qty) in enumerate([(100, 2), (101, 2), (102, 3), (103, 1), (104, 6)]):
+            for builder in bars:
+                bars[builder].extend(builder.on_trade(price, qty, i))
+        self.assertEqual([7, 7], [bar.volume for bar in bars[volume]])
+        self.assertEqual([2, 2], [bar.count for bar in bars[tick]])
+        self.assertEqual([(0, 4)], [(bar.open_time, bar.close_time) for bar in bars[dollar]])
+
+
+class TestMarketBars(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        heartbeat.reset()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def test_reconcile_with_kline_frames(self):
+        """ Trades and klines pushed by the exchange, BTC-USDT contract size is 0.001 BTC. """
+        trades = {"ch": "market.BTC-USDT.trade.detail", "ts": 60500,
+                  "tick": {"id": 1, "ts": 60500, "data": [
+                      {"id": 1, "ts": 60100, "price": 50000, "amount": 2, "quantity": 0.002,
+                       "trade_turnover": 100, "direction": "buy"},
+                      {"id": 2, "ts": 60200, "price": 50010, "amount": 3, "quantity": 0.003,
+                       "trade_turnover": 150.03, "direction": "sell"}]}}
+        # The kline of the same minute also has a trade the stream missed.
+        kline = {"ch": "market.BTC-USDT.kline.1min", "ts": 61000,
+                 "tick": {"id": 60, "mrid": 3, "open": 49990, "close": 50010, "high": 50020, "low": 49990,
+                          "amount": 0.006, "vol": 6, "trade_turnover": 299.98, "count": 3}}
+
+        async def on_update(data):
+            pass
+
+        async def do():
+            market = HuobiUsdtSwapMarket(platform="huobi_usdt_swap", symbols=["BTC-USDT"], channels=[],
+                                         wss="wss://api.hbdm.com", bars=[{"type": "time", "size": 60}],
+                                         trade_update_callback=on_update, kline_update_callback=on_update)
+            market._symbol_to_channel("BTC-USDT", "trade")  # Mapped on subscribing when online.
+            market._symbol_to_channel("BTC-USDT", "kline")
+            await market.process_trade(trades)
+            builder = market._bar_aggregator.builders("BTC-USDT")[0]
+            volume = builder.current.volume
+            await market.process_kline(kline)
+            return volume, builder.current
+
+        Websocket.offline = True
+        try:
+            volume, bar = self.loop.run_until_complete(do())
+        finally:
+            Websocket.offline = False
+        self.assertEqual(5, volume)
+        self.assertEqual((49990, 50020, 49990, 50010, 6), (bar.open, bar.high, bar.low, bar.close, bar.volume))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
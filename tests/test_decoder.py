@@ -0,0 +1,43 @@
+import sys
+import gzip
+import json
+import logging
+import unittest
+
+sys.path.append('..')
+from huobi.utils import logger
+from huobi.utils.websocket import FrameDecoder, JSON_BACKEND
+
+
+class Lazy:
+    formatted = 0
+
+    def __repr__(self):
+        Lazy.formatted += 1
+        return "lazy"
+
+
+class TestFrameDecoder(unittest.TestCase):
+
+    def test_decode(self):
+        data = {"ch": "market.BTC-USD.depth.step0", "tick": {"asks": [[1.5, 2]], "bids": []}, "ts": 1}
+        msg = gzip.compress(json.dumps(data).encode())
+        for backend in ("json", JSON_BACKEND):
+            self.assertEqual(data, FrameDecoder(backend).decode(msg))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            FrameDecoder("xjson")
+
+    def test_lazy_debug(self):
+        level = logging.root.level
+        logging.root.setLevel(logging.INFO)
+        try:
+            logger.debug("data:", Lazy())
+            self.assertEqual(0, Lazy.formatted)
+        finally:
+            logging.root.setLevel(level)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,45 @@
+import sys
+import unittest
+
+sys.path.append('..')
+from huobi.depthbook import DepthBook
+
+
+class TestDepthBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = DepthBook("BTC-USDT", depth=3)
+        self.book.reset([[101, 1], [100, 2], [102, 3]], [[99, 1], [98, 2]], 10, 1000)
+
+    def test_sorted_levels(self):
+        self.assertEqual([[100.0, 2.0], [101.0, 1.0], [102.0, 3.0]], self.book.asks())
+        self.assertEqual([[99.0, 1.0], [98.0, 2.0]], self.book.bids())
+        self.assertEqual([[100.0, 2.0]], self.book.asks(1))
+        self.assertEqual(100.0, self.book.best_ask())
+        self.assertEqual(99.0, self.book.best_bid())
+
+    def test_update(self):
+        self.assertTrue(self.book.update([[100, 0], [100.5, 4]], [[99.5, 1], [98, 0]], 11, 1001))
+        self.assertEqual([[100.5, 4.0], [101.0, 1.0], [102.0, 3.0]], self.book.asks())
+        self.assertEqual([[99.5, 1.0], [99.0, 1.0]], self.book.bids())
+        self.assertEqual(11, self.book.version)
+        self.assertEqual(1001, self.book.timestamp)
+
+    def test_trim_depth(self):
+        self.book.update([[99.9, 1]], [], 11)
+        self.assertEqual([99.9, 100.0, 101.0], [p for p, _ in self.book.asks()])
+
+    def test_version_gap(self):
+        self.assertFalse(self.book.update([[100, 0]], [], 12))
+        self.assertEqual(10, self.book.version)
+        self.assertEqual(100.0, self.book.best_ask())
+
+    def test_clear(self):
+        self.book.clear()
+        self.assertFalse(self.book.synced)
+        self.assertFalse(self.book.update([], [], 1))
+        self.assertEqual(0, len(self.book))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,120 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi import const
+from huobi.market import Market
+from huobi.tasks import SingleTask
+from huobi.utils.websocket import Websocket
+from huobi.dispatch import Dispatcher, DISPATCH_BOUNDED, DISPATCH_DROP_OLDEST, DISPATCH_CONFLATE, DISPATCH_ORDERED
+
+
+class Event:
+
+    def __init__(self, symbol, value):
+        self.symbol = symbol
+        self.value = value
+
+
+class TestDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.received = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def callback(self, event):
+        await asyncio.sleep(0.001)
+        self.received.append(event.value)
+
+    def dispatch(self, dispatcher, events):
+        async def do():
+            for event in events:
+                SingleTask.run(dispatcher, event)
+            while dispatcher.depth or dispatcher._running:
+                await asyncio.sleep(0.001)
+        self.loop.run_until_complete(do())
+
+    def test_bounded(self):
+        dispatcher = Dispatcher(self.callback, DISPATCH_BOUNDED, maxsize=3)
+        self.dispatch(dispatcher, [Event("A", i) for i in range(10)])
+        self.assertEqual([0, 1, 2], self.received)
+        self.assertEqual(7, dispatcher.stats()["dropped"])
+        self.assertEqual(3, dispatcher.stats()["max_depth"])
+
+    def test_drop_oldest(self):
+        dispatcher = Dispatcher(self.callback, DISPATCH_DROP_OLDEST, maxsize=3)
+        self.dispatch(dispatcher, [Event("A", i) for i in range(10)])
+        self.assertEqual([7, 8, 9], self.received)
+        self.assertEqual(7, dispatcher.stats()["dropped"])
+
+    def test_conflate(self):
+        dispatcher = Dispatcher(self.callback, DISPATCH_CONFLATE)
+        events = [Event("A", 1), Event("B", 2), Event("A", 3), Event("B", 4), Event("A", 5)]
+        self.dispatch(dispatcher, events)
+        self.assertEqual([5, 4], self.received)
+        self.assertEqual(3, dispatcher.stats()["conflated"])
+
+    def test_conflate_while_running(self):
+        dispatcher = Dispatcher(self.callback, DISPATCH_CONFLATE)
+
+        async def do():
+            SingleTask.run(dispatcher, Event("A", 1))
+            await asyncio.sleep(0)
+            for i in range(2, 5):
+                SingleTask.run(dispatcher, Event("A", i))
+            while dispatcher.depth or dispatcher._running:
+                await asyncio.sleep(0.001)
+        self.loop.run_until_complete(do())
+        self.assertEqual([1, 4], self.received)
+        self.assertEqual(2, dispatcher.stats()["conflated"])
+
+    def test_ordered(self):
+        dispatcher = Dispatcher(self.callback, DISPATCH_ORDERED)
+        self.dispatch(dispatcher, [Event("A", i) for i in range(200)])
+        self.assertEqual(list(range(200)), self.received)
+        self.assertEqual(200, dispatcher.stats()["delivered"])
+
+    def test_market_conflate_orderbooks(self):
+        """ The conflated orderbook is the object kept in the history, the other policies get a copy. """
+        frame = {"ch": "market.BTC-USDT.depth.step6", "ts": 1,
+                 "tick": {"asks": [[101, 1]], "bids": [[100, 2]], "ts": 1}}
+
+        async def do(conflate):
+            books = []
+
+            async def on_orderbook(orderbook):
+                books.append(orderbook)
+
+            market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook"], 10, 10, 10, 10, "wss://api.hbdm.com",
+                            orderbook_update_callback=on_orderbook, conflate_orderbooks=conflate)
+            market._m._symbol_to_channel("BTC-USDT", "depth")  # Mapped on subscribing when online.
+            await market._m.process_orderbook(frame)
+            while not books:
+                await asyncio.sleep(0.001)
+            return books[0], market.orderbooks[-1]
+
+        Websocket.offline = True
+        try:
+            shared, history = self.loop.run_until_complete(do(True))
+            self.assertIs(shared, history)
+            copied, history = self.loop.run_until_complete(do(False))
+            self.assertIsNot(copied, history)
+            self.assertEqual(copied.best_ask, history.best_ask)
+        finally:
+            Websocket.offline = False
+
+    def test_wrap(self):
+        self.assertEqual(self.callback, Dispatcher.wrap(self.callback, None))
+        dispatcher = Dispatcher.wrap(self.callback, {"policy": "drop_oldest", "maxsize": 5})
+        self.assertEqual((DISPATCH_DROP_OLDEST, 5), (dispatcher.policy, dispatcher.maxsize))
+        with self.assertRaises(ValueError):
+            Dispatcher(self.callback, "lifo")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
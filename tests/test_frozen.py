@@ -0,0 +1,70 @@
+import sys
+import copy
+import pickle
+import unittest
+
+sys.path.append('..')
+from huobi.asset import Asset, FrozenAsset
+from huobi.order import Order, FrozenOrder, ORDER_STATUS_SUBMITTED, ORDER_STATUS_FILLED
+from huobi.position import Position, FrozenPosition
+
+
+class TestFrozen(unittest.TestCase):
+
+    def test_order_snapshot(self):
+        order = Order(order_no="1", price=100, quantity=2, status=ORDER_STATUS_SUBMITTED)
+        self.assertEqual(order.ctime, order.utime)
+        snapshot = order.snapshot()
+        self.assertIsInstance(snapshot, Order)
+        self.assertIsInstance(snapshot, FrozenOrder)
+        order.status = ORDER_STATUS_FILLED
+        self.assertEqual(snapshot.status, ORDER_STATUS_SUBMITTED)
+        self.assertEqual(snapshot.remain, 2)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        with self.assertRaises(AttributeError):
+            snapshot.status = ORDER_STATUS_FILLED
+        with self.assertRaises(AttributeError):
+            del snapshot.price
+        with self.assertRaises(AttributeError):
+            order.unknown = 1
+        self.assertIn("order_no: 1", str(snapshot))
+
+    def test_position_snapshot(self):
+        position = Position("huobi_swap", "test", "s", "BTC-USD", long_quantity=1)
+        snapshot = position.snapshot()
+        self.assertIsInstance(snapshot, FrozenPosition)
+        position.update(long_quantity=2)
+        self.assertEqual(snapshot.long_quantity, 1)
+        with self.assertRaises(AttributeError):
+            snapshot.update(long_quantity=3)
+
+    def test_asset_snapshot(self):
+        asset = Asset("huobi_swap", "test", {"BTC": {"total": "1"}}, 1, True)
+        snapshot = asset.snapshot()
+        self.assertIsInstance(snapshot, FrozenAsset)
+        asset.assets.update({"ETH": {"total": "2"}})
+        self.assertEqual(list(snapshot.assets), ["BTC"])
+        self.assertEqual(snapshot.data["timestamp"], 1)
+        self.assertIsNone(Asset().snapshot().assets)
+
+    def test_copy(self):
+        snapshot = Order(order_no="1", price=100, quantity=2).snapshot()
+        self.assertIs(copy.copy(snapshot), snapshot)
+        self.assertIs(copy.deepcopy(snapshot), snapshot)
+        self.assertIs(copy.deepcopy([snapshot])[0], snapshot)
+
+    def test_pickle(self):
+        snapshots = [Order(order_no="1", price=100, quantity=2, status=ORDER_STATUS_FILLED).snapshot(),
+                     Position("huobi_swap", "test", "s", "BTC-USD", long_quantity=1).snapshot(),
+                     Asset("huobi_swap", "test", {"BTC": {"total": "1"}}, 1, True).snapshot()]
+        for snapshot in snapshots:
+            restored = pickle.loads(pickle.dumps(snapshot))
+            self.assertIs(type(restored), type(snapshot))
+            self.assertEqual(str(restored), str(snapshot))
+            with self.assertRaises(AttributeError):
+                restored.platform = "other"
+        self.assertEqual(pickle.loads(pickle.dumps(snapshots[2])).assets, {"BTC": {"total": "1"}})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.heartbeat import HeartBeat
+
+
+class TestHeartBeat(unittest.TestCase):
+
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    def test_fixed_rate(self):
+        async def run():
+            hb = HeartBeat()
+            loop = asyncio.get_event_loop()
+            start = loop.time()
+            runs = []
+
+            async def on_tick(*args, **kwargs):
+                runs.append(loop.time() - start)
+                await asyncio.sleep(0.03)
+
+            hb.register(on_tick, 0.02)
+            await asyncio.sleep(0.11)
+            return runs
+        runs = self._run(run())
+        self.assertEqual(5, len(runs))
+        for i, t in enumerate(runs):
+            self.assertAlmostEqual(0.02 * (i + 1), t, delta=0.005)
+
+    def test_fixed_delay(self):
+        async def run():
+            hb = HeartBeat()
+            loop = asyncio.get_event_loop()
+            start = loop.time()
+            runs = []
+
+            async def on_tick(*args, **kwargs):
+                runs.append(loop.time() - start)
+                await asyncio.sleep(0.03)
+
+            hb.register_fixed_delay(on_tick, 0.02)
+            await asyncio.sleep(0.13)
+            return runs
+        runs = self._run(run())
+        self.assertEqual(3, len(runs))
+        for i, t in enumerate(runs):
+            self.assertAlmostEqual(0.02 + 0.05 * i, t, delta=0.005)
+
+    def test_unregister(self):
+        async def run():
+            hb = HeartBeat()
+            runs = []
+
+            async def on_tick(*args, **kwargs):
+                runs.append(kwargs["task_id"])
+
+            task_id = hb.register(on_tick, 0.01)
+            await asyncio.sleep(0.025)
+            hb.unregister(task_id)
+            await asyncio.sleep(0.03)
+            return runs
+        self.assertEqual(2, len(self._run(run())))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
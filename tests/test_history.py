@@ -0,0 +1,96 @@
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append('..')
+from huobi import history
+from huobi.history import TradeColumns, KlineColumns, SIDE_BUY, SIDE_SELL
+
+
+TRADES = [(10, 1, SIDE_BUY), (11, 2, SIDE_SELL), (12, 3, SIDE_BUY), (13, 4, SIDE_SELL), (14, 5, SIDE_BUY)]
+
+
+def make_trades(maxlen=4):
+    trades = TradeColumns(maxlen)
+    for i, (price, qty, side) in enumerate(TRADES):
+        trades.append(1000 + i, price, qty, side)
+    return trades
+
+
+class TestTradeColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.trades = make_trades()
+
+    def test_wrap_around(self):
+        self.assertEqual(4, len(self.trades))
+        self.assertEqual([11, 12, 13, 14], list(self.trades.column("price")))
+        self.assertEqual([13, 14], list(self.trades.column("price", 2)))
+
+    def test_indicators(self):
+        self.assertAlmostEqual((13 * 4 + 14 * 5) / 9, self.trades.vwap(2))
+        self.assertEqual(14, self.trades.volume())
+        self.assertEqual(8, self.trades.volume(side=SIDE_BUY))
+        self.assertEqual([2, 5, 7, 9], list(self.trades.rolling_volume(2)))
+        returns = list(self.trades.returns(3))
+        self.assertAlmostEqual(13 / 12 - 1, returns[0])
+        self.assertAlmostEqual(14 / 13 - 1, returns[1])
+
+    def test_rolling_volume_window(self):
+        self.assertEqual([2, 3, 4, 5], list(self.trades.rolling_volume(1)))
+        self.assertEqual([2, 5, 9, 14], list(self.trades.rolling_volume(10)))
+        for window in (0, -1):
+            with self.assertRaises(ValueError):
+                self.trades.rolling_volume(window)
+
+
+def indicators(trades):
+    """ Indicators of `make_trades()` over a few `n` and `window`, as plain lists. """
+    results = []
+    for n in (None, 2, 10):
+        results.append([list(trades.rolling_volume(window, n)) for window in (1, 2, 3, 10)])
+        results.append([trades.vwap(n), trades.volume(n), trades.volume(n, SIDE_SELL)])
+        results.append([list(trades.returns(n, log)) for log in (False, True)])
+    return results
+
+
+@unittest.skipUnless(history.np is not None, "NumPy is not installed")
+class TestBackends(unittest.TestCase):
+    """ The NumPy and the stdlib `array` columns give the same results. """
+
+    def test_same_results(self):
+        numpy_results = indicators(make_trades())
+        with mock.patch.object(history, "np", None):
+            array_results = indicators(make_trades())
+        for numpy_values, array_values in zip(numpy_results, array_results):
+            self.assertEqual(len(numpy_values), len(array_values))
+            for a, b in zip(numpy_values, array_values):
+                if isinstance(a, list):
+                    self.assertEqual(len(a), len(b))
+                    for x, y in zip(a, b):
+                        self.assertAlmostEqual(x, y)
+                else:
+                    self.assertAlmostEqual(a, b)
+
+    def test_numpy_rolling_volume_window(self):
+        trades = make_trades()
+        self.assertEqual([2, 3, 4, 5], list(trades.rolling_volume(1)))
+        with self.assertRaises(ValueError):
+            trades.rolling_volume(0)
+
+
+class TestKlineColumns(unittest.TestCase):
+
+    def test_update_last_bar(self):
+        klines = KlineColumns(10)
+        klines.append(60000, 1, 2, 0.5, 1.5, 10)
+        klines.append(60000, 1, 3, 0.5, 2, 20)
+        klines.append(120000, 2, 4, 2, 4, 5)
+        self.assertEqual(2, len(klines))
+        self.assertEqual([2, 4], list(klines.column("close")))
+        self.assertEqual(25, klines.volume())
+        self.assertAlmostEqual(1, list(klines.returns())[0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
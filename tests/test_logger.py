@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+sys.path.append('..')
+from huobi.utils import logger
+
+
+class Counter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __repr__(self):
+        self.count += 1
+        return "Counter(%d)" % self.count
+
+
+class Collector(logging.Handler):
+
+    def __init__(self):
+        super(Collector, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.level = logging.root.level
+        self.handlers = logging.root.handlers[:]
+        logging.root.handlers.clear()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logger.shutdown()
+        for handler in logging.root.handlers:
+            handler.close()
+        logging.root.handlers[:] = self.handlers
+        logging.root.setLevel(self.level)
+        shutil.rmtree(self.path)
+
+    def read(self):
+        with open(os.path.join(self.path, "test.log")) as f:
+            return f.read().splitlines()
+
+    def test_level_check_before_format(self):
+        collector = Collector()
+        logging.root.addHandler(collector)
+        logging.root.setLevel(logging.WARNING)
+        counter = Counter()
+        logger.debug("debug", counter)
+        logger.info("info", counter)
+        self.assertEqual(counter.count, 0)
+        self.assertEqual(collector.records, [])
+        logger.error("error", counter, caller=self)
+        self.assertEqual(len(collector.records), 1)
+        self.assertEqual(collector.records[0].getMessage(), "[-] [TestLogger] error Counter(1) ")
+        self.assertEqual(counter.count, 1)
+
+    def test_text(self):
+        logger.initLogger("INFO", self.path, "test.log")
+        logger.info("hello", 1, "s", {"a": 1}, caller=self, k=2)
+        logger.error("bad", caller=self)
+        lines = self.read()
+        self.assertTrue(lines[0].startswith("I ["))
+        self.assertTrue(lines[0].endswith("[-] [TestLogger] hello 1 s {'a': 1} {'k': 2}"))
+        self.assertEqual(lines[1], "*" * 60)
+        self.assertTrue(lines[2].endswith("[-] [TestLogger] bad "))
+        self.assertEqual(lines[3], "*" * 60)
+
+    def test_queued_json(self):
+        logger.initLogger("DEBUG", self.path, "test.log", queued=True, json_lines=True)
+        data = {"price": 1}
+        logger.debug("data:", data, caller=self)
+        data["price"] = 2  # Arguments are rendered when logged, not when written.
+        try:
+            1 / 0
+        except ZeroDivisionError as e:
+            logger.exception("error:", e)
+        logger.shutdown()
+        lines = [json.loads(line) for line in self.read()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["level"], "DEBUG")
+        self.assertEqual(lines[0]["caller"], "TestLogger")
+        self.assertEqual(lines[0]["msg"], "data: {'price': 1} ")
+        self.assertEqual(lines[1]["level"], "ERROR")
+        self.assertIn("ZeroDivisionError", lines[1]["exc"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
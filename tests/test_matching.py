@@ -0,0 +1,143 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi import const
+from huobi.trade import Trade
+from huobi.matching import MatchingEngine, MatchOrder, KIND_IOC, KIND_FOK, KIND_POST_ONLY, KIND_MARKET
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL, ORDER_TYPE_MARKET, ORDER_STATUS_FILLED, \
+    ORDER_STATUS_SUBMITTED, ORDER_STATUS_CANCELED
+
+ASKS = [[101.0, 5], [102.0, 10]]
+BIDS = [[100.0, 4], [99.0, 10]]
+
+
+def fills_of(fills):
+    return [(order.order_no, price, volume, maker) for order, price, volume, maker in fills]
+
+
+class TestMatchingEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = MatchingEngine()
+        self.engine.on_book(ASKS, BIDS)
+
+    def test_taker_walks_levels(self):
+        order = MatchOrder("1", True, 102.0, 8)
+        self.assertEqual(fills_of(self.engine.submit(order)), [("1", 101.0, 5, False), ("1", 102.0, 3, False)])
+        self.assertEqual(order.remain, 0)
+        # The quantity taken is gone until the next book update.
+        order = MatchOrder("2", True, 101.0, 2)
+        self.assertEqual(self.engine.submit(order), [])
+        self.assertIn("2", self.engine)
+        self.assertEqual(ASKS, [[101.0, 5], [102.0, 10]])
+
+    def test_order_kinds(self):
+        self.assertEqual(self.engine.submit(MatchOrder("1", False, 100.0, 1, KIND_POST_ONLY)), ())
+        self.assertNotIn("1", self.engine)
+        order = MatchOrder("2", False, 99.0, 20, KIND_IOC)
+        self.assertEqual(len(self.engine.submit(order)), 2)
+        self.assertEqual(order.remain, 6)
+        self.assertNotIn("2", self.engine)
+        self.assertEqual(self.engine.submit(MatchOrder("3", True, 102.0, 16, KIND_FOK)), ())
+        order = MatchOrder("4", True, None, 100, KIND_MARKET)
+        self.assertEqual(fills_of(self.engine.submit(order)), [("4", 101.0, 5, False), ("4", 102.0, 10, False)])
+
+    def test_queue_position(self):
+        first = MatchOrder("1", True, 100.0, 2)
+        second = MatchOrder("2", True, 100.0, 3)
+        self.engine.submit(first)
+        self.engine.submit(second)
+        self.assertEqual((first.ahead, second.ahead), (4, 4))
+        # Cancels ahead in the book shrink the queue.
+        self.engine.on_book(ASKS, [[100.0, 3], [99.0, 10]])
+        self.assertEqual(first.ahead, 3)
+        self.assertEqual(self.engine.on_trade(100.0, 3, True), ())
+        self.assertEqual(self.engine.on_trade(100.0, 3, False), [])
+        self.assertEqual(first.ahead, 0)
+        fills = self.engine.on_trade(100.0, 4, False)
+        self.assertEqual(fills_of(fills), [("1", 100.0, 2, True), ("2", 100.0, 2, True)])
+        self.assertNotIn("1", self.engine)
+        self.assertEqual(second.remain, 1)
+        # A trade through the price fills the rest.
+        self.assertEqual(fills_of(self.engine.on_trade(99.5, 1, False)), [("2", 100.0, 1, True)])
+        self.assertEqual(len(self.engine), 0)
+
+    def test_book_crossing_and_cancel(self):
+        sell = MatchOrder("1", False, 103.0, 2)
+        other = MatchOrder("2", False, 104.0, 2)
+        self.engine.submit(sell)
+        self.engine.submit(other)
+        self.assertEqual(sell.ahead, 0)
+        fills = self.engine.on_book([[104.0, 1]], [[103.5, 1]])
+        self.assertEqual(fills_of(fills), [("1", 103.0, 2, True)])
+        self.assertEqual(self.engine.cancel("2"), other)
+        self.assertIsNone(self.engine.cancel("2"))
+        self.assertEqual(self.engine.on_trade(200.0, 1, True), ())
+
+
+class TestSimulatedTrade(unittest.TestCase):
+
+    def test_trade_api(self):
+        async def run():
+            orders, positions, assets = [], [], []
+
+            async def on_order(order):
+                orders.append(order)
+
+            async def on_position(position):
+                positions.append(position)
+
+            async def on_asset(asset):
+                assets.append(asset)
+
+            trader = Trade("test", const.SIMULATED, "BTC-USDT", account="sim", contract_size=1, balance=1000,
+                           maker_fee=0.001, taker_fee=0.002, order_update_callback=on_order,
+                           position_update_callback=on_position, asset_update_callback=on_asset)
+            sim = trader._t
+            await sim.process_data({"ch": "market.BTC-USDT.depth.step6", "tick": {"asks": ASKS, "bids": BIDS}})
+
+            # Open long 2 at 100, resting behind 4 contracts.
+            order_no, error = await trader.create_order(ORDER_ACTION_BUY, "100", 2, lever_rate=10)
+            self.assertIsNone(error)
+            await sim.process_data({"ch": "market.BTC-USDT.trade.detail", "tick": {"data": [
+                {"price": 100.0, "amount": 5, "direction": "sell"},
+                {"price": 100.0, "amount": 1, "direction": "sell"}]}})
+            # Close long 3 is more than the position.
+            _, error = await trader.create_order(ORDER_ACTION_SELL, 100, 3)
+            self.assertEqual(error["err_code"], 1048)
+            # Close long at market, taker at 100.
+            close_no, error = await trader.create_order(ORDER_ACTION_SELL, 0, 1, ORDER_TYPE_MARKET)
+            self.assertIsNone(error)
+            sell_no, _ = await trader.create_order(ORDER_ACTION_SELL, 110, -1)
+            success, error = await trader.revoke_order(sell_no)
+            self.assertEqual(success, sell_no)
+            await asyncio.sleep(0.01)
+            return trader, orders, positions, assets
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            trader, orders, positions, assets = loop.run_until_complete(run())
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+        statuses = [(o.order_no, o.status) for o in orders]
+        self.assertEqual(statuses, [("1", ORDER_STATUS_SUBMITTED), ("1", "PARTIAL-FILLED"), ("1", ORDER_STATUS_FILLED),
+                                    ("2", ORDER_STATUS_FILLED), ("3", ORDER_STATUS_SUBMITTED),
+                                    ("3", ORDER_STATUS_CANCELED)])
+        self.assertEqual(orders[1].role, "maker")
+        self.assertEqual(positions[-1].long_quantity, 1)
+        self.assertEqual(positions[-1].long_avg_price, 100.0)
+        stats = trader.simulation_stats()
+        self.assertEqual(stats["volume"], 3)
+        self.assertAlmostEqual(stats["fees"], 200 * 0.001 + 100 * 0.002)
+        self.assertAlmostEqual(stats["balance"], 1000 - 0.4)
+        self.assertEqual(assets[-1].assets["BTC"]["total"], "%.8f" % (1000 - 0.4))
+        self.assertEqual(len(trader.orders), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
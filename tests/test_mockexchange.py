@@ -0,0 +1,152 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.config import config
+from huobi.heartbeat import heartbeat
+from huobi.order import ORDER_ACTION_BUY, ORDER_TYPE_MARKET, ORDER_STATUS_FILLED
+from huobi.mockexchange import MockExchange
+from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.notification import NotificationSession
+from huobi.platforms.huobi_swap_api import HuobiSwapRestAPI
+from huobi.platforms.huobi_usdt_swap_api import HuobiUsdtSwapRestAPI
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+from huobi.platforms.huobi_usdt_swap_market import HuobiUsdtSwapMarket
+
+
+async def wait(condition, timeout=3):
+    for _ in range(int(timeout * 100)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+class TestMockExchange(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.http = config.http
+        config.http = {"rate_limit": False}
+
+    def tearDown(self):
+        config.http = self.http
+        NotificationSession._SESSIONS.clear()
+        heartbeat.reset()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def test_rest(self):
+        async def run():
+            exchange = MockExchange(symbols=["BTC-USDT", "BTC-USD"], latency=0.01)
+            await exchange.start()
+            api = HuobiUsdtSwapRestAPI("access", "secret", exchange.host)
+            results = {
+                "info": await api.get_swap_info("BTC-USDT"),
+                "depth": await api.get_orderbook("BTC-USDT"),
+                "asset": await api.get_asset_info("BTC-USDT"),
+                "order": await api.create_order("BTC-USDT", 9000, 2, "buy", "open", 20, "limit", 7),
+                "too_large": await api.create_order("BTC-USDT", 9000, 100000, "buy", "open", 20, "limit"),
+                "open": await api.get_open_orders("BTC-USDT"),
+                "swap": await HuobiSwapRestAPI("access", "secret", exchange.host).create_order(
+                    "BTC-USD", 9000, 1, "buy", "open", 20, "limit"),
+                "wrong_secret": await HuobiUsdtSwapRestAPI("access", "wrong", exchange.host).get_asset_info(),
+                "wrong_key": await HuobiUsdtSwapRestAPI("other", "secret", exchange.host).get_asset_info()
+            }
+            results["revoke"] = await api.revoke_order("BTC-USDT", results["order"][0]["data"]["order_id"])
+            results["revoke_again"] = await api.revoke_order("BTC-USDT", results["order"][0]["data"]["order_id"])
+            results["history"] = await api.get_history_orders("BTC-USDT", 0, 1, 0, 7)
+            stats = exchange.stats()
+            await AsyncHttpRequests.close()
+            await exchange.stop()
+            return results, stats
+
+        results, stats = self.loop.run_until_complete(run())
+        self.assertEqual(results["info"][0]["data"][0]["contract_size"], 0.001)
+        tick = results["depth"][0]["tick"]
+        self.assertEqual(len(tick["asks"]), 20)
+        self.assertLess(tick["bids"][0][0], tick["asks"][0][0])
+        self.assertEqual(results["asset"][0]["data"][0]["margin_balance"], 10000)
+        self.assertEqual(results["order"][0]["data"]["order_id"], 1)
+        self.assertEqual(results["order"][0]["data"]["client_order_id"], 7)
+        self.assertEqual(results["too_large"][1]["err_code"], 1047)
+        orders = results["open"][0]["data"]["orders"]
+        self.assertEqual([(o["order_id"], o["volume"], o["status"]) for o in orders], [(1, 2, 3)])
+        self.assertEqual(results["swap"][0]["status"], "ok")
+        self.assertEqual(results["wrong_secret"][1]["err_code"], 403)
+        self.assertEqual(results["wrong_key"][1]["err_code"], 403)
+        self.assertEqual(results["revoke"][0]["data"]["successes"], "1")
+        self.assertEqual(results["revoke_again"][0]["data"]["errors"][0]["err_code"], 1061)
+        self.assertEqual(results["history"][0]["data"]["orders"][0]["status"], 7)
+        self.assertEqual(stats["signature_errors"], 2)
+        self.assertEqual(stats["requests"], 12)
+
+    def test_market_and_trade(self):
+        async def run():
+            exchange = MockExchange(depth_rate=200, trade_rate=50, push_latency=0.001, jitter=0.001, seed=1)
+            await exchange.start()
+            books = []
+            trades = []
+            inited = []
+            orders = []
+            positions = []
+
+            async def on_orderbook(orderbook):
+                books.append(orderbook)
+
+            async def on_trade(trade):
+                trades.append(trade)
+
+            async def on_init(success, error):
+                inited.append((success, error))
+
+            async def on_order(order):
+                orders.append(order)
+
+            async def on_position(position):
+                positions.append(position)
+
+            async def on_asset(asset):
+                pass
+
+            market = HuobiUsdtSwapMarket(platform="huobi_usdt_swap", symbols=["BTC-USDT"],
+                                         channels=["orderbook", "trade"], wss=exchange.wss, host=exchange.host,
+                                         orderbook_incremental=True, orderbook_update_callback=on_orderbook,
+                                         trade_update_callback=on_trade)
+            trader = HuobiUsdtSwapTrade(account="test", strategy="test", symbol="BTC-USDT", contract_type="swap",
+                                        host=exchange.host, wss=exchange.wss, access_key="access",
+                                        secret_key="secret", shared_notification=True, init_success_callback=on_init,
+                                        order_update_callback=on_order, position_update_callback=on_position,
+                                        asset_update_callback=on_asset)
+            self.assertTrue(await wait(lambda: inited and len(books) > 20))
+            order_no, error = await trader.create_order(ORDER_ACTION_BUY, 0, 2, ORDER_TYPE_MARKET)
+            self.assertTrue(await wait(lambda: positions and positions[-1].long_quantity == 2))
+            stats = exchange.stats()
+            await trader._session.close()
+            await market.close()
+            await AsyncHttpRequests.close()
+            await exchange.stop()
+            return market, books, trades, inited, order_no, error, orders, stats
+
+        market, books, trades, inited, order_no, error, orders, stats = self.loop.run_until_complete(run())
+        self.assertEqual(inited, [(True, None)])
+        # The incremental book never went out of sync.
+        self.assertEqual(market._depth_buffers, {})
+        for book in books:
+            self.assertEqual(len(book.asks), 10)
+            self.assertLess(float(book.bids[0][0]), float(book.asks[0][0]))
+        self.assertTrue(trades)
+        self.assertIsNone(error)
+        self.assertEqual(orders[-1].order_no, order_no)
+        self.assertEqual(orders[-1].status, ORDER_STATUS_FILLED)
+        self.assertEqual(stats["fills"], 1)
+        self.assertEqual(stats["signature_errors"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,151 @@
+import sys
+import gzip
+import json
+import asyncio
+import unittest
+
+from aiohttp import web
+
+sys.path.append('..')
+from huobi.config import config
+from huobi.heartbeat import heartbeat
+from huobi.utils.signer import Signer
+from huobi.utils.request import AsyncHttpRequests
+from huobi.utils.notification import NotificationSession
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+
+
+class MockNotification:
+    """ Notification websocket and open orders endpoint, pushes are sent by `push`. """
+
+    def __init__(self):
+        self.sockets = []
+        self.auths = 0
+        self.topics = []
+        self.runner = None
+        self.port = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/linear-swap-api/v1/swap_openorders", self.open_orders)
+        app.router.add_get("/linear-swap-notification", self.ws_handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def open_orders(self, request):
+        return web.json_response({"status": "ok", "data": {"orders": []}})
+
+    async def send(self, ws, data):
+        await ws.send_bytes(gzip.compress(json.dumps(data).encode()))
+
+    async def push(self, data):
+        for ws in self.sockets:
+            await self.send(ws, dict(data, op="notify"))
+
+    async def ws_handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        async for msg in ws:
+            data = json.loads(msg.data)
+            if data["op"] == "auth":
+                self.auths += 1
+                # Only the four auth params are signed, not `op` and `type`.
+                params = {name: data.get(name) for name in ("AccessKeyId", "SignatureMethod", "SignatureVersion",
+                                                            "Timestamp")}
+                signer = Signer.get("ws://127.0.0.1:%s" % self.port, "access", "secret")
+                ok = data.get("Signature") == signer.sign("GET", "/linear-swap-notification", params)
+                await self.send(ws, {"op": "auth", "err-code": 0 if ok else 2002})
+            elif data["op"] == "sub":
+                self.topics.append(data["topic"])
+                await self.send(ws, {"op": "sub", "topic": data["topic"], "err-code": 0})
+        return ws
+
+
+class TestNotificationSession(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.http = config.http
+        config.http = {"rate_limit": False}
+
+    def tearDown(self):
+        config.http = self.http
+        NotificationSession._SESSIONS.clear()
+        heartbeat.reset()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def test_shared_session(self):
+        gateway = MockNotification()
+        inited = []
+        updates = {"BTC-USDT": [], "ETH-USDT": []}
+
+        def create(symbol):
+            async def on_init(success, error):
+                inited.append((symbol, success, error))
+
+            async def on_order(order):
+                updates[symbol].append(("order", order.order_no))
+
+            async def on_position(position):
+                updates[symbol].append(("position", position.long_quantity))
+
+            async def on_asset(asset):
+                updates[symbol].append(("asset", sorted(asset.assets)))
+
+            return HuobiUsdtSwapTrade(account="test", strategy="test", symbol=symbol, contract_type="swap",
+                                      host="http://127.0.0.1:%s" % gateway.port,
+                                      wss="ws://127.0.0.1:%s" % gateway.port, access_key="access",
+                                      secret_key="secret", shared_notification=True, init_success_callback=on_init,
+                                      order_update_callback=on_order, position_update_callback=on_position,
+                                      asset_update_callback=on_asset)
+
+        async def run():
+            await gateway.start()
+            btc = create("BTC-USDT")
+            eth = create("ETH-USDT")
+            for _ in range(100):
+                if len(inited) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            order = {"topic": "orders.eth-usdt", "contract_code": "ETH-USDT", "order_id": 1, "client_order_id": None,
+                     "direction": "buy", "offset": "open", "order_type": 1, "order_price_type": "limit",
+                     "price": 100, "volume": 1, "status": 3, "trade_volume": 0, "trade_avg_price": None,
+                     "created_at": 1, "ts": 1}
+            await gateway.push(order)
+            await gateway.push(dict(order, contract_code="XRP-USDT"))
+            await gateway.push({"topic": "positions.*", "ts": 1, "data": [
+                {"contract_code": "BTC-USDT", "direction": "buy", "volume": 2, "cost_open": 10},
+                {"contract_code": "ETH-USDT", "direction": "buy", "volume": 3, "cost_open": 10}]})
+            await gateway.push({"topic": "accounts.*", "ts": 1, "data": [
+                {"contract_code": "BTC-USDT", "symbol": "BTC", "margin_balance": 1, "margin_available": 1,
+                 "margin_frozen": 0}]})
+            await asyncio.sleep(0.1)
+            stats = btc._session.stats()
+            self.assertIs(btc._session, eth._session)
+            await btc._session.close()
+            await AsyncHttpRequests.close()
+            await gateway.runner.cleanup()
+            return stats
+
+        stats = self.loop.run_until_complete(run())
+        self.assertEqual(sorted(inited), [("BTC-USDT", True, None), ("ETH-USDT", True, None)])
+        self.assertEqual(gateway.auths, 1)
+        self.assertEqual(sorted(gateway.topics), ["accounts.*", "orders.*", "positions.*"])
+        self.assertEqual(updates["BTC-USDT"], [("position", 2), ("asset", ["BTC"])])
+        self.assertEqual(updates["ETH-USDT"], [("order", "1"), ("position", 3)])
+        self.assertEqual(stats["contracts"], 2)
+        self.assertEqual(stats["messages"], 4)
+        self.assertEqual(stats["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,45 @@
+import sys
+import copy
+import unittest
+
+sys.path.append('..')
+from huobi.orderbook import Orderbook
+
+
+class TestOrderbook(unittest.TestCase):
+
+    def setUp(self):
+        self.orderbook = Orderbook.from_levels("huobi_usdt_swap", "BTC-USDT", [101, 102], [1, 2], [99, 98], [3, 4],
+                                               1000)
+
+    def test_accessors(self):
+        self.assertEqual(101, self.orderbook.best_ask)
+        self.assertEqual(99, self.orderbook.best_bid)
+        self.assertEqual(1, self.orderbook.best_ask_quantity)
+        self.assertEqual(3, self.orderbook.best_bid_quantity)
+        self.assertEqual(100, self.orderbook.mid)
+        self.assertEqual(2, self.orderbook.spread)
+        self.assertAlmostEqual((99 * 1 + 101 * 3) / 4, self.orderbook.microprice)
+
+    def test_string_view(self):
+        self.assertEqual([["101.00000000", "1.00000000"], ["102.00000000", "2.00000000"]], self.orderbook.asks)
+        self.assertEqual([["99.00000000", "3.00000000"], ["98.00000000", "4.00000000"]], self.orderbook.bids)
+        self.assertEqual("BTC-USDT", self.orderbook.data["symbol"])
+
+    def test_compatible_init(self):
+        asks = [["101.5", "1"]]
+        orderbook = Orderbook("huobi_swap", "BTC-USD", asks, [], 1)
+        self.assertIs(asks, orderbook.asks)
+        self.assertEqual(101.5, orderbook.best_ask)
+        self.assertIsNone(orderbook.best_bid)
+        self.assertIsNone(orderbook.mid)
+        self.assertEqual([], orderbook.bids)
+
+    def test_copy(self):
+        orderbook = copy.copy(self.orderbook)
+        self.assertEqual(self.orderbook.best_ask, orderbook.best_ask)
+        self.assertEqual(self.orderbook.asks, orderbook.asks)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+import sys
+import unittest
+
+sys.path.append('..')
+from huobi.orderstore import OrderStore
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+from huobi.order import Order, ORDER_ACTION_BUY, ORDER_ACTION_SELL, ORDER_STATUS_SUBMITTED, \
+    ORDER_STATUS_PARTIAL_FILLED, ORDER_STATUS_FILLED, ORDER_STATUS_CANCELED
+
+
+def order(order_no, action, price, client_order_id=None, status=ORDER_STATUS_SUBMITTED):
+    return Order(order_no=order_no, action=action, price=price, quantity=1, status=status,
+                 client_order_id=client_order_id, ctime=1, utime=1)
+
+
+class TestOrderStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = OrderStore(history_size=2)
+        for i, price in enumerate([100, 101, 102, 102, 103]):
+            self.store.put(order("b%d" % i, ORDER_ACTION_BUY, price, client_order_id=i))
+        self.store.put(order("s0", ORDER_ACTION_SELL, 105))
+        self.store.put(order("s1", ORDER_ACTION_SELL, "106.5"))
+
+    def nos(self, orders):
+        return [o.order_no for o in orders]
+
+    def test_lookup(self):
+        self.assertEqual(len(self.store), 7)
+        self.assertEqual(self.store.get("b1").price, 101)
+        self.assertEqual(self.store.get_by_client_order_id(3).order_no, "b3")
+        self.assertIsNone(self.store.get("x"))
+        self.assertIn("s0", self.store)
+
+    def test_price_queries(self):
+        self.assertEqual(self.nos(self.store.above(ORDER_ACTION_BUY, 101)), ["b4", "b2", "b3"])
+        self.assertEqual(self.nos(self.store.above(ORDER_ACTION_BUY, 101, inclusive=True)), ["b4", "b2", "b3", "b1"])
+        self.assertEqual(self.nos(self.store.below(ORDER_ACTION_BUY, 102)), ["b0", "b1"])
+        self.assertEqual(self.nos(self.store.below(ORDER_ACTION_SELL, 106.5, inclusive=True)), ["s0", "s1"])
+        self.assertEqual(self.nos(self.store.at_price(ORDER_ACTION_BUY, "102")), ["b2", "b3"])
+        self.assertEqual(self.nos(self.store.best(ORDER_ACTION_BUY)), ["b4"])
+        self.assertEqual(self.nos(self.store.best(ORDER_ACTION_SELL)), ["s0"])
+
+    def test_status_and_history(self):
+        o = self.store.get("b4")
+        o.status = ORDER_STATUS_PARTIAL_FILLED
+        self.store.put(o)
+        self.assertEqual(self.nos(self.store.by_status(ORDER_STATUS_PARTIAL_FILLED)), ["b4"])
+        self.assertNotIn("b4", self.nos(self.store.by_status(ORDER_STATUS_SUBMITTED)))
+
+        for order_no, status in (("b4", ORDER_STATUS_FILLED), ("b3", ORDER_STATUS_CANCELED),
+                                 ("b2", ORDER_STATUS_FILLED)):
+            o = self.store.get(order_no)
+            o.status = status
+            self.store.put(o)
+        self.assertEqual(len(self.store), 4)
+        self.assertNotIn("b4", self.store.open)
+        self.assertEqual(self.nos(self.store.above(ORDER_ACTION_BUY, 100)), ["b1"])
+        self.assertEqual(self.nos(self.store.history), ["b3", "b2"])
+        # b4 is evicted from history, b3 can still be found.
+        self.assertIsNone(self.store.get("b4"))
+        self.assertIsNone(self.store.get_by_client_order_id(4))
+        self.assertEqual(self.store.get_by_client_order_id(3).status, ORDER_STATUS_CANCELED)
+
+    def test_remove(self):
+        self.assertEqual(self.store.remove("b0").order_no, "b0")
+        self.assertIsNone(self.store.get_by_client_order_id(0))
+        self.assertEqual(self.nos(self.store.below(ORDER_ACTION_BUY, 102)), ["b1"])
+        self.assertIsNone(self.store.remove("b0"))
+
+    def test_platform_keeps_new_order(self):
+        """ A new order is stored by the platform even if its first push has an unhandled status. """
+        trade = HuobiUsdtSwapTrade.__new__(HuobiUsdtSwapTrade)
+        trade._platform = "huobi_usdt_swap"
+        trade._account = "test"
+        trade._strategy = "test"
+        trade._symbol = "BTC-USDT"
+        trade._contract_type = "swap"
+        trade._orders = OrderStore()
+        trade._update_order({"contract_code": "BTC-USDT", "order_id": 1, "client_order_id": 9, "status": 11,
+                             "direction": "buy", "offset": "open", "order_type": 1, "price": 100, "volume": 2})
+        self.assertEqual(trade.order_store.get("1").quantity, 2)
+        self.assertEqual(trade.order_store.get_by_client_order_id(9).order_no, "1")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+import sys
+import gzip
+import json
+import asyncio
+import unittest
+
+from aiohttp import web
+
+sys.path.append('..')
+from huobi.heartbeat import heartbeat
+from huobi.utils.request import AsyncHttpRequests
+from huobi.ordertransport import LatencyHistogram, WebsocketOrderTransport, OrderRouter
+from huobi.platforms.huobi_usdt_swap_api import HuobiUsdtSwapRestAPI
+
+
+class MockGateway:
+    """ REST order endpoint and websocket order gateway, websocket responses of odd cid are delayed and sent in gzip
+    binary frames, the others are sent in text frames.
+    """
+
+    def __init__(self):
+        self.rest_orders = 0
+        self.ws_orders = 0
+        self.runner = None
+        self.port = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/linear-swap-api/v1/swap_order", self.rest_order)
+        app.router.add_get("/linear-swap-order", self.ws_handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def rest_order(self, request):
+        self.rest_orders += 1
+        body = await request.json()
+        return web.json_response({"status": "ok", "data": {"order_id": body["client_order_id"], "via": "rest"}})
+
+    async def ws_handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async def reply(data):
+            if int(data["cid"]) % 2:
+                await asyncio.sleep(0.02)
+            self.ws_orders += 1
+            result = {"op": "req", "cid": data["cid"], "status": "ok",
+                      "data": {"order_id": data["data"]["client_order_id"], "via": "websocket"}}
+            if int(data["cid"]) % 2:
+                await ws.send_bytes(gzip.compress(json.dumps(result).encode()))
+            else:
+                await ws.send_str(json.dumps(result))
+
+        async for msg in ws:
+            data = json.loads(msg.data)
+            if data["op"] == "auth":
+                ok = "Signature" in data and data["AccessKeyId"] == "access"
+                await ws.send_bytes(gzip.compress(json.dumps({"op": "auth", "err-code": 0 if ok else 2002}).encode()))
+            elif data["op"] == "req":
+                asyncio.ensure_future(reply(data))
+        return ws
+
+
+class TestOrderTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        heartbeat.reset()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.record(i / 1000)
+        stats = histogram.stats()
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["mean"], 50.5)
+        self.assertTrue(50 <= stats["p50"] <= 50 * 1.2, stats)
+        self.assertTrue(99 <= stats["p99"] <= 100, stats)
+        self.assertEqual(stats["max"], 100)
+        self.assertEqual(LatencyHistogram().stats(), {"count": 0})
+
+    def test_websocket_and_fallback(self):
+        async def run():
+            gateway = MockGateway()
+            await gateway.start()
+            transport = WebsocketOrderTransport("ws://127.0.0.1:%s/linear-swap-order" % gateway.port, "access",
+                                                "secret")
+            router = OrderRouter(transport)
+            rest_api = HuobiUsdtSwapRestAPI("access", "secret", "http://127.0.0.1:%s" % gateway.port, router)
+            # Another client of the same account is not routed.
+            other_api = HuobiUsdtSwapRestAPI("access", "secret", "http://127.0.0.1:%s" % gateway.port)
+
+            # Not authorized yet, sent by REST.
+            first = await rest_api.create_order("BTC-USDT", 1, 1, "buy", "open", 20, "limit", 100)
+            for _ in range(100):
+                if transport.ready:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertTrue(transport.ready)
+
+            # Pipelined, responses are out of order.
+            results = await asyncio.gather(*[rest_api.create_order("BTC-USDT", 1, 1, "buy", "open", 20, "limit", i)
+                                             for i in range(1, 11)])
+            other = await other_api.create_order("BTC-USDT", 1, 1, "buy", "open", 20, "limit", 200)
+            await transport.close()
+            await AsyncHttpRequests.close()
+            await gateway.stop()
+            return gateway, router, first, results, other
+
+        gateway, router, first, results, other = self.loop.run_until_complete(run())
+        self.assertEqual(first[0]["data"]["via"], "rest")
+        self.assertEqual(other[0]["data"]["via"], "rest")
+        self.assertEqual([r[0]["data"]["order_id"] for r in results], list(range(1, 11)))
+        self.assertTrue(all(r[0]["data"]["via"] == "websocket" for r in results))
+        self.assertEqual(gateway.rest_orders, 2)
+        self.assertEqual(gateway.ws_orders, 10)
+        stats = router.stats()
+        self.assertEqual(stats["fallbacks"], 1)
+        self.assertEqual(stats["rest"]["count"], 1)
+        self.assertEqual(stats["websocket"]["count"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+import sys
+import time
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.utils.ratelimit import RateLimiter, TokenBucket, PRIORITY_TRADE, PRIORITY_QUERY
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_burst_then_wait(self):
+        async def run():
+            bucket = TokenBucket("test", 5, 0.1)
+            waits = [await bucket.acquire() for _ in range(7)]
+            return bucket, waits
+        bucket, waits = self.loop.run_until_complete(run())
+        self.assertEqual(waits[:5], [0] * 5)
+        self.assertGreater(waits[5], 0.01)
+        stats = bucket.stats()
+        self.assertEqual(stats["query"]["acquired"], 7)
+        self.assertEqual(stats["query"]["waited"], 2)
+        self.assertGreater(stats["query"]["wait_time"], 0)
+        self.assertEqual(stats["waiting"], 0)
+
+    def test_trade_before_query(self):
+        order = []
+
+        async def request(bucket, priority, name):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        async def run():
+            bucket = TokenBucket("test", 1, 0.02)
+            await bucket.acquire()
+            tasks = [asyncio.ensure_future(request(bucket, PRIORITY_QUERY, "query%s" % i)) for i in range(3)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.ensure_future(request(bucket, PRIORITY_TRADE, "trade")))
+            await asyncio.gather(*tasks)
+        self.loop.run_until_complete(run())
+        self.assertEqual(order[0], "trade")
+        self.assertEqual(order[1:], ["query0", "query1", "query2"])
+
+    def test_cancelled_waiter(self):
+        async def run():
+            bucket = TokenBucket("test", 1, 0.02)
+            await bucket.acquire()
+            task = asyncio.ensure_future(bucket.acquire())
+            await asyncio.sleep(0)
+            task.cancel()
+            wait = await bucket.acquire()
+            return wait
+        self.assertLess(self.loop.run_until_complete(run()), 0.1)
+
+    def test_headers(self):
+        async def run():
+            bucket = TokenBucket("test", 72, 3)
+            bucket.update({"Ratelimit-Limit": "36", "Ratelimit-Interval": "3000", "Ratelimit-Remaining": "2"})
+            return bucket.stats()
+        stats = self.loop.run_until_complete(run())
+        self.assertEqual(stats["limit"], 36)
+        self.assertEqual(stats["interval"], 3)
+        self.assertLess(stats["tokens"], 2.1)
+
+    def test_rate_limited_error(self):
+        async def run():
+            bucket = TokenBucket("test", 10, 1)
+            reset = int((time.time() + 0.05) * 1000)
+            bucket.update({"ratelimit-reset": str(reset)}, {"status": "error", "err_code": 1032})
+            wait = await bucket.acquire()
+            return bucket, wait
+        bucket, wait = self.loop.run_until_complete(run())
+        self.assertGreater(wait, 0.03)
+        self.assertEqual(bucket.stats()["throttled"], 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_shared_buckets(self):
+        a = RateLimiter.get("https://api.hbdm.com/swap-api/v1/swap_order", "key-a", True)
+        b = RateLimiter.get("https://api.hbdm.com/linear-swap-api/v1/swap_order", "key-a", True)
+        c = RateLimiter.get("https://api.hbdm.com/swap-api/v1/swap_order", "key-b", True)
+        d = RateLimiter.get("https://api.hbdm.com/swap-ex/market/depth", "key-a", False)
+        e = RateLimiter.get("https://api.hbdm.com/market/history/kline", None, False)
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertIsNot(a, d)
+        self.assertIs(d, e)
+
+    def test_priority(self):
+        for uri in ("/linear-swap-api/v1/swap_order", "/swap-api/v1/swap_batchorder", "/api/v1/contract_cancel",
+                    "/linear-swap-api/v1/swap_cross_cancelall", "/linear-swap-api/v1/swap_trigger_order",
+                    "/swap-api/v1/swap_lightning_close_position"):
+            self.assertEqual(RateLimiter.priority(uri), PRIORITY_TRADE, uri)
+        for uri in ("/linear-swap-api/v1/swap_order_info", "/api/v1/contract_order_detail",
+                    "/swap-api/v1/swap_openorders", "/swap-api/v1/swap_hisorders", "/swap-api/v1/swap_account_info"):
+            self.assertEqual(RateLimiter.priority(uri), PRIORITY_QUERY, uri)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+import os
+import sys
+import gzip
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.append('..')
+from huobi.config import config
+from huobi.utils.recorder import FrameRecorder, FrameReader
+
+
+MARKET = "wss://api.hbdm.com/linear-swap-ws"
+NOTIFICATION = "wss://api.hbdm.com/linear-swap-notification"
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_roundtrip(self):
+        recorder = FrameRecorder(self.path)
+        frames = []
+        for i in range(1000):
+            url = MARKET if i % 3 else NOTIFICATION
+            data = gzip.compress(b'{"seq": %d}' % i)
+            frames.append((url, data))
+            recorder.record(url, data)
+        recorder.close()
+        self.assertEqual(recorder.stats()["written"], 1000)
+        self.assertEqual(recorder.stats()["pending"], 0)
+        result = list(FrameReader(self.path))
+        self.assertEqual([(url, data) for _, url, data in result], frames)
+        times = [ts for ts, _, _ in result]
+        self.assertEqual(times, sorted(times))
+        notifications = list(FrameReader(self.path).read(urls=[NOTIFICATION]))
+        self.assertEqual(len(notifications), 334)
+
+    def test_rotate_and_seek(self):
+        recorder = FrameRecorder(self.path, segment_size=2000, index_interval=0.001)
+        for i in range(200):
+            recorder.record(MARKET if i % 2 else NOTIFICATION, b"x" * 50 + b"%03d" % i)
+            if i % 20 == 0:
+                recorder.flush()
+                time.sleep(0.002)
+        recorder.close()
+        reader = FrameReader(self.path)
+        self.assertGreater(len(reader.segments()), 3)
+        frames = list(reader)
+        self.assertEqual([data[-3:] for _, _, data in frames], [b"%03d" % i for i in range(200)])
+        start, end = frames[95][0], frames[150][0]
+        part = list(reader.read(start, end))
+        self.assertEqual(part, [f for f in frames if start <= f[0] < end])
+        self.assertTrue(all(url in (MARKET, NOTIFICATION) for _, url, _ in part))
+        self.assertEqual(reader.time_range(), (frames[0][0], frames[-1][0]))
+        self.assertEqual(FrameReader(self.path, "empty").time_range(), (None, None))
+
+    def test_truncated_tail(self):
+        recorder = FrameRecorder(self.path)
+        for i in range(10):
+            recorder.record(MARKET, b"frame%d" % i)
+        recorder.close()
+        segment = FrameReader(self.path).segments()[0]
+        with open(segment, "r+b") as f:
+            f.truncate(os.path.getsize(segment) - 3)
+        self.assertEqual(len(list(FrameReader(self.path))), 9)
+
+    def test_config(self):
+        config.recorder = {"path": self.path, "urls": ["/linear-swap-ws"]}
+        try:
+            recorder = FrameRecorder.get(MARKET)
+            self.assertIsNotNone(recorder)
+            self.assertIs(FrameRecorder.get(MARKET), recorder)
+            self.assertIsNone(FrameRecorder.get(NOTIFICATION))
+            recorder.close()
+        finally:
+            config.recorder = None
+            FrameRecorder._DEFAULT = None
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
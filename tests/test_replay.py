@@ -0,0 +1,167 @@
+import sys
+import gzip
+import json
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+sys.path.append('..')
+from huobi import const
+from huobi.trade import Trade
+from huobi.market import Market
+from huobi.replay import Replay
+from huobi.config import config
+from huobi.utils import tools
+from huobi.utils.websocket import Websocket
+from huobi.tasks import LoopRunTask, SingleTask
+from huobi.utils.recorder import FrameRecorder
+from huobi.order import ORDER_ACTION_SELL, ORDER_STATUS_FILLED
+
+URL = "wss://api.hbdm.com/linear-swap-ws"
+START = 1600000000000  # ms
+
+
+def frame(data):
+    return gzip.compress(json.dumps(data).encode())
+
+
+def record(path, seconds):
+    """ One depth frame every 100ms and one trade frame every second, a ping every 5 seconds. """
+    recorder = FrameRecorder(path)
+    for i in range(seconds * 10):
+        ts = START + i * 100
+        recorder.record(URL, frame({"ch": "market.BTC-USDT.depth.step6", "ts": ts,
+                                    "tick": {"asks": [[10001 + i, 1]], "bids": [[10000 + i, 2]], "ts": ts}}),
+                        ts * 1000000)
+        if i % 10 == 0:
+            recorder.record(URL, frame({"ch": "market.BTC-USDT.trade.detail", "ts": ts, "tick": {"data": [
+                {"direction": "buy", "price": 10000 + i, "amount": 1, "ts": ts}]}}), ts * 1000000 + 1)
+        if i % 50 == 0:
+            recorder.record(URL, frame({"ping": ts}), ts * 1000000 + 2)
+    recorder.close()
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.replay = None
+
+    def tearDown(self):
+        if self.replay:
+            self.replay.close()
+        asyncio.set_event_loop(None)
+        shutil.rmtree(self.path)
+
+    def run_replay(self, seconds, speed=None, start=None):
+        record(self.path, seconds)
+        self.replay = replay = Replay(self.path, speed=speed, start=start)
+        asyncio.set_event_loop(replay.loop)
+        orderbooks, trades, ticks, later = [], [], [], []
+
+        async def on_orderbook(orderbook):
+            # The callback runs at the receive time of the frame.
+            orderbooks.append((orderbook.timestamp, tools.get_cur_timestamp_ms()))
+
+        async def on_trade(trade):
+            trades.append(trade.price)
+            SingleTask.call_later(on_later, 0.05, trade.timestamp)
+
+        async def on_later(ts):
+            later.append(tools.get_cur_timestamp_ms() - ts)
+
+        async def on_tick(*args, **kwargs):
+            ticks.append(tools.get_cur_timestamp_ms())
+
+        async def setup():
+            market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook", "trade"], 10, 100, 100, 100,
+                            "wss://api.hbdm.com", orderbook_update_callback=on_orderbook,
+                            trade_update_callback=on_trade)
+            LoopRunTask.register(on_tick, 1)
+            return market
+
+        market = replay.loop.run_until_complete(setup())
+        replay.add(market)
+        stats = replay.loop.run_until_complete(replay.run())
+        return stats, orderbooks, trades, ticks, later
+
+    def test_fast(self):
+        stats, orderbooks, trades, ticks, later = self.run_replay(60)
+        self.assertEqual(stats["frames"], 60 * 10 + 60 + 12)
+        self.assertEqual(len(orderbooks), 600)
+        self.assertTrue(all(ts == now for ts, now in orderbooks), orderbooks[:3])
+        self.assertEqual(len(trades), 60)
+        self.assertEqual(later, [50] * 60)
+        # The loop run task follows replay time: once every replay second.
+        self.assertIn(len(ticks), (59, 60))
+        self.assertEqual(ticks[0], START + 1000)
+        self.assertAlmostEqual(stats["replay_seconds"], 59.9, places=3)
+        self.assertGreater(stats["speedup"], 10)
+
+    def test_speed_and_start(self):
+        stats, orderbooks, _, _, _ = self.run_replay(2, speed=20, start=START + 1000)
+        self.assertEqual(len(orderbooks), 10)
+        self.assertEqual(orderbooks[0][0], START + 1000)
+        # 0.9 replay seconds at 20x real time.
+        self.assertTrue(0.03 < stats["real_seconds"] < 0.5, stats)
+
+    def run_simulated(self, latency):
+        record(self.path, 1)
+        self.replay = replay = Replay(self.path)
+        asyncio.set_event_loop(replay.loop)
+        orders = []
+
+        async def on_orderbook(orderbook):
+            if orderbook.timestamp == START:
+                # Open short at the best ask, the bids of the next book cross it.
+                await trader.create_order(ORDER_ACTION_SELL, orderbook.best_ask, -1)
+
+        async def on_order(order):
+            orders.append(order)
+
+        async def setup():
+            trader = Trade("test", const.SIMULATED, "BTC-USDT", account="sim", latency=latency,
+                           order_update_callback=on_order)
+            market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook"], 10, 100, 100, 100,
+                            "wss://api.hbdm.com", orderbook_update_callback=on_orderbook)
+            return trader, market
+
+        trader, market = replay.loop.run_until_complete(setup())
+        replay.add(trader)
+        replay.add(market)
+        replay.loop.run_until_complete(replay.run())
+        return orders[-1]
+
+    def test_close_restores(self):
+        record(self.path, 1)
+        heartbeat_config = config.heartbeat
+        config.heartbeat = {"interval": 3, "spin": 0.002}
+        try:
+            self.replay = Replay(self.path)
+            self.assertEqual(config.heartbeat, {"interval": 3, "spin": 0})
+            self.assertTrue(Websocket.offline)
+            self.assertEqual(tools.get_cur_timestamp_ms(), START)
+            self.replay.close()
+            self.assertEqual(config.heartbeat, {"interval": 3, "spin": 0.002})
+            self.assertFalse(Websocket.offline)
+            self.assertGreater(tools.get_cur_timestamp_ms(), START + 86400000)
+        finally:
+            config.heartbeat = heartbeat_config
+
+    def test_simulated_trade(self):
+        # The order arrives before the next book, and is filled by the book at its price.
+        order = self.run_simulated(0.05)
+        self.assertEqual((order.status, order.role, order.avg_price), (ORDER_STATUS_FILLED, "maker", 10001))
+        self.assertEqual((order.ctime, order.utime), (START, START + 100))
+        self.replay.close()
+        shutil.rmtree(self.path)
+        self.path = tempfile.mkdtemp()
+        # The order arrives after the next book, and takes the crossing bid.
+        order = self.run_simulated(0.15)
+        self.assertEqual((order.status, order.role, order.avg_price), (ORDER_STATUS_FILLED, "taker", 10001))
+        self.assertEqual(order.utime, START + 150)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
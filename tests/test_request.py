@@ -0,0 +1,109 @@
+import sys
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+sys.path.append('..')
+from huobi.config import config
+from huobi.utils.request import AsyncHttpRequests
+
+
+class TestAsyncHttpRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.inflight = 0
+        self.max_inflight = 0
+
+    def tearDown(self):
+        self.loop.run_until_complete(AsyncHttpRequests.close())
+        self.loop.close()
+
+    async def start_server(self):
+        """ Local server, `/slow` holds the request for a while and records the requests in flight. """
+        async def fast(request):
+            return web.json_response({"status": "ok"})
+
+        async def slow(request):
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+            await asyncio.sleep(0.02)
+            self.inflight -= 1
+            return web.json_response({"status": "ok"})
+
+        app = web.Application()
+        app.router.add_get("/fast", fast)
+        app.router.add_get("/slow", slow)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        return runner, "http://127.0.0.1:%d" % port
+
+    def test_keepalive_reuse(self):
+        async def run():
+            runner, host = await self.start_server()
+            results = [await AsyncHttpRequests.get(host + "/fast") for _ in range(5)]
+            session = AsyncHttpRequests._get_session(host)
+            stats = AsyncHttpRequests.stats(host + "/fast")
+            await AsyncHttpRequests.close()
+            await runner.cleanup()
+            return results, session, stats
+
+        results, session, stats = self.loop.run_until_complete(run())
+        self.assertEqual([r[1] for r in results], [{"status": "ok"}] * 5)
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_created"], 1)
+        self.assertEqual(stats["connections_reused"], 4)
+        self.assertEqual(stats["inflight"], 0)
+        # close() drops and closes the pooled sessions.
+        self.assertTrue(session.closed)
+        self.assertEqual(AsyncHttpRequests._SESSIONS, {})
+        self.assertEqual(AsyncHttpRequests._SEMAPHORES, {})
+
+    def test_max_inflight_per_host(self):
+        async def run():
+            runner, host = await self.start_server()
+            tasks = [asyncio.ensure_future(AsyncHttpRequests.get(host + "/slow")) for _ in range(10)]
+            await asyncio.sleep(0.005)
+            waiting = AsyncHttpRequests.stats(host)["waiting"]
+            results = await asyncio.gather(*tasks)
+            stats = AsyncHttpRequests.stats(host)
+            await AsyncHttpRequests.close()
+            await runner.cleanup()
+            return results, waiting, stats
+
+        with mock.patch.object(config, "http", {"max_inflight_per_host": 3}):
+            results, waiting, stats = self.loop.run_until_complete(run())
+        self.assertTrue(all(r[1] == {"status": "ok"} for r in results))
+        self.assertEqual(self.max_inflight, 3)
+        self.assertEqual(waiting, 7)
+        self.assertEqual(stats["inflight"], 0)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertLessEqual(stats["connections_created"], 3)
+
+    def test_new_session_after_close(self):
+        async def run():
+            runner, host = await self.start_server()
+            await AsyncHttpRequests.get(host + "/fast")
+            first = AsyncHttpRequests._get_session(host)
+            await AsyncHttpRequests.close()
+            code, result, error = await AsyncHttpRequests.get(host + "/fast")
+            second = AsyncHttpRequests._get_session(host)
+            await AsyncHttpRequests.close()
+            await runner.cleanup()
+            return first, second, code, error
+
+        first, second, code, error = self.loop.run_until_complete(run())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertEqual(code, 200)
+        self.assertIsNone(error)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
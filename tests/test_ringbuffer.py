@@ -0,0 +1,60 @@
+import sys
+import unittest
+
+sys.path.append('..')
+from huobi.utils.ringbuffer import RingBuffer, BufferWrappedError
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_wrap_around(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(i)
+        view = buffer.view()
+        self.assertEqual(3, len(view))
+        self.assertEqual((2, 4), (view[0], view[-1]))
+        self.assertEqual([3, 4], view.last(2))
+        self.assertEqual([2, 3, 4], list(view))
+        self.assertEqual([2, 3, 4], list(buffer.copy()))
+        self.assertEqual(3, buffer.copy().maxlen)
+        self.assertEqual((5, 2), (view.seq, view.first_seq))
+        with self.assertRaises(BufferWrappedError):
+            view.get(1)
+        with self.assertRaises(IndexError):
+            view.get(5)
+        self.assertFalse(hasattr(view, "append"))
+
+    def test_iter_from(self):
+        buffer = RingBuffer(3)
+        buffer.append(0)
+        it = buffer.iter_from(0)
+        self.assertEqual(0, next(it))
+        buffer.append(1)
+        self.assertEqual(1, next(it))
+        for i in range(2, 6):
+            buffer.append(i)
+        with self.assertRaises(BufferWrappedError):
+            next(it)
+
+    def test_iter_detects_wrap(self):
+        buffer = RingBuffer(3)
+        for i in range(3):
+            buffer.append(i)
+        it = iter(buffer.view())
+        self.assertEqual(0, next(it))
+        buffer.append(3)
+        buffer.append(4)
+        with self.assertRaises(BufferWrappedError):
+            next(it)
+
+    def test_unlimited(self):
+        buffer = RingBuffer(None)
+        for i in range(5):
+            buffer.append(i)
+        self.assertEqual([0, 1, 2, 3, 4], list(buffer.copy()))
+        self.assertEqual(4, buffer[-1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
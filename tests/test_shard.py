@@ -0,0 +1,98 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.utils.shard import ShardManager
+
+
+class FakeConnection:
+
+    def __init__(self, manager, index, url, send_hb_interval=5):
+        self.index = index
+        self.channels = {}
+        self.connected = True
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(data)
+
+
+class FakeManager(ShardManager):
+    connection_class = FakeConnection
+
+
+class Listener:
+
+    def __init__(self):
+        self.received = []
+
+    async def process_data(self, data):
+        self.received.append(data)
+
+
+class TestShardManager(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        for t in asyncio.all_tasks(self.loop):
+            t.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def create_manager(self, **kwargs):
+        async def do():
+            return FakeManager("wss://test", **kwargs)
+        return self.run_async(do())
+
+    def subscribe(self, manager, listener, channels):
+        async def do():
+            for channel in channels:
+                manager.subscribe(channel, {"sub": channel}, listener)
+            await asyncio.sleep(0)
+        self.run_async(do())
+
+    def test_spread_and_share(self):
+        manager = self.create_manager(shards=2)
+        a, b = Listener(), Listener()
+        self.subscribe(manager, a, ["c1", "c2", "c3", "c4"])
+        self.subscribe(manager, b, ["c1"])
+        self.assertEqual([2, 2], [s["channels"] for s in manager.stats()])
+        self.assertEqual(1, sum(shard.sent.count({"sub": "c1"}) for shard in manager._shards))
+        owner = manager._owners["c1"]
+        other = [shard for shard in manager._shards if shard is not owner][0]
+        self.run_async(manager.dispatch(owner, "c1", {"ch": "c1"}))
+        self.run_async(manager.dispatch(other, "c1", {"ch": "c1"}))
+        self.assertEqual([{"ch": "c1"}], a.received)
+        self.assertEqual([{"ch": "c1"}], b.received)
+
+    def test_move_saturated(self):
+        manager = self.create_manager(shards=2, max_rate=100)
+        listener = Listener()
+        self.subscribe(manager, listener, ["c1", "c2", "c3", "c4"])
+        hot = manager._owners["c1"]
+        cool = [shard for shard in manager._shards if shard is not hot][0]
+        hot_channels = [c for c, s in manager._owners.items() if s is hot]
+        manager._counts[hot_channels[0]] = 1000
+        manager._counts[hot_channels[1]] = 300
+        manager._last_rebalance -= 1
+        self.run_async(manager._rebalance())
+        self.assertEqual(1, len(manager._moving))
+        channel = list(manager._moving)[0]
+        self.assertIn(channel, hot_channels)
+        self.assertEqual({"sub": channel}, cool.sent[-1])
+        self.assertIs(hot, manager._owners[channel])
+
+        self.run_async(manager.on_subbed(cool, channel))
+        self.assertIs(cool, manager._owners[channel])
+        self.assertEqual({"unsub": channel}, hot.sent[-1])
+        self.assertNotIn(channel, hot.channels)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,50 @@
+import sys
+import hmac
+import base64
+import hashlib
+import unittest
+import urllib.parse
+from unittest import mock
+
+sys.path.append('..')
+from huobi.utils import signer as signer_module
+from huobi.utils.signer import Signer, utc_timestamp
+
+
+def legacy_sign(host, secret_key, method, params, request_path):
+    host_url = urllib.parse.urlparse(host).hostname.lower()
+    sorted_params = sorted(params.items(), key=lambda d: d[0], reverse=False)
+    payload = "\n".join([method, host_url, request_path, urllib.parse.urlencode(sorted_params)])
+    digest = hmac.new(secret_key.encode("utf8"), payload.encode("UTF8"), digestmod=hashlib.sha256).digest()
+    return base64.b64encode(digest).decode()
+
+
+class TestSigner(unittest.TestCase):
+
+    def test_same_as_legacy(self):
+        signer = Signer("https://API.hbdm.com", "access", "secret")
+        params = signer.auth_params()
+        params.update({"contract_code": "BTC-USDT", "price": 10000.5, "volume": 1, "client_order_id": None,
+                       "note": "a b&c=d/"})
+        self.assertEqual(signer.sign("POST", "/linear-swap-api/v1/swap_order", params),
+                         legacy_sign("https://api.hbdm.com", "secret", "POST", params,
+                                     "/linear-swap-api/v1/swap_order"))
+
+    def test_shared(self):
+        a = Signer.get("https://api.hbdm.com", "access", "secret")
+        b = Signer.get("https://api.hbdm.com/", "access", "secret")
+        c = Signer.get("wss://api.hbdm.com", "access", "secret")
+        d = Signer.get("https://api.hbdm.com", "other", "secret")
+        self.assertIs(a, b)
+        self.assertIs(a, c)
+        self.assertIsNot(a, d)
+
+    def test_timestamp(self):
+        with mock.patch.object(signer_module.time, "time", return_value=1600000000.5):
+            self.assertEqual(utc_timestamp(), "2020-09-13T12:26:40")
+        with mock.patch.object(signer_module.time, "time", return_value=1600000001.0):
+            self.assertEqual(utc_timestamp(), "2020-09-13T12:26:41")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,112 @@
+import os
+import sys
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.append('..')
+from huobi import const
+from huobi.trade import Trade
+from huobi.market import Market
+from huobi.order import ORDER_ACTION_SELL
+from huobi.utils.recorder import FrameRecorder
+from huobi.sweep import Sweep, grid, random_search, daily_periods
+
+URL = "wss://api.hbdm.com/linear-swap-ws"
+DAY = 1600041600000  # 2020-09-14 00:00:00 UTC
+
+
+def record(path):
+    """ Two hours of each of two days, the price goes up by 1 every second. """
+    recorder = FrameRecorder(path)
+    for day in range(2):
+        for i in range(7200):
+            ts = DAY + day * 86400000 + i * 1000
+            price = 10000 + i
+            recorder.record(URL, gzip.compress(json.dumps({"ch": "market.BTC-USDT.depth.step6", "ts": ts, "tick": {
+                "asks": [[price + 1, 10]], "bids": [[price, 10]], "ts": ts}}).encode()), ts * 1000000)
+    recorder.close()
+
+
+async def backtest(replay, params):
+    """ Sell at the best ask plus `spread` once, the rising price fills it. """
+    state = {}
+
+    async def on_orderbook(orderbook):
+        if not state:
+            state["price"] = orderbook.best_ask + params["spread"]
+            await trader.create_order(ORDER_ACTION_SELL, state["price"], -params["quantity"])
+
+    trader = Trade("sweep", const.SIMULATED, "BTC-USDT", account="sim", contract_size=1, maker_fee=0)
+    market = Market(const.HUOBI_USDT_SWAP, ["BTC-USDT"], ["orderbook"], 10, 100, 100, 100, "wss://api.hbdm.com",
+                    orderbook_update_callback=on_orderbook)
+    if params["spread"] < 0:
+        raise ValueError("negative spread")
+    replay.add(trader)
+    replay.add(market)
+    stats = await replay.run()
+    result = trader.simulation_stats()
+    result["frames"] = stats["frames"]
+    return result
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_params(self):
+        self.assertEqual(grid(spread=[1, 2], quantity=[1, 5]), [
+            {"spread": 1, "quantity": 1}, {"spread": 1, "quantity": 5},
+            {"spread": 2, "quantity": 1}, {"spread": 2, "quantity": 5}])
+        params = random_search(20, seed=1, spread=(0.5, 3.0), delta_limit=(1, 5), quantity=[1, 2, 5])
+        self.assertEqual(params, random_search(20, seed=1, spread=(0.5, 3.0), delta_limit=(1, 5), quantity=[1, 2, 5]))
+        for p in params:
+            self.assertTrue(0.5 <= p["spread"] <= 3.0)
+            self.assertIn(p["delta_limit"], range(1, 6))
+            self.assertIn(p["quantity"], (1, 2, 5))
+
+    def test_sweep(self):
+        record(self.path)
+        periods = daily_periods(self.path)
+        self.assertEqual(periods, [(DAY, DAY + 86400000), (DAY + 86400000, DAY + 2 * 86400000)])
+        csv_path = os.path.join(self.path, "result.csv")
+        rows = []
+        sweep = Sweep(backtest, self.path, grid(spread=[-1, 10, 100], quantity=[1, 2]), periods, workers=2)
+        table = sweep.run(on_result=rows.append, csv_path=csv_path)
+        self.assertEqual(len(table), 12)
+        self.assertEqual(len(rows), 12)
+        ok = [row for row in table.rows if not row["error"]]
+        self.assertEqual(len(ok), 8)
+        self.assertTrue(all(row["frames"] == 7200 for row in ok))
+        # Filled at 10 above the first ask, marked by the mid price of the last book.
+        row = [row for row in ok if row["spread"] == 10 and row["quantity"] == 2][0]
+        self.assertEqual(row["short_quantity"], 2)
+        self.assertAlmostEqual(row["unrealized_pnl"], -2 * (17199.5 - 10011))
+
+        summary = table.summary("equity")
+        self.assertEqual([(r["spread"], r["quantity"]) for r in summary.rows][:2], [(100, 1), (10, 1)])
+        self.assertEqual(summary.rows[-1]["errors"], 2)
+        self.assertIsNone(summary.rows[-1]["mean"])
+        self.assertIn("ValueError", table.format(sort="spread", reverse=False).splitlines()[1])
+        with open(csv_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 13)
+        self.assertTrue(lines[0].startswith("spread,quantity,start,end,orders"))
+
+        # A rerun appends to the earlier results under the same header.
+        Sweep(backtest, self.path, [{"spread": 10, "quantity": 3}], periods[:1], workers=1).run(csv_path=csv_path)
+        with open(csv_path) as f:
+            rerun = f.read().splitlines()
+        self.assertEqual(rerun[:13], lines)
+        self.assertEqual(len(rerun), 14)
+        self.assertTrue(rerun[13].startswith("10,3,%d,%d," % periods[0]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+import sys
+import asyncio
+import unittest
+
+sys.path.append('..')
+from huobi.trade import Trade, OrderBatcher
+from huobi.order import ORDER_ACTION_BUY, ORDER_ACTION_SELL, ORDER_TYPE_LIMIT
+from huobi.platforms.huobi_usdt_swap_trade import HuobiUsdtSwapTrade
+
+
+class FakePlatform:
+    """ The order with price 0 is rejected, the order id 13 can't be canceled. """
+
+    def __init__(self):
+        self.calls = []
+        self.next_id = 100
+
+    async def create_order(self, action, price, quantity, order_type=ORDER_TYPE_LIMIT, client_order_id=None, *args,
+                           **kwargs):
+        self.calls.append(("create_order", price))
+        self.next_id += 1
+        return str(self.next_id), None
+
+    async def _create_orders_indexed(self, orders, *args, **kwargs):
+        self.calls.append(("create_orders", [o["price"] for o in orders]))
+        self.lever_rates = [o.get("lever_rate") for o in orders]
+        order_nos, errors = [], []
+        for index, order in enumerate(orders, 1):
+            if order["price"] == 0:
+                errors.append({"index": index, "err_code": 1050, "err_msg": "price error"})
+            else:
+                self.next_id += 1
+                order_nos.append((index, self.next_id))
+        # The exchange doesn't promise the order of the successful orders.
+        return order_nos[::-1], errors
+
+    async def revoke_order(self, *order_nos):
+        self.calls.append(("revoke_order", order_nos))
+        if len(order_nos) == 1:
+            return order_nos[0], None
+        errors = [{"order_id": str(no), "err_code": 1071, "err_msg": "canceled"} for no in order_nos if no == "13"]
+        if errors:
+            return False, errors
+        return {"successes": ",".join(order_nos)}, None
+
+
+class FakeRestAPI:
+    """ The batch order response of the exchange, the successful orders are not in the order of request. """
+
+    async def create_orders(self, data):
+        self.orders_data = data["orders_data"]
+        return {"status": "ok", "data": {
+            "errors": [{"index": 2, "err_code": 1050, "err_msg": "price error"}],
+            "success": [{"index": 3, "order_id": 203, "order_id_str": "203"},
+                        {"index": 1, "order_id": 201, "order_id_str": "201"}]}}, None
+
+
+class TestOrderBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def create_trade(self, order_batch):
+        async def on_init(success, error):
+            pass
+
+        async def create():
+            trade = Trade(platform="fake", order_batch=order_batch, init_success_callback=on_init)
+            trade._t = FakePlatform()
+            return trade
+        return self.loop.run_until_complete(create())
+
+    def test_create_orders_batched(self):
+        trade = self.create_trade({"window": 0.005})
+
+        async def run():
+            return await asyncio.gather(
+                trade.create_order(ORDER_ACTION_BUY, 1, 1),
+                trade.create_order(ORDER_ACTION_SELL, 0, 1, lever_rate=10),
+                trade.create_order(ORDER_ACTION_BUY, 3, 1, client_order_id=7))
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(trade._t.calls, [("create_orders", [1, 0, 3])])
+        self.assertEqual(trade._t.lever_rates, [None, 10, None])
+        self.assertEqual(results[0], ("101", None))
+        self.assertIsNone(results[1][0])
+        self.assertEqual(results[1][1]["err_code"], 1050)
+        self.assertEqual(results[2], ("102", None))
+        self.assertEqual(trade.order_batch_stats()["order"], {"batches": 1, "requests": 3, "pending": 0})
+
+    def test_max_size_and_single(self):
+        trade = self.create_trade({"window": 10, "max_size": 2})
+
+        async def run():
+            first = await asyncio.gather(trade.create_order(ORDER_ACTION_BUY, 1, 1),
+                                         trade.create_order(ORDER_ACTION_BUY, 2, 1))
+            # Not batchable kwargs are sent at once.
+            second = await trade.create_order(ORDER_ACTION_BUY, 3, 1, other=1)
+            return first, second
+        first, second = self.loop.run_until_complete(run())
+        self.assertEqual(trade._t.calls, [("create_orders", [1, 2]), ("create_order", 3)])
+        self.assertEqual(first, [("101", None), ("102", None)])
+        self.assertEqual(second, ("103", None))
+
+    def test_single_order_window(self):
+        trade = self.create_trade(True)
+        result = self.loop.run_until_complete(trade.create_order(ORDER_ACTION_BUY, 1, 1))
+        self.assertEqual(result, ("101", None))
+        self.assertEqual(trade._t.calls, [("create_order", 1)])
+
+    def test_revoke_batched(self):
+        trade = self.create_trade({"window": 0.005})
+
+        async def run():
+            return await asyncio.gather(trade.revoke_order("11"), trade.revoke_order("12"), trade.revoke_order("13"),
+                                        trade.revoke_order("11"))
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(trade._t.calls, [("revoke_order", ("11", "12", "13"))])
+        self.assertEqual(results[0], ("11", None))
+        self.assertEqual(results[1], ("12", None))
+        self.assertEqual(results[2][0], False)
+        self.assertEqual(results[2][1][0]["err_code"], 1071)
+        self.assertEqual(results[3], ("11", None))
+
+    def test_platform_create_orders(self):
+        """ The public `create_orders` still returns the order ids, only the batcher uses the indexes. """
+        trade = HuobiUsdtSwapTrade.__new__(HuobiUsdtSwapTrade)
+        trade._symbol = "BTC-USDT"
+        trade._rest_api = FakeRestAPI()
+        orders = [{"action": ORDER_ACTION_BUY, "price": price, "quantity": 1, "order_type": ORDER_TYPE_LIMIT}
+                  for price in (1, 0, 3)]
+        order_nos, errors = self.loop.run_until_complete(trade.create_orders(orders))
+        self.assertEqual(order_nos, [203, 201])
+        self.assertEqual([e["index"] for e in errors], [2])
+        self.assertEqual([o["leverRate"] for o in trade._rest_api.orders_data], [20, 20, 20])
+        order_nos, _ = self.loop.run_until_complete(trade._create_orders_indexed(orders))
+        self.assertEqual(order_nos, [(3, 203), (1, 201)])
+
+    def test_batch_error(self):
+        async def send(items):
+            raise ValueError("boom")
+
+        async def run():
+            batcher = OrderBatcher(send, window=0.001)
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2))
+        results = self.loop.run_until_complete(run())
+        self.assertEqual([r[0] for r in results], [None, None])
+        self.assertIsInstance(results[0][1], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)